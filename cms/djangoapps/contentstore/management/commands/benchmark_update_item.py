@@ -0,0 +1,102 @@
+"""
+Command to measure the latency and allocation of versioning and updating the
+structure of a split modulestore course.
+"""
+
+
+import copy
+import gc
+import itertools
+import timeit
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey, UsageKey
+
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py cms benchmark_update_item course-v1:edX+DemoX+Demo_Course --settings=devstack
+        $ ./manage.py cms benchmark_update_item course-v1:edX+DemoX+Demo_Course --no-update --iterations 50
+
+    Unless --no-update is given, each iteration renames the block and saves a
+    new draft version of the course, so don't run it against courses in use.
+    """
+    help = u'Measures the time and memory to version the structure of a course and to update one of its blocks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id', help=u'The split modulestore course to benchmark.')
+        parser.add_argument(
+            '--block',
+            help=u'Usage key of the block to update. Defaults to the course block.',
+        )
+        parser.add_argument(
+            '--iterations',
+            help=u'Number of timed runs of each operation.',
+            default=10,
+            type=int,
+        )
+        parser.add_argument(
+            '--no-update',
+            action='store_true',
+            help=u"Only time versioning the structure, without saving any versions of the course.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            course_key = CourseKey.from_string(options['course_id'])
+        except InvalidKeyError:
+            raise CommandError(u'Invalid course id: {}'.format(options['course_id']))
+        store = modulestore()._get_modulestore_for_courselike(course_key)  # pylint: disable=protected-access
+        if store.get_modulestore_type() != ModuleStoreEnum.Type.split:
+            raise CommandError(u'{} is not a split modulestore course'.format(course_key))
+
+        draft_key = course_key.for_branch(ModuleStoreEnum.BranchName.draft)
+        structure = store._lookup_course(draft_key).structure  # pylint: disable=protected-access
+        self.stdout.write(u'{} blocks'.format(len(structure['blocks'])))
+
+        user_id = ModuleStoreEnum.UserID.mgmt_command
+        operations = [
+            (u'deepcopy', lambda: copy.deepcopy(structure)),
+            (u'version_structure', lambda: store.version_structure(draft_key, structure, user_id)),
+        ]
+        if not options['no_update']:
+            usage_key = (
+                UsageKey.from_string(options['block']).map_into_course(course_key)
+                if options['block'] else store.make_course_usage_key(course_key)
+            )
+
+            edits = itertools.count()
+
+            def update_item():
+                # A changed field, so that each update saves a new version
+                block = modulestore().get_item(usage_key)
+                block.display_name = u'Benchmark {}'.format(next(edits))
+                modulestore().update_item(block, user_id)
+
+            operations.append((u'update_item', update_item))
+
+        for name, operation in operations:
+            seconds = min(timeit.repeat(operation, number=1, repeat=options['iterations']))
+            self.stdout.write(u'  {:<17} {:>8.2f} ms  peak alloc: {:>12,d} B'.format(
+                name, seconds * 1000, _peak_allocation(operation)
+            ))
+
+
+def _peak_allocation(operation):
+    """
+    Returns the peak bytes allocated by a single run of operation.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak_bytes
@@ -3,6 +3,9 @@ Script for exporting all courseware from Mongo to a directory and listing the co
 """
 
 
+import os
+
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from six import text_type
 
@@ -10,6 +13,10 @@ from xmodule.contentstore.django import contentstore
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.xml_exporter import export_course_to_xml
 
+# The file in each exported course directory recording the md5 of its exported assets, which
+# lets the next export into the same directory skip unchanged assets.
+ASSET_MANIFEST_FILENAME = '.asset_manifest.json'
+
 
 class Command(BaseCommand):
     """
@@ -19,12 +26,23 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('output_path')
+        parser.add_argument('--asset-workers',
+                            type=int,
+                            default=settings.COURSE_EXPORT_ASSET_WORKERS,
+                            help='Number of threads exporting the assets of each course')
+        parser.add_argument('--full',
+                            action='store_true',
+                            help='Export every asset, even those unchanged since the last export to output_path')
 
     def handle(self, *args, **options):
         """
         Execute the command
         """
-        courses, failed_export_courses = export_courses_to_output_path(options['output_path'])
+        courses, failed_export_courses = export_courses_to_output_path(
+            options['output_path'],
+            asset_workers=options['asset_workers'],
+            incremental=not options['full'],
+        )
 
         print("=" * 80)
         print("=" * 30 + "> Export summary")
@@ -35,9 +53,12 @@ class Command(BaseCommand):
         print("=" * 80)
 
 
-def export_courses_to_output_path(output_path):
+def export_courses_to_output_path(output_path, asset_workers=1, incremental=True):
     """
     Export all courses to target directory and return the list of courses which failed to export
+
+    If incremental, assets which are unchanged since the last export of their course to
+    output_path aren't exported again.
     """
     content_store = contentstore()
     module_store = modulestore()
@@ -52,7 +73,13 @@ def export_courses_to_output_path(output_path):
         print(u"Exporting course id = {0} to {1}".format(course_id, output_path))
         try:
             course_dir = text_type(course_id).replace('/', '...')
-            export_course_to_xml(module_store, content_store, course_id, root_dir, course_dir)
+            asset_manifest_file = None
+            if incremental:
+                asset_manifest_file = os.path.join(root_dir, course_dir, ASSET_MANIFEST_FILENAME)
+            export_course_to_xml(
+                module_store, content_store, course_id, root_dir, course_dir,
+                asset_workers=asset_workers, asset_manifest_file=asset_manifest_file,
+            )
         except Exception as err:  # pylint: disable=broad-except
             failed_export_courses.append(text_type(course_id))
             print(u"=" * 30 + u"> Oops, failed to export {0}".format(course_id))
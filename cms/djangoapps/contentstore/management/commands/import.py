@@ -3,6 +3,7 @@ Script for importing courseware from XML format
 """
 
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
 
 from openedx.core.djangoapps.django_comment_common.utils import are_permissions_roles_seeded, seed_permissions_roles
@@ -37,6 +38,10 @@ class Command(BaseCommand):
         parser.add_argument('--python-lib-filename',
                             default=DEFAULT_PYTHON_LIB_FILENAME,
                             help='Filename of the course code library (if it exists)')
+        parser.add_argument('--static-workers',
+                            type=int,
+                            default=settings.COURSE_IMPORT_STATIC_WORKERS,
+                            help='Number of threads saving static content')
 
     def handle(self, *args, **options):
         data_dir = options['data_directory']
@@ -69,6 +74,7 @@ class Command(BaseCommand):
             do_import_static=do_import_static, do_import_python_lib=do_import_python_lib,
             create_if_not_present=True,
             python_lib_filename=python_lib_filename,
+            static_import_workers=options['static_workers'],
         )
 
         for course in course_items:
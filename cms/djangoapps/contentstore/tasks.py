@@ -293,9 +293,15 @@ def create_export_tarball(course_module, course_key, context, status=None):
 
     try:
         if isinstance(course_key, LibraryLocator):
-            export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name)
+            export_library_to_xml(
+                modulestore(), contentstore(), course_key, root_dir, name,
+                asset_workers=settings.COURSE_EXPORT_ASSET_WORKERS,
+            )
         else:
-            export_course_to_xml(modulestore(), contentstore(), course_module.id, root_dir, name)
+            export_course_to_xml(
+                modulestore(), contentstore(), course_module.id, root_dir, name,
+                asset_workers=settings.COURSE_EXPORT_ASSET_WORKERS,
+            )
 
         if status:
             status.set_state(u'Compressing')
@@ -524,7 +530,8 @@ def import_olx(self, user_id, course_key_string, archive_path, archive_name, lan
             settings.GITHUB_REPO_ROOT, [dirpath],
             load_error_modules=False,
             static_content_store=contentstore(),
-            target_id=courselike_key
+            target_id=courselike_key,
+            static_import_workers=settings.COURSE_IMPORT_STATIC_WORKERS,
         )
 
         new_location = courselike_items[0].location
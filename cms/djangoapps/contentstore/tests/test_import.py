@@ -138,6 +138,27 @@ class ContentStoreImportTest(ModuleStoreTestCase):
         print(u"static_asset_path = {0}".format(course.static_asset_path))
         self.assertEqual(course.static_asset_path, 'test_import_course')
 
+    def test_parallel_static_import(self):
+        '''
+        Static content saved by several threads is the same as when saved by one
+        '''
+        content_store = contentstore()
+        module_store = modulestore()
+        imported_assets = []
+        for run, workers in (('sequential', 1), ('parallel', 4)):
+            course_key = module_store.make_course_key('edX', 'toy', run)
+            import_course_from_xml(
+                module_store, self.user.id, TEST_DATA_DIR, ['toy'],
+                static_content_store=content_store, target_id=course_key,
+                create_if_not_present=True, static_import_workers=workers,
+            )
+            all_assets, __ = content_store.get_all_content_for_course(course_key)
+            imported_assets.append(sorted(asset['displayname'] for asset in all_assets))
+            self.assertIsNotNone(module_store.get_course(course_key))
+
+        self.assertGreater(len(imported_assets[0]), 1)
+        self.assertEqual(imported_assets[0], imported_assets[1])
+
     def test_asset_import_nostatic(self):
         '''
         This test validates that an image asset is NOT imported when do_import_static=False
@@ -816,6 +816,22 @@ CONTENTSTORE = {
     'DOC_STORE_CONFIG': DOC_STORE_CONFIG
 }
 
+# .. setting_name: CONTENTSERVER_DISK_CACHE
+# .. setting_default: {'DIRECTORY': None, 'MAX_SIZE': 10 * 1024 * 1024 * 1024,
+#     'MIN_ASSET_SIZE': 1024 * 1024, 'MAX_ASSET_SIZE': 512 * 1024 * 1024}
+# .. setting_description: Local disk cache of the course assets served by the contentserver that are
+#     too large for memcached. DIRECTORY is where cached assets are kept, and may be shared by the
+#     processes of a server; the cache is disabled when it is None. MAX_SIZE is the total size, in
+#     bytes, past which the least recently served assets are removed. Only assets of MIN_ASSET_SIZE
+#     to MAX_ASSET_SIZE bytes are cached. The first Range request for an uncached asset waits for
+#     the whole asset to be copied from the contentstore, so MAX_ASSET_SIZE bounds that delay.
+CONTENTSERVER_DISK_CACHE = {
+    'DIRECTORY': None,
+    'MAX_SIZE': 10 * 1024 * 1024 * 1024,
+    'MIN_ASSET_SIZE': 1024 * 1024,
+    'MAX_ASSET_SIZE': 512 * 1024 * 1024,
+}
+
 MODULESTORE_BRANCH = 'draft-preferred'
 
 MODULESTORE = {
@@ -944,6 +960,19 @@ HTTPS = 'on'
 ROOT_URLCONF = 'cms.urls'
 
 COURSE_IMPORT_EXPORT_BUCKET = ''
+
+# .. setting_name: COURSE_IMPORT_STATIC_WORKERS
+# .. setting_default: 4
+# .. setting_description: Number of threads saving the static files of a course or library imported in
+#     Studio into the contentstore. When more than 1, static files are saved while the blocks of the course
+#     are imported, rather than before them.
+COURSE_IMPORT_STATIC_WORKERS = 4
+
+# .. setting_name: COURSE_EXPORT_ASSET_WORKERS
+# .. setting_default: 4
+# .. setting_description: Number of threads fetching the assets of a course or library exported in Studio,
+#     or by the export_all_courses management command, from the contentstore.
+COURSE_EXPORT_ASSET_WORKERS = 4
 ALTERNATE_WORKER_QUEUES = 'lms'
 
 STATIC_URL_BASE = '/static/'
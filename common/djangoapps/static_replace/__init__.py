@@ -2,11 +2,13 @@
 
 import logging
 import re
+from functools import lru_cache
 
 import six
 from django.conf import settings
 from django.contrib.staticfiles import finders
 from django.contrib.staticfiles.storage import staticfiles_storage
+from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.locator import AssetLocator
 from six import text_type
 
@@ -31,6 +33,35 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)
 
 
+def _static_url_prefix_regex(data_dir):
+    """
+    Match the prefix of static urls, unless they are followed by the data directory.
+    """
+    return u'(?:{static_url}|/static/)(?!{data_dir})'.format(
+        static_url=settings.STATIC_URL,
+        data_dir=data_dir
+    )
+
+
+@lru_cache(maxsize=64)
+def _url_rewrite_regex(static_prefix, replace_course, replace_jump_to_id):
+    """
+    Match the urls in quotes that a UrlRewriter replaces, in one regex:
+    static urls if `static_prefix` is not None, /course/ urls if
+    `replace_course`, and /jump_to_id/ urls if `replace_jump_to_id`.
+
+    The group named after the matching kind of url holds its prefix.
+    """
+    prefixes = []
+    if static_prefix is not None:
+        prefixes.append(u'(?P<static>{})'.format(static_prefix))
+    if replace_course:
+        prefixes.append(u'(?P<course>/course/)')
+    if replace_jump_to_id:
+        prefixes.append(u'(?P<jump_to_id>/jump_to_id/)')
+    return re.compile(_url_replace_regex(u'|'.join(prefixes)))
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
@@ -66,13 +97,7 @@ def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):
 
     output: <text> after the link rewriting rules are applied
     """
-
-    def replace_jump_to_id_url(match):
-        quote = match.group('quote')
-        rest = match.group('rest')
-        return "".join([quote, jump_to_id_base_url + rest, quote])
-
-    return re.sub(_url_replace_regex('/jump_to_id/'), replace_jump_to_id_url, text)
+    return UrlRewriter(course_id, replace_static=False, jump_to_id_base_url=jump_to_id_base_url).rewrite(text)
 
 
 def replace_course_urls(text, course_key):
@@ -84,15 +109,7 @@ def replace_course_urls(text, course_key):
 
     returns: text with the links replaced
     """
-
-    course_id = text_type(course_key)
-
-    def replace_course_url(match):
-        quote = match.group('quote')
-        rest = match.group('rest')
-        return "".join([quote, '/courses/' + course_id + '/', rest, quote])
-
-    return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
+    return UrlRewriter(course_key, replace_static=False, replace_course=True).rewrite(text)
 
 
 def process_static_urls(text, replacement_function, data_dir=None):
@@ -110,25 +127,23 @@ def process_static_urls(text, replacement_function, data_dir=None):
         quote = match.group('quote')
         rest = match.group('rest')
 
-        # Don't rewrite XBlock resource links.  Probably wasn't a good idea that /static
-        # works for actual static assets and for magical course asset URLs....
-        full_url = prefix + rest
-
-        starts_with_static_url = full_url.startswith(six.text_type(settings.STATIC_URL))
-        starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
-        contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
-        if starts_with_prefix or (starts_with_static_url and contains_prefix):
+        # Don't rewrite XBlock resource links.
+        if _is_xblock_resource_url(prefix + rest):
             return original
 
         return replacement_function(original, prefix, quote, rest)
 
-    return re.sub(
-        _url_replace_regex(u'(?:{static_url}|/static/)(?!{data_dir})'.format(
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
-        text
+    return re.sub(_url_replace_regex(_static_url_prefix_regex(data_dir)), wrap_part_extraction, text)
+
+
+def _is_xblock_resource_url(full_url):
+    """
+    Returns whether a static url is an XBlock resource link, which isn't rewritten.
+    """
+    # Probably wasn't a good idea that /static works for actual static assets and for
+    # magical course asset URLs....
+    return full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX) or (
+        full_url.startswith(six.text_type(settings.STATIC_URL)) and XBLOCK_STATIC_RESOURCE_PREFIX in full_url
     )
 
 
@@ -164,27 +179,140 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
       * the original unmodified static URI
       * the updated static URI (will match the original if unchanged)
     """
+    rewriter = UrlRewriter(course_id, data_directory=data_directory, static_asset_path=static_asset_path)
+    return rewriter.rewrite(text, static_paths_out=static_paths_out)
 
-    if static_paths_out is None:
-        static_paths_out = []
 
-    def replace_static_url(original, prefix, quote, rest):
+def get_course_url_rewriter(course_id, data_directory=None, static_asset_path='', jump_to_id_base_url=None):
+    """
+    Returns a UrlRewriter of the /static/, /course/ and /jump_to_id/ urls of
+    the course, shared for the rest of the request, so that each static url
+    is only resolved once however many fragments it appears in.
+    """
+    request_cache = RequestCache('static_replace.course_url_rewriters')
+    cache_key = (text_type(course_id), data_directory, static_asset_path, jump_to_id_base_url)
+    cached_response = request_cache.get_cached_response(cache_key)
+    if cached_response.is_found:
+        return cached_response.value
+
+    rewriter = UrlRewriter(
+        course_id,
+        data_directory=data_directory,
+        static_asset_path=static_asset_path,
+        replace_course=True,
+        jump_to_id_base_url=jump_to_id_base_url,
+    )
+    request_cache.set(cache_key, rewriter)
+    return rewriter
+
+
+class UrlRewriter(object):
+    """
+    Replaces the /static/, /course/ and /jump_to_id/ urls of a course in a
+    single scan of the text, as replace_static_urls, replace_course_urls and
+    replace_jump_to_id_urls do one after the other.
+
+    Resolved static urls are remembered, so a rewriter should be shared by
+    the rewrites of one course's content that happen close together, such as
+    the fragments of a page.  Since asset urls carry the digest and locked
+    state of the asset, it shouldn't be kept much longer than that.
+    """
+
+    def __init__(
+        self,
+        course_id=None,
+        data_directory=None,
+        static_asset_path='',
+        replace_static=True,
+        replace_course=False,
+        jump_to_id_base_url=None,
+    ):
         """
-        Replace a single matched url.
+        course_id: The course in which the rewrite happens
+        data_directory: The directory in which course data is stored
+        static_asset_path: Path for static assets, which overrides data_directory and course_id, if nonempty
+        replace_static: Whether to replace /static/ urls
+        replace_course: Whether to replace /course/ urls
+        jump_to_id_base_url: The base of the /jump_to_id/ handler, or None to leave /jump_to_id/ urls alone
+        """
+        self.course_id = course_id
+        self.data_directory = data_directory
+        self.static_asset_path = static_asset_path
+        self.jump_to_id_base_url = jump_to_id_base_url
+        self._course_url = u'/courses/{}/'.format(text_type(course_id)) if replace_course else None
+        self._static_urls = {}
+        self._asset_config = None
+        self._regex = _url_rewrite_regex(
+            _static_url_prefix_regex(static_asset_path or data_directory) if replace_static else None,
+            replace_course,
+            jump_to_id_base_url is not None,
+        )
+
+    def rewrite(self, text, static_paths_out=None):
+        """
+        Returns the text with its urls replaced.
+
+        static_paths_out: (optional) pass an array to collect tuples for each static URI found, as
+            replace_static_urls does
+        """
+        if static_paths_out is None:
+            static_paths_out = []
+
+        def replace_url(match):
+            """
+            Replace a single matched url.
+            """
+            quote = match.group('quote')
+            rest = match.group('rest')
+            groups = match.groupdict()
+            if groups.get('course') is not None:
+                return "".join([quote, self._course_url, rest, quote])
+            if groups.get('jump_to_id') is not None:
+                return "".join([quote, self.jump_to_id_base_url + rest, quote])
+
+            prefix = groups['static']
+            original_uri = "".join([prefix, rest])
+            # Don't rewrite XBlock resource links.
+            if _is_xblock_resource_url(original_uri):
+                return match.group(0)
+
+            if (prefix, rest) not in self._static_urls:
+                self._static_urls[(prefix, rest)] = self._resolve_static_url(prefix, rest)
+            url = self._static_urls[(prefix, rest)]
+            static_paths_out.append((original_uri, url))
+            if url == original_uri:
+                return match.group(0)
+            return "".join([quote, url, quote])
+
+        return self._regex.sub(replace_url, text)
+
+    def _get_asset_config(self):
+        """
+        Returns the base url and excluded extensions of course assets.
+        """
+        if self._asset_config is None:
+            # Import is placed here to avoid model import at project startup.
+            from common.djangoapps.static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
+            self._asset_config = (
+                AssetBaseUrlConfig.get_base_url(),
+                AssetExcludedExtensionsConfig.get_excluded_extensions(),
+            )
+        return self._asset_config
+
+    def _resolve_static_url(self, prefix, rest):
+        """
+        Returns the url that a static url of the given prefix and rest is replaced with.
         """
-        original_uri = "".join([prefix, rest])
         # Don't mess with things that end in '?raw'
         if rest.endswith('?raw'):
-            static_paths_out.append((original_uri, original_uri))
-            return original
+            return "".join([prefix, rest])
 
         # In debug mode, if we can find the url as is,
         if settings.DEBUG and finders.find(rest, True):
-            static_paths_out.append((original_uri, original_uri))
-            return original
+            return "".join([prefix, rest])
 
         # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
-        elif (not static_asset_path) and course_id:
+        elif (not self.static_asset_path) and self.course_id:
             # first look in the static file pipeline and see if we are trying to reference
             # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
 
@@ -200,18 +328,15 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
             else:
                 # if not, then assume it's courseware specific content and then look in the
                 # Mongo-backed database
-                # Import is placed here to avoid model import at project startup.
-                from common.djangoapps.static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
-                base_url = AssetBaseUrlConfig.get_base_url()
-                excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
-                url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
+                base_url, excluded_exts = self._get_asset_config()
+                url = StaticContent.get_canonicalized_asset_path(self.course_id, rest, base_url, excluded_exts)
 
                 if AssetLocator.CANONICAL_NAMESPACE in url:
                     url = url.replace('block@', 'block/', 1)
 
         # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
         else:
-            course_path = "/".join((static_asset_path or data_directory, rest))
+            course_path = "/".join((self.static_asset_path or self.data_directory, rest))
 
             try:
                 if staticfiles_storage.exists(rest):
@@ -224,7 +349,4 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
                     rest, str(err)))
                 url = "".join([prefix, course_path])
 
-        static_paths_out.append((original_uri, url))
-        return "".join([quote, url, quote])
-
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+        return url
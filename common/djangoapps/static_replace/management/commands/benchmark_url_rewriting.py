@@ -0,0 +1,78 @@
+"""
+Command to compare rewriting the urls of a course's HTML in successive passes and in a single pass.
+"""
+
+
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from six import text_type
+
+from common.djangoapps.static_replace import (
+    UrlRewriter,
+    replace_course_urls,
+    replace_jump_to_id_urls,
+    replace_static_urls
+)
+from xmodule.modulestore.django import modulestore
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms benchmark_url_rewriting course-v1:edX+DemoX+Demo_Course --settings=devstack
+        $ ./manage.py lms benchmark_url_rewriting course-v1:edX+DemoX+Demo_Course --iterations 20
+    """
+    help = u'Compares the time to rewrite the urls of the HTML blocks of a course in successive passes and in one pass.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id', help=u'The course whose HTML blocks are rewritten.')
+        parser.add_argument(
+            '--iterations',
+            help=u'Number of timed rewrites of the HTML with each approach.',
+            default=10,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        try:
+            course_key = CourseKey.from_string(options['course_id'])
+        except InvalidKeyError:
+            raise CommandError(u'Invalid course id: {}'.format(options['course_id']))
+
+        html_blocks = modulestore().get_items(course_key, qualifiers={'category': 'html'})
+        if not html_blocks:
+            raise CommandError(u'No HTML blocks in course {}'.format(course_key))
+        fragments = [block.data for block in html_blocks]
+        static_asset_path = html_blocks[0].static_asset_path
+        jump_to_id_base_url = reverse(
+            'jump_to_id', kwargs={'course_id': text_type(course_key), 'module_id': ''}
+        )
+        self.stdout.write(u'{} HTML blocks, {} characters'.format(
+            len(fragments), sum(len(fragment) for fragment in fragments)
+        ))
+
+        def rewrite_in_passes():
+            for fragment in fragments:
+                fragment = replace_static_urls(fragment, None, course_key, static_asset_path=static_asset_path)
+                fragment = replace_course_urls(fragment, course_key)
+                replace_jump_to_id_urls(fragment, course_key, jump_to_id_base_url)
+
+        def rewrite_in_one_pass():
+            rewriter = UrlRewriter(
+                course_key,
+                static_asset_path=static_asset_path,
+                replace_course=True,
+                jump_to_id_base_url=jump_to_id_base_url,
+            )
+            for fragment in fragments:
+                rewriter.rewrite(fragment)
+
+        timings = {}
+        for name, rewrite in ((u'passes', rewrite_in_passes), (u'one pass', rewrite_in_one_pass)):
+            timings[name] = min(timeit.repeat(rewrite, number=1, repeat=options['iterations']))
+            self.stdout.write(u'  {:<8} rewrite: {:>8.2f} ms'.format(name, timings[name] * 1000))
+        self.stdout.write(u'speedup: {:.1f}x'.format(timings[u'passes'] / timings[u'one pass']))
@@ -15,10 +15,13 @@ from opaque_keys.edx.keys import CourseKey
 from PIL import Image
 
 from common.djangoapps.static_replace import (
+    UrlRewriter,
     _url_replace_regex,
+    get_course_url_rewriter,
     make_static_urls_absolute,
     process_static_urls,
     replace_course_urls,
+    replace_jump_to_id_urls,
     replace_static_urls
 )
 from xmodule.assetstore.assetmgr import AssetManager
@@ -252,6 +255,64 @@ def test_static_url_with_xblock_resource_on_cdn(mock_modulestore, mock_storage):
     assert replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY) == post_text
 
 
+@patch('common.djangoapps.static_replace.staticfiles_storage', autospec=True)
+def test_url_rewriter_single_pass(mock_storage):
+    """
+    Make sure that a UrlRewriter replaces the urls that replace_static_urls, replace_course_urls
+    and replace_jump_to_id_urls replace one after the other.
+    """
+    mock_storage.exists.return_value = True
+    mock_storage.url.side_effect = lambda path: '/static/hashed/' + path
+
+    text = (
+        '<img src="/static/file.png"/><a href="/course/info">info</a>'
+        "<a href='/jump_to_id/block_id'>block</a><img src=\\'/static/other.png?raw\\'/>"
+    )
+    expected = replace_jump_to_id_urls(
+        replace_course_urls(replace_static_urls(text, DATA_DIRECTORY), COURSE_KEY),
+        COURSE_KEY,
+        '/courses/org/course/run/jump_to_id/',
+    )
+    rewriter = UrlRewriter(
+        COURSE_KEY,
+        data_directory=DATA_DIRECTORY,
+        static_asset_path=DATA_DIRECTORY,
+        replace_course=True,
+        jump_to_id_base_url='/courses/org/course/run/jump_to_id/',
+    )
+    assert rewriter.rewrite(text) == expected
+    assert '"/static/hashed/file.png"' in expected
+    assert '"/courses/org/course/run/info"' in expected
+    assert "'/courses/org/course/run/jump_to_id/block_id'" in expected
+
+
+@patch('common.djangoapps.static_replace.staticfiles_storage', autospec=True)
+def test_url_rewriter_resolves_each_url_once(mock_storage):
+    """
+    Make sure that a UrlRewriter looks each static url up once, and still reports every occurrence
+    in static_paths_out.
+    """
+    mock_storage.exists.return_value = True
+    mock_storage.url.return_value = '/static/file.hashed.png'
+
+    rewriter = UrlRewriter(data_directory=DATA_DIRECTORY)
+    static_paths = []
+    assert rewriter.rewrite('"/static/file.png" "/static/file.png"') == \
+        '"/static/file.hashed.png" "/static/file.hashed.png"'
+    assert rewriter.rewrite('"/static/file.png"', static_paths_out=static_paths) == '"/static/file.hashed.png"'
+    mock_storage.exists.assert_called_once_with('file.png')
+    assert static_paths == [('/static/file.png', '/static/file.hashed.png')]
+
+
+def test_course_url_rewriter_shared():
+    """
+    Make sure that the course url rewriter is shared for the same course and paths.
+    """
+    rewriter = get_course_url_rewriter(COURSE_KEY, DATA_DIRECTORY, jump_to_id_base_url='/jump/')
+    assert get_course_url_rewriter(COURSE_KEY, DATA_DIRECTORY, jump_to_id_base_url='/jump/') is rewriter
+    assert get_course_url_rewriter(COURSE_KEY, 'other_dir', jump_to_id_base_url='/jump/') is not rewriter
+
+
 @ddt.ddt
 class CanonicalContentTest(SharedModuleStoreTestCase):
     """
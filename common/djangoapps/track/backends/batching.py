@@ -0,0 +1,282 @@
+"""
+Event tracker backend that sends events to another backend in batches, from
+a background thread.
+
+Sending an event to a backend such as MongoDB costs a network round trip on
+the request thread.  This backend puts events on a bounded in-memory queue
+instead, and a background thread sends them to the wrapped backend in
+batches, as soon as enough events are queued or the oldest queued event has
+waited long enough.  Queued events are sent when the process exits.
+
+Example configuration::
+
+  TRACKING_BACKENDS = {
+      'mongo': {
+          'ENGINE': 'common.djangoapps.track.backends.batching.BatchingBackend',
+          'OPTIONS': {
+              'backend': {
+                  'ENGINE': 'common.djangoapps.track.backends.mongodb.MongoBackend',
+                  'OPTIONS': {'database': 'track'},
+              },
+              'batch_size': 100,
+              'flush_interval': 1.0,
+          }
+      }
+  }
+
+The backend works with the eventtracking backends too.
+"""
+
+
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.utils.module_loading import import_string
+from edx_django_utils.monitoring import set_custom_attribute
+from six.moves import queue
+
+from common.djangoapps.track.backends import BaseBackend
+
+log = logging.getLogger(__name__)
+
+# What to do with an event when the queue is full.
+DROP_NEWEST = 'drop_newest'
+DROP_OLDEST = 'drop_oldest'
+BLOCK = 'block'
+OVERFLOW_POLICIES = (DROP_NEWEST, DROP_OLDEST, BLOCK)
+
+# Queued to wake up the background thread when stopping.
+_WAKE_UP = object()
+
+
+class BatchingBackend(BaseBackend):
+    """
+    Event tracker backend that queues events, and sends them to a wrapped
+    backend in batches from a background thread.
+
+    The wrapped backend receives each batch through its `send_batch` method
+    if it has one, or through `send` for each event otherwise.
+    """
+
+    def __init__(
+        self,
+        backend,
+        max_queue_size=10000,
+        batch_size=100,
+        flush_interval=1.0,
+        overflow=DROP_NEWEST,
+        block_timeout=0.05,
+        shutdown_timeout=5.0,
+        **kwargs
+    ):
+        """
+        :Parameters:
+
+          - `backend`: the backend to send events to, or its configuration
+            as a dict with `ENGINE` and `OPTIONS` keys.
+          - `max_queue_size`: the maximum number of queued events.
+          - `batch_size`: the number of queued events that are sent at once.
+          - `flush_interval`: the maximum time, in seconds, that an event is
+            queued before its batch is sent.
+          - `overflow`: what to do with an event when the queue is full:
+            'drop_newest' drops the event, 'drop_oldest' drops the oldest
+            queued event to make room for it, and 'block' waits up to
+            `block_timeout` seconds for room before dropping it.
+          - `shutdown_timeout`: the maximum time, in seconds, to wait for
+            queued events to be sent when the process exits.
+
+        """
+        super(BatchingBackend, self).__init__(**kwargs)
+
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError('Invalid overflow policy %s' % overflow)
+
+        if isinstance(backend, dict):
+            backend = import_string(backend['ENGINE'])(**backend.get('OPTIONS', {}))
+        self.backend = backend
+
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.shutdown_timeout = shutdown_timeout
+
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._stopping = None
+        self._thread = None
+        atexit.register(self.close)
+
+    @property
+    def queue_depth(self):
+        """
+        The number of events waiting to be sent.
+        """
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def send(self, event):
+        """
+        Queue the event to be sent to the wrapped backend.
+        """
+        self._start()
+        if not self._put(event):
+            self._drop()
+        set_custom_attribute('tracking_batching_queue_depth', self.queue_depth)
+
+    def close(self):
+        """
+        Send the queued events, and stop the background thread.
+        """
+        thread = self._thread
+        if thread is None or self._pid != os.getpid():
+            return
+        self._stopping.set()
+        try:
+            self._queue.put_nowait(_WAKE_UP)
+        except queue.Full:
+            # The thread isn't waiting for events.
+            pass
+        thread.join(self.shutdown_timeout)
+        if thread.is_alive():
+            log.warning(
+                'Timed out sending queued events to event tracker backend %s; %d events are lost',
+                self.backend.__class__.__name__,
+                self.queue_depth,
+            )
+
+    def _start(self):
+        """
+        Start the background thread, unless it is running in this process.
+
+        A forked process doesn't inherit the threads of its parent, so each
+        process starts its own thread and queue.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(self.max_queue_size)
+            self._stopping = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(self._queue, self._stopping),
+                name='track-batching-{}'.format(self.backend.__class__.__name__),
+            )
+            self._thread.daemon = True
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _put(self, event):
+        """
+        Queue the event, applying the overflow policy, and return whether it
+        was queued.
+        """
+        try:
+            if self.overflow == BLOCK:
+                self._queue.put(event, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            if self.overflow != DROP_OLDEST:
+                return False
+
+        # Make room for the event by dropping the oldest one.
+        try:
+            self._queue.get_nowait()
+            self._drop()
+        except queue.Empty:
+            pass
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            return False
+
+    def _drop(self):
+        """
+        Count a dropped event.
+        """
+        with self._lock:
+            self.dropped += 1
+            dropped = self.dropped
+        set_custom_attribute('tracking_batching_dropped_events', dropped)
+        # Log the first drop, and then every thousandth, so a full queue doesn't flood the logs.
+        if dropped % 1000 == 1:
+            log.warning(
+                'Event tracker backend %s queue is full; %d events dropped so far',
+                self.backend.__class__.__name__,
+                dropped,
+            )
+
+    def _run(self, event_queue, stopping):
+        """
+        Send the queued events in batches until stopped, and then send the
+        remaining events.
+        """
+        while not stopping.is_set():
+            batch = self._next_batch(event_queue, stopping)
+            if batch:
+                self._send_batch(batch)
+
+        while True:
+            batch = self._next_batch(event_queue, stopping)
+            if not batch:
+                break
+            self._send_batch(batch)
+
+    def _next_batch(self, event_queue, stopping):
+        """
+        Return up to `batch_size` queued events, waiting at most
+        `flush_interval` seconds after the first one for the rest, and not at
+        all once stopping.
+        """
+        batch = []
+        deadline = None
+        while len(batch) < self.batch_size:
+            if stopping.is_set():
+                timeout = None
+            elif deadline is None:
+                timeout = self.flush_interval
+            else:
+                timeout = deadline - time.time()
+                if timeout <= 0:
+                    break
+            try:
+                event = event_queue.get_nowait() if timeout is None else event_queue.get(timeout=timeout)
+            except queue.Empty:
+                if batch or stopping.is_set():
+                    break
+                continue
+            if event is _WAKE_UP:
+                continue
+            batch.append(event)
+            if deadline is None:
+                deadline = time.time() + self.flush_interval
+        return batch
+
+    def _send_batch(self, batch):
+        """
+        Send a batch of events to the wrapped backend.
+        """
+        try:
+            send_batch = getattr(self.backend, 'send_batch', None)
+            if send_batch is not None:
+                send_batch(batch)
+            else:
+                for event in batch:
+                    self.backend.send(event)
+        except Exception:  # pylint: disable=broad-except
+            # The batch is lost, as events are when a synchronous backend fails.
+            log.exception(
+                'Error sending %d events to event tracker backend %s',
+                len(batch),
+                self.backend.__class__.__name__,
+            )
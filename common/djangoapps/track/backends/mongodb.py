@@ -98,3 +98,11 @@ class MongoBackend(BaseBackend):
             # during the next event.
             msg = 'Error inserting to MongoDB event tracker backend'
             log.exception(msg)
+
+    def send_batch(self, events):
+        """Insert the events in to the Mongo collection at once"""
+        try:
+            self.collection.insert(events, manipulate=False, continue_on_error=True)
+        except (PyMongoError, BSONError):
+            msg = 'Error inserting %d events to MongoDB event tracker backend'
+            log.exception(msg, len(events))
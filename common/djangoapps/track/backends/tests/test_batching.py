@@ -0,0 +1,115 @@
+"""Tests for the batching event tracker backend."""
+
+
+import threading
+from unittest import TestCase
+
+import ddt
+from mock import patch
+
+from common.djangoapps.track.backends import BaseBackend
+from common.djangoapps.track.backends.batching import BLOCK, DROP_NEWEST, DROP_OLDEST, BatchingBackend
+
+
+class InMemoryBackend(BaseBackend):
+    """Backend that records the batches it is sent, and can be held up."""
+
+    def __init__(self, **kwargs):
+        super(InMemoryBackend, self).__init__(**kwargs)
+        self.batches = []
+        self.sending = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def send(self, event):
+        self.send_batch([event])
+
+    def send_batch(self, events):
+        self.sending.set()
+        self.release.wait()
+        self.batches.append(list(events))
+
+
+@ddt.ddt
+class TestBatchingBackend(TestCase):
+    """Tests for BatchingBackend."""
+
+    def setUp(self):
+        super(TestBatchingBackend, self).setUp()
+        patcher = patch('common.djangoapps.track.backends.batching.set_custom_attribute')
+        self.mock_set_custom_attribute = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_backend(self, **kwargs):
+        """Return a batching backend, around an in-memory backend by default."""
+        kwargs.setdefault('backend', InMemoryBackend())
+        backend = BatchingBackend(**kwargs)
+        self.addCleanup(backend.close)
+        return backend
+
+    def test_batches_by_count(self):
+        backend = self.create_backend(batch_size=2, flush_interval=60)
+        for event_id in range(5):
+            backend.send({'id': event_id})
+        backend.close()
+
+        self.assertEqual(
+            backend.backend.batches,
+            [[{'id': 0}, {'id': 1}], [{'id': 2}, {'id': 3}], [{'id': 4}]],
+        )
+
+    def test_batches_by_time(self):
+        backend = self.create_backend(batch_size=100, flush_interval=0.01)
+        backend.send({'id': 0})
+        # The batch is sent well before it is full.
+        self.assertTrue(backend.backend.sending.wait(5))
+        backend.close()
+        self.assertEqual(backend.backend.batches, [[{'id': 0}]])
+
+    def test_backend_from_configuration(self):
+        backend = self.create_backend(backend={
+            'ENGINE': 'common.djangoapps.track.backends.tests.test_batching.InMemoryBackend',
+            'OPTIONS': {},
+        })
+        self.assertIsInstance(backend.backend, InMemoryBackend)
+
+    def test_invalid_overflow_policy(self):
+        with self.assertRaises(ValueError):
+            BatchingBackend(backend=InMemoryBackend(), overflow='unknown')
+
+    @ddt.data(
+        (DROP_NEWEST, [0, 1, 2]),
+        (DROP_OLDEST, [0, 3, 4]),
+        (BLOCK, [0, 1, 2]),
+    )
+    @ddt.unpack
+    def test_overflow(self, overflow, expected_ids):
+        backend = self.create_backend(
+            max_queue_size=2,
+            batch_size=1,
+            flush_interval=60,
+            overflow=overflow,
+            block_timeout=0.01,
+        )
+        # Hold up the first event in the backend, so the next ones fill the queue.
+        backend.backend.release.clear()
+        backend.send({'id': 0})
+        self.assertTrue(backend.backend.sending.wait(5))
+        for event_id in range(1, 5):
+            backend.send({'id': event_id})
+
+        self.assertEqual(backend.queue_depth, 2)
+        self.assertEqual(backend.dropped, 2)
+        self.mock_set_custom_attribute.assert_any_call('tracking_batching_dropped_events', 2)
+
+        backend.backend.release.set()
+        backend.close()
+        self.assertEqual([batch[0]['id'] for batch in backend.backend.batches], expected_ids)
+
+    def test_backend_errors(self):
+        backend = self.create_backend(batch_size=1)
+        with patch.object(backend.backend, 'send_batch', side_effect=[Exception, None]):
+            backend.send({'id': 0})
+            backend.send({'id': 1})
+            backend.close()
+            self.assertEqual(backend.backend.send_batch.call_count, 2)
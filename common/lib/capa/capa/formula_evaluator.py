@@ -0,0 +1,214 @@
+"""
+Cached and batched evaluation of math expressions with `calc`.
+
+`calc.evaluator` parses its expression with pyparsing on every call, which is
+most of the cost of checking NumericalResponse and FormulaResponse answers;
+FormulaResponse evaluates both the student and the instructor formula at every
+sample point.  This module keeps the parse trees of recently used expressions,
+and evaluates a formula at all of its sample points at once, with NumPy arrays
+of the sample values in place of the variables.
+
+NumPy's array operations don't always round like Python's float operations:
+in particular, `**` on arrays differs from `**` on floats in the last place
+for a few percent of values.  So batched results match those of evaluating
+each sample separately only up to such rounding errors, which are far smaller
+than the default tolerance of answer comparisons (`compare_with_tolerance`).
+"""
+
+
+import math
+import operator
+from functools import lru_cache, reduce
+
+import numpy
+import six
+from calc import functions as calc_functions
+from calc.calc import (
+    ParseAugmenter,
+    add_defaults,
+    check_parens,
+    eval_atom,
+    eval_number,
+    eval_parallel,
+    eval_power,
+    eval_product,
+    eval_sum
+)
+
+# Number of parsed expressions to keep, per process.
+PARSE_CACHE_SIZE = 1024
+
+# Default functions that don't accept arrays, and so are evaluated separately
+# at each sample point.
+SCALAR_FUNCTIONS = frozenset([math.factorial, calc_functions.arccot])
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse(math_expr, case_sensitive):
+    """
+    Return a `calc.ParseAugmenter` that has parsed `math_expr`.
+
+    The result is shared by all callers, so it must not be modified.
+    """
+    check_parens(math_expr)
+    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
+    math_interpreter.parse_algebra()
+    return math_interpreter
+
+
+def evaluator(variables, functions, math_expr, case_sensitive=False):
+    """
+    Evaluate an expression like `calc.evaluator`, reusing its parse tree if
+    the expression was parsed before.
+    """
+    if math_expr.strip() == "":
+        return float('nan')
+
+    math_interpreter = parse(math_expr, case_sensitive)
+    all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
+    math_interpreter.check_variables(all_variables, all_functions)
+
+    casify = _casify(case_sensitive)
+    return math_interpreter.reduce_tree({
+        'number': eval_number,
+        'variable': lambda x: all_variables[casify(x[0])],
+        'function': lambda x: all_functions[casify(x[0])](x[1]),
+        'atom': eval_atom,
+        'power': eval_power,
+        'parallel': eval_parallel,
+        'product': eval_product,
+        'sum': eval_sum,
+    })
+
+
+def evaluate_samples(var_dict_list, math_expr, case_sensitive=False):
+    """
+    Evaluate an expression at each of the given dicts of variable values.
+
+    Returns the same list as calling `evaluator(var_dict, {}, math_expr,
+    case_sensitive)` for each dict in `var_dict_list`, up to rounding errors
+    in the last place (see the module docstring), and raises the same
+    exceptions, but evaluates the expression once over arrays of the values
+    when possible.  If the batched evaluation fails or has a non-finite
+    result, which Python floats may raise on or represent differently (as in
+    division by zero, or fractional powers of negative numbers), the
+    expression is evaluated at each sample point instead.
+    """
+    results = None
+    if var_dict_list and math_expr.strip() != "":
+        results = _evaluate_batch(var_dict_list, math_expr, case_sensitive)
+    if results is None:
+        return [evaluator(var_dict, {}, math_expr, case_sensitive) for var_dict in var_dict_list]
+    return results
+
+
+def _evaluate_batch(var_dict_list, math_expr, case_sensitive):
+    """
+    Evaluate an expression over arrays of the given variable values, and
+    return the list of results, or None if the expression can't be batched.
+    """
+    names = set(var_dict_list[0])
+    if any(set(var_dict) != names for var_dict in var_dict_list):
+        return None
+    variables = {name: numpy.array([var_dict[name] for var_dict in var_dict_list]) for name in names}
+
+    math_interpreter = parse(math_expr, case_sensitive)
+    all_variables, all_functions = add_defaults(variables, {}, case_sensitive)
+    math_interpreter.check_variables(all_variables, all_functions)
+
+    casify = _casify(case_sensitive)
+    if any(all_functions[casify(name)] in SCALAR_FUNCTIONS for name in math_interpreter.functions_used):
+        return None
+
+    try:
+        with numpy.errstate(all='ignore'):
+            results = math_interpreter.reduce_tree({
+                'number': eval_number,
+                'variable': lambda x: all_variables[casify(x[0])],
+                'function': lambda x: all_functions[casify(x[0])](x[1]),
+                'atom': _eval_array_atom,
+                'power': _eval_array_power,
+                'parallel': _eval_array_parallel,
+                'product': _eval_array_product,
+                'sum': _eval_array_sum,
+            })
+            results = numpy.broadcast_to(results, (len(var_dict_list),))
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+    if not numpy.isfinite(results).all():
+        return None
+    return results.tolist()
+
+
+def _casify(case_sensitive):
+    """
+    Return the function that normalizes the case of variable and function
+    names.
+    """
+    if case_sensitive:
+        return lambda x: x
+    return lambda x: x.lower()
+
+
+# The following evaluation actions match those of `calc`, but tell operators
+# from operands by type, since the operands may be arrays.
+
+def _operands(parse_result):
+    """
+    Return the operands among the given tokens.
+    """
+    return [token for token in parse_result if not isinstance(token, six.string_types)]
+
+
+def _eval_array_atom(parse_result):
+    """
+    Return the value wrapped by the atom, ignoring any parentheses.
+    """
+    return _operands(parse_result)[0]
+
+
+def _eval_array_power(parse_result):
+    """
+    Exponentiate the operands, right to left.
+    """
+    return reduce(lambda a, b: b ** a, reversed(_operands(parse_result)))
+
+
+def _eval_array_parallel(parse_result):
+    """
+    Compute the parallel resistors operator, with NaN where an input is zero.
+    """
+    operands = _operands(parse_result)
+    if len(operands) == 1:
+        return operands[0]
+    has_zero = reduce(numpy.logical_or, [numpy.equal(operand, 0) for operand in operands])
+    return numpy.where(has_zero, numpy.nan, 1. / sum(1. / operand for operand in operands))
+
+
+def _eval_array_sum(parse_result):
+    """
+    Add the operands, keeping in mind their sign.
+    """
+    total = 0.0
+    current_op = operator.add
+    for token in parse_result:
+        if isinstance(token, six.string_types):
+            current_op = operator.sub if token == '-' else operator.add
+        else:
+            total = current_op(total, token)
+    return total
+
+
+def _eval_array_product(parse_result):
+    """
+    Multiply and divide the operands.
+    """
+    prod = 1.0
+    current_op = operator.mul
+    for token in parse_result:
+        if isinstance(token, six.string_types):
+            current_op = operator.truediv if token == '/' else operator.mul
+        else:
+            prod = current_op(prod, token)
+    return prod
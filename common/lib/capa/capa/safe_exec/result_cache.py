@@ -0,0 +1,160 @@
+"""
+A tiered cache for the results of safe_exec.
+
+Executing code in the sandbox costs a process spawn, so safe_exec caches its
+results, keyed by a digest of the code, the globals and the random seed.  The
+shared cache (memcached in production) saves the execution, but still costs a
+network round trip for every problem that is rendered or checked.  Most
+executions come from a small set of popular problems, so a size-bounded LRU
+local to the process answers most lookups before the shared cache is asked.
+"""
+
+
+import json
+
+from edx_django_utils import monitoring as monitoring_utils
+
+from openedx.core.lib.cache_utils import LRUCache
+
+# The tiers a cache lookup can be answered from, as named in the monitoring counts.
+LOCAL_HIT = 'local_hits'
+SHARED_HIT = 'shared_hits'
+MISS = 'misses'
+
+
+class LocalResultCache(object):
+    """
+    Process-local LRU cache of safe_exec results.
+
+    Results are stored JSON-encoded, so that every hit returns a fresh copy
+    that the caller is free to mutate, and the cache is bounded by the total
+    encoded size of the results rather than by their number.
+    """
+    def __init__(self, max_size):
+        """
+        Arguments:
+            max_size (int): The maximum total encoded size, in bytes, of the
+                cached results.
+        """
+        self._results = LRUCache(max_size)
+
+    @property
+    def max_size(self):
+        """
+        The maximum total encoded size, in bytes, of the cached results.
+        """
+        return self._results.max_size
+
+    @property
+    def size(self):
+        """
+        The total encoded size, in bytes, of the cached results.
+        """
+        return self._results.size
+
+    def get(self, key):
+        """
+        Return the result cached for ``key``, or None if it isn't cached.
+        """
+        encoded = self._results.get(key)
+        return None if encoded is None else json.loads(encoded)
+
+    def set(self, key, value):
+        """
+        Cache ``value`` for ``key``, evicting the least recently used results
+        as needed to stay within the size limit.
+        """
+        encoded = json.dumps(value)
+        self._results.set(key, encoded, len(encoded))
+
+    def clear(self):
+        """
+        Remove all results from the cache.
+        """
+        self._results.clear()
+
+    def __len__(self):
+        return len(self._results)
+
+
+class TieredResultCache(object):
+    """
+    A cache for the `cache` argument of safe_exec, that looks up results in a
+    process-local cache before a shared one.
+
+    Results are written to both tiers, and results found in the shared cache
+    are copied to the local one.  Since the cache keys are digests of
+    everything that determines a result, cached results never need to be
+    invalidated.
+
+    Each lookup increments the request's ``safe_exec_cache.local_hits``,
+    ``safe_exec_cache.shared_hits`` or ``safe_exec_cache.misses`` custom
+    attribute, and the request is tagged with the lookups' context in
+    ``safe_exec_cache.context``, so hit rates can be reported per course.
+    """
+    def __init__(self, shared_cache, local_cache=None, context=None):
+        """
+        Arguments:
+            shared_cache: An object with .get(key) and .set(key, value)
+                methods, such as the Django cache.
+            local_cache (LocalResultCache): The process-local cache, or None
+                to only use the shared cache.
+            context (str): The context the lookups are reported under,
+                usually the course run id.
+        """
+        self.shared_cache = shared_cache
+        self.local_cache = local_cache
+        self.context = context
+
+    def get(self, key):
+        """
+        Return the result cached for ``key`` in either tier, or None.
+        """
+        if self.local_cache is not None:
+            value = self.local_cache.get(key)
+            if value is not None:
+                self._record(LOCAL_HIT)
+                return value
+
+        value = self.shared_cache.get(key)
+        if value is None:
+            self._record(MISS)
+            return None
+
+        self._record(SHARED_HIT)
+        if self.local_cache is not None:
+            self.local_cache.set(key, value)
+        return value
+
+    def set(self, key, value):
+        """
+        Cache ``value`` for ``key`` in both tiers.
+        """
+        if self.local_cache is not None:
+            self.local_cache.set(key, value)
+        self.shared_cache.set(key, value)
+
+    def _record(self, tier):
+        """
+        Report a lookup that was answered by ``tier``.
+        """
+        if self.context is not None:
+            monitoring_utils.set_custom_attribute('safe_exec_cache.context', self.context)
+        monitoring_utils.increment('safe_exec_cache.{}'.format(tier))
+
+
+_LOCAL_RESULT_CACHE = None
+
+
+def get_local_result_cache(max_size):
+    """
+    Return the process-local :class:`LocalResultCache` with the given size
+    limit, or None if ``max_size`` is 0.
+    """
+    global _LOCAL_RESULT_CACHE  # pylint: disable=global-statement
+    if not max_size:
+        return None
+
+    if _LOCAL_RESULT_CACHE is None or _LOCAL_RESULT_CACHE.max_size != max_size:
+        _LOCAL_RESULT_CACHE = LocalResultCache(max_size)
+    return _LOCAL_RESULT_CACHE
@@ -16,10 +16,12 @@ from codejail.safe_exec import SafeExecException
 from django.conf import settings
 from django.core.exceptions import MiddlewareNotUsed
 from django.test import override_settings
+from mock import call, patch
 from six import text_type, unichr
 from six.moves import range
 
 from capa.safe_exec import safe_exec, update_hash
+from capa.safe_exec.result_cache import LocalResultCache, TieredResultCache
 
 
 class TestSafeExec(unittest.TestCase):
@@ -260,6 +262,70 @@ class TestSafeExecCaching(unittest.TestCase):
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
 
+class TestTieredResultCache(unittest.TestCase):
+    """Test the process-local tier in front of the shared safe_exec cache."""
+
+    def setUp(self):
+        super(TestTieredResultCache, self).setUp()
+        patcher = patch('capa.safe_exec.result_cache.monitoring_utils')
+        self.monitoring = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.shared = {}
+        self.local_cache = LocalResultCache(10000)
+
+    def tiered_cache(self):
+        """Return a tiered cache over the test's shared and local caches."""
+        return TieredResultCache(DictCache(self.shared), self.local_cache, context='course-v1:edX+Test+Run')
+
+    def test_miss_then_local_hit(self):
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=self.tiered_cache())
+        self.assertEqual(list(self.shared.values()), [(None, {'a': 3})])
+        self.assertEqual(len(self.local_cache), 1)
+
+        # The local tier answers without asking the shared cache.
+        self.shared.clear()
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=self.tiered_cache())
+        self.assertEqual(g['a'], 3)
+
+        self.assertEqual(
+            self.monitoring.increment.call_args_list,
+            [call('safe_exec_cache.misses'), call('safe_exec_cache.local_hits')]
+        )
+        self.monitoring.set_custom_attribute.assert_called_with('safe_exec_cache.context', 'course-v1:edX+Test+Run')
+
+    def test_shared_hit_populates_local(self):
+        safe_exec("a = int(math.pi)", {}, cache=DictCache(self.shared))
+        self.assertEqual(len(self.local_cache), 0)
+
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=self.tiered_cache())
+        self.assertEqual(g['a'], 3)
+        self.assertEqual(len(self.local_cache), 1)
+        self.monitoring.increment.assert_called_once_with('safe_exec_cache.shared_hits')
+
+    def test_local_hits_are_copies(self):
+        self.local_cache.set('key', [None, {'a': [1, 2]}])
+        self.local_cache.get('key')[1]['a'].append(3)
+        self.assertEqual(self.local_cache.get('key'), [None, {'a': [1, 2]}])
+
+    def test_local_eviction(self):
+        local_cache = LocalResultCache(40)
+        local_cache.set('first', [None, {'a': 1}])
+        local_cache.set('second', [None, {'a': 2}])
+        # Reading the first result makes the second the least recently used.
+        local_cache.get('first')
+        local_cache.set('third', [None, {'a': 3}])
+        self.assertIsNone(local_cache.get('second'))
+        self.assertEqual(local_cache.get('first'), [None, {'a': 1}])
+        self.assertLessEqual(local_cache.size, 40)
+
+        # Results larger than the cache aren't cached.
+        local_cache.set('large', [None, {'a': 'x' * 100}])
+        self.assertIsNone(local_cache.get('large'))
+
+
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
 
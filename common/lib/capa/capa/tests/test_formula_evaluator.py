@@ -0,0 +1,104 @@
+"""
+Tests capa formula_evaluator
+"""
+
+
+import unittest
+
+import calc
+import ddt
+import numpy
+import random2 as random
+
+from capa import formula_evaluator
+from capa.util import compare_with_tolerance
+
+
+@ddt.ddt
+class FormulaEvaluatorTest(unittest.TestCase):
+    """Tests for the cached and batched evaluation of calc expressions"""
+
+    def setUp(self):
+        super(FormulaEvaluatorTest, self).setUp()
+        rand = random.Random(17)
+        self.var_dict_list = [
+            {'x': rand.uniform(-10, 10), 'y': rand.uniform(-10, 10), 'R_1': rand.uniform(1, 5)}
+            for _ in range(20)
+        ]
+
+    def assert_same_as_calc(self, math_expr, case_sensitive=False, var_dict_list=None):
+        """
+        Assert that evaluate_samples returns what calc.evaluator returns at each sample, up to rounding errors.
+        """
+        var_dict_list = var_dict_list or self.var_dict_list
+        expected = [
+            calc.evaluator(var_dict, {}, math_expr, case_sensitive=case_sensitive)
+            for var_dict in var_dict_list
+        ]
+        results = formula_evaluator.evaluate_samples(var_dict_list, math_expr, case_sensitive)
+        numpy.testing.assert_allclose(results, expected, rtol=1e-13)
+        for result, expected_result in zip(results, expected):
+            self.assertTrue(compare_with_tolerance(result, expected_result))
+
+    def is_batched(self, math_expr):
+        """
+        Return whether the expression is evaluated over arrays of the sample values.
+        """
+        # pylint: disable=protected-access
+        return formula_evaluator._evaluate_batch(self.var_dict_list, math_expr, False) is not None
+
+    @ddt.data(
+        'x+2*y',
+        'x^2*sin(y)/(1+x^2)',
+        'sqrt(x) + e^(i*pi)',
+        'R_1 || y',
+        'sec(x) + cosh(y) - ln(abs(y))',
+        '25%*y',
+        '5',
+    )
+    def test_batched(self, math_expr):
+        self.assertTrue(self.is_batched(math_expr))
+        self.assert_same_as_calc(math_expr)
+
+    @ddt.data(
+        # Fractional powers of negative floats are complex, not NaN.
+        'x^0.5',
+        'arccot(x)',
+        # Parallel resistors with a zero input are NaN.
+        'x || 0',
+    )
+    def test_falls_back_to_samples(self, math_expr):
+        self.assertFalse(self.is_batched(math_expr))
+        self.assert_same_as_calc(math_expr)
+
+    def test_powers_within_tolerance(self):
+        # Powers of arrays and of floats round differently in the last place for some values.
+        rand = random.Random(3)
+        var_dict_list = [{'x': rand.uniform(0.1, 10), 'y': rand.uniform(-3, 3)} for _ in range(1000)]
+        self.assertIsNotNone(formula_evaluator._evaluate_batch(  # pylint: disable=protected-access
+            var_dict_list, 'x^y', False
+        ))
+        self.assert_same_as_calc('x^y', var_dict_list=var_dict_list)
+
+    def test_case_sensitive(self):
+        self.assert_same_as_calc('X+y')
+        with self.assertRaises(calc.UndefinedVariable):
+            formula_evaluator.evaluate_samples(self.var_dict_list, 'X+y', case_sensitive=True)
+
+    @ddt.data(
+        ('1/(x-x)', ZeroDivisionError),
+        ('x+(y', calc.UnmatchedParenthesis),
+        ('x+z', calc.UndefinedVariable),
+    )
+    @ddt.unpack
+    def test_errors(self, math_expr, error):
+        with self.assertRaises(error):
+            formula_evaluator.evaluate_samples(self.var_dict_list, math_expr)
+
+    def test_parse_cache(self):
+        formula_evaluator.parse.cache_clear()
+        for var_dict in self.var_dict_list:
+            formula_evaluator.evaluator(var_dict, {}, 'x*y')
+        formula_evaluator.evaluate_samples(self.var_dict_list, 'x*y')
+        cache_info = formula_evaluator.parse.cache_info()
+        self.assertEqual((cache_info.misses, cache_info.hits), (1, len(self.var_dict_list)))
@@ -10,11 +10,12 @@ from decimal import Decimal
 
 import bleach
 import six
-from calc import evaluator
 from lxml import etree
 
 from openedx.core.djangolib.markup import HTML
 
+from .formula_evaluator import evaluator
+
 #-----------------------------------------------------------------------------
 #
 # Utility functions used in CAPA responsetypes
@@ -4,7 +4,10 @@ MongoDB/GridFS-level code for the contentstore.
 
 
 import json
+import logging
 import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import gridfs
 import pymongo
@@ -23,6 +26,8 @@ from xmodule.util.misc import escape_invalid_characters
 
 from .content import ContentStore, StaticContent, StaticContentStream
 
+log = logging.getLogger(__name__)
+
 
 class MongoContentStore(ContentStore):
     """
@@ -176,24 +181,27 @@ class MongoContentStore(ContentStore):
                 return None
 
     def export(self, location, output_directory):
-        content = self.find(location)
-
-        filename = content.name
-        if content.import_path is not None:
-            output_directory = output_directory + '/' + os.path.dirname(content.import_path)
-
-        if not os.path.exists(output_directory):
-            os.makedirs(output_directory)
-
-        # Escape invalid char from filename.
-        export_name = escape_invalid_characters(name=filename, invalid_char_list=['/', '\\'])
-
-        disk_fs = OSFS(output_directory)
-
-        with disk_fs.open(export_name, 'wb') as asset_file:
-            asset_file.write(content.data)
-
-    def export_all_for_course(self, course_key, output_directory, assets_policy_file):
+        content = self.find(location, as_stream=True)
+        try:
+            export_dir = output_directory + '/' + _asset_export_dir(content.import_path)
+            if not os.path.exists(export_dir):
+                try:
+                    os.makedirs(export_dir)
+                except FileExistsError:
+                    # Made by another thread exporting an asset to the same directory.
+                    pass
+
+            disk_fs = OSFS(export_dir)
+
+            with disk_fs.open(_asset_export_name(content.name), 'wb') as asset_file:
+                for chunk in content.stream_data():
+                    asset_file.write(chunk)
+        finally:
+            content.close()
+
+    def export_all_for_course(
+            self, course_key, output_directory, assets_policy_file, max_workers=1, manifest_file=None
+    ):
         """
         Export all of this course's assets to the output_directory. Export all of the assets'
         attributes to the policy file.
@@ -203,11 +211,50 @@ class MongoContentStore(ContentStore):
             output_directory: the directory under which to put all the asset files
             assets_policy_file: the filename for the policy file which should be in the same
                 directory as the other policy files.
+            max_workers: the number of threads fetching and writing asset files
+            manifest_file: if given, the md5 of each exported asset file is kept in this file. An
+                asset which is unchanged since the export recorded in it, and whose file is still
+                in output_directory, isn't exported again. Files of assets that were deleted since
+                that export are removed.
         """
         policy = {}
         assets, __ = self.get_all_content_for_course(course_key)
 
+        previous_manifest = {}
+        if manifest_file and os.path.isfile(manifest_file):
+            try:
+                with open(manifest_file) as f:
+                    previous_manifest = json.load(f)
+            except ValueError:
+                log.warning(u'Ignoring invalid asset export manifest %s', manifest_file)
+
+        # The assets to export by their path under output_directory. The last of several
+        # assets with the same path is exported, as when they were exported one at a time.
+        assets_by_path = OrderedDict()
         for asset in assets:
+            asset_path = (
+                _asset_export_dir(asset.get('import_path')) + '/' + _asset_export_name(asset['displayname'])
+            ).lstrip('/')
+            assets_by_path[asset_path] = asset
+            for attr, value in six.iteritems(asset):
+                if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
+                    policy.setdefault(asset['asset_key'].block_id, {})[attr] = value
+
+        manifest = {}
+        changed_assets = []
+        for asset_path, asset in six.iteritems(assets_by_path):
+            manifest[asset_path] = asset.get('md5')
+            asset_file = output_directory + '/' + asset_path
+            if (
+                manifest[asset_path] is not None and
+                previous_manifest.get(asset_path) == manifest[asset_path] and
+                os.path.isfile(asset_file) and
+                os.path.getsize(asset_file) == asset.get('length')
+            ):
+                continue
+            changed_assets.append(asset)
+
+        def export_asset(asset):
             # TODO: On 6/19/14, I had to put a try/except around this
             # to export a course. The course failed on JSON files in
             # the /static/ directory placed in it with an import.
@@ -217,13 +264,27 @@ class MongoContentStore(ContentStore):
             # When debugging course exports, this might be a good place
             # to look. -- pmitros
             self.export(asset['asset_key'], output_directory)
-            for attr, value in six.iteritems(asset):
-                if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
-                    policy.setdefault(asset['asset_key'].block_id, {})[attr] = value
+
+        if max_workers > 1 and len(changed_assets) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Consume the results so that errors are raised.
+                list(executor.map(export_asset, changed_assets))
+        else:
+            for asset in changed_assets:
+                export_asset(asset)
+
+        for asset_path in set(previous_manifest) - set(manifest):
+            asset_file = output_directory + '/' + asset_path
+            if os.path.isfile(asset_file):
+                os.remove(asset_file)
 
         with open(assets_policy_file, 'w') as f:
             json.dump(policy, f, sort_keys=True, indent=4)
 
+        if manifest_file:
+            with open(manifest_file, 'w') as f:
+                json.dump(manifest, f, sort_keys=True, indent=4)
+
     def get_all_content_thumbnails_for_course(self, course_key):
         return self._get_all_content_for_course(course_key, get_thumbnails=True)[0]
 
@@ -603,6 +664,21 @@ class MongoContentStore(ContentStore):
         )
 
 
+def _asset_export_dir(import_path):
+    """
+    Return the directory, relative to the exported static directory, to export an asset to.
+    """
+    return os.path.dirname(import_path) if import_path is not None else ''
+
+
+def _asset_export_name(displayname):
+    """
+    Return the name of the file to export an asset to.
+    """
+    # Escape invalid char from filename.
+    return escape_invalid_characters(name=displayname, invalid_char_list=['/', '\\'])
+
+
 def query_for_course(course_key, category=None):
     """
     Construct a SON object that will query for all assets possibly limited to the given type
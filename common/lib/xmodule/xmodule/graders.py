@@ -11,6 +11,7 @@ import sys
 from collections import OrderedDict
 from datetime import datetime
 
+import numpy
 import six
 from contracts import contract
 from pytz import UTC
@@ -376,6 +377,32 @@ class AssignmentFormatGrader(CourseGrader):
 
         return aggregate_score, dropped_indices
 
+    def bulk_total_with_drops(self, percents):
+        """
+        Calculates the totals of many breakdowns at once, as
+        total_with_drops does for a single breakdown.
+
+        percents is a 2-dimensional array with one row of section
+        percentages per breakdown.  Returns a 1-dimensional array with
+        the total of each row.
+        """
+        num_rows, num_sections = percents.shape
+        dropped = numpy.zeros((num_rows, num_sections), dtype=bool)
+        if self.drop_count > 0:
+            # Drop the same sections as the stable sort in total_with_drops.
+            sorted_indices = numpy.argsort(-percents, axis=1, kind='stable')
+            numpy.put_along_axis(dropped, sorted_indices[:, -self.drop_count:], True, axis=1)
+
+        # Accumulate the sections in order, so the sums match total_with_drops exactly.
+        totals = numpy.zeros(num_rows)
+        for index in range(num_sections):
+            totals += numpy.where(dropped[:, index], 0.0, percents[:, index])
+
+        if num_sections - self.drop_count > 0:
+            totals /= num_sections - self.drop_count
+
+        return totals
+
     def grade(self, grade_sheet, generate_random_scores=False):
         scores = list(grade_sheet.get(self.type, {}).values())
         breakdown = []
@@ -5,6 +5,7 @@ that are stored in a database an accessible using their Location as an identifie
 
 
 import datetime
+import heapq
 import logging
 import re
 import threading
@@ -564,6 +565,23 @@ class SortedAssetList(SortedKeyList):
         self.add(metadata_to_insert)
 
 
+def _find_sorted_asset(assets, filename):
+    """
+    Returns the index of the asset with the given filename in a list of storable asset dicts
+    already sorted by filename, as they're stored, or None if it isn't in the list.
+    """
+    lo, hi = 0, len(assets)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if assets[mid]['filename'] < filename:
+            lo = mid + 1
+        else:
+            hi = mid
+    if lo < len(assets) and assets[lo]['filename'] == filename:
+        return lo
+    return None
+
+
 class ModuleStoreAssetBase(object):
     """
     The methods for accessing assets and their metadata
@@ -582,8 +600,8 @@ class ModuleStoreAssetBase(object):
             - the index of asset in list (None if asset does not exist)
         """
         course_assets = self._find_course_assets(asset_key.course_key)
-        all_assets = SortedAssetList(iterable=course_assets.setdefault(asset_key.block_type, []))
-        idx = all_assets.find(asset_key)
+        # The stored assets are kept sorted by filename, so search them rather than re-sorting them
+        idx = _find_sorted_asset(course_assets.setdefault(asset_key.block_type, []), asset_key.path)
 
         return course_assets, idx
 
@@ -639,14 +657,14 @@ class ModuleStoreAssetBase(object):
             if sort[1] == ModuleStoreEnum.SortOrder.descending:
                 sort_order = ModuleStoreEnum.SortOrder.descending
 
-        if asset_type is None:
-            # Add assets of all types to the sorted list.
-            all_assets = SortedAssetList(iterable=[], key=key_func)
-            for asset_type, val in six.iteritems(course_assets):
-                all_assets.update(val)
-        else:
-            # Add assets of a single type to the sorted list.
-            all_assets = SortedAssetList(iterable=course_assets.get(asset_type, []), key=key_func)
+        if asset_type is not None:
+            raw_assets = self._page_assets(course_assets.get(asset_type, []), key_func, sort_order, start, maxresults)
+            return [self._asset_metadata_from_storable(course_key, raw_asset) for raw_asset in raw_assets]
+
+        # Add assets of all types to the sorted list.
+        all_assets = SortedAssetList(iterable=[], key=key_func)
+        for asset_type, val in six.iteritems(course_assets):
+            all_assets.update(val)
         num_assets = len(all_assets)
 
         start_idx = start
@@ -662,14 +680,42 @@ class ModuleStoreAssetBase(object):
             start_idx = (num_assets - 1) - start_idx
             end_idx = (num_assets - 1) - end_idx
 
-        ret_assets = []
-        for idx in range(start_idx, end_idx, step_incr):
-            raw_asset = all_assets[idx]
-            asset_key = course_key.make_asset_key(raw_asset['asset_type'], raw_asset['filename'])
-            new_asset = AssetMetadata(asset_key)
-            new_asset.from_storable(raw_asset)
-            ret_assets.append(new_asset)
-        return ret_assets
+        return [
+            self._asset_metadata_from_storable(course_key, all_assets[idx])
+            for idx in range(start_idx, end_idx, step_incr)
+        ]
+
+    @staticmethod
+    def _page_assets(assets, key_func, sort_order, start, maxresults):
+        """
+        Returns the requested page of a list of storable asset dicts of one type, which are stored sorted
+        by filename. Only the page is sorted by any other key, and ties keep their order by filename.
+        """
+        if maxresults == 0 or start >= len(assets):
+            return []
+        descending = sort_order == ModuleStoreEnum.SortOrder.descending
+        if key_func is None:
+            # Already in filename order
+            ordered = assets[::-1] if descending else assets
+        elif maxresults < 0:
+            ordered = sorted(assets[::-1] if descending else assets, key=key_func, reverse=descending)
+        elif descending:
+            ordered = heapq.nlargest(start + maxresults, reversed(assets), key=key_func)
+        else:
+            ordered = heapq.nsmallest(start + maxresults, assets, key=key_func)
+        if maxresults < 0:
+            return ordered[start:]
+        return ordered[start:start + maxresults]
+
+    @staticmethod
+    def _asset_metadata_from_storable(course_key, raw_asset):
+        """
+        Returns the AssetMetadata for a storable asset dict of the course.
+        """
+        asset_key = course_key.make_asset_key(raw_asset['asset_type'], raw_asset['filename'])
+        new_asset = AssetMetadata(asset_key)
+        new_asset.from_storable(raw_asset)
+        return new_asset
 
     # pylint: disable=unused-argument
     def check_supports(self, course_key, method):
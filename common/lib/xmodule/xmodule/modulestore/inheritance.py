@@ -336,6 +336,13 @@ class InheritingFieldData(KvsFieldData):
         The default for an inheritable name is found on a parent.
         """
         if name in self.inheritable_names:
+            # The kvs may already know the values set on the block's ancestors
+            precomputed_inherited_settings = getattr(self._kvs, 'precomputed_inherited_settings', None)
+            if precomputed_inherited_settings is not None:
+                if name in precomputed_inherited_settings:
+                    return precomputed_inherited_settings[name]
+                return super(InheritingFieldData, self).default(block, name)
+
             # Walk up the content tree to find the first ancestor
             # that this field is set on. Use the field from the current
             # block so that if it has a different default than the root
@@ -3,6 +3,7 @@ General utilities
 """
 
 
+import copy
 from collections import namedtuple
 
 from contracts import check, contract
@@ -23,3 +24,109 @@ class BlockKey(namedtuple('BlockKey', 'type id')):
 
 
 CourseEnvelope = namedtuple('CourseEnvelope', 'course_key structure')
+
+
+class CopyOnWriteBlocks(dict):
+    """
+    The {BlockKey: BlockData} map of a new structure version, which shares
+    the BlockData of its parent version until they're used.
+
+    Structures are immutable once saved, so a new version used to deepcopy
+    every block of its parent, although an edit only changes a few of them.
+    Instead, a block is deepcopied the first time it's looked up, set aside
+    or iterated over through this map, as the caller may then mutate it.
+    Blocks which are only counted, checked for or serialized are never
+    copied.
+    """
+    def __init__(self, blocks):
+        super(CopyOnWriteBlocks, self).__init__(dict.items(blocks))
+        # Keys of the blocks still shared with the parent version
+        self._shared = set(dict.keys(self))
+
+    def _own(self, key):
+        """
+        Replace the block at key with a copy, if it's still shared.
+        """
+        if key in self._shared:
+            self._shared.discard(key)
+            dict.__setitem__(self, key, copy.deepcopy(dict.__getitem__(self, key)))
+
+    def _own_all(self):
+        """
+        Replace all of the still shared blocks with copies.
+        """
+        for key in list(self._shared):
+            self._own(key)
+
+    def items_for_reading(self):
+        """
+        Return the (BlockKey, BlockData) pairs without copying any blocks,
+        which the caller must not mutate.
+        """
+        return dict.items(self)
+
+    def __getitem__(self, key):
+        self._own(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        self._own(key)
+        return dict.get(self, key, default)
+
+    def __setitem__(self, key, value):
+        self._shared.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self._shared.discard(key)
+        dict.__delitem__(self, key)
+
+    def __iter__(self):
+        # Overridden so that dict(blocks) and {**blocks} go through __getitem__
+        return dict.__iter__(self)
+
+    def pop(self, key, *args):
+        self._own(key)
+        return dict.pop(self, key, *args)
+
+    def popitem(self):
+        self._own_all()
+        return dict.popitem(self)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        self._shared.clear()
+        dict.clear(self)
+
+    def values(self):
+        self._own_all()
+        return dict.values(self)
+
+    def items(self):
+        self._own_all()
+        return dict.items(self)
+
+    def copy(self):
+        self._own_all()
+        return dict(dict.items(self))
+
+    def __copy__(self):
+        # Blocks this map already owns may still be mutated through it, so from
+        # now on both maps treat all of the blocks as shared
+        self._shared.update(dict.keys(self))
+        return CopyOnWriteBlocks(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(dict.items(self)), memo)
+
+    def __reduce__(self):
+        # Pickle as a plain dict, without copying the shared blocks first
+        return (dict, (dict(dict.items(self)),))
@@ -16,7 +16,7 @@ from xmodule.error_module import ErrorDescriptor
 from xmodule.errortracker import exc_info_to_str
 from xmodule.library_tools import LibraryToolsService
 from xmodule.mako_module import MakoDescriptorSystem
-from xmodule.modulestore import BlockData
+from xmodule.modulestore import BlockData, ModuleStoreEnum
 from xmodule.modulestore.edit_info import EditInfoRuntimeMixin
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.inheritance import InheritanceMixin, inheriting_field_data
@@ -96,6 +96,20 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
                 parent_map[child] = block_key
         return parent_map
 
+    @lazy
+    def _inheritance_map(self):
+        """
+        The settings each block inherits from its ancestors, precomputed for
+        the published branch, or None. Blocks on other branches look their
+        ancestors up, so that they see unsaved changes to them.
+        """
+        course_key = self.course_entry.course_key
+        if course_key.branch != ModuleStoreEnum.BranchName.published:
+            return None
+        if InheritanceMixin not in self.modulestore.xblock_mixins:
+            return None
+        return self.modulestore.get_inheritance_map(course_key, self.course_entry.structure)
+
     @contract(usage_key="BlockUsageLocator | BlockKey", course_entry_override="CourseEnvelope | None")
     def _load_item(self, usage_key, course_entry_override=None, **kwargs):
         """
@@ -223,6 +237,10 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         else:
             parent = None
 
+        inherited_settings = None
+        if self._inheritance_map is not None and block_key in self.course_entry.structure['blocks']:
+            inherited_settings = self._inheritance_map.get(block_key, {})
+
         aside_fields = None
 
         # for the situation if block_data has no asides attribute
@@ -242,7 +260,8 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
                 converted_defaults,
                 parent=parent,
                 aside_fields=aside_fields,
-                field_decorator=kwargs.get('field_decorator')
+                field_decorator=kwargs.get('field_decorator'),
+                precomputed_inherited_settings=inherited_settings,
             )
 
             if InheritanceMixin in self.modulestore.xblock_mixins:
@@ -20,12 +20,14 @@ from mongodb_proxy import autoretry_read
 # Import this just to export it
 from pymongo.errors import DuplicateKeyError  # pylint: disable=unused-import
 
+from openedx.core.lib.cache_utils import LRUCache
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore import BlockData
-from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo import BlockKey, CopyOnWriteBlocks
 from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
 
 try:
+    from django.conf import settings
     from django.core.cache import caches, InvalidCacheBackendError
     DJANGO_AVAILABLE = True
 except ImportError:
@@ -34,6 +36,14 @@ except ImportError:
 new_contract('BlockData', BlockData)
 log = logging.getLogger(__name__)
 
+# Key of the inheritance map of a structure in the structure caches.
+INHERITANCE_MAP_CACHE_KEY = u'inheritance_map.{}'
+
+# The tiers a cache lookup can be answered from, as tagged on its timer.
+PROCESS_HIT = 'process'
+SHARED_HIT = 'shared'
+MISS = 'miss'
+
 
 def get_cache(alias):
     """
@@ -184,18 +194,22 @@ def structure_to_mongo(structure, course_context=None):
         directly into mongo.
     """
     with TIMER.timer('structure_to_mongo', course_context) as tagger:
-        tagger.measure('blocks', len(structure['blocks']))
+        blocks = structure['blocks']
+        if isinstance(blocks, CopyOnWriteBlocks):
+            # Serializing doesn't mutate the blocks, so don't copy the shared ones
+            blocks = dict(blocks.items_for_reading())
+        tagger.measure('blocks', len(blocks))
 
         check('BlockKey', structure['root'])
-        check('dict(BlockKey: BlockData)', structure['blocks'])
-        for block in six.itervalues(structure['blocks']):
+        check('dict(BlockKey: BlockData)', blocks)
+        for block in six.itervalues(blocks):
             if 'children' in block.fields:
                 check('list(BlockKey)', block.fields['children'])
 
         new_structure = dict(structure)
         new_structure['blocks'] = []
 
-        for block_key, block in six.iteritems(structure['blocks']):
+        for block_key, block in six.iteritems(blocks):
             new_block = dict(block.to_storable())
             new_block.setdefault('block_type', block_key.type)
             new_block['block_id'] = block_key.id
@@ -204,58 +218,154 @@ def structure_to_mongo(structure, course_context=None):
         return new_structure
 
 
+_PROCESS_STRUCTURE_CACHE = None
+
+
+def get_process_structure_cache():
+    """
+    Return the process-local LRU cache of deserialized course structures,
+    keyed by structure id, and of what is derived from them alone, or None if
+    it is disabled.
+
+    Since structures are immutable, a cached structure never needs to be
+    invalidated, and the same object can be shared by all requests that are
+    served by the process. The cache is bounded by the total pickled size of
+    the structures it holds, rather than by their number, since course
+    structures vary in size by orders of magnitude.
+
+    The cache is sized by the COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE setting,
+    in bytes, and disabled if the setting is unset or 0.
+    """
+    global _PROCESS_STRUCTURE_CACHE  # pylint: disable=global-statement
+    if not DJANGO_AVAILABLE:
+        return None
+
+    max_size = getattr(settings, 'COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE', 0)
+    if not max_size:
+        return None
+
+    if _PROCESS_STRUCTURE_CACHE is None or _PROCESS_STRUCTURE_CACHE.max_size != max_size:
+        _PROCESS_STRUCTURE_CACHE = LRUCache(max_size)
+    return _PROCESS_STRUCTURE_CACHE
+
+
 class CourseStructureCache(object):
     """
     Wrapper around django cache object to cache course structure objects.
     The course structures are pickled and compressed when cached.
 
+    The inheritance maps computed from structures are cached alongside them
+    by structure id, so that processes loading the same version of a course
+    share the computation.
+
+    Deserialized structures are also kept in the process-local LRU cache
+    (see :func:`get_process_structure_cache`), if it is enabled, so that popular structures
+    skip the cache round trip and deserialization altogether.
+
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
     """
     def __init__(self):
         self.cache = None
+        self.process_cache = None
         if DJANGO_AVAILABLE:
             try:
                 self.cache = get_cache('course_structure_cache')
             except InvalidCacheBackendError:
                 pass
+            else:
+                self.process_cache = get_process_structure_cache()
 
     def get(self, key, course_context=None):
         """Pull the compressed, pickled struct data from cache and deserialize."""
+        return self._get("CourseStructureCache.get", key, course_context)
+
+    def get_inheritance_map(self, structure_id, course_context=None):
+        """
+        Return the inheritance map cached for the structure with the given id,
+        or None.
+        """
+        return self._get(
+            "CourseStructureCache.get_inheritance_map",
+            INHERITANCE_MAP_CACHE_KEY.format(structure_id),
+            course_context,
+        )
+
+    def set_inheritance_map(self, structure_id, inheritance_map, course_context=None):
+        """
+        Cache the inheritance map of the structure with the given id.
+        """
+        self._set(
+            "CourseStructureCache.set_inheritance_map",
+            INHERITANCE_MAP_CACHE_KEY.format(structure_id),
+            inheritance_map,
+            course_context,
+        )
+
+    def _get(self, metric_name, key, course_context):
+        """
+        Return the value cached for key, or None, and tag the timer of the
+        lookup with the tier that answered it, as cache_tier.
+        """
         if self.cache is None:
             return None
 
-        with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
-            try:
-                compressed_pickled_data = self.cache.get(key)
-                tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
+        with TIMER.timer(metric_name, course_context) as tagger:
+            value, tier = self._get_from_tiers(key, course_context, tagger)
+            tagger.tag(cache_tier=tier)
+            return value
+
+    def _get_from_tiers(self, key, course_context, tagger):
+        """
+        Return the value cached for key and the tier it was found in, or
+        None and MISS.
+        """
+        if self.process_cache is not None:
+            structure = self.process_cache.get(key)
+            tagger.tag(from_process_cache=str(structure is not None).lower())
+            tagger.measure('process_cache_size', self.process_cache.size)
+            if structure is not None:
+                return structure, PROCESS_HIT
+
+        try:
+            compressed_pickled_data = self.cache.get(key)
+            tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
 
-                if compressed_pickled_data is None:
-                    # Always log cache misses, because they are unexpected
-                    tagger.sample_rate = 1
-                    return None
+            if compressed_pickled_data is None:
+                # Always log cache misses, because they are unexpected
+                tagger.sample_rate = 1
+                return None, MISS
+
+            tagger.measure('compressed_size', len(compressed_pickled_data))
 
-                tagger.measure('compressed_size', len(compressed_pickled_data))
+            pickled_data = zlib.decompress(compressed_pickled_data)
+            tagger.measure('uncompressed_size', len(pickled_data))
 
-                pickled_data = zlib.decompress(compressed_pickled_data)
-                tagger.measure('uncompressed_size', len(pickled_data))
+            if six.PY2:
+                structure = pickle.loads(pickled_data)
+            else:
+                structure = pickle.loads(pickled_data, encoding='latin-1')
+        except Exception:
+            # The cached data is corrupt in some way, get rid of it.
+            log.warning("CourseStructureCache: Bad data in cache for %s", course_context)
+            self.cache.delete(key)
+            return None, MISS
 
-                if six.PY2:
-                    return pickle.loads(pickled_data)
-                else:
-                    return pickle.loads(pickled_data, encoding='latin-1')
-            except Exception:
-                # The cached data is corrupt in some way, get rid of it.
-                log.warning("CourseStructureCache: Bad data in cache for %s", course_context)
-                self.cache.delete(key)
-                return None
+        self._set_in_process_cache(key, structure, len(pickled_data), tagger)
+        return structure, SHARED_HIT
 
     def set(self, key, structure, course_context=None):
         """Given a structure, will pickle, compress, and write to cache."""
+        self._set("CourseStructureCache.set", key, structure, course_context)
+
+    def _set(self, metric_name, key, structure, course_context):
+        """
+        Pickle, compress, and write the value to the cache under key.
+        """
         if self.cache is None:
             return None
 
-        with TIMER.timer("CourseStructureCache.set", course_context) as tagger:
+        with TIMER.timer(metric_name, course_context) as tagger:
             pickled_data = pickle.dumps(structure, 4)  # Protocol can't be incremented until cache is cleared
             tagger.measure('uncompressed_size', len(pickled_data))
 
@@ -266,6 +376,15 @@ class CourseStructureCache(object):
             # Stuctures are immutable, so we set a timeout of "never"
             self.cache.set(key, compressed_pickled_data, None)
 
+            self._set_in_process_cache(key, structure, len(pickled_data), tagger)
+
+    def _set_in_process_cache(self, key, structure, size, tagger):
+        """
+        Add the structure to the process-local cache, if it is enabled.
+        """
+        if self.process_cache is not None:
+            tagger.measure('process_cache_evictions', len(self.process_cache.set(key, structure, size)))
+
 
 class MongoConnection(object):
     """
@@ -334,6 +453,19 @@ class MongoConnection(object):
 
             return structure
 
+    def get_cached_inheritance_map(self, structure_id, course_context=None):
+        """
+        Return the inheritance map cached for the structure whose id is given, or None.
+        """
+        return CourseStructureCache().get_inheritance_map(structure_id, course_context)
+
+    def cache_inheritance_map(self, structure_id, inheritance_map, course_context=None):
+        """
+        Cache the inheritance map of the structure whose id is given, which must be
+        immutable, i.e. already stored.
+        """
+        CourseStructureCache().set_inheritance_map(structure_id, inheritance_map, course_context)
+
     @autoretry_read()
     def find_structures_by_id(self, ids, course_context=None):
         """
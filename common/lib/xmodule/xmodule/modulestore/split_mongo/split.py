@@ -59,7 +59,7 @@ import copy
 import datetime
 import hashlib
 import logging
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from importlib import import_module
 
 import six
@@ -92,6 +92,7 @@ from xmodule.modulestore import (
     BulkOpsRecord,
     ModuleStoreEnum,
     ModuleStoreWriteBase,
+    Pattern,
     SortedAssetList,
     inheritance
 )
@@ -103,7 +104,7 @@ from xmodule.modulestore.exceptions import (
     MultipleLibraryBlocksFound,
     VersionConflictError
 )
-from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
+from xmodule.modulestore.split_mongo import BlockKey, CopyOnWriteBlocks, CourseEnvelope
 from xmodule.modulestore.split_mongo.mongo_connection import DuplicateKeyError, MongoConnection
 from xmodule.modulestore.store_utilities import DETACHED_XBLOCK_TYPES
 from xmodule.partitions.partitions_service import PartitionService
@@ -140,6 +141,20 @@ new_contract('BlockKey', BlockKey)
 new_contract('XBlock', XBlock)
 
 
+def _is_indexable(criterion):
+    """
+    Return whether the blocks matching a plain get_items criterion can be looked
+    up in a field index, rather than it being a regex, function, list or dict.
+    """
+    if isinstance(criterion, (list, dict, Pattern)) or callable(criterion):
+        return False
+    try:
+        hash(criterion)
+    except TypeError:
+        return False
+    return True
+
+
 class SplitBulkWriteRecord(BulkOpsRecord):
     def __init__(self):
         super(SplitBulkWriteRecord, self).__init__()
@@ -149,6 +164,8 @@ class SplitBulkWriteRecord(BulkOpsRecord):
         self.structures_in_db = set()
         # dict(version_guid, dict(BlockKey, module))
         self.modules = defaultdict(dict)
+        # dict(version_guid, (structure, dict(index name, index)))
+        self.structure_indexes = {}
         self.definitions = {}
         self.definitions_in_db = set()
         self.course_key = None
@@ -365,6 +382,8 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         bulk_write_record = self._get_bulk_ops_record(course_key)
         if bulk_write_record.active:
             bulk_write_record.structures[structure['_id']] = structure
+            # The structure may have been edited in place since it was indexed.
+            bulk_write_record.structure_indexes.pop(structure['_id'], None)
         else:
             self.db_connection.insert_structure(structure, course_key)
 
@@ -400,6 +419,171 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
             except KeyError:
                 pass
 
+    def _get_structure_indexes(self, course_key, structure):
+        """
+        Return the dict of the indexes built so far for the structure, by name.
+
+        The indexes are kept in the active bulk operation on course_key if there
+        is one, and in the request cache otherwise, until the structure is updated.
+        """
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        if bulk_write_record.active:
+            structure_indexes = bulk_write_record.structure_indexes
+        elif self.request_cache is not None:
+            structure_indexes = self.request_cache.data.setdefault('structure_index_cache', {})
+        else:
+            structure_indexes = {}
+
+        indexed_structure, indexes = structure_indexes.get(structure['_id'], (None, None))
+        if indexed_structure is not structure:
+            indexes = {}
+            structure_indexes[structure['_id']] = (structure, indexes)
+        return indexes
+
+    def get_parents_index(self, course_key, structure):
+        """
+        Return a dict of the keys of the parents of each block of the structure,
+        by block key, as built by :meth:`build_block_key_to_parents_mapping`.
+
+        The index is built the first time that it's needed for a structure, and
+        kept as described in :meth:`_get_structure_indexes`.
+        """
+        indexes = self._get_structure_indexes(course_key, structure)
+        if 'parents' not in indexes:
+            indexes['parents'] = dict(self.build_block_key_to_parents_mapping(structure))
+        return indexes['parents']
+
+    def get_field_index(self, course_key, structure, field_name):
+        """
+        Return an index of the blocks of the structure by field_name, which is
+        either 'block_type' or the name of a settings field, as built by
+        :meth:`build_field_index`.
+
+        The index is built the first time that it's needed for a structure, and
+        kept as described in :meth:`_get_structure_indexes`.
+        """
+        indexes = self._get_structure_indexes(course_key, structure)
+        index_name = ('field', field_name)
+        if index_name not in indexes:
+            indexes[index_name] = self.build_field_index(structure, field_name)
+        return indexes[index_name]
+
+    def build_field_index(self, structure, field_name):
+        """
+        Given a structure, builds an index of its blocks by the value of field_name,
+        which is either 'block_type' or the name of a settings field.
+
+        :param structure: db json of course structure
+        :param field_name: the field whose values are indexed
+
+        :return tuple: a list of the keys of the blocks which have the field set, and a dict
+            of the keys of the blocks by field value. Blocks whose value is a list are listed under
+            each of its elements, and unhashable values aren't indexed. Keys are in structure order.
+        """
+        set_block_keys = []
+        block_keys_by_value = defaultdict(list)
+        for block_key, block_data in six.iteritems(structure['blocks']):
+            if field_name == 'block_type':
+                value = block_key.type
+            elif field_name in block_data.fields:
+                value = block_data.fields[field_name]
+            else:
+                continue
+            set_block_keys.append(block_key)
+            for element in (value if isinstance(value, list) else [value]):
+                try:
+                    block_keys = block_keys_by_value[element]
+                except TypeError:
+                    continue
+                # A list may contain the same element more than once
+                if not block_keys or block_keys[-1] != block_key:
+                    block_keys.append(block_key)
+
+        return set_block_keys, dict(block_keys_by_value)
+
+    def get_inheritance_map(self, course_key, structure):
+        """
+        Return the inheritable settings which each block of the structure
+        inherits from its ancestors, as built by :meth:`build_inheritance_map`.
+
+        The map is kept as described in :meth:`_get_structure_indexes`. Maps of
+        stored structures, which can't change, are also cached by structure id
+        in the course structure cache, to be shared with other processes.
+        """
+        indexes = self._get_structure_indexes(course_key, structure)
+        if 'inheritance' in indexes:
+            return indexes['inheritance']
+
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        # Structures created in a bulk operation may still be edited in place
+        is_stored = not bulk_write_record.active or structure['_id'] in bulk_write_record.structures_in_db
+        inheritance_map = None
+        if is_stored:
+            inheritance_map = self.db_connection.get_cached_inheritance_map(structure['_id'], course_key)
+        if inheritance_map is None:
+            inheritance_map = self.build_inheritance_map(structure)
+            if is_stored:
+                self.db_connection.cache_inheritance_map(structure['_id'], inheritance_map, course_key)
+
+        indexes['inheritance'] = inheritance_map
+        return inheritance_map
+
+    def build_inheritance_map(self, structure):
+        """
+        Given a structure, builds a map of the inheritable settings which each of its blocks
+        inherits from its ancestors, as :class:`~xmodule.modulestore.inheritance.InheritingFieldData`
+        would find them by walking up the tree: the value of each setting is the one set on the
+        nearest ancestor, except for the settings which children of library_content blocks have
+        template defaults for.
+
+        :param structure: db json of course structure
+
+        :return dict: a dictionary of {field name: json value} by block key, for the blocks which
+            have a parent. Blocks with the same settings may share a dictionary.
+        """
+        # The same parent as CachingDescriptorSystem gives each block
+        parent_map = {}
+        for block_key, block_data in six.iteritems(structure['blocks']):
+            for child_key in block_data.fields.get('children', []):
+                parent_map[child_key] = block_key
+
+        # block key -> the settings which the block's children inherit
+        passed_down = {}
+
+        def _passed_down(block_key, descendants):
+            """
+            Return the settings which the children of block_key inherit.
+            """
+            if block_key not in passed_down:
+                parent_key = parent_map.get(block_key)
+                if parent_key is None or parent_key in descendants:
+                    inherited = {}
+                else:
+                    inherited = _passed_down(parent_key, descendants | {block_key})
+                fields = structure['blocks'][block_key].fields if block_key in structure['blocks'] else {}
+                # The json values, as InheritingFieldData reads them from ancestors
+                own_settings = {
+                    field_name: field.to_json(field.from_json(fields[field_name]))
+                    for field_name, field in six.iteritems(inheritance.InheritanceMixin.fields)
+                    if field_name in fields
+                }
+                passed_down[block_key] = dict(inherited, **own_settings) if own_settings else inherited
+            return passed_down[block_key]
+
+        inheritance_map = {}
+        for block_key, parent_key in six.iteritems(parent_map):
+            if block_key not in structure['blocks']:
+                continue
+            inherited = _passed_down(parent_key, frozenset([block_key]))
+            defaults = structure['blocks'][block_key].defaults
+            if parent_key.type == 'library_content' and defaults:
+                # Children of library_content blocks use their template defaults rather than inheriting
+                inherited = {
+                    field_name: value for field_name, value in six.iteritems(inherited) if field_name not in defaults
+                }
+            inheritance_map[block_key] = inherited
+        return inheritance_map
+
     def get_definition(self, course_key, definition_guid):
         """
         Retrieve a single definition by id, respecting the active bulk operation
@@ -484,8 +668,16 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         if bulk_write_record.active and course_key.branch in bulk_write_record.dirty_branches:
             return bulk_write_record.structure_for_branch(course_key.branch)
 
-        # Otherwise, make a new structure
-        new_structure = copy.deepcopy(structure)
+        # Otherwise, make a new structure, which only copies the blocks it uses. Asset metadata is
+        # replaced rather than edited in place, so the new structure only needs its own lists of assets.
+        new_structure = copy.deepcopy({
+            key: value for key, value in six.iteritems(structure) if key not in ('blocks', 'assets')
+        })
+        new_structure['blocks'] = CopyOnWriteBlocks(structure['blocks'])
+        if 'assets' in structure:
+            new_structure['assets'] = {
+                asset_type: list(assets) for asset_type, assets in six.iteritems(structure['assets'])
+            }
         new_structure['_id'] = ObjectId()
         new_structure['previous_version'] = structure['_id']
         new_structure['edited_by'] = user_id
@@ -705,6 +897,10 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
     # It won't recompute the value on operations such as update_course_index (e.g., to revert to a prev
     # version) but those functions will have an optional arg for setting these.
     SEARCH_TARGET_DICT = ['wiki_slug']
+    # The settings fields by which get_items looks up blocks in an index of the
+    # structure rather than by checking every block, unless overridden by the
+    # indexed_settings_fields option. block_type is always indexed.
+    INDEXED_SETTINGS_FIELDS = ['discussion_id', 'format', 'graded', 'group_access']
 
     DEFAULT_ROOT_LIBRARY_BLOCK_TYPE = 'library'
     DEFAULT_ROOT_COURSE_BLOCK_TYPE = 'course'
@@ -713,9 +909,11 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                  default_class=None,
                  error_tracker=null_error_tracker,
                  i18n_service=None, fs_service=None, user_service=None,
-                 services=None, signal_handler=None, **kwargs):
+                 services=None, signal_handler=None, indexed_settings_fields=None, **kwargs):
         """
         :param doc_store_config: must have a host, db, and collection entries. Other common entries: port, tz_aware.
+        :param indexed_settings_fields: the settings fields to index for get_items, instead of
+            INDEXED_SETTINGS_FIELDS.
         """
 
         super(SplitMongoModuleStore, self).__init__(contentstore, **kwargs)
@@ -745,6 +943,9 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             self.services["request_cache"] = self.request_cache
 
         self.signal_handler = signal_handler
+        self.indexed_settings_fields = (
+            self.INDEXED_SETTINGS_FIELDS if indexed_settings_fields is None else list(indexed_settings_fields)
+        )
 
     def close_connections(self):
         """
@@ -806,12 +1007,17 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                 definitions = {definition['_id']: definition
                                for definition in descendent_definitions}
 
-                for block in six.itervalues(new_module_data):
+                for block_key, block in six.iteritems(new_module_data):
                     if block.definition in definitions:
                         definition = definitions[block.definition]
+                        # Merge the definition into a copy of the block, since structures are
+                        # immutable and may be shared through the process-local structure cache.
+                        block = copy.copy(block)
                         # convert_fields gets done later in the runtime's xblock_from_json
+                        block.fields = dict(block.fields)
                         block.fields.update(definition.get('fields'))
                         block.definition_loaded = True
+                        new_module_data[block_key] = block
 
             system.module_data.update(new_module_data)
             return system.module_data
@@ -872,8 +1078,10 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                 del self.request_cache.data.setdefault('course_cache', {})[course_version_guid]
             except KeyError:
                 pass
+            self.request_cache.data.setdefault('structure_index_cache', {}).pop(course_version_guid, None)
         else:
             self.request_cache.data['course_cache'] = {}
+            self.request_cache.data['structure_index_cache'] = {}
 
     def _lookup_course(self, course_key, head_validation=True):
         """
@@ -1319,9 +1527,15 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         if not include_orphans:
             path_cache = {}
-            parents_cache = self.build_block_key_to_parents_mapping(course.structure)
+            parents_cache = self.get_parents_index(course.course_key, course.structure)
+
+        candidate_block_ids = self._get_indexed_candidates(course, qualifiers, settings)
+        if candidate_block_ids is None:
+            blocks = six.iteritems(course.structure['blocks'])
+        else:
+            blocks = ((block_id, course.structure['blocks'][block_id]) for block_id in candidate_block_ids)
 
-        for block_id, value in six.iteritems(course.structure['blocks']):
+        for block_id, value in blocks:
             if _block_matches_all(value):
                 if not include_orphans:
                     if (  # pylint: disable=bad-continuation
@@ -1337,6 +1551,50 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         else:
             return []
 
+    def _get_indexed_candidates(self, course, qualifiers, settings):
+        """
+        Return the keys of the blocks of the course structure which may match the
+        block_type qualifier or an indexed settings field, using the fewest found in
+        the field indexes, or None if no criteria can be looked up in them.
+
+        Only plain values, {'$in': [plain values]} and {'$exists': True} are
+        looked up. The candidates must still be checked against all of the criteria.
+        """
+        criteria = [('block_type', qualifiers['block_type'])] if 'block_type' in qualifiers else []
+        criteria.extend(
+            (field_name, settings[field_name]) for field_name in self.indexed_settings_fields if field_name in settings
+        )
+
+        candidates = None
+        for field_name, criterion in criteria:
+            if isinstance(criterion, dict):
+                if criterion == {'$exists': True}:
+                    values = None
+                elif list(criterion) == ['$in'] and all(_is_indexable(value) for value in criterion['$in']):
+                    values = list(criterion['$in'])
+                else:
+                    continue
+            elif _is_indexable(criterion):
+                values = [criterion]
+            else:
+                continue
+
+            set_block_keys, block_keys_by_value = self.get_field_index(course.course_key, course.structure, field_name)
+            if values is None:
+                block_keys = set_block_keys
+            elif len(values) == 1:
+                block_keys = block_keys_by_value.get(values[0], [])
+            else:
+                block_keys = []
+                for value in values:
+                    block_keys.extend(block_keys_by_value.get(value, []))
+                # Blocks whose value is a list may be listed under more than one of the values
+                block_keys = list(OrderedDict.fromkeys(block_keys))
+
+            if candidates is None or len(block_keys) < len(candidates):
+                candidates = block_keys
+        return candidates
+
     def build_block_key_to_parents_mapping(self, structure):
         """
         Given a structure, builds block_key to parents mapping for all block keys in structure
@@ -1361,8 +1619,8 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         :param course: actual db json of course from structures
         :param path_cache: a dictionary that records which modules have a path to the root so that we don't have to
         double count modules if we're computing this for a list of modules in a course.
-        :param parents_cache: a dictionary containing mapping of block_key to list of its parents. Optionally, this
-        should be built for course structure to make this method faster.
+        :param parents_cache: a dictionary containing mapping of block_key to list of its parents. If it isn't
+        given, the index of the course structure from :meth:`get_parents_index` is used.
 
         :return Bool: whether or not component has path to the root
         """
@@ -1371,9 +1629,8 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             return path_cache[block_key]
 
         if parents_cache is None:
-            xblock_parents = self._get_parents_from_structure(block_key, course.structure)
-        else:
-            xblock_parents = parents_cache[block_key]
+            parents_cache = self.get_parents_index(course.course_key, course.structure)
+        xblock_parents = parents_cache.get(block_key, [])
 
         if len(xblock_parents) == 0 and block_key.type in ["course", "library"]:
             # Found, xblock has the path to the root
@@ -1405,14 +1662,16 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             raise ItemNotFoundError(locator)
 
         course = self._lookup_course(locator.course_key)
-        all_parent_ids = self._get_parents_from_structure(BlockKey.from_usage_key(locator), course.structure)
+        parents_index = self.get_parents_index(course.course_key, course.structure)
+        all_parent_ids = parents_index.get(BlockKey.from_usage_key(locator), [])
 
         # Check and verify the found parent_ids are not orphans; Remove parent which has no valid path
         # to the course root
+        path_cache = {}
         parent_ids = [
             valid_parent
             for valid_parent in all_parent_ids
-            if self.has_path_to_root(valid_parent, course)
+            if self.has_path_to_root(valid_parent, course, path_cache, parents_index)
         ]
 
         if len(parent_ids) == 0:
@@ -2937,7 +3196,8 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
             # Form an AssetMetadata.
             mdata = AssetMetadata(asset_key, asset_key.path)
-            mdata.from_storable(all_assets[asset_idx])
+            # Copy the asset, which the previous version of the structure shares
+            mdata.from_storable(copy.deepcopy(all_assets[asset_idx]))
             mdata.update(attr_dict)
 
             # Generate a Mongo doc from the metadata and update the course asset info.
@@ -2988,7 +3248,9 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             index_entry = self._get_index_if_valid(dest_course_key)
             new_structure = self.version_structure(dest_course_key, original_structure, user_id)
 
-            new_structure['assets'] = source_structure.get('assets', {})
+            new_structure['assets'] = {
+                asset_type: list(assets) for asset_type, assets in six.iteritems(source_structure.get('assets', {}))
+            }
             new_structure['thumbnails'] = source_structure.get('thumbnails', [])
 
             # update index if appropriate and structures
@@ -3213,6 +3475,9 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         """
         Given a structure, find block_key's parent in that structure. Note returns
         the encoded format for parent
+
+        This scans the whole structure, so it also works while the structure is
+        being edited. Use :meth:`get_parents_index` for structures which aren't.
         """
         return [
             parent_block_key
@@ -28,13 +28,16 @@ class SplitMongoKVS(InheritanceKeyValueStore):
     VALID_SCOPES = (Scope.parent, Scope.children, Scope.settings, Scope.content)
 
     @contract(parent="BlockUsageLocator | None")
-    def __init__(self, definition, initial_values, default_values, parent, aside_fields=None, field_decorator=None):
+    def __init__(self, definition, initial_values, default_values, parent, aside_fields=None, field_decorator=None,
+                 precomputed_inherited_settings=None):
         """
 
         :param definition: either a lazyloader or definition id for the definition
         :param initial_values: a dictionary of the locally set values
         :param default_values: any Scope.settings field defaults that are set locally
             (copied from a template block with copy_from_template)
+        :param precomputed_inherited_settings: the inheritable settings set on the block's ancestors,
+            if they're known, so that InheritingFieldData needn't walk up the tree to find them
         """
         # deepcopy so that manipulations of fields does not pollute the source
         super(SplitMongoKVS, self).__init__(copy.deepcopy(initial_values))
@@ -50,6 +53,7 @@ class SplitMongoKVS(InheritanceKeyValueStore):
 
         self.parent = parent
         self.aside_fields = aside_fields if aside_fields else {}
+        self.precomputed_inherited_settings = precomputed_inherited_settings
 
     def get(self, key):
         if key.block_family == XBlockAside.entry_point:
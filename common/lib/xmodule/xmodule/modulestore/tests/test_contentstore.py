@@ -11,6 +11,7 @@ from tempfile import mkdtemp
 from uuid import uuid4
 
 import ddt
+import mock
 import path
 from opaque_keys.edx.keys import AssetKey
 from opaque_keys.edx.locator import AssetLocator, CourseLocator
@@ -148,6 +149,45 @@ class TestContentstore(unittest.TestCase):
         finally:
             shutil.rmtree(root_dir)
 
+    @ddt.data(True, False)
+    def test_export_for_course_incremental(self, deprecated):
+        """
+        Test that an export with a manifest only exports the assets changed since the last one
+        """
+        self.set_up_assets(deprecated)
+        root_dir = path.Path(mkdtemp())
+        self.addCleanup(shutil.rmtree, root_dir)
+        manifest_file = path.Path(root_dir / "manifest.json")
+
+        def export_all():
+            """
+            Export course1's assets with several threads, returning the keys of the exported assets.
+            """
+            with mock.patch.object(self.contentstore, 'export', wraps=self.contentstore.export) as mock_export:
+                self.contentstore.export_all_for_course(
+                    self.course1_key, root_dir / "static", path.Path(root_dir / "policy.json"),
+                    max_workers=4, manifest_file=manifest_file,
+                )
+            return {call[0][0].block_id for call in mock_export.call_args_list}
+
+        self.assertEqual(export_all(), set(self.course1_files))
+        for filename in self.course1_files:
+            self.assertTrue(path.Path(root_dir / "static" / filename).isfile())
+
+        self.assertEqual(export_all(), set())
+
+        # A changed asset, an asset whose file was removed and a deleted asset.
+        changed_file, removed_file, deleted_file = self.course1_files
+        self.save_asset(
+            'picture3.jpg', self.course1_key.make_asset_key('asset', changed_file), changed_file, False
+        )
+        path.Path(root_dir / "static" / removed_file).remove()
+        self.contentstore.delete(self.course1_key.make_asset_key('asset', deleted_file))
+
+        self.assertEqual(export_all(), {changed_file, removed_file})
+        self.assertTrue(path.Path(root_dir / "static" / removed_file).isfile())
+        self.assertFalse(path.Path(root_dir / "static" / deleted_file).exists())
+
     @ddt.data(True, False)
     def test_get_all_content(self, deprecated):
         """
@@ -3,6 +3,7 @@
 """
 
 
+import copy
 import datetime
 import os
 import random
@@ -15,6 +16,7 @@ import six
 from ccx_keys.locator import CCXBlockUsageLocator
 from contracts import contract
 from django.core.cache import InvalidCacheBackendError, caches
+from django.test.utils import override_settings
 from mock import patch
 from opaque_keys.edx.locator import BlockUsageLocator, CourseKey, CourseLocator, LocalId, VersionTree
 from path import Path as path
@@ -23,6 +25,7 @@ from xblock.fields import Reference, ReferenceList, ReferenceValueDict
 
 from openedx.core.lib import tempdir
 from openedx.core.lib.tests import attr
+from xmodule.assetstore import AssetMetadata
 from xmodule.course_module import CourseDescriptor
 from xmodule.fields import Date, Timedelta
 from xmodule.modulestore import ModuleStoreEnum
@@ -35,7 +38,14 @@ from xmodule.modulestore.exceptions import (
     VersionConflictError
 )
 from xmodule.modulestore.inheritance import InheritanceMixin
-from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo import BlockKey, CopyOnWriteBlocks
+from xmodule.modulestore.split_mongo.mongo_connection import (
+    MISS,
+    SHARED_HIT,
+    Tagger,
+    get_process_structure_cache,
+    structure_to_mongo
+)
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.factories import check_mongo_calls
 from xmodule.modulestore.tests.mongo_connection import MONGO_HOST, MONGO_PORT_NUM
@@ -1013,6 +1023,46 @@ class TestCourseStructureCache(SplitModuleTest):
         # now make sure that you get the same structure
         self.assertEqual(cached_structure, not_cached_structure)
 
+    @override_settings(COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE=64 * 1024 * 1024)
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_process_structure_cache(self, mock_get_cache):
+        mock_get_cache.return_value = self.cache
+        process_cache = get_process_structure_cache()
+        process_cache.clear()
+        self.addCleanup(process_cache.clear)
+
+        with check_mongo_calls(1):
+            not_cached_structure = self._get_structure(self.new_course)
+
+        # Clearing the django cache doesn't matter once the structure is cached in process,
+        # and the deserialized structure itself is shared.
+        self.cache.clear()
+        with check_mongo_calls(0):
+            cached_structure = self._get_structure(self.new_course)
+        self.assertIs(cached_structure, not_cached_structure)
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_inheritance_map_cache(self, mock_get_cache):
+        mock_get_cache.return_value = self.cache
+        store = modulestore()
+        structure = self._get_structure(self.new_course)
+
+        with patch.object(store, 'build_inheritance_map', wraps=store.build_inheritance_map) as mock_build, \
+                patch.object(Tagger, 'tag', autospec=True) as mock_tag:
+            inheritance_map = store.get_inheritance_map(self.new_course.id, structure)
+            self.assertEqual(mock_build.call_count, 1)
+
+            # Other processes get the map from the cache.
+            store._clear_cache()  # pylint: disable=protected-access
+            self.assertEqual(store.get_inheritance_map(self.new_course.id, structure), inheritance_map)
+            self.assertEqual(mock_build.call_count, 1)
+
+        # Each lookup's timer is tagged with the tier that answered it.
+        self.assertEqual(
+            [kwargs['cache_tier'] for _, kwargs in mock_tag.call_args_list if 'cache_tier' in kwargs],
+            [MISS, SHARED_HIT]
+        )
+
     def _get_structure(self, course):
         """
         Helper function to get a structure from a course.
@@ -1235,6 +1285,45 @@ class SplitModuleItemTests(SplitModuleTest):
         matches = modulestore().get_items(locator, settings={'group_access': {'$exists': False}})
         self.assertEqual(len(matches), 7)
 
+    def test_get_items_field_indexes(self):
+        """
+        Test that get_items looks up blocks by type and indexed settings in
+        indexes built once per structure, and scans for other criteria.
+        """
+        store = modulestore()
+        locator = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        with store.bulk_operations(locator):
+            with patch.object(store, 'build_field_index', wraps=store.build_field_index) as mock_build:
+                chapters = store.get_items(locator, qualifiers={'category': 'chapter'})
+                self.assertEqual(len(chapters), 4)
+                self.assertEqual(
+                    [chapter.location for chapter in store.get_items(locator, qualifiers={'category': 'chapter'})],
+                    [chapter.location for chapter in chapters]
+                )
+                matches = store.get_items(locator, qualifiers={'category': {'$in': ['chapter', 'course']}})
+                self.assertEqual(len(matches), 5)
+                self.assertEqual(mock_build.call_count, 1)
+
+                matches = store.get_items(
+                    locator,
+                    qualifiers={'category': 'problem'},
+                    settings={'display_name': re.compile(r'Problem'), 'group_access': {'$exists': True}},
+                )
+                self.assertEqual(len(matches), 1)
+                self.assertEqual(mock_build.call_count, 2)
+
+                matches = store.get_items(locator, qualifiers={'category': re.compile(r'^chap')})
+                self.assertEqual(len(matches), 4)
+                matches = store.get_items(locator, settings={'group_access': {'$exists': False}})
+                self.assertEqual(len(matches), 7)
+                self.assertEqual(mock_build.call_count, 2)
+
+                # Edits rebuild the indexes
+                store.create_child('user123', chapters[0].location, 'chapter', block_id='new_chapter')
+                matches = store.get_items(locator, qualifiers={'category': 'chapter'})
+                self.assertEqual(len(matches), 5)
+                self.assertEqual(mock_build.call_count, 3)
+
     def test_get_parents(self):
         '''
         get_parent_location(locator): BlockUsageLocator
@@ -1288,6 +1377,104 @@ class TestItemCrud(SplitModuleTest):
     """
     Test create update and delete of items
     """
+    def test_parents_index(self):
+        """
+        Test that the parents index of a structure is reused by lookups, and
+        rebuilt when the structure is edited in place in a bulk operation.
+        """
+        store = modulestore()
+        course_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        chapter = course_key.make_usage_key('chapter', 'chapter1')
+        with store.bulk_operations(course_key):
+            with patch.object(
+                store, 'build_block_key_to_parents_mapping', wraps=store.build_block_key_to_parents_mapping
+            ) as mock_build:
+                self.assertEqual(store.get_parent_location(chapter).block_id, 'head12345')
+                self.assertEqual(
+                    store.get_parent_location(course_key.make_usage_key('chapter', 'chapter2')).block_id,
+                    'head12345'
+                )
+                self.assertEqual(mock_build.call_count, 1)
+
+                for block_id in ('new_vertical', 'another_vertical'):
+                    store.create_child('user123', chapter, 'vertical', block_id=block_id)
+                    new_block = course_key.make_usage_key('vertical', block_id)
+                    self.assertEqual(store.get_parent_location(new_block).block_id, 'chapter1')
+                self.assertEqual(mock_build.call_count, 3)
+
+    def test_version_structure_copy_on_write(self):
+        """
+        Test that a new structure version only copies the blocks it uses, and
+        never changes the blocks of its previous version.
+        """
+        store = modulestore()
+        course_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        structure = store._lookup_course(course_key).structure
+        chapter_key = BlockKey('chapter', 'chapter1')
+        chapter_children = list(structure['blocks'][chapter_key].fields['children'])
+
+        new_structure = store.version_structure(course_key, structure, 'user123')
+        self.assertIsInstance(new_structure['blocks'], CopyOnWriteBlocks)
+        self.assertEqual(new_structure['previous_version'], structure['_id'])
+        self.assertEqual(
+            structure_to_mongo(new_structure)['blocks'],
+            structure_to_mongo(structure)['blocks']
+        )
+        self.assertTrue(all(
+            block is structure['blocks'][block_key]
+            for block_key, block in new_structure['blocks'].items_for_reading()
+        ))
+
+        new_structure['blocks'][chapter_key].fields['children'].append(BlockKey('vertical', 'new_vertical'))
+        self.assertEqual(structure['blocks'][chapter_key].fields['children'], chapter_children)
+        self.assertIsNot(new_structure['blocks'][chapter_key], structure['blocks'][chapter_key])
+        self.assertIs(
+            dict.__getitem__(new_structure['blocks'], BlockKey('chapter', 'chapter2')),
+            structure['blocks'][BlockKey('chapter', 'chapter2')]
+        )
+
+        # Shallow copies are copied on write too, from both the copy and the original.
+        blocks_copy = copy.copy(new_structure['blocks'])
+        self.assertIsInstance(blocks_copy, CopyOnWriteBlocks)
+        blocks_copy[chapter_key].fields['children'].append(BlockKey('vertical', 'other_vertical'))
+        self.assertNotIn(
+            BlockKey('vertical', 'other_vertical'), new_structure['blocks'][chapter_key].fields['children']
+        )
+        self.assertEqual(structure['blocks'][chapter_key].fields['children'], chapter_children)
+
+    def test_version_structure_shares_assets(self):
+        """
+        Test that new structure versions share the unchanged asset metadata of
+        their previous version, and never change the assets of that version.
+        """
+        store = modulestore()
+        course_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        store.save_asset_metadata_list([
+            AssetMetadata(course_key.make_asset_key('asset', filename), fields={'size': 1})
+            for filename in ('b.txt', 'a.txt', 'c.txt')
+        ], ModuleStoreEnum.UserID.test)
+        structure = store._lookup_course(course_key).structure
+        self.assertEqual([asset['filename'] for asset in structure['assets']['asset']], ['a.txt', 'b.txt', 'c.txt'])
+
+        store.set_asset_metadata_attrs(
+            course_key.make_asset_key('asset', 'b.txt'), {'size': 2}, ModuleStoreEnum.UserID.test
+        )
+        new_structure = store._lookup_course(course_key).structure
+        self.assertEqual(new_structure['previous_version'], structure['_id'])
+        self.assertEqual(structure['assets']['asset'][1]['fields'], {'size': 1})
+        self.assertEqual(new_structure['assets']['asset'][1]['fields'], {'size': 2})
+        self.assertIs(new_structure['assets']['asset'][0], structure['assets']['asset'][0])
+        self.assertIs(new_structure['assets']['asset'][2], structure['assets']['asset'][2])
+
+        self.assertEqual(store.find_asset_metadata(course_key.make_asset_key('asset', 'b.txt')).fields, {'size': 2})
+        self.assertIsNone(store.find_asset_metadata(course_key.make_asset_key('asset', 'd.txt')))
+        self.assertEqual(
+            [asset.asset_id.path for asset in store.get_all_asset_metadata(
+                course_key, 'asset', start=1, maxresults=2, sort=('displayname', ModuleStoreEnum.SortOrder.descending)
+            )],
+            ['b.txt', 'a.txt']
+        )
+
     # DHM do I need to test this case which I believe won't work:
     #  1) fetch a course and some of its blocks
     #  2) do a series of CRUD operations on those previously fetched elements
@@ -1998,6 +2185,50 @@ class TestInheritance(SplitModuleTest):
         # overridden
         self.assertEqual(node.graceperiod, datetime.timedelta(hours=4))
 
+    @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
+    def test_inheritance_map(self, _from_json):
+        """
+        Test that the precomputed inheritance map has the values which blocks
+        find by walking up the tree.
+        """
+        store = modulestore()
+        course_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        structure = store._lookup_course(course_key).structure  # pylint: disable=protected-access
+        inheritance_map = store.build_inheritance_map(structure)
+
+        self.assertNotIn(structure['root'], inheritance_map)
+        self.assertIn('graceperiod', inheritance_map[BlockKey('problem', 'problem3_2')])
+        for block in store.get_items(course_key):
+            for field_name, value in six.iteritems(inheritance_map.get(BlockKey.from_usage_key(block.location), {})):
+                if not block.fields[field_name].is_set_on(block):
+                    self.assertEqual(block.fields[field_name].read_json(block), value)
+
+    @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
+    def test_inheritance_map_published(self, _from_json):
+        """
+        Test that blocks of the published branch use the precomputed inheritance map.
+        """
+        store = modulestore()
+        draft_course_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        course_key = draft_course_key.for_branch(BRANCH_NAME_PUBLISHED)
+        store.copy(
+            self.user_id, draft_course_key, course_key,
+            [BlockUsageLocator(draft_course_key, 'course', 'head12345')], None
+        )
+
+        with store.bulk_operations(course_key):
+            with patch.object(store, 'build_inheritance_map', wraps=store.build_inheritance_map) as mock_build:
+                problem = store.get_item(BlockUsageLocator(course_key, 'problem', 'problem3_2'))
+                self.assertIsNotNone(problem.xblock_kvs.precomputed_inherited_settings)
+                self.assertEqual(problem.graceperiod, datetime.timedelta(hours=2))
+                problem = store.get_item(BlockUsageLocator(course_key, 'problem', 'problem1'))
+                self.assertEqual(problem.graceperiod, datetime.timedelta(hours=4))
+                self.assertEqual(mock_build.call_count, 1)
+
+        # Blocks of the draft branch walk up the tree, to see unsaved changes to their ancestors.
+        problem = store.get_item(BlockUsageLocator(draft_course_key, 'problem', 'problem3_2'))
+        self.assertIsNone(problem.xblock_kvs.precomputed_inherited_settings)
+
     def test_inheritance_not_saved(self):
         """
         Was saving inherited settings with updated blocks causing inheritance to be sticky
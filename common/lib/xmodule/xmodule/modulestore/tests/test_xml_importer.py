@@ -381,6 +381,26 @@ class StaticContentImporterTest(unittest.TestCase):
                 'static/inner/file1.txt', base_dir=expected_base_dir
             )
 
+    def test_import_static_content_directory_parallel(self):
+        static_content_importer = StaticContentImporter(
+            static_content_store=self.mocked_content_store,
+            course_data_path=self.course_data_path,
+            target_id=CourseKey.from_string('course-v1:edX+DemoX+Demo_Course'),
+            max_workers=4,
+        )
+        mocked_os_walk_yield = [
+            ('static', None, ['file{}.txt'.format(num) for num in range(10)] + ['.DS_Store']),
+        ]
+        with mock.patch(
+            'xmodule.modulestore.xml_importer.os.walk',
+            return_value=mocked_os_walk_yield
+        ), mock.patch.object(
+            static_content_importer, 'import_static_file', side_effect=lambda file_path, base_dir: (file_path, 'key')
+        ) as patched_import_static_file:
+            remap_dict = static_content_importer.import_static_content_directory('static')
+            self.assertEqual(patched_import_static_file.call_count, 10)
+            self.assertEqual(remap_dict, {'static/file{}.txt'.format(num): 'key' for num in range(10)})
+
     def test_import_static_file(self):
         base_dir = path('/path/to/dir')
         full_file_path = os.path.join(base_dir, 'static/some_file.txt')
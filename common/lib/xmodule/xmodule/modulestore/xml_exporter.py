@@ -107,7 +107,10 @@ class ExportManager(object):
     """
     Manages XML exporting for courselike objects.
     """
-    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir):
+    def __init__(
+            self, modulestore, contentstore, courselike_key, root_dir, target_dir,
+            asset_workers=1, asset_manifest_file=None,
+    ):
         """
         Export all modules from `modulestore` and content from `contentstore` as xml to `root_dir`.
 
@@ -116,12 +119,17 @@ class ExportManager(object):
         `courselike_key`: The Locator of the Descriptor to export
         `root_dir`: The directory to write the exported xml to
         `target_dir`: The name of the directory inside `root_dir` to write the content to
+        `asset_workers`: The number of threads exporting assets from `contentstore`
+        `asset_manifest_file`: If given, assets which are unchanged since the export recorded in this
+            file aren't exported again (see `MongoContentStore.export_all_for_course`)
         """
         self.modulestore = modulestore
         self.contentstore = contentstore
         self.courselike_key = courselike_key
         self.root_dir = root_dir
         self.target_dir = text_type(target_dir)
+        self.asset_workers = asset_workers
+        self.asset_manifest_file = asset_manifest_file
 
     @abstractmethod
     def get_key(self):
@@ -224,6 +232,8 @@ class CourseExportManager(ExportManager):
                 self.courselike_key,
                 root_courselike_dir + '/static/',
                 root_courselike_dir + '/policies/assets.json',
+                max_workers=self.asset_workers,
+                manifest_file=self.asset_manifest_file,
             )
 
             # If we are using the default course image, export it to the
@@ -323,6 +333,8 @@ class LibraryExportManager(ExportManager):
                 self.courselike_key,
                 self.root_dir + '/' + self.target_dir + '/static/',
                 self.root_dir + '/' + self.target_dir + '/policies/assets.json',
+                max_workers=self.asset_workers,
+                manifest_file=self.asset_manifest_file,
             )
 
     def post_process(self, root, export_fs):
@@ -338,18 +350,18 @@ class LibraryExportManager(ExportManager):
         xml_file.close()
 
 
-def export_course_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
+def export_course_to_xml(modulestore, contentstore, course_key, root_dir, course_dir, **kwargs):
     """
     Thin wrapper for the Course Export Manager. See ExportManager for details.
     """
-    CourseExportManager(modulestore, contentstore, course_key, root_dir, course_dir).export()
+    CourseExportManager(modulestore, contentstore, course_key, root_dir, course_dir, **kwargs).export()
 
 
-def export_library_to_xml(modulestore, contentstore, library_key, root_dir, library_dir):
+def export_library_to_xml(modulestore, contentstore, library_key, root_dir, library_dir, **kwargs):
     """
     Thin wrapper for the Library Export Manager. See ExportManager for details.
     """
-    LibraryExportManager(modulestore, contentstore, library_key, root_dir, library_dir).export()
+    LibraryExportManager(modulestore, contentstore, library_key, root_dir, library_dir, **kwargs).export()
 
 
 def adapt_references(subtree, destination_course_key, export_fs):
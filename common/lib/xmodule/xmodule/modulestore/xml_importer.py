@@ -28,7 +28,10 @@ import logging
 import mimetypes
 import os
 import re
+import time
 from abc import abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import six
 import xblock
@@ -84,10 +87,14 @@ class LocationMixin(XBlockMixin):
 
 
 class StaticContentImporter:
-    def __init__(self, static_content_store, course_data_path, target_id):
+    def __init__(self, static_content_store, course_data_path, target_id, max_workers=1):
+        """
+        Static files are saved to `static_content_store` by `max_workers` threads.
+        """
         self.static_content_store = static_content_store
         self.target_id = target_id
         self.course_data_path = course_data_path
+        self.max_workers = max_workers
         try:
             with open(course_data_path / 'policies/assets.json') as f:
                 self.policy = json.load(f)
@@ -102,6 +109,7 @@ class StaticContentImporter:
 
     def import_static_content_directory(self, content_subdir=DEFAULT_STATIC_CONTENT_SUBDIR, verbose=False):
         remap_dict = {}
+        file_paths = []
 
         static_dir = self.course_data_path / content_subdir
         for dirname, _, filenames in os.walk(static_dir):
@@ -117,12 +125,24 @@ class StaticContentImporter:
                 if verbose:
                     log.debug('importing static content %s...', file_path)
 
-                imported_file_attrs = self.import_static_file(file_path, base_dir=static_dir)
+                file_paths.append(file_path)
+
+        def import_file(file_path):
+            return self.import_static_file(file_path, base_dir=static_dir)
 
-                if imported_file_attrs:
-                    # store the remapping information which will be needed
-                    # to subsitute in the module data
-                    remap_dict[imported_file_attrs[0]] = imported_file_attrs[1]
+        if self.max_workers > 1 and len(file_paths) > 1:
+            # Saving a file is mostly waiting on the contentstore, so files are
+            # read, thumbnailed and saved by several threads at once.
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                imported_files_attrs = list(executor.map(import_file, file_paths))
+        else:
+            imported_files_attrs = [import_file(file_path) for file_path in file_paths]
+
+        for imported_file_attrs in imported_files_attrs:
+            if imported_file_attrs:
+                # store the remapping information which will be needed
+                # to subsitute in the module data
+                remap_dict[imported_file_attrs[0]] = imported_file_attrs[1]
 
         return remap_dict
 
@@ -221,6 +241,9 @@ class ImportManager(object):
         python_lib_filename: The filename of the courselike's python library. Course authors can optionally
             create this file to implement custom logic in their course.
 
+        static_import_workers: The number of threads saving static files into static_content_store. If more
+            than 1, static files are saved in the background while the courselike's blocks are imported.
+
         default_class, load_error_modules: are arguments for constructing the XMLModuleStore (see its doc)
     """
     store_class = XMLModuleStore
@@ -234,6 +257,7 @@ class ImportManager(object):
             create_if_not_present=False, raise_on_failure=False,
             static_content_subdir=DEFAULT_STATIC_CONTENT_SUBDIR,
             python_lib_filename='python_lib.zip',
+            static_import_workers=1,
     ):
         self.store = store
         self.user_id = user_id
@@ -249,6 +273,10 @@ class ImportManager(object):
         self.do_import_python_lib = do_import_python_lib
         self.create_if_not_present = create_if_not_present
         self.raise_on_failure = raise_on_failure
+        self.static_import_workers = static_import_workers
+        # The seconds spent in each stage of the import of the last courselike.
+        self.stage_timings = OrderedDict()
+        parse_start = time.time()
         self.xml_module_store = self.store_class(
             data_dir,
             default_class=default_class,
@@ -258,6 +286,7 @@ class ImportManager(object):
             xblock_select=store.xblock_select,
             target_course_id=target_id,
         )
+        self.parse_time = time.time() - parse_start
         self.logger, self.errors = make_error_tracker()
 
     def preflight(self):
@@ -280,7 +309,8 @@ class ImportManager(object):
         static_content_importer = StaticContentImporter(
             self.static_content_store,
             course_data_path=data_path,
-            target_id=dest_id
+            target_id=dest_id,
+            max_workers=self.static_import_workers,
         )
         if self.do_import_static:
             if self.verbose:
@@ -496,6 +526,35 @@ class ImportManager(object):
                 log.error('failed to import module location %s', leftover)
                 raise
 
+    def run_stage(self, stage, func, *args):
+        """
+        Call func(*args) as the named stage of the import, recording how long it took.
+        """
+        start = time.time()
+        try:
+            return func(*args)
+        finally:
+            self.stage_timings[stage] = time.time() - start
+
+    def import_published(self, source_courselike, courselike, courselike_key, data_path, dest_id):
+        """
+        Import the static files, asset metadata and children of the courselike.
+        """
+        if self.static_import_workers > 1:
+            # Blocks don't refer to the contentstore, so static files are saved
+            # by another thread while the blocks are written.
+            with ThreadPoolExecutor(max_workers=1) as static_executor:
+                static_import = static_executor.submit(self.run_stage, 'static', self.import_static, data_path, dest_id)
+                self.run_stage('asset_metadata', self.import_asset_metadata, data_path, dest_id)
+                self.run_stage(
+                    'children', self.import_children, source_courselike, courselike, courselike_key, dest_id
+                )
+                static_import.result()
+        else:
+            self.run_stage('static', self.import_static, data_path, dest_id)
+            self.run_stage('asset_metadata', self.import_asset_metadata, data_path, dest_id)
+            self.run_stage('children', self.import_children, source_courselike, courselike, courselike_key, dest_id)
+
     def run_imports(self):
         """
         Iterate over the given directories and yield courses.
@@ -507,19 +566,17 @@ class ImportManager(object):
             except DuplicateCourseError:
                 continue
 
+            import_start = time.time()
+            self.stage_timings = OrderedDict([('parse', self.parse_time)])
             # This bulk operation wraps all the operations to populate the published branch.
             with self.store.bulk_operations(dest_id):
                 # Retrieve the course itself.
-                source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
-
-                # Import all static pieces.
-                self.import_static(data_path, dest_id)
-
-                # Import asset metadata stored in XML.
-                self.import_asset_metadata(data_path, dest_id)
+                source_courselike, courselike, data_path = self.run_stage(
+                    'courselike', self.get_courselike, courselike_key, runtime, dest_id
+                )
 
-                # Import all children
-                self.import_children(source_courselike, courselike, courselike_key, dest_id)
+                # Import all static pieces, asset metadata stored in XML and all children.
+                self.import_published(source_courselike, courselike, courselike_key, data_path, dest_id)
 
             # This bulk operation wraps all the operations to populate the draft branch with any items
             # from the /drafts subdirectory.
@@ -528,8 +585,16 @@ class ImportManager(object):
             # and then publishing it.
             with self.store.bulk_operations(dest_id):
                 # Import all draft items into the courselike.
-                courselike = self.import_drafts(courselike, courselike_key, data_path, dest_id)
+                courselike = self.run_stage(
+                    'drafts', self.import_drafts, courselike, courselike_key, data_path, dest_id
+                )
 
+            log.info(
+                u'Import of %s finished in %.2fs after parsing: %s',
+                dest_id,
+                time.time() - import_start,
+                u', '.join(u'{}={:.2f}s'.format(stage, secs) for stage, secs in self.stage_timings.items()),
+            )
             yield courselike
 
 
@@ -7,6 +7,7 @@ import unittest
 from datetime import datetime, timedelta
 
 import ddt
+import numpy
 from pytz import UTC
 import six
 from six import text_type
@@ -183,6 +184,18 @@ class GraderTest(unittest.TestCase):
         self.assertAlmostEqual(graded['percent'], 0.50)
         self.assertEqual(len(graded['section_breakdown']), 0 + 1)
 
+    @ddt.data(0, 1, 2, 5)
+    def test_bulk_total_with_drops(self, drop_count):
+        grader = graders.AssignmentFormatGrader("Homework", 4, drop_count)
+        percents = numpy.around(numpy.random.RandomState(drop_count).rand(20, 4), decimals=2)
+        percents[0] = [0.5, 0.5, 0.5, 0.5]
+        percents[1] = 0.0
+
+        totals = grader.bulk_total_with_drops(percents)
+        for row, total in zip(percents, totals):
+            expected_total, _ = grader.total_with_drops([{'percent': percent} for percent in row])
+            self.assertEqual(total, expected_total)
+
     def test_weighted_subsections_grader(self):
         # First, a few sub graders
         homework_grader = graders.AssignmentFormatGrader("Homework", 12, 2)
@@ -33,6 +33,7 @@ class HiddenContentTransformer(FilteringTransformerMixin, BlockStructureTransfor
     """
     WRITE_VERSION = 2
     READ_VERSION = 2
+    SUPPORTS_INCREMENTAL_COLLECT = True
     MERGED_DUE_DATE = 'merged_due_date'
     MERGED_HIDE_AFTER_DUE = 'merged_hide_after_due'
 
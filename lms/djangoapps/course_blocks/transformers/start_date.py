@@ -5,7 +5,7 @@ Start Date Transformer implementation.
 from datetime import datetime
 from pytz import UTC
 
-from lms.djangoapps.courseware.access_utils import check_start_date
+from lms.djangoapps.courseware.access_utils import StartDateChecker
 from openedx.core.djangoapps.content.block_structure.transformer import (
     BlockStructureTransformer,
     FilteringTransformerMixin
@@ -33,6 +33,7 @@ class StartDateTransformer(FilteringTransformerMixin, BlockStructureTransformer)
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
     MERGED_START_DATE = 'merged_start_date'
 
     @classmethod
@@ -76,13 +77,10 @@ class StartDateTransformer(FilteringTransformerMixin, BlockStructureTransformer)
         if usage_info.has_staff_access or usage_info.allow_start_dates_in_future:
             return [block_structure.create_universal_filter()]
 
-        now = datetime.now(UTC)
+        start_date_checker = StartDateChecker(usage_info.user, usage_info.course_key, now=datetime.now(UTC))
 
-        removal_condition = lambda block_key: not check_start_date(
-            usage_info.user,
+        removal_condition = lambda block_key: not start_date_checker.check(
             block_structure.get_xblock_field(block_key, 'days_early_for_beta'),
             self._get_merged_start_date(block_structure, block_key),
-            usage_info.course_key,
-            now=now,
         )
         return [block_structure.create_removal_filter(removal_condition)]
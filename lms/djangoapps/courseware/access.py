@@ -13,11 +13,13 @@ Note: The access control logic in this file does NOT check for enrollment in
 
 
 import logging
+from contextlib import contextmanager
 from datetime import datetime
 
 import six
 from django.conf import settings  # pylint: disable=unused-import
 from django.contrib.auth.models import AnonymousUser
+from edx_django_utils.cache import RequestCache
 from edx_django_utils.monitoring import function_trace
 from opaque_keys.edx.keys import CourseKey, UsageKey
 from pytz import UTC
@@ -34,9 +36,9 @@ from lms.djangoapps.courseware.access_response import (
 from lms.djangoapps.courseware.access_utils import (
     ACCESS_DENIED,
     ACCESS_GRANTED,
+    StartDateChecker,
     adjust_start_date,
     check_course_open_for_learner,
-    check_start_date,
     debug,
     in_preview_mode
 )
@@ -71,6 +73,10 @@ from xmodule.x_module import XModule
 
 log = logging.getLogger(__name__)
 
+# Request cache of the _BlockAccess of the current bulk_access_checks
+BULK_ACCESS_CACHE_NAMESPACE = u'courseware.access.bulk_access_checks'
+BULK_ACCESS_CACHE_KEY = u'block_access'
+
 
 def has_ccx_coach_role(user, course_key):
     """
@@ -136,6 +142,13 @@ def has_access(user, action, obj, course_key=None):
     if not user:
         user = AnonymousUser()
 
+    # Inside bulk_access_checks, the blocks of the course share the state
+    # resolved for the user.
+    if isinstance(obj, XBlock):
+        block_access = _get_bulk_block_access(user, course_key)
+        if block_access is not None:
+            return block_access.has_access(action, obj)
+
     # Preview mode is only accessible by staff.
     if in_preview_mode() and course_key:
         if not has_staff_access_to_preview_mode(user, course_key):
@@ -174,6 +187,186 @@ def has_access(user, action, obj, course_key=None):
                     .format(type(obj)))
 
 
+def has_access_many(user, action, blocks, course_key):
+    """
+    Check whether a user has the access to do action on each of the given
+    blocks of a course.
+
+    This is equivalent to calling has_access for each block, but the user's
+    roles, masquerade, preview mode and beta testing state, and partition
+    groups, are resolved once and shared by all of the blocks, rather than
+    being looked up again for each block.
+
+    blocks: descriptors or modules of the course with course_key.
+
+    Returns a dict of AccessResponse objects, by block usage key.
+    """
+    with bulk_access_checks(user, course_key) as block_access:
+        return {block.location: block_access.has_access(action, block) for block in blocks}
+
+
+@contextmanager
+def bulk_access_checks(user, course_key):
+    """
+    Context manager in which calls to has_access for the blocks of the given
+    course by the given user share the state resolved for the user, as in
+    has_access_many.
+
+    It is meant to be used around code that checks the access to many blocks
+    one at a time, e.g. while binding them, and during which the user's roles
+    and masquerade don't change.  Yields the _BlockAccess that is used.
+    """
+    if not user:
+        user = AnonymousUser()
+    request_cache = RequestCache(BULK_ACCESS_CACHE_NAMESPACE)
+    cached_response = request_cache.get_cached_response(BULK_ACCESS_CACHE_KEY)
+    block_access = cached_response.value if cached_response.is_found else None
+    if block_access is not None and block_access.user is user and block_access.course_key == course_key:
+        # Already inside bulk_access_checks for this user and course.
+        yield block_access
+        return
+
+    block_access = _BlockAccess(user, course_key)
+    request_cache.set(BULK_ACCESS_CACHE_KEY, block_access)
+    try:
+        yield block_access
+    finally:
+        if cached_response.is_found:
+            request_cache.set(BULK_ACCESS_CACHE_KEY, cached_response.value)
+        else:
+            request_cache.delete(BULK_ACCESS_CACHE_KEY)
+
+
+def _get_bulk_block_access(user, course_key):
+    """
+    Returns the _BlockAccess of the enclosing bulk_access_checks for the given
+    user and course, or None.
+    """
+    if course_key is None:
+        return None
+    cached_response = RequestCache(BULK_ACCESS_CACHE_NAMESPACE).get_cached_response(BULK_ACCESS_CACHE_KEY)
+    if not cached_response.is_found:
+        return None
+    block_access = cached_response.value
+    # Masquerading replaces the user object, so the object itself is compared.
+    if block_access.user is not user or block_access.course_key != course_key:
+        return None
+    return block_access
+
+
+class _BlockAccess(object):
+    """
+    The access of a user to the blocks of a course.
+
+    What doesn't depend on the block is resolved the first time that it is
+    needed, and reused for the following blocks.
+    """
+    def __init__(self, user, course_key):
+        self.user = user
+        self.course_key = course_key
+        self.start_date_checker = StartDateChecker(user, course_key)
+        self._resolved = {}
+        # Group of the user by partition ID
+        self._user_groups = {}
+
+    def has_access(self, action, block):
+        """
+        Returns has_access(self.user, action, block, self.course_key).
+        """
+        # Preview mode is only accessible by staff.
+        if self._resolve('preview_denied', lambda: (
+            bool(self.course_key) and in_preview_mode() and
+            not has_staff_access_to_preview_mode(self.user, self.course_key)
+        )):
+            return ACCESS_DENIED
+
+        if isinstance(block, CourseDescriptor):
+            return _has_access_course(self.user, action, block)
+
+        if isinstance(block, ErrorDescriptor):
+            return _has_access_error_desc(self.user, action, block, self.course_key)
+
+        if isinstance(block, XModule):
+            return self.has_access(action, block.descriptor)
+
+        if isinstance(block, XBlock):
+            return self.has_access_descriptor(action, block)
+
+        raise TypeError(u"Unknown block type in has_access_many(): '{0}'".format(type(block)))
+
+    def has_access_descriptor(self, action, descriptor):
+        """
+        Same as _has_access_descriptor, for this user and course.
+        """
+        def can_load():
+            """
+            NOTE: This does not check that the student is enrolled in the course
+            that contains this module.  We may or may not want to allow non-enrolled
+            students to see modules.  If not, views should check the course, so we
+            don't have to hit the enrollments table on every module load.
+            """
+            # If the user (or the role the user is currently masquerading as) does not have
+            # access to this content, then deny access. The problem with calling _has_staff_access_to_descriptor
+            # before this method is that _has_staff_access_to_descriptor short-circuits and returns True
+            # for staff users in preview mode.
+            group_access_response = _has_group_access(
+                descriptor,
+                self.user,
+                self.course_key,
+                user_role=self._resolve('user_role', lambda: get_user_role(self.user, self.course_key)),
+                user_groups=self._user_groups,
+            )
+            if not group_access_response:
+                return group_access_response
+
+            # If the user has staff access, they can load the module and checks below are not needed.
+            staff_access_response = self._course_access('staff', descriptor)
+            if staff_access_response:
+                return staff_access_response
+
+            return (
+                _visible_to_nonstaff_users(descriptor, display_error_to_user=False) and
+                (
+                    _has_detached_class_tag(descriptor) or
+                    self.start_date_checker.check(
+                        descriptor.days_early_for_beta,
+                        descriptor.start,
+                        display_error_to_user=False
+                    )
+                )
+            )
+
+        checkers = {
+            'load': can_load,
+            'staff': lambda: self._course_access('staff', descriptor),
+            'instructor': lambda: self._course_access('instructor', descriptor),
+        }
+
+        return _dispatch(checkers, action, self.user, descriptor)
+
+    def _course_access(self, access_level, descriptor):
+        """
+        Returns the staff or instructor access of the user to the course of
+        the descriptor.
+        """
+        if access_level == 'staff':
+            check_access = _has_staff_access_to_descriptor
+        else:
+            check_access = _has_instructor_access_to_descriptor
+        if self.course_key is None:
+            # The access depends on the course of each descriptor.
+            return check_access(self.user, descriptor, self.course_key)
+        return self._resolve(access_level, lambda: check_access(self.user, descriptor, self.course_key))
+
+    def _resolve(self, name, compute):
+        """
+        Returns the result of compute(), calling it only the first time.
+        """
+        if name not in self._resolved:
+            self._resolved[name] = compute()
+        return self._resolved[name]
+
+
 def has_staff_access_to_preview_mode(user, course_key):
     """
     Checks if given user can access course in preview mode.
@@ -437,13 +630,20 @@ def _has_access_error_desc(user, action, descriptor, course_key):
     return _dispatch(checkers, action, user, descriptor)
 
 
-def _has_group_access(descriptor, user, course_key):
+def _has_group_access(descriptor, user, course_key, user_role=None, user_groups=None):
     """
     This function returns a boolean indicating whether or not `user` has
     sufficient group memberships to "load" a block (the `descriptor`)
+
+    user_role: the result of get_user_role, if it is already known.
+    user_groups: a dict in which the user's group in each partition is
+        kept by partition ID, to share them between blocks.
     """
+    if user_role is None:
+        user_role = get_user_role(user, course_key)
+
     # Allow staff and instructors roles group access, as they are not masquerading as a student.
-    if get_user_role(user, course_key) in ['staff', 'instructor']:
+    if user_role in ['staff', 'instructor']:
         return ACCESS_GRANTED
 
     # use merged_group_access which takes group access on the block's
@@ -504,11 +704,16 @@ def _has_group_access(descriptor, user, course_key):
     missing_groups = []
     block_key = descriptor.scope_ids.usage_id
     for partition, groups in partition_groups:
-        user_group = partition.scheme.get_group_for_user(
-            course_key,
-            user,
-            partition,
-        )
+        if user_groups is not None and partition.id in user_groups:
+            user_group = user_groups[partition.id]
+        else:
+            user_group = partition.scheme.get_group_for_user(
+                course_key,
+                user,
+                partition,
+            )
+            if user_groups is not None:
+                user_groups[partition.id] = user_group
         if user_group not in groups:
             missing_groups.append((
                 partition,
@@ -547,47 +752,7 @@ def _has_access_descriptor(user, action, descriptor, course_key=None):
     (e.g. courses).  If you call this method directly instead of going through
     has_access(), it will not do the right thing.
     """
-    def can_load():
-        """
-        NOTE: This does not check that the student is enrolled in the course
-        that contains this module.  We may or may not want to allow non-enrolled
-        students to see modules.  If not, views should check the course, so we
-        don't have to hit the enrollments table on every module load.
-        """
-        # If the user (or the role the user is currently masquerading as) does not have
-        # access to this content, then deny access. The problem with calling _has_staff_access_to_descriptor
-        # before this method is that _has_staff_access_to_descriptor short-circuits and returns True
-        # for staff users in preview mode.
-        group_access_response = _has_group_access(descriptor, user, course_key)
-        if not group_access_response:
-            return group_access_response
-
-        # If the user has staff access, they can load the module and checks below are not needed.
-        staff_access_response = _has_staff_access_to_descriptor(user, descriptor, course_key)
-        if staff_access_response:
-            return staff_access_response
-
-        return (
-            _visible_to_nonstaff_users(descriptor, display_error_to_user=False) and
-            (
-                _has_detached_class_tag(descriptor) or
-                check_start_date(
-                    user,
-                    descriptor.days_early_for_beta,
-                    descriptor.start,
-                    course_key,
-                    display_error_to_user=False
-                )
-            )
-        )
-
-    checkers = {
-        'load': can_load,
-        'staff': lambda: _has_staff_access_to_descriptor(user, descriptor, course_key),
-        'instructor': lambda: _has_instructor_access_to_descriptor(user, descriptor, course_key)
-    }
-
-    return _dispatch(checkers, action, user, descriptor)
+    return _BlockAccess(user, course_key).has_access_descriptor(action, descriptor)
 
 
 def _has_access_xmodule(user, action, xmodule, course_key):
@@ -76,23 +76,58 @@ def check_start_date(user, days_early_for_beta, start, course_key, display_error
     Returns:
         AccessResponse: Either ACCESS_GRANTED or StartDateError.
     """
-    start_dates_disabled = settings.FEATURES['DISABLE_START_DATES']
-    masquerading_as_student = is_masquerading_as_student(user, course_key)
+    return StartDateChecker(user, course_key, now=now).check(
+        days_early_for_beta, start, display_error_to_user=display_error_to_user
+    )
 
-    if start_dates_disabled and not masquerading_as_student:
-        return ACCESS_GRANTED
-    else:
-        if start is None or in_preview_mode() or get_course_masquerade(user, course_key):
+
+class StartDateChecker(object):
+    """
+    Checks the start dates of many blocks of a course for a user.
+
+    The user's masquerade, preview mode and beta tester state are looked up
+    once, the first time they are needed, rather than for every block.
+    """
+    def __init__(self, user, course_key, now=None):
+        self.user = user
+        self.course_key = course_key
+        self.now = now
+        self._start_dates_bypassed = None
+        self._is_beta_tester = None
+
+    def check(self, days_early_for_beta, start, display_error_to_user=True):
+        """
+        Same as check_start_date, for this checker's user and course.
+        """
+        if self._start_dates_bypassed is None:
+            self._start_dates_bypassed = self._are_start_dates_bypassed()
+        if start is None or self._start_dates_bypassed:
             return ACCESS_GRANTED
 
-        if now is None:
-            now = datetime.now(UTC)
-        effective_start = adjust_start_date(user, days_early_for_beta, start, course_key)
-        if now > effective_start:
+        if self.now is None:
+            self.now = datetime.now(UTC)
+        effective_start = start
+        if days_early_for_beta is not None:
+            if self._is_beta_tester is None:
+                self._is_beta_tester = CourseBetaTesterRole(self.course_key).has_user(self.user)
+            if self._is_beta_tester:
+                debug(u"Adjust start time: user in beta role for %s", self.course_key)
+                effective_start = start - timedelta(days_early_for_beta)
+        if self.now > effective_start:
             return ACCESS_GRANTED
 
         return StartDateError(start, display_error_to_user=display_error_to_user)
 
+    def _are_start_dates_bypassed(self):
+        """
+        Returns whether start dates don't apply to the user.
+        """
+        start_dates_disabled = settings.FEATURES['DISABLE_START_DATES']
+        masquerading_as_student = is_masquerading_as_student(self.user, self.course_key)
+        if start_dates_disabled and not masquerading_as_student:
+            return True
+        return bool(in_preview_mode() or get_course_masquerade(self.user, self.course_key))
+
 
 def in_preview_mode():
     """
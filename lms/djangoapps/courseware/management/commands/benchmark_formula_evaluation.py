@@ -0,0 +1,81 @@
+"""
+Command to compare the legacy and the cached, batched evaluation of FormulaResponse answers.
+"""
+
+
+import timeit
+
+import calc
+import random2 as random
+from django.core.management.base import BaseCommand
+
+from capa import formula_evaluator
+
+# (instructor answer, student answer, samples) of typical formula-heavy physics problems.
+PHYSICS_FORMULAS = [
+    (u'm*g*h + 0.5*m*v^2', u'm*(g*h + v^2/2)', u'm,g,h,v@1,9,0,0:5,10,10,20#50'),
+    (u'2*pi*sqrt(L/g)', u'2*pi*(L/g)^0.5', u'L,g@0.1,9:5,10#50'),
+    (u'q1*q2/(4*pi*epsilon_0*r^2)', u'k*q1*q2/r^2', u'q1,q2,epsilon_0,r,k@1,1,1,1,1:2,2,1,10,1#50'),
+    (u'A*cos(omega*t + phi)', u'A*sin(omega*t + phi + pi/2)', u'A,omega,t,phi@1,1,0,0:5,10,10,3#50'),
+    (u'R1 || R2 || R3', u'1/(1/R1 + 1/R2 + 1/R3)', u'R1,R2,R3@1,1,1:100,100,100#50'),
+    (u'V0*exp(-t/(R*C))', u'V0/e^(t/(R*C))', u'V0,t,R,C@1,0,1,1:10,5,10,2#50'),
+]
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms benchmark_formula_evaluation --settings=devstack
+        $ ./manage.py lms benchmark_formula_evaluation --iterations 200
+    """
+    help = u'Compares the time to check FormulaResponse answers with calc.evaluator and with formula_evaluator.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            help=u'Number of timed checks per formula and evaluator.',
+            default=50,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        total = {u'legacy': 0.0, u'batched': 0.0}
+        for instructor_answer, student_answer, samples in PHYSICS_FORMULAS:
+            var_dict_list = _randomize_variables(samples)
+            self.stdout.write(u'{} ({} samples)'.format(instructor_answer, len(var_dict_list)))
+            for name, evaluate in _evaluators():
+                seconds = min(timeit.repeat(
+                    lambda: [evaluate(var_dict_list, answer) for answer in (student_answer, instructor_answer)],
+                    number=1,
+                    repeat=options['iterations'],
+                ))
+                total[name] += seconds
+                self.stdout.write(u'  {:<8} check: {:>8.2f} ms'.format(name, seconds * 1000))
+        self.stdout.write(u'speedup: {:.1f}x'.format(total[u'legacy'] / total[u'batched']))
+
+
+def _evaluators():
+    """
+    Returns (name, evaluate) for each evaluator, where evaluate returns the
+    values of an answer at each of the given samples.
+    """
+    def evaluate_legacy(var_dict_list, answer):
+        return [calc.evaluator(var_dict, {}, answer) for var_dict in var_dict_list]
+
+    return [
+        (u'legacy', evaluate_legacy),
+        (u'batched', formula_evaluator.evaluate_samples),
+    ]
+
+
+def _randomize_variables(samples):
+    """
+    Returns sample values of the variables, as FormulaResponse.randomize_variables.
+    """
+    variables, ranges = samples.split('@')
+    ranges, num_samples = ranges.split('#')
+    ranges = list(zip(*[[float(value) for value in bounds.split(',')] for bounds in ranges.split(':')]))
+    return [
+        {variable: random.uniform(*bounds) for variable, bounds in zip(variables.split(','), ranges)}
+        for _ in range(int(num_samples))
+    ]
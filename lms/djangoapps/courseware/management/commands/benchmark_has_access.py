@@ -0,0 +1,74 @@
+"""
+Command to compare checking a user's access to the blocks of a course with has_access and has_access_many.
+"""
+
+
+import timeit
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from lms.djangoapps.courseware.access import has_access, has_access_many
+from xmodule.modulestore.django import modulestore
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms benchmark_has_access course-v1:edX+DemoX+Demo_Course staff --settings=devstack
+        $ ./manage.py lms benchmark_has_access course-v1:edX+DemoX+Demo_Course honor --iterations 20
+    """
+    help = (
+        u"Compares the time and queries to check a user's access to the blocks of a course "
+        u"one at a time and at once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id', help=u'The course whose blocks are checked.')
+        parser.add_argument('username', help=u'The user whose access is checked.')
+        parser.add_argument(
+            '--iterations',
+            help=u'Number of timed checks of all of the blocks with each approach.',
+            default=10,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        try:
+            course_key = CourseKey.from_string(options['course_id'])
+        except InvalidKeyError:
+            raise CommandError(u'Invalid course id: {}'.format(options['course_id']))
+        try:
+            user_id = User.objects.get(username=options['username']).id
+        except User.DoesNotExist:
+            raise CommandError(u'No user {}'.format(options['username']))
+
+        blocks = [
+            block for block in modulestore().get_items(course_key)
+            if block.location.block_type in ('chapter', 'sequential', 'vertical')
+        ]
+        if not blocks:
+            raise CommandError(u'No blocks in course {}'.format(course_key))
+        self.stdout.write(u'{} chapters, sequentials and verticals'.format(len(blocks)))
+
+        def check_one_at_a_time():
+            # A fresh user object doesn't have cached roles.
+            user = User.objects.get(id=user_id)
+            for block in blocks:
+                has_access(user, 'load', block, course_key)
+
+        def check_at_once():
+            user = User.objects.get(id=user_id)
+            has_access_many(user, 'load', blocks, course_key)
+
+        timings = {}
+        for name, check in ((u'has_access', check_one_at_a_time), (u'has_access_many', check_at_once)):
+            with CaptureQueriesContext(connection) as queries:
+                check()
+            timings[name] = min(timeit.repeat(check, number=1, repeat=options['iterations']))
+            self.stdout.write(u'  {:<15} {:>8.2f} ms, {} queries'.format(name, timings[name] * 1000, len(queries)))
+        self.stdout.write(u'speedup: {:.1f}x'.format(timings[u'has_access'] / timings[u'has_access_many']))
@@ -19,6 +19,10 @@ UserStateSummaryCache: A cache for Scope.user_state_summary
 PreferencesCache: A cache for Scope.preferences
 UserInfoCache: A cache for Scope.user_info
 DjangoOrmFieldCache: A base-class for single-row-per-field caches.
+
+:class:`FieldDataPrefetchPlan`: The set of blocks whose field data a
+    :class:`~FieldDataCache` loads up front, in one batched query per scope,
+    computed from a block structure rather than from instantiated XBlocks.
 """
 
 
@@ -33,8 +37,9 @@ from django.db import DatabaseError, IntegrityError, transaction
 from opaque_keys.edx.asides import AsideUsageKeyV1, AsideUsageKeyV2
 from opaque_keys.edx.block_types import BlockTypeKeyV1
 from opaque_keys.edx.keys import LearningContextKey
-from xblock.core import XBlockAside
+from xblock.core import XBlock, XBlockAside
 from xblock.exceptions import InvalidScopeError, KeyValueMultiSaveError
+from xblock.plugin import PluginMissingError
 from xblock.fields import Scope, UserScope
 from xblock.runtime import KeyValueStore
 
@@ -84,6 +89,69 @@ def _all_block_types(descriptors, aside_types):
     return block_types
 
 
+def _with_aside_usage_keys(usage_keys, aside_types):
+    """
+    Return the set of `usage_keys` and the usage keys of the asides in
+    `aside_types` for those usage keys.
+    """
+    all_usage_keys = set(usage_keys)
+    for usage_key in usage_keys:
+        for aside_type in aside_types:
+            all_usage_keys.add(AsideUsageKeyV1(usage_key, aside_type))
+            all_usage_keys.add(AsideUsageKeyV2(usage_key, aside_type))
+    return all_usage_keys
+
+
+def _with_aside_block_types(block_types, aside_types):
+    """
+    Return the set of `block_types` and the block types of the asides in `aside_types`.
+    """
+    return set(block_types) | {BlockTypeKeyV1(XBlockAside.entry_point, aside_type) for aside_type in aside_types}
+
+
+class FieldDataPrefetchPlan(object):
+    """
+    The set of blocks whose field data a :class:`~FieldDataCache` should load
+    up front, via :meth:`FieldDataCache.prefetch`.
+
+    All fields of the planned blocks are loaded with a single batched query
+    per scope, and blocks that are later added to the cache as descriptors
+    don't trigger any further queries.
+    """
+    def __init__(self, usage_keys, block_types):
+        """
+        Arguments:
+            usage_keys (iterable of UsageKey): The blocks to prefetch user_state and user_state_summary for.
+            block_types (iterable of BlockTypeKeyV1): The block types to prefetch preferences for.
+        """
+        self.usage_keys = frozenset(usage_keys)
+        self.block_types = frozenset(block_types)
+
+    @classmethod
+    def for_block_structure(cls, block_structure, root_usage_key=None):
+        """
+        Return a plan for all blocks in `block_structure` at or below `root_usage_key`
+        (or the root of the structure, if not given), without instantiating them.
+
+        Arguments:
+            block_structure (BlockStructure): For example, a collected course block structure.
+            root_usage_key (UsageKey): The block whose descendants are to be prefetched.
+        """
+        usage_keys = list(block_structure.topological_traversal(start_node=root_usage_key))
+        block_types = set()
+        for block_type in set(usage_key.block_type for usage_key in usage_keys):
+            try:
+                block_class = XBlock.load_class(block_type)
+            except PluginMissingError:
+                # Fields of unknown blocks are loaded lazily, if the block is ever rendered.
+                continue
+            block_types.add(BlockTypeKeyV1(block_class.entry_point, block_type))
+        return cls(usage_keys, block_types)
+
+    def __len__(self):
+        return len(self.usage_keys)
+
+
 class DjangoKeyValueStore(KeyValueStore):
     """
     This KeyValueStore will read and write data in the following scopes to django models
@@ -162,6 +230,8 @@ class DjangoOrmFieldCache(six.with_metaclass(ABCMeta, object)):
 
     def __init__(self):
         self._cache = {}
+        # The keys (usage ids, block types, ...) whose fields have all been prefetched.
+        self._prefetched_keys = set()
 
     def cache_fields(self, fields, xblocks, aside_types):
         """
@@ -176,6 +246,22 @@ class DjangoOrmFieldCache(six.with_metaclass(ABCMeta, object)):
         for field_object in self._read_objects(fields, xblocks, aside_types):
             self._cache[self._cache_key_for_field_object(field_object)] = field_object
 
+    def prefetch(self, usage_keys, block_types):
+        """
+        Load all fields of the supplied blocks into this cache, with one query.
+
+        Arguments:
+            usage_keys (set of :class:`UsageKey`): Blocks (and asides) to load fields for.
+            block_types (set of :class:`BlockTypeKeyV1`): Block (and aside) types to load fields for.
+        """
+        prefetch_keys = self._prefetch_keys(usage_keys, block_types) - self._prefetched_keys
+        if not prefetch_keys:
+            return
+
+        for field_object in self._read_all_objects(prefetch_keys):
+            self._cache[self._cache_key_for_field_object(field_object)] = field_object
+        self._prefetched_keys.update(prefetch_keys)
+
     @contract(kvs_key=DjangoKeyValueStore.Key)
     def get(self, kvs_key):
         """
@@ -321,6 +407,29 @@ class DjangoOrmFieldCache(six.with_metaclass(ABCMeta, object)):
         """
         raise NotImplementedError()
 
+    @abstractmethod
+    def _prefetch_keys(self, usage_keys, block_types):
+        """
+        Return the set of keys that determine which objects this cache
+        stores for the supplied blocks (usage ids, block types, ...).
+
+        Arguments:
+            usage_keys (set of :class:`UsageKey`): Blocks to return keys for
+            block_types (set of :class:`BlockTypeKeyV1`): Block types to return keys for
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _read_all_objects(self, prefetch_keys):
+        """
+        Return an iterator for all objects stored in the underlying datastore
+        for the supplied keys, regardless of field name.
+
+        Arguments:
+            prefetch_keys (set): Keys returned by :meth:`_prefetch_keys`
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     def _cache_key_for_field_object(self, field_object):
         """
@@ -351,6 +460,8 @@ class UserStateCache(object):
         self.course_id = course_id
         self.user = user
         self._client = DjangoXBlockUserStateClient(self.user)
+        # The usage keys whose state has already been prefetched.
+        self._prefetched_keys = set()
 
     def cache_fields(self, fields, xblocks, aside_types):  # pylint: disable=unused-argument
         """
@@ -362,10 +473,28 @@ class UserStateCache(object):
             xblocks (list of :class:`XBlock`): XBlocks to cache fields for.
             aside_types (list of str): Aside types to cache fields for.
         """
-        block_field_state = self._client.get_many(
-            self.user.username,
-            _all_usage_keys(xblocks, aside_types),
-        )
+        usage_keys = _all_usage_keys(xblocks, aside_types) - self._prefetched_keys
+        if usage_keys:
+            self._cache_state(usage_keys)
+
+    def prefetch(self, usage_keys, block_types):  # pylint: disable=unused-argument
+        """
+        Load the state of all of the supplied blocks into this cache, with one query.
+
+        Arguments:
+            usage_keys (set of :class:`UsageKey`): Blocks (and asides) to load state for.
+            block_types (set of :class:`BlockTypeKeyV1`): Unused, since state is stored per block.
+        """
+        usage_keys = usage_keys - self._prefetched_keys
+        if usage_keys:
+            self._cache_state(usage_keys)
+            self._prefetched_keys.update(usage_keys)
+
+    def _cache_state(self, usage_keys):
+        """
+        Load the state of the supplied blocks into this cache.
+        """
+        block_field_state = self._client.get_many(self.user.username, usage_keys)
         for user_state in block_field_state:
             self._cache[user_state.block_key] = user_state.state
 
@@ -530,12 +659,27 @@ class UserStateSummaryCache(DjangoOrmFieldCache):
             aside_types (list of str): Asides to load field for (which annotate the supplied
                 xblocks).
         """
+        usage_keys = _all_usage_keys(xblocks, aside_types) - self._prefetched_keys
+        if not usage_keys:
+            return []
         return XModuleUserStateSummaryField.objects.chunked_filter(
             'usage_id__in',
-            _all_usage_keys(xblocks, aside_types),
+            usage_keys,
             field_name__in=set(field.name for field in fields),
         )
 
+    def _prefetch_keys(self, usage_keys, block_types):
+        """
+        Return the usage keys, since user_state_summary is stored per block.
+        """
+        return set(usage_keys)
+
+    def _read_all_objects(self, prefetch_keys):
+        """
+        Return an iterator for all user_state_summary fields of the supplied usage keys.
+        """
+        return XModuleUserStateSummaryField.objects.chunked_filter('usage_id__in', prefetch_keys)
+
     def _cache_key_for_field_object(self, field_object):
         """
         Return the key used in this DjangoOrmFieldCache to store the specified field_object.
@@ -592,13 +736,32 @@ class PreferencesCache(DjangoOrmFieldCache):
             aside_types (list of str): Asides to load field for (which annotate the supplied
                 xblocks).
         """
+        block_types = _all_block_types(xblocks, aside_types) - self._prefetched_keys
+        if not block_types:
+            return []
         return XModuleStudentPrefsField.objects.chunked_filter(
             'module_type__in',
-            _all_block_types(xblocks, aside_types),
+            block_types,
             student=self.user.pk,
             field_name__in=set(field.name for field in fields),
         )
 
+    def _prefetch_keys(self, usage_keys, block_types):
+        """
+        Return the block types, since preferences are stored per block type.
+        """
+        return set(block_types)
+
+    def _read_all_objects(self, prefetch_keys):
+        """
+        Return an iterator for all of the user's preferences for the supplied block types.
+        """
+        return XModuleStudentPrefsField.objects.chunked_filter(
+            'module_type__in',
+            prefetch_keys,
+            student=self.user.pk,
+        )
+
     def _cache_key_for_field_object(self, field_object):
         """
         Return the key used in this DjangoOrmFieldCache to store the specified field_object.
@@ -654,11 +817,25 @@ class UserInfoCache(DjangoOrmFieldCache):
             aside_types (list of str): Asides to load field for (which annotate the supplied
                 xblocks).
         """
+        if self._prefetched_keys:
+            return []
         return XModuleStudentInfoField.objects.filter(
             student=self.user.pk,
             field_name__in=set(field.name for field in fields),
         )
 
+    def _prefetch_keys(self, usage_keys, block_types):
+        """
+        Return the user's id, since user_info isn't stored per block.
+        """
+        return {self.user.pk}
+
+    def _read_all_objects(self, prefetch_keys):
+        """
+        Return an iterator for all of the user's user_info fields.
+        """
+        return XModuleStudentInfoField.objects.filter(student=self.user.pk)
+
     def _cache_key_for_field_object(self, field_object):
         """
         Return the key used in this DjangoOrmFieldCache to store the specified field_object.
@@ -777,6 +954,23 @@ class FieldDataCache(object):
 
         self.add_descriptors_to_cache(descriptors)
 
+    def prefetch(self, plan):
+        """
+        Load all field data for the blocks in the supplied plan, with one query
+        per scope. Adding those blocks' descriptors to this cache later on doesn't
+        make any further queries.
+
+        Arguments:
+            plan (:class:`FieldDataPrefetchPlan`): The blocks to load field data for.
+        """
+        if not self.user.is_authenticated:
+            return
+
+        usage_keys = _with_aside_usage_keys(plan.usage_keys, self.asides)
+        block_types = _with_aside_block_types(plan.block_types, self.asides)
+        for cache in self.cache.values():
+            cache.prefetch(usage_keys, block_types)
+
     @classmethod
     def cache_for_descriptor_descendents(cls, course_id, user, descriptor, depth=None,
                                          descriptor_filter=lambda descriptor: True,
@@ -989,6 +1183,30 @@ class ScoresClient(object):
         client.fetch_scores(scorable_locations)
         return client
 
+    @classmethod
+    def create_for_users(cls, course_id, user_ids, scorable_locations):
+        """
+        Create ScoresClients with pre-fetched data for the given locations,
+        for each of the given users, with a single query.
+
+        Returns a dict of ScoresClients by user id.
+        """
+        clients = {user_id: cls(course_id, user_id) for user_id in user_ids}
+        scores_qset = StudentModule.objects.filter(
+            student_id__in=list(clients),
+            course_id=course_id,
+            module_state_key__in=set(scorable_locations),
+        )
+        for user_id, location, correct, total, created in scores_qset.values_list(
+            'student_id', 'module_state_key', 'grade', 'max_grade', 'created'
+        ):
+            # See fetch_scores about adding the course run to the locations.
+            location = location.map_into_course(course_id)
+            clients[user_id]._locations_to_scores[location] = cls.Score(correct, total, created)
+        for client in clients.values():
+            client._has_fetched = True
+        return clients
+
 
 # @contract(user_id=int, usage_key=UsageKey, score="number|None", max_score="number|None")
 def set_score(user_id, usage_key, score, max_score):
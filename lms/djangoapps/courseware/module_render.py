@@ -45,8 +45,9 @@ from xblock.reference.plugins import FSService
 from xblock.runtime import KvsFieldData
 
 from common.djangoapps import static_replace
+from capa.safe_exec import TieredResultCache, get_local_result_cache
 from capa.xqueue_interface import XQueueInterface
-from lms.djangoapps.courseware.access import get_user_role, has_access
+from lms.djangoapps.courseware.access import bulk_access_checks, get_user_role, has_access
 from lms.djangoapps.courseware.entrance_exams import user_can_skip_entrance_exam, user_has_passed_entrance_exam
 from lms.djangoapps.courseware.masquerade import (
     MasqueradingKeyValueStore,
@@ -79,9 +80,7 @@ from openedx.core.lib.xblock_utils import (
     get_aside_from_xblock,
     hash_resource,
     is_xblock_aside,
-    replace_course_urls,
-    replace_jump_to_id_urls,
-    replace_static_urls
+    replace_urls
 )
 from openedx.core.lib.xblock_utils import request_token as xblock_request_token
 from openedx.core.lib.xblock_utils import wrap_xblock
@@ -170,7 +169,9 @@ def toc_for_course(user, request, course, active_chapter, active_section, field_
 
     field_data_cache must include data from the course module and 2 levels of its descendants
     '''
-    with modulestore().bulk_operations(course.id):
+    # The access of the user to each chapter and section is checked as it is
+    # bound, and the checks share the state resolved for the user.
+    with modulestore().bulk_operations(course.id), bulk_access_checks(user, course.id):
         course_module = get_module_for_descriptor(
             user, request, course, field_data_cache, course.id, course=course
         )
@@ -707,27 +708,19 @@ def get_module_system_for_user(
     # prefix is going to have to be specific to the module, not the directory
     # that the xml was loaded from
 
-    # Rewrite urls beginning in /static to point to course-specific content
-    block_wrappers.append(partial(
-        replace_static_urls,
-        getattr(descriptor, 'data_dir', None),
-        course_id=course_id,
-        static_asset_path=static_asset_path or descriptor.static_asset_path
-    ))
-
-    # Allow URLs of the form '/course/' refer to the root of multicourse directory
-    #   hierarchy of this course
-    block_wrappers.append(partial(replace_course_urls, course_id))
-
-    # this will rewrite intra-courseware links (/jump_to_id/<id>). This format
-    # is an improvement over the /course/... format for studio authored courses,
-    # because it is agnostic to course-hierarchy.
+    # Rewrite urls beginning in /static to point to course-specific content,
+    # allow URLs of the form '/course/' refer to the root of multicourse directory
+    # hierarchy of this course, and rewrite intra-courseware links (/jump_to_id/<id>),
+    # all in one pass. The /jump_to_id/ format is an improvement over the /course/...
+    # format for studio authored courses, because it is agnostic to course-hierarchy.
     # NOTE: module_id is empty string here. The 'module_id' will get assigned in the replacement
     # function, we just need to specify something to get the reverse() to work.
     block_wrappers.append(partial(
-        replace_jump_to_id_urls,
+        replace_urls,
         course_id,
         reverse('jump_to_id', kwargs={'course_id': text_type(course_id), 'module_id': ''}),
+        getattr(descriptor, 'data_dir', None),
+        static_asset_path=static_asset_path or descriptor.static_asset_path
     ))
 
     block_wrappers.append(partial(display_access_messages, user))
@@ -803,7 +796,11 @@ def get_module_system_for_user(
         publish=publish,
         anonymous_student_id=anonymous_student_id,
         course_id=course_id,
-        cache=cache,
+        cache=TieredResultCache(
+            cache,
+            get_local_result_cache(settings.SAFE_EXEC_PROCESS_CACHE_MAX_SIZE),
+            context=text_type(course_id),
+        ),
         can_execute_unsafe_code=(lambda: can_execute_unsafe_code(course_id)),
         get_python_lib_zip=(lambda: get_python_lib_zip(contentstore, course_id)),
         # TODO: When we merge the descriptor and module systems, we can stop reaching into the mixologist (cpennington)
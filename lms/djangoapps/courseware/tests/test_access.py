@@ -6,14 +6,17 @@ Test the access control framework
 
 import datetime
 import itertools
+import re
 
 import ddt
 import pytz
 import six
 from ccx_keys.locator import CCXLocator
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
 from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from milestones.tests.utils import MilestonesTestCaseMixin
 from mock import Mock, patch
@@ -868,3 +871,87 @@ class CourseOverviewAccessTestCase(ModuleStoreTestCase):
         course_overview = CourseOverview.get_from_id(course.id)
         with self.assertNumQueries(num_queries, table_blacklist=QUERY_COUNT_TABLE_BLACKLIST):
             bool(access.has_access(user, action, course_overview, course_key=course.id))
+
+
+@ddt.ddt
+class HasAccessManyTestCase(ModuleStoreTestCase):
+    """
+    Tests for has_access_many and bulk_access_checks.
+    """
+    def setUp(self):
+        super(HasAccessManyTestCase, self).setUp()
+        tomorrow = datetime.datetime.now(pytz.utc) + datetime.timedelta(days=1)
+        self.course = CourseFactory.create(start=datetime.datetime.now(pytz.utc) - datetime.timedelta(days=1))
+        chapter = ItemFactory.create(category='chapter', parent_location=self.course.location)
+        self.blocks = [
+            ItemFactory.create(category='sequential', parent_location=chapter.location),
+            ItemFactory.create(category='sequential', parent_location=chapter.location, visible_to_staff_only=True),
+            ItemFactory.create(category='sequential', parent_location=chapter.location, start=tomorrow),
+        ] + [
+            ItemFactory.create(category='sequential', parent_location=chapter.location)
+            for _ in range(7)
+        ]
+        self.student = UserFactory()
+        self.beta_user = BetaTesterFactory(course_key=self.course.id)
+        self.course_staff = StaffFactory(course_key=self.course.id)
+
+    @ddt.data(
+        *itertools.product(['student', 'beta_user', 'course_staff'], ['load', 'staff', 'instructor'])
+    )
+    @ddt.unpack
+    @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+    def test_same_as_has_access(self, user_attr_name, action):
+        user = getattr(self, user_attr_name)
+        responses = access.has_access_many(user, action, [self.course] + self.blocks, self.course.id)
+        self.assertEqual(
+            {usage_key: bool(response) for usage_key, response in responses.items()},
+            {
+                block.location: bool(access.has_access(user, action, block, self.course.id))
+                for block in [self.course] + self.blocks
+            }
+        )
+
+    @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+    def test_errors(self):
+        responses = access.has_access_many(self.student, 'load', self.blocks, self.course.id)
+        self.assertTrue(responses[self.blocks[0].location])
+        self.assertIsInstance(responses[self.blocks[1].location], access_response.VisibilityError)
+        self.assertIsInstance(responses[self.blocks[2].location], access_response.StartDateError)
+
+    @ddt.data('student', 'beta_user', 'course_staff')
+    @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+    def test_num_queries(self, user_attr_name):
+        """
+        Tests that the queries to resolve the user's access are made once, not
+        once per block.
+        """
+        def fresh_user():
+            # get a fresh user object that won't have any cached role information
+            return User.objects.get(id=getattr(self, user_attr_name).id)
+
+        user = fresh_user()
+        with CaptureQueriesContext(connection) as single_block_queries:
+            access.has_access(user, 'load', self.blocks[2], self.course.id)
+        # Count the queries as assertNumQueries does, without those of blacklisted tables.
+        num_single_block_queries = len([
+            query for query in single_block_queries.captured_queries
+            if not any(re.search(r'[^.]"{}"'.format(table), query['sql']) for table in QUERY_COUNT_TABLE_BLACKLIST)
+        ])
+
+        user = fresh_user()
+        with self.assertNumQueries(num_single_block_queries, table_blacklist=QUERY_COUNT_TABLE_BLACKLIST):
+            access.has_access_many(user, 'load', self.blocks, self.course.id)
+
+    def test_bulk_access_checks(self):
+        with patch('lms.djangoapps.courseware.access.get_user_role', return_value='student') as mock_user_role:
+            with access.bulk_access_checks(self.student, self.course.id):
+                for block in self.blocks:
+                    access.has_access(self.student, 'load', block, self.course.id)
+            self.assertEqual(mock_user_role.call_count, 1)
+
+            # Outside of the context manager, and for other users, each check is independent.
+            with access.bulk_access_checks(self.student, self.course.id):
+                access.has_access(self.course_staff, 'load', self.blocks[0], self.course.id)
+                access.has_access(self.course_staff, 'load', self.blocks[1], self.course.id)
+            access.has_access(self.student, 'load', self.blocks[0], self.course.id)
+            self.assertEqual(mock_user_role.call_count, 4)
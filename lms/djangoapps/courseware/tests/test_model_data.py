@@ -6,14 +6,22 @@ Test for lms courseware app, module data (runtime data storage for XBlocks)
 import json
 from functools import partial
 
-from django.db import DatabaseError
+import ddt
+from django.db import DatabaseError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from edx_toggles.toggles.testutils import override_waffle_flag
 from mock import Mock, patch
 from xblock.core import XBlock
 from xblock.exceptions import KeyValueMultiSaveError
 from xblock.fields import BlockScope, Scope, ScopeIds
 
-from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError
+from lms.djangoapps.courseware.model_data import (
+    DjangoKeyValueStore,
+    FieldDataCache,
+    FieldDataPrefetchPlan,
+    InvalidScopeError
+)
 from lms.djangoapps.courseware.models import (
     StudentModule,
     XModuleStudentInfoField,
@@ -23,7 +31,14 @@ from lms.djangoapps.courseware.models import (
 from lms.djangoapps.courseware.tests.factories import StudentInfoFactory
 from lms.djangoapps.courseware.tests.factories import StudentModuleFactory as cmfStudentModuleFactory
 from lms.djangoapps.courseware.tests.factories import StudentPrefsFactory, UserStateSummaryFactory, course_id, location
+from lms.djangoapps.courseware.module_render import get_module_for_descriptor
+from lms.djangoapps.courseware.toggles import COURSEWARE_PREFETCH_FIELD_DATA_PLAN
 from common.djangoapps.student.tests.factories import UserFactory
+from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
+from openedx.core.djangolib.testing.utils import get_mock_request
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+from xmodule.x_module import STUDENT_VIEW
 
 
 def mock_field(scope, name):
@@ -424,3 +439,103 @@ class TestStudentInfoStorage(OtherUserFailureTestMixin, StorageTestBase, TestCas
     storage_class = XModuleStudentInfoField
     other_key_factory = partial(DjangoKeyValueStore.Key, Scope.user_info, 2, 'mock_problem')  # user_id=2, not 1
     existing_field_name = "existing_field"
+
+
+@ddt.ddt
+class TestFieldDataPrefetchPlan(SharedModuleStoreTestCase):
+    """Tests for prefetching field data with a FieldDataPrefetchPlan"""
+    NUM_UNITS = 50
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestFieldDataPrefetchPlan, cls).setUpClass()
+        cls.course = CourseFactory.create()
+        with cls.store.bulk_operations(cls.course.id):
+            chapter = ItemFactory.create(parent=cls.course, category='chapter')
+            cls.sequential = ItemFactory.create(parent=chapter, category='sequential')
+            for _ in range(cls.NUM_UNITS):
+                vertical = ItemFactory.create(parent=cls.sequential, category='vertical')
+                ItemFactory.create(parent=vertical, category='problem')
+                ItemFactory.create(parent=vertical, category='html')
+
+    def setUp(self):
+        super(TestFieldDataPrefetchPlan, self).setUp()
+        self.user = UserFactory.create()
+        self.plan = FieldDataPrefetchPlan.for_block_structure(
+            get_course_in_cache(self.course.id), self.sequential.location,
+        )
+
+    def test_plan(self):
+        # The sequential, and a vertical, problem and html block per unit.
+        self.assertEqual(len(self.plan), 1 + 3 * self.NUM_UNITS)
+        self.assertEqual(
+            set(block_type.block_type for block_type in self.plan.block_types),
+            {'sequential', 'vertical', 'problem', 'html'},
+        )
+
+    def test_prefetch_query_count(self):
+        sequential = self.store.get_item(self.sequential.location, depth=None, lazy=False)
+        field_data_cache = FieldDataCache([], self.course.id, self.user)
+
+        # One query each for StudentModule, XModuleUserStateSummaryField,
+        # XModuleStudentPrefsField and XModuleStudentInfoField.
+        with self.assertNumQueries(4):
+            field_data_cache.prefetch(self.plan)
+
+        # Adding the (already loaded) descriptors of the whole sequential doesn't query again.
+        with self.assertNumQueries(0):
+            field_data_cache.add_descriptor_descendents(sequential, depth=None)
+
+    @ddt.data(True, False)
+    def test_render_sequential_query_count(self, prefetch_enabled):
+        field_data_tables = [
+            model._meta.db_table  # pylint: disable=protected-access
+            for model in (
+                StudentModule, XModuleUserStateSummaryField, XModuleStudentPrefsField, XModuleStudentInfoField,
+            )
+        ]
+        request = get_mock_request(self.user)
+        course = self.store.get_course(self.course.id, depth=2)
+        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(self.course.id, self.user, course, depth=2)
+
+        # Prefetch, bind and render the sequential as the courseware index view does.
+        with override_waffle_flag(COURSEWARE_PREFETCH_FIELD_DATA_PLAN, active=prefetch_enabled):
+            sequential = self.store.get_item(self.sequential.location, depth=None, lazy=False)
+            if COURSEWARE_PREFETCH_FIELD_DATA_PLAN.is_enabled(self.course.id):
+                field_data_cache.prefetch(self.plan)
+            with CaptureQueriesContext(connection) as render_queries:
+                field_data_cache.add_descriptor_descendents(sequential, depth=None)
+                sequential = get_module_for_descriptor(
+                    self.user, request, sequential, field_data_cache, self.course.id, course=course,
+                )
+                html = sequential.render(STUDENT_VIEW).content
+        self.assertEqual(html.count('seq_contents_'), self.NUM_UNITS)
+
+        # Once prefetched, the field data of the units is read from the cache.
+        field_data_queries = [
+            query for query in render_queries.captured_queries
+            if any('"{}"'.format(table) in query['sql'] for table in field_data_tables)
+        ]
+        if prefetch_enabled:
+            self.assertEqual(field_data_queries, [])
+        else:
+            self.assertNotEqual(field_data_queries, [])
+
+    def test_prefetched_state(self):
+        problem_location = self.sequential.get_children()[0].get_children()[0].location
+        cmfStudentModuleFactory.create(
+            student=self.user,
+            course_id=self.course.id,
+            module_state_key=problem_location,
+            state=json.dumps({'attempts': 2}),
+        )
+        field_data_cache = FieldDataCache([], self.course.id, self.user)
+        field_data_cache.prefetch(self.plan)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                field_data_cache.get(
+                    DjangoKeyValueStore.Key(Scope.user_state, self.user.id, problem_location, 'attempts')
+                ),
+                2,
+            )
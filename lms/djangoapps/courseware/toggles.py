@@ -101,6 +101,21 @@ COURSEWARE_PROCTORING_IMPROVEMENTS = CourseWaffleFlag(
     WAFFLE_FLAG_NAMESPACE, 'proctoring_improvements', __name__
 )
 
+# .. toggle_name: courseware.prefetch_field_data_plan
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Waffle flag to load the learner's field data (StudentModule, user state summary,
+#   preferences and user info) for a whole sequence with one query per table, as planned from the course's block
+#   structure, before the sequence is rendered.
+# .. toggle_use_cases: temporary
+# .. toggle_creation_date: 2026-10-18
+# .. toggle_target_removal_date: None
+# .. toggle_warnings: None
+# .. toggle_tickets: None
+COURSEWARE_PREFETCH_FIELD_DATA_PLAN = CourseWaffleFlag(
+    WAFFLE_FLAG_NAMESPACE, 'prefetch_field_data_plan', __name__
+)
+
 
 def course_exit_page_is_active(course_key):
     return (
@@ -32,6 +32,7 @@ from lms.djangoapps.courseware.exceptions import CourseAccessRedirect, Redirect
 from lms.djangoapps.experiments.utils import get_experiment_user_metadata_context
 from lms.djangoapps.gating.api import get_entrance_exam_score_ratio, get_entrance_exam_usage_key
 from lms.djangoapps.grades.api import CourseGradeFactory
+from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.djangoapps.crawlers.models import CrawlersConfig
 from openedx.core.djangoapps.lang_pref import LANGUAGE_KEY
@@ -63,10 +64,14 @@ from ..entrance_exams import (
     user_has_passed_entrance_exam
 )
 from ..masquerade import check_content_start_date_for_masquerade_user, setup_masquerade
-from ..model_data import FieldDataCache
+from ..model_data import FieldDataCache, FieldDataPrefetchPlan
 from ..module_render import get_module_for_descriptor, toc_for_course
 from ..permissions import MASQUERADE_AS_STUDENT
-from ..toggles import COURSEWARE_MICROFRONTEND_COURSE_TEAM_PREVIEW, REDIRECT_TO_COURSEWARE_MICROFRONTEND
+from ..toggles import (
+    COURSEWARE_MICROFRONTEND_COURSE_TEAM_PREVIEW,
+    COURSEWARE_PREFETCH_FIELD_DATA_PLAN,
+    REDIRECT_TO_COURSEWARE_MICROFRONTEND
+)
 from ..url_helpers import get_microfrontend_url
 from .views import CourseTabView
 
@@ -390,6 +395,12 @@ class CoursewareIndex(View):
         """
         # Pre-fetch all descendant data
         self.section = modulestore().get_item(self.section.location, depth=None, lazy=False)
+        if COURSEWARE_PREFETCH_FIELD_DATA_PLAN.is_enabled(self.course_key):
+            # Load the field data of the whole section in one batch, as planned from the
+            # collected block structure, so that binding its blocks doesn't query again.
+            self.field_data_cache.prefetch(
+                FieldDataPrefetchPlan.for_block_structure(get_course_in_cache(self.course_key), self.section.location)
+            )
         self.field_data_cache.add_descriptor_descendents(self.section, depth=None)
 
         # Bind section to user
@@ -5,13 +5,16 @@
 import datetime
 import json
 import sys
+import time
 
 import ddt
 import mock
 import pytest
 import six
-from django.test import RequestFactory, TestCase
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import RequestFactory, TestCase, override_settings
 from django.urls import reverse
+from django.utils import translation
 from edx_django_utils.cache import RequestCache
 from mock import Mock, patch
 from opaque_keys.edx.keys import CourseKey
@@ -27,12 +30,16 @@ from lms.djangoapps.discussion.django_comment_client.constants import TYPE_ENTRY
 from lms.djangoapps.discussion.django_comment_client.tests.factories import RoleFactory
 from lms.djangoapps.discussion.django_comment_client.tests.unicode import UnicodeTestMixin
 from lms.djangoapps.discussion.django_comment_client.tests.utils import config_course_discussions, topic_name_to_id
+from lms.djangoapps.discussion.tasks import update_discussions_map
 from lms.djangoapps.teams.tests.factories import CourseTeamFactory
 from openedx.core.djangoapps.course_groups import cohorts
 from openedx.core.djangoapps.course_groups.cohorts import set_course_cohorted
 from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory, config_course_cohorts
+import openedx.core.djangoapps.django_comment_common.comment_client as cc
+import openedx.core.djangoapps.django_comment_common.comment_client.utils as cc_utils
 from openedx.core.djangoapps.django_comment_common.comment_client.utils import (
     CommentClientMaintenanceError,
+    perform_in_parallel,
     perform_request
 )
 from openedx.core.djangoapps.django_comment_common.models import (
@@ -1123,6 +1130,108 @@ class CategoryMapTestCase(CategoryMapTestMixin, ModuleStoreTestCase):
         )
 
 
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'discussion_category_entries'}
+})
+class DiscussionCategoryEntriesTestCase(ModuleStoreTestCase):
+    """
+    Tests for the entries of discussion category maps, which are cached by
+    course version.
+    """
+    def setUp(self):
+        super(DiscussionCategoryEntriesTestCase, self).setUp()
+        self.course = CourseFactory.create(
+            default_store=ModuleStoreEnum.Type.split,
+            start=datetime.datetime(2012, 2, 3, tzinfo=UTC)
+        )
+        self.open_discussion = self.create_discussion('open_discussion')
+        self.staff_discussion = self.create_discussion('staff_discussion', visible_to_staff_only=True)
+        self.unstarted_discussion = self.create_discussion(
+            'unstarted_discussion', start=datetime.datetime(2050, 1, 1, tzinfo=UTC)
+        )
+        self.course = self.get_published_course()
+        # Courses get a default discussion topic on creation, so remove it
+        self.course.discussion_topics = {}
+        RequestCache.clear_all_namespaces()
+
+    def create_discussion(self, discussion_id, **kwargs):
+        return ItemFactory.create(
+            parent_location=self.course.location,
+            category='discussion',
+            discussion_id=discussion_id,
+            discussion_category='Chapter',
+            discussion_target=discussion_id,
+            **kwargs
+        )
+
+    def get_published_course(self):
+        with self.store.branch_setting(ModuleStoreEnum.Branch.published_only, self.course.id):
+            return self.store.get_course(self.course.id)
+
+    def test_entries(self):
+        entries = utils.get_discussion_category_entries(self.course)
+        self.assertEqual(
+            {entry['id']: entry['open_to_all'] for entry in entries},
+            {'open_discussion': True, 'staff_discussion': False, 'unstarted_discussion': False}
+        )
+
+    def test_cached_by_course_version(self):
+        with patch.object(utils, '_get_discussion_xblocks', wraps=utils._get_discussion_xblocks) as mock_get:
+            utils.get_discussion_category_entries(self.course)
+            RequestCache.clear_all_namespaces()
+            utils.get_discussion_category_entries(self.course)
+            self.assertEqual(mock_get.call_count, 1)
+
+            # A new version of the course is built again.
+            self.create_discussion('new_discussion')
+            entries = utils.get_discussion_category_entries(self.get_published_course())
+            self.assertEqual(mock_get.call_count, 2)
+            self.assertIn('new_discussion', [entry['id'] for entry in entries])
+
+    def test_cached_on_publish(self):
+        update_discussions_map({'course_id': text_type(self.course.id)})
+        RequestCache.clear_all_namespaces()
+        with patch.object(utils, '_get_discussion_xblocks') as mock_get:
+            entries = utils.get_discussion_category_entries(self.course)
+        self.assertFalse(mock_get.called)
+        self.assertEqual(len(entries), 3)
+
+    def test_access_checked_for_restricted_xblocks_only(self):
+        student = UserFactory.create()
+        CourseEnrollmentFactory.create(user=student, course_id=self.course.id)
+        with patch.object(utils, 'has_access_many', wraps=utils.has_access_many) as mock_has_access_many:
+            accessible_ids = utils.get_discussion_categories_ids(self.course, student)
+        self.assertEqual(accessible_ids, ['open_discussion'])
+        checked_locations = set(block.location for block in mock_has_access_many.call_args[0][2])
+        self.assertEqual(
+            checked_locations,
+            {self.staff_discussion.location, self.unstarted_discussion.location}
+        )
+
+    def test_only_restricted_xblocks_loaded(self):
+        student = UserFactory.create()
+        CourseEnrollmentFactory.create(user=student, course_id=self.course.id)
+        utils.get_discussion_category_entries(self.course)
+        RequestCache.clear_all_namespaces()
+        get_item = utils._get_item_from_modulestore  # pylint: disable=protected-access
+        with patch.object(utils, '_get_discussion_xblocks') as mock_get_all, \
+                patch.object(utils, '_get_item_from_modulestore', wraps=get_item) as mock_get:
+            utils.get_discussion_categories_ids(self.course, student)
+        self.assertFalse(mock_get_all.called)
+        self.assertEqual(
+            set(call_args[0][0] for call_args in mock_get.call_args_list),
+            {self.staff_discussion.location, self.unstarted_discussion.location}
+        )
+
+    def test_staff_access(self):
+        staff = AdminFactory.create()
+        six.assertCountEqual(
+            self,
+            utils.get_discussion_categories_ids(self.course, staff),
+            ['open_discussion', 'staff_discussion', 'unstarted_discussion']
+        )
+
+
 class ContentGroupCategoryMapTestCase(CategoryMapTestMixin, ContentGroupTestCase):
     """
     Tests `get_discussion_category_map` on discussion xblocks which are
@@ -1898,6 +2007,85 @@ class ClientConfigurationTestCase(TestCase):
         self.assertEqual(result, {})
 
 
+class ClientRequestsTestCase(TestCase):
+    """Tests for how requests are made to the comment service."""
+
+    def setUp(self):
+        super(ClientRequestsTestCase, self).setUp()
+        config = ForumsConfig.current()
+        config.enabled = True
+        config.save()
+
+    def _response(self, data=None):
+        response = Mock()
+        response.status_code = 200
+        response.json = lambda: data or {}
+        return response
+
+    @patch('requests.request')
+    @patch('requests.Session.request')
+    def test_pooled_session(self, mock_session_request, mock_request):
+        mock_session_request.return_value = self._response()
+        with override_settings(COMMENTS_SERVICE_POOL_SIZE=4):
+            perform_request('GET', 'http://www.google.com')
+            perform_request('GET', 'http://www.google.com')
+            self.assertIs(cc_utils._get_session(), cc_utils._get_session())
+        self.assertEqual(mock_session_request.call_count, 2)
+        self.assertFalse(mock_request.called)
+
+        perform_request('GET', 'http://www.google.com')
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertIsNone(cc_utils._get_session())
+
+    @patch('requests.request')
+    def test_perform_in_parallel(self, mock_request):
+        mock_request.return_value = self._response({'a': 1})
+        with translation.override('eo'):
+            results = perform_in_parallel(
+                lambda: perform_request('GET', 'http://www.google.com'),
+                translation.get_language,
+                lambda: 2,
+            )
+        self.assertEqual(results, [{'a': 1}, 'eo', 2])
+        self.assertEqual(mock_request.call_args[1]['headers']['Accept-Language'], 'eo')
+
+    def test_perform_in_parallel_error(self):
+        finished = []
+
+        def fail():
+            raise CommentClientMaintenanceError('service disabled')
+
+        def slow():
+            time.sleep(0.1)
+            finished.append(True)
+
+        with self.assertRaises(CommentClientMaintenanceError):
+            perform_in_parallel(fail, slow)
+        # The error is only raised once all of the calls are done.
+        self.assertEqual(finished, [True])
+
+    @override_settings(COMMENTS_SERVICE_USER_CACHE_TIMEOUT=30)
+    @patch('requests.request')
+    def test_user_cache(self, mock_request):
+        mock_request.return_value = self._response({'id': '1', 'upvoted_ids': []})
+        with patch.object(cc_utils, 'cache', LocMemCache('comment_client_users', {})):
+            cc.User(id='1', course_id='course-v1:edX+DemoX+Demo').retrieve()
+            self.assertEqual(cc.User(id='1', course_id='course-v1:edX+DemoX+Demo').upvoted_ids, [])
+            self.assertEqual(mock_request.call_count, 1)
+
+            # Users are cached by the parameters they are retrieved with.
+            cc.User(id='1').retrieve()
+            self.assertEqual(mock_request.call_count, 2)
+
+            # Requests which change the user remove it from the cache.
+            perform_request('put', 'http://localhost:4567/api/v1/threads/2/votes', {'user_id': '1', 'value': 'up'})
+            cc.User(id='1', course_id='course-v1:edX+DemoX+Demo').retrieve()
+            self.assertEqual(mock_request.call_count, 4)
+            perform_request('post', 'http://localhost:4567/api/v1/users/1/subscriptions', {'source_id': '2'})
+            cc.User(id='1').retrieve()
+            self.assertEqual(mock_request.call_count, 6)
+
+
 def set_discussion_division_settings(
         course_key, enable_cohorts=False, always_divide_inline_discussions=False,
         divided_discussions=[], division_scheme=CourseDiscussionSettings.COHORT
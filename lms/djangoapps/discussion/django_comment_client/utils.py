@@ -13,13 +13,15 @@ from django.db import connection
 from django.http import HttpResponse
 from django.urls import reverse
 from django.utils.deprecation import MiddlewareMixin
+from edx_django_utils.cache import TieredCache
 from opaque_keys.edx.keys import CourseKey, i4xEncoder, UsageKey
 from pytz import UTC
 from six import text_type
 from six.moves import map
 
 from lms.djangoapps.courseware import courses
-from lms.djangoapps.courseware.access import has_access
+from lms.djangoapps.courseware.access import has_access, has_access_many
+from lms.djangoapps.courseware.access_utils import in_preview_mode
 from lms.djangoapps.discussion.django_comment_client.constants import TYPE_ENTRY, TYPE_SUBCATEGORY
 from lms.djangoapps.discussion.django_comment_client.permissions import (
     check_permissions_by_view,
@@ -45,6 +47,8 @@ from xmodule.partitions.partitions_service import PartitionService
 
 log = logging.getLogger(__name__)
 
+DISCUSSION_CATEGORY_ENTRIES_CACHE_KEY = u'discussion.category_entries.{course_id}.{version}'
+
 
 def extract(dic, keys):
     """
@@ -152,11 +156,109 @@ def get_accessible_discussion_xblocks_by_course_id(course_id, user=None, include
     Return a list of all valid discussion xblocks in this course.
     Checks for the given user's access if include_all is False.
     """
+    return [
+        xblock for xblock in _get_discussion_xblocks(course_id)
+        if include_all or has_access(user, 'load', xblock, course_id)
+    ]
+
+
+def _get_discussion_xblocks(course_id):
+    """
+    Return a list of all valid discussion xblocks in this course, from the
+    current branch of the modulestore.
+    """
     all_xblocks = modulestore().get_items(course_id, qualifiers={'category': 'discussion'}, include_orphans=False)
+    return [xblock for xblock in all_xblocks if has_required_keys(xblock)]
+
+
+def _get_discussion_category_entry(xblock, now):
+    """
+    Returns the metadata of a discussion xblock which is needed to place it in
+    the category map, and which doesn't depend on the user.
+    """
+    return {
+        "id": xblock.discussion_id,
+        "location": xblock.location,
+        "title": xblock.discussion_target,
+        "category": " / ".join([x.strip() for x in xblock.discussion_category.split("/")]),
+        "sort_key": xblock.sort_key,
+        "start": xblock.start,
+        # Whether any user may load the xblock, as it isn't restricted to
+        # groups or to staff, and it has started.  Only the access to the
+        # other xblocks has to be checked for each user.
+        "open_to_all": (
+            not xblock.merged_group_access and
+            not xblock.visible_to_staff_only and
+            (xblock.start is None or xblock.start <= now)
+        ),
+    }
+
+
+def get_discussion_category_entries(course):
+    """
+    Return the metadata of all valid discussion xblocks in this course, for
+    all users, as built by _get_discussion_category_entry.
+
+    The entries only change when the course is published, so they are cached
+    by course version, and are usually built when the course is published
+    (see cache_discussion_category_entries).  Courses without versions (i.e.
+    Old Mongo courses) aren't cached.
+    """
+    version = getattr(course, 'course_version', None)
+    if version is not None:
+        cached_response = TieredCache.get_cached_response(
+            DISCUSSION_CATEGORY_ENTRIES_CACHE_KEY.format(course_id=course.id, version=version)
+        )
+        if cached_response.is_found:
+            return cached_response.value
+    return cache_discussion_category_entries(course.id)
+
+
+def cache_discussion_category_entries(course_id):
+    """
+    Build the entries of get_discussion_category_entries from the current
+    branch of the modulestore, cache them by the version of the course that
+    they were built from, and return them.
+    """
+    xblocks = _get_discussion_xblocks(course_id)
+    now = datetime.now(UTC)
+    entries = [_get_discussion_category_entry(xblock, now) for xblock in xblocks]
+
+    # The version of the xblocks is used rather than that of the course
+    # object of the caller, which may have been loaded before a publish.
+    version = getattr(xblocks[0], 'course_version', None) if xblocks else None
+    if version is not None:
+        TieredCache.set_all_tiers(
+            DISCUSSION_CATEGORY_ENTRIES_CACHE_KEY.format(course_id=course_id, version=version),
+            entries,
+            settings.DISCUSSION_SETTINGS['CATEGORY_MAP_CACHE_TIMEOUT'],
+        )
+    return entries
+
 
+def get_accessible_discussion_entries(course, user):
+    """
+    Return the entries of get_discussion_category_entries for the discussion
+    xblocks of this course that are accessible to the given user.
+
+    Only the xblocks that aren't open to all users are loaded to check the
+    user's access, except in preview mode, where all of them are.
+    """
+    entries = get_discussion_category_entries(course)
+    if getattr(user, 'is_community_ta', False):
+        return entries
+
+    check_all = in_preview_mode()
+    locations_to_check = [entry["location"] for entry in entries if check_all or not entry["open_to_all"]]
+    if not locations_to_check:
+        return entries
+
+    with modulestore().bulk_operations(course.id):
+        xblocks_to_check = [_get_item_from_modulestore(location) for location in locations_to_check]
+    access = has_access_many(user, 'load', xblocks_to_check, course.id)
     return [
-        xblock for xblock in all_xblocks
-        if has_required_keys(xblock) and (include_all or has_access(user, 'load', xblock, course_id))
+        entry for entry in entries
+        if (entry["open_to_all"] and not check_all) or access.get(entry["location"])
     ]
 
 
@@ -233,7 +335,13 @@ def get_discussion_id_map(course, user):
     Transform the list of this course's discussion xblocks (visible to a given user) into a dictionary of metadata keyed
     by discussion_id.
     """
-    return get_discussion_id_map_by_course_id(course.id, user)
+    return {
+        entry["id"]: {
+            "location": entry["location"],
+            "title": entry["category"].split("/")[-1].strip() + (" / " + entry["title"] if entry["title"] else "")
+        }
+        for entry in get_accessible_discussion_entries(course, user)
+    }
 
 
 def get_discussion_id_map_by_course_id(course_id, user):
@@ -359,23 +467,19 @@ def get_discussion_category_map(course, user, divided_only_if_explicit=False, ex
     """
     unexpanded_category_map = defaultdict(list)
 
-    xblocks = get_accessible_discussion_xblocks(course, user)
+    entries = get_accessible_discussion_entries(course, user)
 
     discussion_settings = get_course_discussion_settings(course.id)
     discussion_division_enabled = course_discussion_division_enabled(discussion_settings)
     divided_discussion_ids = discussion_settings.divided_discussions
 
-    for xblock in xblocks:
-        discussion_id = xblock.discussion_id
-        title = xblock.discussion_target
-        sort_key = xblock.sort_key
-        category = " / ".join([x.strip() for x in xblock.discussion_category.split("/")])
+    for entry in entries:
         # Handle case where xblock.start is None
-        entry_start_date = xblock.start if xblock.start else datetime.max.replace(tzinfo=UTC)
-        unexpanded_category_map[category].append({"title": title,
-                                                  "id": discussion_id,
-                                                  "sort_key": sort_key,
-                                                  "start_date": entry_start_date})
+        entry_start_date = entry["start"] if entry["start"] else datetime.max.replace(tzinfo=UTC)
+        unexpanded_category_map[entry["category"]].append({"title": entry["title"],
+                                                           "id": entry["id"],
+                                                           "sort_key": entry["sort_key"],
+                                                           "start_date": entry_start_date})
 
     category_map = {"entries": defaultdict(dict), "subcategories": defaultdict(dict)}
     for category_path, entries in unexpanded_category_map.items():
@@ -481,9 +585,7 @@ def get_discussion_categories_ids(course, user, include_all=False):
         include_all (bool): If True, return all ids. Used by configuration views.
 
     """
-    accessible_discussion_ids = [
-        xblock.discussion_id for xblock in get_accessible_discussion_xblocks(course, user, include_all=include_all)
-    ]
+    accessible_discussion_ids = [entry["id"] for entry in get_accessible_discussion_entries(course, user)]
     return course.top_level_discussion_topic_ids + accessible_discussion_ids
 
 
@@ -7,4 +7,7 @@ def plugin_settings(settings):
     settings.DISCUSSION_SETTINGS = {
         'MAX_COMMENT_DEPTH': 2,
         'COURSE_PUBLISH_TASK_DELAY': 30,
+        # Seconds for which the discussion xblocks of a course version are
+        # cached, to build the discussion category maps of its users.
+        'CATEGORY_MAP_CACHE_TIMEOUT': 24 * 60 * 60,
     }
@@ -22,6 +22,7 @@ from six.moves.urllib.parse import urljoin
 
 import openedx.core.djangoapps.django_comment_common.comment_client as cc
 from lms.djangoapps.discussion.django_comment_client.utils import (
+    cache_discussion_category_entries,
     get_accessible_discussion_xblocks_by_course_id,
     permalink
 )
@@ -31,6 +32,8 @@ from openedx.core.djangoapps.content.course_overviews.models import CourseOvervi
 from openedx.core.djangoapps.django_comment_common.models import DiscussionsIdMapping
 from openedx.core.lib.celery.task_utils import emulate_http_request
 from common.djangoapps.track import segment
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
 
 log = logging.getLogger(__name__)
 
@@ -44,7 +47,8 @@ ROUTING_KEY = getattr(settings, 'ACE_ROUTING_KEY', None)
 def update_discussions_map(context):
     """
     Updates the mapping between discussion_id to discussion block usage key
-    for all discussion blocks in the given course.
+    for all discussion blocks in the given course, and caches the entries of
+    the discussion category maps of the published version of the course.
 
     context is a dict that contains:
         course_id (string): identifier of the course
@@ -57,6 +61,9 @@ def update_discussions_map(context):
     }
     DiscussionsIdMapping.update_mapping(course_key, discussions_id_map)
 
+    with modulestore().branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
+        cache_discussion_category_entries(course_key)
+
 
 class ResponseNotification(BaseMessageType):
     pass
@@ -0,0 +1,189 @@
+"""
+BulkCourseGrades Class
+"""
+
+
+from collections import namedtuple
+
+import numpy
+
+from .config import assume_zero_if_absent, should_persist_grades
+from .models import PersistentCourseGrade, PersistentSubsectionGrade
+
+BulkCourseGrade = namedtuple('BulkCourseGrade', ['percent', 'letter_grade', 'attempted'])
+
+
+class BulkCourseGrades(object):
+    """
+    Reads the persisted grades of a batch of users in a course into
+    (users x subsections) arrays, so that grading policy can be applied
+    to all of the users at once instead of through per-user CourseGrade
+    and SubsectionGrade objects.
+
+    Users whose course grade, or the grade of any of the given
+    subsections, is neither persisted nor assumed to be zero are not read;
+    they are listed in ungraded_users and should be graded through the
+    CourseGradeFactory, which computes the missing grades from the user's
+    own course structure.
+    """
+    def __init__(self, course_key, users, subsection_keys):
+        self.course_key = course_key
+        self.course_grades = {}
+        self.ungraded_users = []
+        self._zero_if_absent = assume_zero_if_absent(course_key)
+        self._row_indices = {}
+        self._persisted_user_ids = []
+        self._column_indices = {subsection_key: index for index, subsection_key in enumerate(subsection_keys)}
+
+        # The users whose grades are read, in the order of the rows of the grade arrays.
+        self.users = self._read_course_grades(users)
+        shape = (len(self.users), len(subsection_keys))
+        self.earned = numpy.zeros(shape)
+        self.possible = numpy.zeros(shape)
+        self.attempted = numpy.zeros(shape, dtype=bool)
+        self.overridden = numpy.zeros(shape, dtype=bool)
+        self._read_subsection_grades()
+
+    @staticmethod
+    def is_enabled(course_key):
+        """
+        Returns whether grades are persisted for the course, and so can
+        be read in bulk.
+        """
+        return should_persist_grades(course_key)
+
+    def row(self, user):
+        """
+        Returns the row index of the given user in the grade arrays.
+        """
+        return self._row_indices[user.id]
+
+    def column(self, subsection_key):
+        """
+        Returns the column index of the given subsection in the grade arrays.
+        """
+        return self._column_indices[subsection_key]
+
+    @property
+    def percent_graded(self):
+        """
+        Returns the graded percent of each subsection grade, rounded as
+        SubsectionGrade.percent_graded.
+        """
+        has_possible = self.possible > 0
+        percents = numpy.around(self.earned / numpy.where(has_possible, self.possible, 1.0), decimals=2)
+        return numpy.where(has_possible, percents, 0.0)
+
+    @property
+    def course_attempted(self):
+        """
+        Returns whether each user attempted the course, as CourseGrade.attempted.
+        """
+        return numpy.array([self.course_grades[user.id].attempted for user in self.users], dtype=bool)
+
+    def _read_course_grades(self, users):
+        """
+        Reads the persisted course grades of the given users, and
+        returns the users that have one or are assumed to have a zero
+        grade.
+        """
+        persistent_grades = {
+            persistent_grade.user_id: persistent_grade
+            for persistent_grade in PersistentCourseGrade.objects.filter(
+                user_id__in=[user.id for user in users],
+                course_id=self.course_key,
+            )
+        }
+        graded_users = []
+        for user in users:
+            persistent_grade = persistent_grades.get(user.id)
+            if persistent_grade is None:
+                if not self._zero_if_absent:
+                    self.ungraded_users.append(user)
+                    continue
+                self.course_grades[user.id] = BulkCourseGrade(0.0, None, False)
+            else:
+                self._persisted_user_ids.append(user.id)
+                # Courses that assume zero grades count as attempted; otherwise,
+                # this is updated when the user's subsection grades are read.
+                self.course_grades[user.id] = BulkCourseGrade(
+                    persistent_grade.percent_grade,
+                    persistent_grade.letter_grade or None,
+                    self._zero_if_absent,
+                )
+            self._row_indices[user.id] = len(graded_users)
+            graded_users.append(user)
+        return graded_users
+
+    def _read_subsection_grades(self):
+        """
+        Reads the persisted subsection grades, with any overrides, of the
+        users that have a persisted course grade into the grade arrays.
+        """
+        # Users with a zero course grade have zero subsection grades.
+        if not self._persisted_user_ids:
+            return
+
+        grades = PersistentSubsectionGrade.objects.filter(
+            user_id__in=self._persisted_user_ids,
+            course_id=self.course_key,
+        ).values_list(
+            'user_id',
+            'usage_key',
+            'earned_graded',
+            'possible_graded',
+            'first_attempted',
+            'override__id',
+            'override__earned_graded_override',
+            'override__possible_graded_override',
+        )
+        persisted = numpy.zeros(self.earned.shape, dtype=bool)
+        for user_id, usage_key, earned, possible, first_attempted, override_id, earned_override, possible_override in (
+            grades
+        ):
+            if first_attempted is not None and not self.course_grades[user_id].attempted:
+                self.course_grades[user_id] = self.course_grades[user_id]._replace(attempted=True)
+
+            if usage_key.run is None:
+                # pylint: disable=unexpected-keyword-arg,no-value-for-parameter
+                usage_key = usage_key.replace(course_key=self.course_key)
+            column = self._column_indices.get(usage_key)
+            if column is None:
+                continue
+
+            row = self._row_indices[user_id]
+            self.earned[row, column] = earned if earned_override is None else earned_override
+            self.possible[row, column] = possible if possible_override is None else possible_override
+            self.attempted[row, column] = first_attempted is not None
+            self.overridden[row, column] = override_id is not None
+            persisted[row, column] = True
+
+        if not self._zero_if_absent:
+            # The missing grades are computed, as the CourseGradeFactory does,
+            # from the structure of the course that's visible to the user.
+            self._remove_rows(~persisted.all(axis=1))
+
+    def _remove_rows(self, removed):
+        """
+        Removes the users of the given rows from the grade arrays, and
+        lists them in ungraded_users instead.
+        """
+        if not removed.any():
+            return
+
+        kept = ~removed
+        self.earned = self.earned[kept]
+        self.possible = self.possible[kept]
+        self.attempted = self.attempted[kept]
+        self.overridden = self.overridden[kept]
+
+        users = self.users
+        self.users = []
+        self._row_indices = {}
+        for user, is_removed in zip(users, removed.tolist()):
+            if is_removed:
+                del self.course_grades[user.id]
+                self.ungraded_users.append(user)
+            else:
+                self._row_indices[user.id] = len(self.users)
+                self.users.append(user)
@@ -5,23 +5,37 @@ Command to compute all grades for specified courses.
 
 import hashlib
 import logging
+import multiprocessing
+import time
 
+from django.core.cache import close_caches
 from django.core.management.base import BaseCommand
+from django.db import connections
+from opaque_keys.edx.keys import CourseKey
 
 from lms.djangoapps.grades.config.models import ComputeGradesSetting
+from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
+from lms.djangoapps.grades.grade_utils import are_grades_frozen
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
 from openedx.core.lib.command_utils import get_mutually_exclusive_required_option, parse_course_keys
-from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.django import clear_existing_modulestores, modulestore
 
 from lms.djangoapps.grades import tasks
 
 log = logging.getLogger(__name__)
 
+# The course, and its collected block structure, whose grades the local
+# process is computing, by course key.  It is kept for all of the batches of
+# students of the course which the process computes.
+_worker_course_data = {}
+
 
 class Command(BaseCommand):
     """
     Example usage:
         $ ./manage.py lms compute_grades --all_courses --settings=devstack
         $ ./manage.py lms compute_grades 'edX/DemoX/Demo_Course' --settings=devstack
+        $ ./manage.py lms compute_grades --courses 'edX/DemoX/Demo_Course' --processes 8 --settings=devstack
     """
     args = '<course_id course_id ...>'
     help = 'Computes grade values for all learners in specified courses.'
@@ -65,6 +79,12 @@ class Command(BaseCommand):
             default=0,
             type=int,
         )
+        parser.add_argument(
+            '--processes',
+            help='Compute grades in this many local processes, rather than in celery tasks, e.g. for backfills.',
+            default=0,
+            type=int,
+        )
         parser.add_argument(
             '--no_estimate_first_attempted',
             help='Use score data to estimate first_attempted timestamp.',
@@ -74,13 +94,17 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         self._set_log_level(options)
-        self.enqueue_all_shuffled_tasks(options)
+        if options['processes'] > 0:
+            self.compute_all_in_processes(options)
+        else:
+            self.enqueue_all_shuffled_tasks(options)
 
     def enqueue_all_shuffled_tasks(self, options):
         """
         Enqueue all tasks, in shuffled order.
         """
         task_options = {'routing_key': options['routing_key']} if options.get('routing_key') else {}
+        seq_id = -1
         for seq_id, kwargs in enumerate(self._shuffled_task_kwargs(options)):
             kwargs['seq_id'] = seq_id
             result = tasks.compute_grades_for_course_v2.apply_async(kwargs=kwargs, **task_options)
@@ -89,6 +113,42 @@ class Command(BaseCommand):
                 task_id=result.task_id,
                 kwargs=kwargs,
             ))
+        log.info("Grades: Created %d tasks", seq_id + 1)
+
+    def compute_all_in_processes(self, options):
+        """
+        Compute the grades of all batches of students in a pool of local
+        processes, reporting the progress as batches complete.
+
+        The batches are kept in course order, so that each process mostly
+        computes batches of the same course, and only loads each course once.
+        """
+        all_args = []
+        for course_key in self._get_course_keys(options):
+            all_args.extend(tasks._course_task_args(course_key, **options))
+        if not all_args:
+            return
+
+        # The processes must open their own database and cache connections,
+        # rather than share the sockets of those this process already opened.
+        connections.close_all()
+        close_caches()
+        start_time = time.time()
+        num_batches = num_students = num_errors = 0
+        pool = multiprocessing.Pool(options['processes'], initializer=clear_existing_modulestores)
+        try:
+            for batch_students, batch_errors in pool.imap_unordered(_compute_grades_for_batch, all_args):
+                num_batches += 1
+                num_students += batch_students
+                num_errors += batch_errors
+                elapsed = time.time() - start_time
+                log.info(
+                    "Grades: Computed %d of %d batches, for %d students with %d errors, in %.0fs (%.1f students/s)",
+                    num_batches, len(all_args), num_students, num_errors, elapsed, num_students / max(elapsed, 1e-6),
+                )
+        finally:
+            pool.close()
+            pool.join()
 
     def _shuffled_task_kwargs(self, options):
         """
@@ -112,8 +172,9 @@ class Command(BaseCommand):
         for args in all_args:
             yield {
                 'course_key': args[0],
-                'offset': args[1],
-                'batch_size': args[2],
+                'min_user_id': args[1],
+                'max_user_id': args[2],
+                'batch_size': args[3],
                 'estimate_first_attempted': estimate_first_attempted,
             }
 
@@ -147,3 +208,41 @@ class Command(BaseCommand):
         Return the latest version of the ComputeGradesSetting
         """
         return ComputeGradesSetting.current()
+
+
+def _compute_grades_for_batch(task_args):
+    """
+    Compute and save the grades of a batch of students of a course, in a local
+    process, as the compute_grades_for_course task does.
+
+    Returns the number of students of the batch, and the number of them whose
+    grades couldn't be computed.
+    """
+    course_key_string, min_user_id, max_user_id, _ = task_args
+    course_key = CourseKey.from_string(course_key_string)
+    if course_key not in _worker_course_data:
+        _worker_course_data.clear()
+        if are_grades_frozen(course_key):
+            log.info("Grades: Not computing grades for course '%s', as they are frozen.", course_key)
+            _worker_course_data[course_key] = None
+        else:
+            _worker_course_data[course_key] = (
+                modulestore().get_course(course_key, depth=0),
+                get_block_structure_manager(course_key).get_collected(),
+            )
+    course_data = _worker_course_data[course_key]
+    if course_data is None:
+        return 0, 0
+
+    course, collected_block_structure = course_data
+    num_students = num_errors = 0
+    for result in CourseGradeFactory().iter(
+        users=tasks._enrolled_students(course_key, min_user_id, max_user_id),
+        course=course,
+        collected_block_structure=collected_block_structure,
+        force_update=True,
+    ):
+        num_students += 1
+        if result.error is not None:
+            num_errors += 1
+    return num_students, num_errors
@@ -10,7 +10,7 @@ import six
 from six.moves import range
 from django.contrib.auth import get_user_model
 from django.core.management import CommandError, call_command
-from mock import ANY, patch
+from mock import ANY, Mock, patch
 
 from lms.djangoapps.grades.config.models import ComputeGradesSetting
 from lms.djangoapps.grades.management.commands import compute_grades
@@ -81,10 +81,11 @@ class TestComputeGrades(SharedModuleStoreTestCase):
         if not estimate_first_attempted:
             command.append('--no_estimate_first_attempted')
         call_command(*(command + courses))
-        _kwargs = lambda course_key, offset: {
+        _kwargs = lambda course_key, min_user, max_user: {
             'course_key': course_key,
             'batch_size': 2,
-            'offset': offset,
+            'min_user_id': min_user.id,
+            'max_user_id': max_user.id,
             'estimate_first_attempted': estimate_first_attempted,
             'seq_id': ANY,
         }
@@ -93,19 +94,19 @@ class TestComputeGrades(SharedModuleStoreTestCase):
         expected = [
             ({
                 'routing_key': 'key',
-                'kwargs': _kwargs(self.course_keys[0], 0)
+                'kwargs': _kwargs(self.course_keys[0], self.users[0], self.users[1])
             },),
             ({
                 'routing_key': 'key',
-                'kwargs': _kwargs(self.course_keys[0], 2)
+                'kwargs': _kwargs(self.course_keys[0], self.users[2], self.users[2])
             },),
             ({
                 'routing_key': 'key',
-                'kwargs': _kwargs(self.course_keys[3], 0)
+                'kwargs': _kwargs(self.course_keys[3], self.users[0], self.users[1])
             },),
             ({
                 'routing_key': 'key',
-                'kwargs': _kwargs(self.course_keys[3], 2)
+                'kwargs': _kwargs(self.course_keys[3], self.users[2], self.users[2])
             },),
         ]
         assert len(expected) == len(actual)
@@ -123,7 +124,8 @@ class TestComputeGrades(SharedModuleStoreTestCase):
                 'kwargs': {
                     'course_key': self.course_keys[1],
                     'batch_size': 2,
-                    'offset': 0,
+                    'min_user_id': self.users[0].id,
+                    'max_user_id': self.users[1].id,
                     'estimate_first_attempted': True,
                     'seq_id': ANY,
                 },
@@ -132,7 +134,8 @@ class TestComputeGrades(SharedModuleStoreTestCase):
                 'kwargs': {
                     'course_key': self.course_keys[1],
                     'batch_size': 2,
-                    'offset': 2,
+                    'min_user_id': self.users[2].id,
+                    'max_user_id': self.users[2].id,
                     'estimate_first_attempted': True,
                     'seq_id': ANY,
                 },
@@ -141,3 +144,37 @@ class TestComputeGrades(SharedModuleStoreTestCase):
         assert len(expected) == len(actual)
         for call in expected:
             assert call in actual
+
+    @patch('lms.djangoapps.grades.management.commands.compute_grades.close_caches')
+    @patch('lms.djangoapps.grades.management.commands.compute_grades.connections')
+    @patch('lms.djangoapps.grades.management.commands.compute_grades.multiprocessing.Pool')
+    @patch('lms.djangoapps.grades.tasks.compute_grades_for_course_v2')
+    def test_compute_in_processes(self, mock_task, mock_pool, mock_connections, mock_close_caches):
+        mock_pool.return_value.imap_unordered.side_effect = lambda func, all_args: [(2, 0) for _ in all_args]
+        call_command('compute_grades', '--processes=2', '--batch_size=2', '--courses', self.course_keys[0])
+        self.assertFalse(mock_task.apply_async.called)
+        # The processes don't share the connections of the command.
+        mock_connections.close_all.assert_called_once_with()
+        mock_close_caches.assert_called_once_with()
+        mock_pool.assert_called_once_with(2, initializer=compute_grades.clear_existing_modulestores)
+        _, all_args = mock_pool.return_value.imap_unordered.call_args[0]
+        self.assertEqual(
+            all_args,
+            [
+                (self.course_keys[0], self.users[0].id, self.users[1].id, 2),
+                (self.course_keys[0], self.users[2].id, self.users[2].id, 2),
+            ]
+        )
+
+    @patch('lms.djangoapps.grades.management.commands.compute_grades.CourseGradeFactory')
+    def test_compute_grades_for_batch(self, mock_factory):
+        mock_factory.return_value.iter.side_effect = lambda users, **kwargs: [
+            Mock(error=None) for _ in users
+        ]
+        batch = (self.course_keys[2], self.users[1].id, self.users[2].id, 2)
+        with patch.object(compute_grades, 'get_block_structure_manager') as mock_manager:
+            self.assertEqual(compute_grades._compute_grades_for_batch(batch), (2, 0))
+            self.assertEqual(compute_grades._compute_grades_for_batch(batch), (2, 0))
+        # The course is only loaded once by each process.
+        self.assertEqual(mock_manager.return_value.get_collected.call_count, 1)
+        compute_grades._worker_course_data.clear()
@@ -3,6 +3,8 @@ Grades related signals.
 """
 
 
+import threading
+from collections import defaultdict
 from contextlib import contextmanager
 from logging import getLogger
 
@@ -27,7 +29,8 @@ from ..scores import weighted_score
 from lms.djangoapps.grades.tasks import (
     RECALCULATE_GRADE_DELAY_SECONDS,
     recalculate_course_and_subsection_grades_for_user,
-    recalculate_subsection_grade_v3
+    recalculate_subsection_grade_v3,
+    recalculate_subsection_grades_for_users
 )
 from .signals import (
     PROBLEM_RAW_SCORE_CHANGED,
@@ -39,6 +42,12 @@ from .signals import (
 
 log = getLogger(__name__)
 
+# Number of users whose grades are updated by each recalculate_subsection_grades_for_users task.
+RECALCULATE_GRADES_FOR_USERS_BATCH_SIZE = 100
+
+# The subsection updates collected by defer_subsection_updates in this thread.
+_deferred_subsection_updates = threading.local()
+
 
 @receiver(score_set, dispatch_uid='submissions_score_set_handler')
 def submissions_score_set_handler(sender, **kwargs):  # pylint: disable=unused-argument
@@ -135,6 +144,93 @@ def disconnect_submissions_signal_receiver(signal):
         signal.connect(handler, dispatch_uid=dispatch_uid)
 
 
+@contextmanager
+def defer_subsection_updates(course_key):
+    """
+    Context manager in which the subsection grade updates for the changed
+    problem scores of the given course, which are saved in StudentModule, are
+    collected rather than each queued in a recalculate_subsection_grade_v3
+    task.  They are queued in recalculate_subsection_grades_for_users tasks
+    that each update a batch of users, once a problem's batch is full, and
+    for the remaining users on exit.
+
+    This is meant for operations that change the score of a problem for many
+    users, e.g. rescoring it for all of them, and that save each score before
+    it's collected.  Since each task updates a range of user ids, the scores
+    should be saved in order of user id.
+    """
+    if getattr(_deferred_subsection_updates, 'course_id', None) is not None:
+        # The enclosing context queues the updates.
+        yield
+        return
+
+    _deferred_subsection_updates.course_id = six.text_type(course_key)
+    # {(usage_id, only_if_higher, score_deleted): set of user ids}
+    _deferred_subsection_updates.user_ids = defaultdict(set)
+    # {(usage_id, only_if_higher, score_deleted): (event transaction id, type)}
+    _deferred_subsection_updates.event_transactions = {}
+    try:
+        yield
+    finally:
+        user_ids = _deferred_subsection_updates.user_ids
+        try:
+            for key in list(user_ids):
+                _enqueue_deferred_subsection_updates(key, user_ids.pop(key))
+        finally:
+            _deferred_subsection_updates.course_id = None
+            _deferred_subsection_updates.user_ids = None
+            _deferred_subsection_updates.event_transactions = None
+
+
+def _defer_subsection_update(**kwargs):
+    """
+    Collects the subsection update for the score change signal with the given
+    kwargs, if it is in the course of the enclosing defer_subsection_updates,
+    and queues the updates of the problem once a batch of users is full.
+    Returns whether the update was deferred.
+    """
+    if (
+        kwargs['course_id'] != getattr(_deferred_subsection_updates, 'course_id', None) or
+        kwargs['score_db_table'] != ScoreDatabaseTableEnum.courseware_student_module or
+        kwargs.get('force_update_subsections', False)
+    ):
+        return False
+    key = (kwargs['usage_id'], kwargs.get('only_if_higher'), kwargs.get('score_deleted', False))
+    user_ids = _deferred_subsection_updates.user_ids
+    if len(user_ids[key]) >= RECALCULATE_GRADES_FOR_USERS_BATCH_SIZE and kwargs['user_id'] not in user_ids[key]:
+        # The batch is queued once the next user's score is saved rather
+        # than with the score of its last user, which may not be committed
+        # yet when the task runs.
+        _enqueue_deferred_subsection_updates(key, user_ids.pop(key))
+    user_ids[key].add(kwargs['user_id'])
+    _deferred_subsection_updates.event_transactions[key] = (
+        six.text_type(get_event_transaction_id()),
+        six.text_type(get_event_transaction_type()),
+    )
+    return True
+
+
+def _enqueue_deferred_subsection_updates(key, user_ids):
+    """
+    Queues the collected subsection updates of the given key, for a batch of
+    users whose ids are in a range.
+    """
+    usage_id, only_if_higher, score_deleted = key
+    event_transaction_id, event_transaction_type = _deferred_subsection_updates.event_transactions[key]
+    recalculate_subsection_grades_for_users.apply_async(
+        kwargs=dict(
+            course_id=_deferred_subsection_updates.course_id,
+            usage_id=usage_id,
+            min_user_id=min(user_ids),
+            max_user_id=max(user_ids),
+            only_if_higher=only_if_higher,
+            score_deleted=score_deleted,
+            event_transaction_id=event_transaction_id,
+            event_transaction_type=event_transaction_type,
+        ),
+    )
+
+
 @receiver(SCORE_PUBLISHED)
 def score_published_handler(sender, block, user, raw_earned, raw_possible, only_if_higher, **kwargs):  # pylint: disable=unused-argument
     """
@@ -224,6 +320,8 @@ def enqueue_subsection_update(sender, **kwargs):  # pylint: disable=unused-argum
     context_key = LearningContextKey.from_string(kwargs['course_id'])
     if not context_key.is_course:
         return  # If it's not a course, it has no subsections, so skip the subsection grading update
+    if _defer_subsection_update(**kwargs):
+        return
     recalculate_subsection_grade_v3.apply_async(
         kwargs=dict(
             user_id=kwargs['user_id'],
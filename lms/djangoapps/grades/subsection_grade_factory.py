@@ -26,9 +26,12 @@ class SubsectionGradeFactory(object):
     """
     Factory for Subsection Grades.
     """
-    def __init__(self, student, course=None, course_structure=None, course_data=None):
+    def __init__(self, student, course=None, course_structure=None, course_data=None, csm_scores=None):
         self.student = student
         self.course_data = course_data or CourseData(student, course=course, structure=course_structure)
+        if csm_scores is not None:
+            # A ScoresClient prefetched along with those of other students.
+            self._csm_scores = csm_scores
 
         self._cached_subsection_grades = None
         self._unsaved_subsection_grades = OrderedDict()
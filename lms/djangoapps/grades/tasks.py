@@ -21,9 +21,11 @@ from opaque_keys.edx.keys import CourseKey, UsageKey
 from opaque_keys.edx.locator import CourseLocator
 from submissions import api as sub_api
 
-from lms.djangoapps.courseware.model_data import get_score
+from lms.djangoapps.courseware.model_data import ScoresClient, get_score
+from lms.djangoapps.courseware.models import StudentModule
 from lms.djangoapps.course_blocks.api import get_course_blocks
 from lms.djangoapps.grades.config.models import ComputeGradesSetting
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from common.djangoapps.student.models import CourseEnrollment
 from common.djangoapps.track.event_transaction_utils import set_event_transaction_id, set_event_transaction_type
@@ -35,6 +37,7 @@ from .constants import ScoreDatabaseTableEnum
 from .course_grade_factory import CourseGradeFactory
 from .exceptions import DatabaseNotReadyError
 from .grade_utils import are_grades_frozen
+from .scores import possibly_scored
 from .signals.signals import SUBSECTION_SCORE_CHANGED
 from .subsection_grade_factory import SubsectionGradeFactory
 from .transformer import GradesTransformer
@@ -50,6 +53,7 @@ KNOWN_RETRY_ERRORS = (  # Errors we expect occasionally, should be resolved on r
 RECALCULATE_GRADE_DELAY_SECONDS = 2  # to prevent excessive _has_db_updated failures. See TNL-6424.
 RETRY_DELAY_SECONDS = 40
 SUBSECTION_GRADE_TIMEOUT_SECONDS = 300
+SUBSECTION_GRADES_FOR_USERS_TIMEOUT_SECONDS = 1200
 
 
 @task(base=LoggedPersistOnFailureTask, routing_key=settings.POLICY_CHANGE_GRADES_ROUTING_KEY)
@@ -67,10 +71,13 @@ def compute_all_grades_for_course(**kwargs):
         if are_grades_frozen(course_key):
             log.info(u"Attempted compute_all_grades_for_course for course '%s', but grades are frozen.", course_key)
             return
-        for course_key_string, offset, batch_size in _course_task_args(course_key=course_key, **kwargs):
+        for course_key_string, min_user_id, max_user_id, batch_size in _course_task_args(
+            course_key=course_key, **kwargs
+        ):
             kwargs.update({
                 'course_key': course_key_string,
-                'offset': offset,
+                'min_user_id': min_user_id,
+                'max_user_id': max_user_id,
                 'batch_size': batch_size,
             })
             compute_grades_for_course_v2.apply_async(
@@ -91,9 +98,10 @@ def compute_grades_for_course_v2(self, **kwargs):
     """
     Compute grades for a set of students in the specified course.
 
-    The set of students will be determined by the order of enrollment date, and
-    limited to at most <batch_size> students, starting from the specified
-    offset.
+    The set of students is the one enrolled with user ids from <min_user_id>
+    to <max_user_id>, or for tasks enqueued with an <offset>, determined by
+    the order of enrollment date and limited to at most <batch_size> students,
+    starting from the offset.
 
     TODO: Roll this back into compute_grades_for_course once all workers have
     the version with **kwargs.
@@ -105,28 +113,40 @@ def compute_grades_for_course_v2(self, **kwargs):
         set_event_transaction_type(kwargs['event_transaction_type'])
 
     try:
-        return compute_grades_for_course(kwargs['course_key'], kwargs['offset'], kwargs['batch_size'])
+        return compute_grades_for_course(
+            kwargs['course_key'],
+            kwargs.get('offset'),
+            kwargs['batch_size'],
+            min_user_id=kwargs.get('min_user_id'),
+            max_user_id=kwargs.get('max_user_id'),
+        )
     except Exception as exc:
         raise self.retry(kwargs=kwargs, exc=exc)
 
 
 @task(base=LoggedPersistOnFailureTask)
 @set_code_owner_attribute
-def compute_grades_for_course(course_key, offset, batch_size, **kwargs):  # pylint: disable=unused-argument
+def compute_grades_for_course(
+        course_key, offset, batch_size, min_user_id=None, max_user_id=None, **kwargs
+):  # pylint: disable=unused-argument
     """
     Compute and save grades for a set of students in the specified course.
 
-    The set of students will be determined by the order of enrollment date, and
-    limited to at most <batch_size> students, starting from the specified
-    offset.
+    The set of students will be the one enrolled with user ids from
+    <min_user_id> to <max_user_id> if they are given.  Otherwise, it will be
+    determined by the order of enrollment date, and limited to at most
+    <batch_size> students, starting from the specified offset.
     """
     course_key = CourseKey.from_string(course_key)
     if are_grades_frozen(course_key):
         log.info(u"Attempted compute_grades_for_course for course '%s', but grades are frozen.", course_key)
         return
 
-    enrollments = CourseEnrollment.objects.filter(course_id=course_key).order_by('created')
-    student_iter = (enrollment.user for enrollment in enrollments[offset:offset + batch_size])
+    if min_user_id is not None:
+        student_iter = _enrolled_students(course_key, min_user_id, max_user_id)
+    else:
+        enrollments = CourseEnrollment.objects.filter(course_id=course_key).order_by('created')
+        student_iter = (enrollment.user for enrollment in enrollments[offset:offset + batch_size])
     for result in CourseGradeFactory().iter(users=student_iter, course_key=course_key, force_update=True):
         if result.error is not None:
             raise result.error
@@ -191,6 +211,71 @@ def recalculate_subsection_grade_v3(self, **kwargs):
     _recalculate_subsection_grade(self, **kwargs)
 
 
+@task(
+    bind=True,
+    base=LoggedPersistOnFailureTask,
+    time_limit=SUBSECTION_GRADES_FOR_USERS_TIMEOUT_SECONDS,
+    max_retries=2,
+    default_retry_delay=RETRY_DELAY_SECONDS,
+    routing_key=settings.RECALCULATE_GRADES_ROUTING_KEY
+)
+@set_code_owner_attribute
+def recalculate_subsection_grades_for_users(self, **kwargs):
+    """
+    Updates the saved subsection grades of the users, in a range of user ids,
+    whose score of a problem changed, e.g. when an instructor rescores the
+    problem for everyone.  The course structure is collected and the
+    problem scores are read once for all of the users, rather than in one
+    recalculate_subsection_grade_v3 task for each of them.
+
+    Only the users who have state for the problem are updated.  The task
+    is queued once their scores are saved, so it doesn't check, as
+    _recalculate_subsection_grade does, that the database is updated.
+
+    Keyword Arguments:
+        course_id (string): identifying the course
+        usage_id (string): identifying the problem
+        min_user_id (int): the lowest id of the users to update
+        max_user_id (int): the highest id of the users to update
+        only_if_higher (boolean): indicating whether grades should
+            be updated only if the new raw_earned is higher than the
+            previous value.
+        score_deleted (boolean): indicating whether the grade change is
+            a result of the problem's score being deleted.
+        event_transaction_id (string): uuid identifying the current
+            event transaction.
+        event_transaction_type (string): human-readable type of the
+            event at the root of the current event transaction.
+    """
+    try:
+        course_key = CourseLocator.from_string(kwargs['course_id'])
+        if are_grades_frozen(course_key):
+            log.info(u"Attempted recalculate_subsection_grades_for_users for course '%s', but grades are frozen.",
+                     course_key)
+            return
+
+        scored_block_usage_key = UsageKey.from_string(kwargs['usage_id']).replace(course_key=course_key)
+
+        set_custom_attributes_for_course_key(course_key)
+        set_custom_attribute('usage_id', six.text_type(scored_block_usage_key))
+        set_event_transaction_id(kwargs.get('event_transaction_id'))
+        set_event_transaction_type(kwargs.get('event_transaction_type'))
+
+        _update_subsection_grades_for_users(
+            course_key,
+            scored_block_usage_key,
+            kwargs['only_if_higher'],
+            kwargs['min_user_id'],
+            kwargs['max_user_id'],
+            kwargs['score_deleted'],
+        )
+    except Exception as exc:
+        if not isinstance(exc, KNOWN_RETRY_ERRORS):
+            log.info(u"Grades: recalculate_subsection_grades_for_users unexpected failure: {}. task id: {}. "
+                     u"kwargs={}".format(repr(exc), self.request.id, kwargs))
+        raise self.retry(kwargs=kwargs, exc=exc)
+
+
 def _recalculate_subsection_grade(self, **kwargs):
     """
     Updates a saved subsection grade.
@@ -321,46 +406,146 @@ def _update_subsection_grades(
     store = modulestore()
     with store.bulk_operations(course_key):
         course_structure = get_course_blocks(student, store.make_course_usage_key(course_key))
-        subsections_to_update = course_structure.get_transformer_block_field(
+        course = store.get_course(course_key, depth=0)
+        _update_subsection_grades_in_structure(
+            student,
+            course,
+            course_structure,
             scored_block_usage_key,
-            GradesTransformer,
-            'subsections',
-            set(),
+            SubsectionGradeFactory(student, course, course_structure),
+            only_if_higher,
+            score_deleted,
+            force_update_subsections,
         )
 
+
+def _update_subsection_grades_for_users(
+        course_key, scored_block_usage_key, only_if_higher, min_user_id, max_user_id, score_deleted
+):
+    """
+    Updates the subsection grades containing the given block, for the users
+    with ids from min_user_id to max_user_id who have state for the block.
+    """
+    user_ids = StudentModule.objects.filter(
+        course_id=course_key,
+        module_state_key=scored_block_usage_key,
+        student_id__range=(min_user_id, max_user_id),
+    ).values_list('student_id', flat=True)
+    students = User.objects.filter(id__in=list(user_ids)).order_by('id')
+    if not students:
+        return
+
+    store = modulestore()
+    with store.bulk_operations(course_key):
+        collected_structure = get_block_structure_manager(course_key).get_collected()
         course = store.get_course(course_key, depth=0)
-        subsection_grade_factory = SubsectionGradeFactory(student, course, course_structure)
-
-        for subsection_usage_key in subsections_to_update:
-            if subsection_usage_key in course_structure:
-                subsection_grade = subsection_grade_factory.update(
-                    course_structure[subsection_usage_key],
-                    only_if_higher,
-                    score_deleted,
-                    force_update_subsections,
-                )
-                SUBSECTION_SCORE_CHANGED.send(
-                    sender=None,
-                    course=course,
-                    course_structure=course_structure,
-                    user=student,
-                    subsection_grade=subsection_grade,
-                )
+        scores_clients = ScoresClient.create_for_users(
+            course_key,
+            [student.id for student in students],
+            [block_key for block_key in collected_structure if possibly_scored(block_key)],
+        )
+        for student in students:
+            course_structure = get_course_blocks(
+                student,
+                collected_structure.root_block_usage_key,
+                collected_block_structure=collected_structure,
+            )
+            _update_subsection_grades_in_structure(
+                student,
+                course,
+                course_structure,
+                scored_block_usage_key,
+                SubsectionGradeFactory(student, course, course_structure, csm_scores=scores_clients[student.id]),
+                only_if_higher,
+                score_deleted,
+            )
+
+
+def _update_subsection_grades_in_structure(
+        student, course, course_structure, scored_block_usage_key, subsection_grade_factory,
+        only_if_higher, score_deleted, force_update_subsections=False
+):
+    """
+    Updates the student's grades of the subsections of the course structure
+    which contain the given block, and signals that they were updated.
+    """
+    subsections_to_update = course_structure.get_transformer_block_field(
+        scored_block_usage_key,
+        GradesTransformer,
+        'subsections',
+        set(),
+    )
+    for subsection_usage_key in subsections_to_update:
+        if subsection_usage_key in course_structure:
+            subsection_grade = subsection_grade_factory.update(
+                course_structure[subsection_usage_key],
+                only_if_higher,
+                score_deleted,
+                force_update_subsections,
+            )
+            SUBSECTION_SCORE_CHANGED.send(
+                sender=None,
+                course=course,
+                course_structure=course_structure,
+                user=student,
+                subsection_grade=subsection_grade,
+            )
 
 
 def _course_task_args(course_key, **kwargs):
     """
     Helper function to generate course-grade task args.
+
+    Yields a (course_key, min_user_id, max_user_id, batch_size) tuple for each
+    range of user ids with at most batch_size enrolled students.
     """
     from_settings = kwargs.pop('from_settings', True)
-    enrollment_count = CourseEnrollment.objects.filter(course_id=course_key).count()
-    if enrollment_count == 0:
-        log.warning(u"No enrollments found for {}".format(course_key))
-
     if from_settings is False:
         batch_size = kwargs.pop('batch_size', 100)
     else:
         batch_size = ComputeGradesSetting.current().batch_size
 
-    for offset in six.moves.range(0, enrollment_count, batch_size):
-        yield (six.text_type(course_key), offset, batch_size)
+    has_enrollments = False
+    for min_user_id, max_user_id in _enrolled_user_id_ranges(course_key, batch_size):
+        has_enrollments = True
+        yield (six.text_type(course_key), min_user_id, max_user_id, batch_size)
+    if not has_enrollments:
+        log.warning(u"No enrollments found for {}".format(course_key))
+
+
+def _enrolled_user_id_ranges(course_key, batch_size):
+    """
+    Yields (min_user_id, max_user_id) tuples for consecutive ranges of the
+    user ids of the students enrolled in the course, each with at most
+    batch_size students.
+
+    The ranges are found by seeking past the last user id of the previous
+    range, rather than by offset, so that each query only reads the rows of
+    its own range.
+    """
+    enrolled_user_ids = CourseEnrollment.objects.filter(course_id=course_key).order_by('user_id').values_list(
+        'user_id', flat=True
+    )
+    last_user_id = None
+    while True:
+        user_ids = enrolled_user_ids
+        if last_user_id is not None:
+            user_ids = user_ids.filter(user_id__gt=last_user_id)
+        user_ids = list(user_ids[:batch_size])
+        if not user_ids:
+            return
+        yield user_ids[0], user_ids[-1]
+        last_user_id = user_ids[-1]
+
+
+def _enrolled_students(course_key, min_user_id, max_user_id):
+    """
+    Returns an iterator over the students enrolled in the course with user ids
+    from min_user_id to max_user_id.
+    """
+    enrollments = CourseEnrollment.objects.filter(
+        course_id=course_key,
+        user_id__gte=min_user_id,
+        user_id__lte=max_user_id,
+    ).select_related('user').order_by('user_id')
+    return (enrollment.user for enrollment in enrollments)
@@ -0,0 +1,109 @@
+"""
+Tests for the BulkCourseGrades class.
+"""
+
+
+import ddt
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from edx_toggles.toggles.testutils import override_waffle_switch
+
+from common.djangoapps.student.tests.factories import UserFactory
+
+from ..bulk_course_grade import BulkCourseGrade, BulkCourseGrades
+from ..config.waffle import ASSUME_ZERO_GRADE_IF_ABSENT, waffle_switch
+from ..course_grade_factory import CourseGradeFactory
+from ..models import PersistentSubsectionGrade, PersistentSubsectionGradeOverride
+from .base import GradeTestBase
+from .utils import mock_get_score
+
+
+@ddt.ddt
+class TestBulkCourseGrades(GradeTestBase):
+    """
+    Tests that BulkCourseGrades reads the same grades as the CourseGradeFactory.
+    """
+    def setUp(self):
+        super(TestBulkCourseGrades, self).setUp()
+        self.user = self.request.user
+        self.ungraded_user = UserFactory()
+        self.subsection_keys = [self.sequence.location, self.sequence2.location]
+        with mock_get_score(1, 2):
+            CourseGradeFactory().update(self.user, self.course)
+
+    def _bulk_grades(self):
+        return BulkCourseGrades(self.course.id, [self.ungraded_user, self.user], self.subsection_keys)
+
+    def test_matches_course_grade(self):
+        bulk_grades = self._bulk_grades()
+        course_grade = CourseGradeFactory().read(self.user, self.course)
+
+        self.assertEqual(bulk_grades.users, [self.user])
+        self.assertEqual(bulk_grades.ungraded_users, [self.ungraded_user])
+        self.assertEqual(
+            bulk_grades.course_grades[self.user.id],
+            BulkCourseGrade(course_grade.percent, course_grade.letter_grade, course_grade.attempted),
+        )
+
+        row = bulk_grades.row(self.user)
+        for subsection_key in self.subsection_keys:
+            subsection_grade = course_grade.subsection_grade(subsection_key)
+            column = bulk_grades.column(subsection_key)
+            self.assertEqual(bulk_grades.percent_graded[row, column], subsection_grade.percent_graded)
+            self.assertEqual(bulk_grades.attempted[row, column], subsection_grade.attempted_graded)
+            self.assertFalse(bulk_grades.overridden[row, column])
+        self.assertEqual(bulk_grades.course_attempted.tolist(), [True])
+
+    def test_override(self):
+        grade_model = PersistentSubsectionGrade.read_grade(self.user.id, self.sequence2.location)
+        PersistentSubsectionGradeOverride.update_or_create_override(
+            self.user,
+            grade_model,
+            earned_graded_override=2.0,
+        )
+        bulk_grades = self._bulk_grades()
+        row, column = bulk_grades.row(self.user), bulk_grades.column(self.sequence2.location)
+        self.assertTrue(bulk_grades.overridden[row, column])
+        self.assertEqual(bulk_grades.percent_graded[row, column], 1.0)
+
+    @ddt.data(True, False)
+    def test_assume_zero_if_absent(self, assume_zero_enabled):
+        with override_waffle_switch(waffle_switch(ASSUME_ZERO_GRADE_IF_ABSENT), active=assume_zero_enabled):
+            bulk_grades = self._bulk_grades()
+
+        if assume_zero_enabled:
+            self.assertEqual(bulk_grades.users, [self.ungraded_user, self.user])
+            self.assertEqual(bulk_grades.ungraded_users, [])
+            self.assertEqual(bulk_grades.course_grades[self.ungraded_user.id], BulkCourseGrade(0.0, None, False))
+            self.assertFalse(bulk_grades.attempted[bulk_grades.row(self.ungraded_user)].any())
+        else:
+            self.assertEqual(bulk_grades.ungraded_users, [self.ungraded_user])
+            self.assertNotIn(self.ungraded_user.id, bulk_grades.course_grades)
+
+    @ddt.data(True, False)
+    def test_missing_subsection_grade(self, assume_zero_enabled):
+        PersistentSubsectionGrade.objects.filter(user_id=self.user.id, usage_key=self.sequence2.location).delete()
+        with override_waffle_switch(waffle_switch(ASSUME_ZERO_GRADE_IF_ABSENT), active=assume_zero_enabled):
+            bulk_grades = self._bulk_grades()
+
+        if assume_zero_enabled:
+            self.assertIn(self.user, bulk_grades.users)
+            row, column = bulk_grades.row(self.user), bulk_grades.column(self.sequence2.location)
+            self.assertEqual(bulk_grades.percent_graded[row, column], 0.0)
+            self.assertFalse(bulk_grades.attempted[row, column])
+        else:
+            # The missing grade is computed by the CourseGradeFactory instead.
+            self.assertEqual(bulk_grades.users, [])
+            self.assertEqual(bulk_grades.ungraded_users, [self.ungraded_user, self.user])
+            self.assertNotIn(self.user.id, bulk_grades.course_grades)
+            self.assertEqual(bulk_grades.earned.shape, (0, len(self.subsection_keys)))
+
+    def test_query_count_per_batch(self):
+        self._bulk_grades()
+        with CaptureQueriesContext(connection) as queries:
+            self._bulk_grades()
+
+        # The grades of more users are read with the same queries.
+        more_users = [self.ungraded_user, self.user] + [UserFactory() for _ in range(3)]
+        with self.assertNumQueries(len(queries.captured_queries)):
+            BulkCourseGrades(self.course.id, more_users, self.subsection_keys)
@@ -24,6 +24,8 @@ from lms.djangoapps.grades.config.waffle import ENFORCE_FREEZE_GRADE_AFTER_COURS
 from lms.djangoapps.grades.constants import ScoreDatabaseTableEnum
 from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsectionGrade
 from lms.djangoapps.grades.services import GradesService
+from lms.djangoapps.courseware.model_data import set_score
+from lms.djangoapps.grades.signals.handlers import defer_subsection_updates
 from lms.djangoapps.grades.signals.signals import PROBLEM_WEIGHTED_SCORE_CHANGED
 from lms.djangoapps.grades.tasks import (
     RECALCULATE_GRADE_DELAY_SECONDS,
@@ -31,7 +33,8 @@ from lms.djangoapps.grades.tasks import (
     compute_all_grades_for_course,
     compute_grades_for_course,
     compute_grades_for_course_v2,
-    recalculate_subsection_grade_v3
+    recalculate_subsection_grade_v3,
+    recalculate_subsection_grades_for_users
 )
 from openedx.core.djangoapps.content.block_structure.exceptions import BlockStructureNotFound
 from common.djangoapps.student.models import CourseEnrollment, anonymous_id_for_user
@@ -402,6 +405,103 @@ class RecalculateSubsectionGradeTest(HasCourseWithProblemsMixin, ModuleStoreTest
         self.assertFalse(mock_retry.called)
 
 
+@patch.dict(settings.FEATURES, {'PERSISTENT_GRADES_ENABLED_FOR_ALL_TESTS': False})
+class RecalculateSubsectionGradesForUsersTest(HasCourseWithProblemsMixin, ModuleStoreTestCase):
+    """
+    Test recalculate_subsection_grades_for_users task, and the deferral of the
+    subsection updates which queues it.
+    """
+    ENABLED_SIGNALS = ['course_published', 'pre_publish']
+
+    def setUp(self):
+        super(RecalculateSubsectionGradesForUsersTest, self).setUp()
+        PersistentGradesEnabledFlag.objects.create(enabled_for_all_courses=True, enabled=True)
+        self.users = [UserFactory.create() for _ in range(4)]
+        self.user = self.users[0]
+        self.set_up_course()
+        # The last user has no state for the problem.
+        for user in self.users[:3]:
+            CourseEnrollment.enroll(user, self.course.id)
+            set_score(user.id, self.problem.location, 1, 2)
+
+    def _task_kwargs(self, min_user_id, max_user_id):
+        return dict(
+            course_id=six.text_type(self.course.id),
+            usage_id=six.text_type(self.problem.location),
+            min_user_id=min_user_id,
+            max_user_id=max_user_id,
+            only_if_higher=False,
+            score_deleted=False,
+            event_transaction_id=six.text_type(get_event_transaction_id()),
+            event_transaction_type=u'edx.grades.problem.rescored',
+        )
+
+    @patch('lms.djangoapps.grades.signals.signals.SUBSECTION_SCORE_CHANGED.send')
+    def test_updates_users_in_range(self, mock_subsection_signal):
+        with mock_get_score(1, 2) as mock_score:
+            recalculate_subsection_grades_for_users.apply(
+                kwargs=self._task_kwargs(self.users[1].id, self.users[3].id)
+            )
+        graded_user_ids = set(
+            PersistentSubsectionGrade.objects.filter(course_id=self.course.id).values_list('user_id', flat=True)
+        )
+        self.assertEqual(graded_user_ids, {self.users[1].id, self.users[2].id})
+        self.assertEqual(mock_subsection_signal.call_count, 2)
+
+        # The scores of all of the users were read at once.
+        csm_scores = {call_args[0][1] for call_args in mock_score.call_args_list}
+        self.assertEqual({scores.user_id for scores in csm_scores}, {self.users[1].id, self.users[2].id})
+        for scores in csm_scores:
+            self.assertIn(self.problem.location, scores)
+
+    def test_deferred_subsection_updates(self):
+        score_changed_kwargs = self.problem_weighted_score_changed_kwargs.copy()
+        with patch('lms.djangoapps.grades.tasks.recalculate_subsection_grade_v3.apply_async') as mock_task_apply:
+            with patch(
+                'lms.djangoapps.grades.tasks.recalculate_subsection_grades_for_users.apply_async'
+            ) as mock_bulk_task_apply:
+                with defer_subsection_updates(self.course.id):
+                    for user in self.users[:3]:
+                        score_changed_kwargs['user_id'] = user.id
+                        PROBLEM_WEIGHTED_SCORE_CHANGED.send(sender=None, **score_changed_kwargs)
+
+                    # Score changes saved elsewhere are updated as usual.
+                    score_changed_kwargs['score_db_table'] = ScoreDatabaseTableEnum.submissions
+                    PROBLEM_WEIGHTED_SCORE_CHANGED.send(sender=None, **score_changed_kwargs)
+
+                    self.assertEqual(mock_task_apply.call_count, 1)
+                    self.assertFalse(mock_bulk_task_apply.called)
+
+        mock_bulk_task_apply.assert_called_once()
+        task_kwargs = mock_bulk_task_apply.call_args[1]['kwargs']
+        self.assertEqual(task_kwargs['usage_id'], six.text_type(self.problem.location))
+        self.assertEqual(task_kwargs['min_user_id'], self.users[0].id)
+        self.assertEqual(task_kwargs['max_user_id'], self.users[2].id)
+
+    def test_deferred_subsection_updates_batches(self):
+        score_changed_kwargs = self.problem_weighted_score_changed_kwargs.copy()
+        with patch('lms.djangoapps.grades.signals.handlers.RECALCULATE_GRADES_FOR_USERS_BATCH_SIZE', 2):
+            with patch(
+                'lms.djangoapps.grades.tasks.recalculate_subsection_grades_for_users.apply_async'
+            ) as mock_bulk_task_apply:
+                with defer_subsection_updates(self.course.id):
+                    for user in self.users:
+                        score_changed_kwargs['user_id'] = user.id
+                        PROBLEM_WEIGHTED_SCORE_CHANGED.send(sender=None, **score_changed_kwargs)
+
+                    # A full batch is queued once the next user is collected.
+                    self.assertEqual(mock_bulk_task_apply.call_count, 1)
+
+        self.assertEqual(mock_bulk_task_apply.call_count, 2)
+        self.assertEqual(
+            [
+                (call_args[1]['kwargs']['min_user_id'], call_args[1]['kwargs']['max_user_id'])
+                for call_args in mock_bulk_task_apply.call_args_list
+            ],
+            [(self.users[0].id, self.users[1].id), (self.users[2].id, self.users[3].id)],
+        )
+
+
 @ddt.ddt
 class ComputeGradesForCourseTest(HasCourseWithProblemsMixin, ModuleStoreTestCase):
     """
@@ -435,16 +535,36 @@ class ComputeGradesForCourseTest(HasCourseWithProblemsMixin, ModuleStoreTestCase
             min(batch_size, 8)  # No more than 8 due to offset
         )
 
+    @ddt.data(*range(1, 8, 3))
+    def test_behavior_with_user_id_range(self, batch_size):
+        with mock_get_score(1, 2):
+            result = compute_grades_for_course_v2.delay(
+                course_key=six.text_type(self.course.id),
+                batch_size=batch_size,
+                min_user_id=self.users[4].id,
+                max_user_id=self.users[4 + batch_size - 1].id,
+            )
+        self.assertTrue(result.successful)
+        self.assertEqual(
+            set(PersistentCourseGrade.objects.filter(course_id=self.course.id).values_list('user_id', flat=True)),
+            set(user.id for user in self.users[4:4 + batch_size])
+        )
+
     @ddt.data(*range(1, 12, 3))
     def test_course_task_args(self, test_batch_size):
-        offset_expected = 0
-        for course_key, offset, batch_size in _course_task_args(
+        user_ids = sorted(user.id for user in self.users)
+        expected_ranges = [
+            (user_ids[index], user_ids[min(index + test_batch_size, len(user_ids)) - 1])
+            for index in range(0, len(user_ids), test_batch_size)
+        ]
+        ranges = []
+        for course_key, min_user_id, max_user_id, batch_size in _course_task_args(
             batch_size=test_batch_size, course_key=self.course.id, from_settings=False
         ):
             self.assertEqual(course_key, six.text_type(self.course.id))
             self.assertEqual(batch_size, test_batch_size)
-            self.assertEqual(offset, offset_expected)
-            offset_expected += test_batch_size
+            ranges.append((min_user_id, max_user_id))
+        self.assertEqual(ranges, expected_ranges)
 
 
 class RecalculateGradesForUserTest(HasCourseWithProblemsMixin, ModuleStoreTestCase):
@@ -12,6 +12,18 @@ WAFFLE_SWITCHES = WaffleSwitchNamespace(name=WAFFLE_NAMESPACE)
 
 # Waffle switches
 OPTIMIZE_GET_LEARNERS_FOR_COURSE = 'optimize_get_learners_for_course'
+# .. toggle_name: instructor_task.use_bulk_course_grades
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: When enabled, course grade reports read the persisted grades of each batch of learners into
+#   arrays and compute the report's grade columns for the whole batch at once, instead of building CourseGrade objects
+#   one learner at a time. Learners without a persisted course grade are still graded one at a time.
+# .. toggle_use_cases: temporary
+# .. toggle_creation_date: 2026-10-18
+# .. toggle_target_removal_date: None
+# .. toggle_warnings: Only has an effect in courses with persistent grades enabled.
+# .. toggle_tickets: None
+USE_BULK_COURSE_GRADES = 'use_bulk_course_grades'
 
 # Course override flags
 GENERATE_PROBLEM_GRADE_REPORT_VERIFIED_ONLY = 'generate_problem_grade_report_verified_only'
@@ -43,6 +55,13 @@ def optimize_get_learners_switch_enabled():
     return WAFFLE_SWITCHES.is_enabled(OPTIMIZE_GET_LEARNERS_FOR_COURSE)
 
 
+def use_bulk_course_grades_switch_enabled():
+    """
+    Returns True if course grade reports should compute grades in bulk, otherwise False.
+    """
+    return WAFFLE_SWITCHES.is_enabled(USE_BULK_COURSE_GRADES)
+
+
 def problem_grade_report_verified_only(course_id):
     """
     Returns True if problem grade reports should only
@@ -20,13 +20,14 @@ import hashlib
 import json
 import logging
 import os.path
+import tempfile
 from uuid import uuid4
 
 import six
 from boto.exception import BotoServerError
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.files.base import ContentFile
+from django.core.files.base import ContentFile, File
 from django.db import models, transaction
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext as _
@@ -196,9 +197,8 @@ class InstructorTask(models.Model):
 class ReportStore(object):
     """
     Simple abstraction layer that can fetch and store CSV files for reports
-    download. Should probably refactor later to create a ReportFile object that
-    can simply be appended to for the sake of memory efficiency, rather than
-    passing in the whole dataset. Doing that for now just because it's simpler.
+    download. Large reports should be appended to a CsvReportFile batch by
+    batch, rather than passing in the whole dataset.
     """
     @classmethod
     def from_config(cls, config_name):
@@ -236,11 +236,71 @@ class ReportStore(object):
         new list of rows with those strings encoded as utf-8 for CSV
         compatibility.
         """
-        for row in rows:
-            if six.PY2:
-                yield [six.text_type(item).encode('utf-8') for item in row]
-            else:
-                yield [six.text_type(item) for item in row]
+        return _get_utf8_encoded_rows(rows)
+
+
+class CsvReportFile(object):
+    """
+    A CSV report that is written to a spooled temporary file as its rows
+    are added, so that a report can be built up batch by batch and stored
+    without ever holding all of its rows in memory.  The file is kept in
+    memory until it grows beyond max_memory_size bytes, and is then
+    rolled over to disk.
+
+    Usable as a context manager, which closes the file on exit.
+    """
+    MAX_MEMORY_SIZE = 5 * 1024 * 1024
+
+    def __init__(self, max_memory_size=MAX_MEMORY_SIZE):
+        self.file = tempfile.SpooledTemporaryFile(max_size=max_memory_size)
+        self.num_rows = 0
+        if six.PY2:
+            # Adding unicode signature (BOM) for MS Excel 2013 compatibility
+            self.file.write(codecs.BOM_UTF8)
+            self._csvwriter = csv.writer(self.file)
+        else:
+            self._csvwriter = csv.writer(_Utf8FileWriter(self.file))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def writerows(self, rows):
+        """
+        Appends the given rows (each row is an iterable of strings) to
+        the report.
+        """
+        for row in _get_utf8_encoded_rows(rows):
+            self._csvwriter.writerow(row)
+            self.num_rows += 1
+
+    def close(self):
+        self.file.close()
+
+
+class _Utf8FileWriter(object):
+    """
+    Encodes the strings written by a csv writer as utf-8, for a binary file.
+    """
+    def __init__(self, binary_file):
+        self._file = binary_file
+
+    def write(self, data):
+        return self._file.write(data.encode('utf-8'))
+
+
+def _get_utf8_encoded_rows(rows):
+    """
+    Given an iterable of `rows` containing unicode strings, yield rows
+    with those strings encoded as utf-8 for CSV compatibility.
+    """
+    for row in rows:
+        if six.PY2:
+            yield [six.text_type(item).encode('utf-8') for item in row]
+        else:
+            yield [six.text_type(item) for item in row]
 
 
 class DjangoStorageReportStore(ReportStore):
@@ -295,15 +355,22 @@ class DjangoStorageReportStore(ReportStore):
         """
         Given a course_id, filename, and rows (each row is an iterable of
         strings), write the rows to the storage backend in csv format.
+        `rows` may be a generator, in which case the rows are written as
+        they are generated.
         """
-        output_buffer = ContentFile('')
-        # Adding unicode signature (BOM) for MS Excel 2013 compatibility
-        if six.PY2:
-            output_buffer.write(codecs.BOM_UTF8)
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        output_buffer.seek(0)
-        self.store(course_id, filename, output_buffer)
+        with CsvReportFile() as report_file:
+            report_file.writerows(rows)
+            self.store_report_file(course_id, filename, report_file)
+
+    def store_report_file(self, course_id, filename, report_file):
+        """
+        Store the contents of the given CsvReportFile in a directory
+        determined by hashing `course_id`, and name the file `filename`.
+        Unlike `store`, the contents are passed to the storage backend
+        as a file, without first being read into memory.
+        """
+        report_file.file.seek(0)
+        self.storage.save(self.path_to(course_id, filename), File(report_file.file))
 
     def links_for(self, course_id):
         """
@@ -9,6 +9,7 @@ from itertools import chain
 from time import time
 
 import re
+import numpy
 import six
 from lms.djangoapps.course_blocks.api import get_course_blocks
 from django.conf import settings
@@ -24,9 +25,11 @@ from lms.djangoapps.certificates.models import CertificateWhitelist, GeneratedCe
 from lms.djangoapps.courseware.courses import get_course_by_id
 from lms.djangoapps.courseware.user_state_client import DjangoXBlockUserStateClient
 from lms.djangoapps.grades.api import (
+    BulkCourseGrades,
     CourseGradeFactory,
     context as grades_context,
     prefetch_course_and_subsection_grades,
+    prefetch_course_grades,
 )
 from lms.djangoapps.instructor_analytics.basic import list_problem_responses
 from lms.djangoapps.instructor_analytics.csvs import format_dictlist
@@ -34,7 +37,9 @@ from lms.djangoapps.instructor_task.config.waffle import (
     course_grade_report_verified_only,
     optimize_get_learners_switch_enabled,
     problem_grade_report_verified_only,
+    use_bulk_course_grades_switch_enabled,
 )
+from lms.djangoapps.instructor_task.models import CsvReportFile
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.services import IDVerificationService
 from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
@@ -47,7 +52,7 @@ from xmodule.modulestore.django import modulestore
 from xmodule.partitions.partitions_service import PartitionService
 from xmodule.split_test_module import get_split_user_partitions
 from .runner import TaskProgress
-from .utils import upload_csv_to_report_store
+from .utils import upload_csv_file_to_report_store, upload_csv_to_report_store
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
@@ -71,6 +76,27 @@ def _flatten(iterable):
     return list(chain.from_iterable(iterable))
 
 
+def _write_batched_rows(context, batched_rows, success_file, error_file):
+    """
+    Writes each of the given batches of (success_rows, error_rows) to the
+    given report files as it is generated, so that the rows of the whole
+    report are never held in memory at once, and updates the task's
+    progress.
+    """
+    succeeded, failed = 0, 0
+    for success_rows, error_rows in batched_rows:
+        success_file.writerows(success_rows)
+        error_file.writerows(error_rows)
+        succeeded += len(success_rows)
+        failed += len(error_rows)
+
+    # update metrics on task status
+    context.task_progress.succeeded = succeeded
+    context.task_progress.failed = failed
+    context.task_progress.attempted = succeeded + failed
+    context.task_progress.total = context.task_progress.attempted
+
+
 class GradeReportBase(object):
     """
     Base class for grade reports (ProblemGradeReport and CourseGradeReport).
@@ -165,31 +191,21 @@ class GradeReportBase(object):
         course_id = context.course_id
         return get_enrolled_learners_for_course(course_id=course_id, verified_only=context.report_for_verified_only)
 
-    def _compile(self, context, batched_rows):
+    def _compile(self, context, batched_rows, success_file, error_file):
         """
-        Compiles and returns the complete list of (success_rows, error_rows) for
-        the given batched_rows and context.
+        Writes the given batched_rows to the given success and error
+        report files, as each batch is computed.
         """
-        # partition and chain successes and errors
-        success_rows, error_rows = zip(*batched_rows)
-        success_rows = list(chain(*success_rows))
-        error_rows = list(chain(*error_rows))
-
-        # update metrics on task status
-        context.task_progress.succeeded = len(success_rows)
-        context.task_progress.failed = len(error_rows)
-        context.task_progress.attempted = context.task_progress.succeeded + context.task_progress.failed
-        context.task_progress.total = context.task_progress.attempted
-        return success_rows, error_rows
+        _write_batched_rows(context, batched_rows, success_file, error_file)
 
-    def _upload(self, context, success_rows, error_rows):
+    def _upload(self, context, success_file, error_file):
         """
-        Creates and uploads a CSV for the given headers and rows.
+        Uploads the given success and error report files.
         """
         date = datetime.now(UTC)
-        upload_csv_to_report_store(success_rows, context.file_name, context.course_id, date)
-        if len(error_rows) > 1:
-            upload_csv_to_report_store(error_rows, context.file_name + '_err', context.course_id, date)
+        upload_csv_file_to_report_store(success_file, context.file_name, context.course_id, date)
+        if error_file.num_rows > 1:
+            upload_csv_file_to_report_store(error_file, context.file_name + '_err', context.course_id, date)
 
     def log_additional_info_for_testing(self, context, message):
         """
@@ -245,6 +261,10 @@ class _CourseGradeReportContext(object):
     def cohorts_enabled(self):
         return is_course_cohorted(self.course_id)
 
+    @lazy
+    def use_bulk_course_grades(self):
+        return use_bulk_course_grades_switch_enabled() and BulkCourseGrades.is_enabled(self.course_id)
+
     @lazy
     def graded_assignments(self):
         """
@@ -391,13 +411,16 @@ class _EnrollmentBulkContext(object):
 
 
 class _CourseGradeBulkContext(object):
-    def __init__(self, context, users):
+    def __init__(self, context, users, prefetch_subsection_grades=True):
         self.certs = _CertificateBulkContext(context, users)
         self.teams = _TeamBulkContext(context, users)
         self.enrollments = _EnrollmentBulkContext(context, users)
         bulk_cache_cohorts(context.course_id, users)
         BulkRoleCache.prefetch(users)
-        prefetch_course_and_subsection_grades(context.course_id, users)
+        if prefetch_subsection_grades:
+            prefetch_course_and_subsection_grades(context.course_id, users)
+        else:
+            prefetch_course_grades(context.course_id, users)
         BulkCourseTags.prefetch(context.course_id, users)
 
 
@@ -426,11 +449,15 @@ class CourseGradeReport(object):
         error_headers = self._error_headers()
         batched_rows = self._batched_rows(context)
 
-        context.update_status(u'Compiling grades')
-        success_rows, error_rows = self._compile(context, batched_rows)
+        with CsvReportFile() as success_file, CsvReportFile() as error_file:
+            success_file.writerows([success_headers])
+            error_file.writerows([error_headers])
+
+            context.update_status(u'Compiling grades')
+            self._compile(context, batched_rows, success_file, error_file)
 
-        context.update_status(u'Uploading grades')
-        self._upload(context, success_headers, success_rows, error_headers, error_rows)
+            context.update_status(u'Uploading grades')
+            self._upload(context, success_file, error_file)
 
         return context.update_status(u'Completed grades')
 
@@ -463,32 +490,21 @@ class CourseGradeReport(object):
             users = [u for u in users if u is not None]
             yield self._rows_for_users(context, users)
 
-    def _compile(self, context, batched_rows):
+    def _compile(self, context, batched_rows, success_file, error_file):
         """
-        Compiles and returns the complete list of (success_rows, error_rows) for
-        the given batched_rows and context.
+        Writes the given batched_rows to the given success and error
+        report files, as each batch is computed.
         """
-        # partition and chain successes and errors
-        success_rows, error_rows = zip(*batched_rows)
-        success_rows = list(chain(*success_rows))
-        error_rows = list(chain(*error_rows))
+        _write_batched_rows(context, batched_rows, success_file, error_file)
 
-        # update metrics on task status
-        context.task_progress.succeeded = len(success_rows)
-        context.task_progress.failed = len(error_rows)
-        context.task_progress.attempted = context.task_progress.succeeded + context.task_progress.failed
-        context.task_progress.total = context.task_progress.attempted
-        return success_rows, error_rows
-
-    def _upload(self, context, success_headers, success_rows, error_headers, error_rows):
+    def _upload(self, context, success_file, error_file):
         """
-        Creates and uploads a CSV for the given headers and rows.
+        Uploads the given success and error report files.
         """
         date = datetime.now(UTC)
-        upload_csv_to_report_store([success_headers] + success_rows, 'grade_report', context.course_id, date)
-        if len(error_rows) > 0:
-            error_rows = [error_headers] + error_rows
-            upload_csv_to_report_store(error_rows, 'grade_report_err', context.course_id, date)
+        upload_csv_file_to_report_store(success_file, 'grade_report', context.course_id, date)
+        if error_file.num_rows > 1:
+            upload_csv_file_to_report_store(error_file, 'grade_report_err', context.course_id, date)
 
     def _grades_header(self, context):
         """
@@ -604,6 +620,37 @@ class CourseGradeReport(object):
             subsection_grades.append(subsection_grade)
         return subsection_grades, grade_results
 
+    def _bulk_user_grades(self, bulk_grades, context):
+        """
+        Returns a list, ordered as the rows of the given bulk_grades, of
+        the grade results of each user corresponding to the headers for
+        this report.  Equivalent to calling _user_grades for each user.
+        """
+        percents = bulk_grades.percent_graded
+        has_grade = bulk_grades.attempted | bulk_grades.overridden
+        course_attempted = bulk_grades.course_attempted
+
+        grade_columns = [[bulk_grades.course_grades[user.id].percent for user in bulk_grades.users]]
+        for assignment_info in six.itervalues(context.graded_assignments):
+            columns = [bulk_grades.column(location) for location in assignment_info['subsection_headers']]
+            for column in columns:
+                subsection_results = zip(percents[:, column].tolist(), has_grade[:, column].tolist())
+                grade_columns.append([
+                    percent if subsection_has_grade else u'Not Attempted'
+                    for percent, subsection_has_grade in subsection_results
+                ])
+
+            grader = assignment_info['grader']
+            if assignment_info['separate_subsection_avg_headers'] and grader:
+                if len(columns) > grader.drop_count:
+                    averages = grader.bulk_total_with_drops(percents[:, columns])
+                    grade_columns.append(numpy.where(course_attempted, averages, 0.0).tolist())
+                else:
+                    # total_with_drops returns an int when all of the subsections are dropped.
+                    grade_columns.append([0 if attempted else 0.0 for attempted in course_attempted.tolist()])
+
+        return [list(user_grades) for user_grades in zip(*grade_columns)]
+
     def _user_assignment_average(self, course_grade, subsection_grades, assignment_info):
         if assignment_info['separate_subsection_avg_headers']:
             if assignment_info['grader']:
@@ -679,32 +726,86 @@ class CourseGradeReport(object):
         """
         Returns a list of rows for the given users for this report.
         """
+        if context.use_bulk_course_grades:
+            return self._bulk_rows_for_users(context, users)
+
         with modulestore().bulk_operations(context.course_id):
             bulk_context = _CourseGradeBulkContext(context, users)
 
             success_rows, error_rows = [], []
-            for user, course_grade, error in CourseGradeFactory().iter(
-                users,
-                course=context.course,
-                collected_block_structure=context.course_structure,
-                course_key=context.course_id,
-            ):
+            for user, course_grade, error in self._iter_course_grades(context, users):
                 if not course_grade:
                     # An empty gradeset means we failed to grade a student.
                     error_rows.append([user.id, user.username, text_type(error)])
                 else:
-                    success_rows.append(
-                        [user.id, user.email, user.username] +
-                        self._user_grades(course_grade, context) +
-                        self._user_cohort_group_names(user, context) +
-                        self._user_experiment_group_names(user, context) +
-                        self._user_team_names(user, bulk_context.teams) +
-                        self._user_verification_mode(user, context, bulk_context.enrollments) +
-                        self._user_certificate_info(user, context, course_grade, bulk_context.certs) +
-                        [_user_enrollment_status(user, context.course_id)]
-                    )
+                    user_grades = self._user_grades(course_grade, context)
+                    success_rows.append(self._user_row(user, context, bulk_context, course_grade, user_grades))
+            return success_rows, error_rows
+
+    def _bulk_rows_for_users(self, context, users):
+        """
+        Returns a list of rows for the given users for this report,
+        computing the grades of all of the users with persisted grades
+        at once.
+        """
+        with modulestore().bulk_operations(context.course_id):
+            bulk_context = _CourseGradeBulkContext(context, users, prefetch_subsection_grades=False)
+            bulk_grades = BulkCourseGrades(
+                context.course_id,
+                users,
+                [
+                    location
+                    for assignment_info in six.itervalues(context.graded_assignments)
+                    for location in assignment_info['subsection_headers']
+                ],
+            )
+            bulk_user_grades = self._bulk_user_grades(bulk_grades, context)
+            ungraded_results = {
+                user.id: (course_grade, error)
+                for user, course_grade, error in self._iter_course_grades(context, bulk_grades.ungraded_users)
+            }
+
+            success_rows, error_rows = [], []
+            for user in users:
+                if user.id in ungraded_results:
+                    course_grade, error = ungraded_results[user.id]
+                    if not course_grade:
+                        error_rows.append([user.id, user.username, text_type(error)])
+                        continue
+                    user_grades = self._user_grades(course_grade, context)
+                else:
+                    course_grade = bulk_grades.course_grades[user.id]
+                    user_grades = bulk_user_grades[bulk_grades.row(user)]
+                success_rows.append(self._user_row(user, context, bulk_context, course_grade, user_grades))
             return success_rows, error_rows
 
+    def _iter_course_grades(self, context, users):
+        """
+        Returns an iterator of (user, course_grade, error) for the given users.
+        """
+        return CourseGradeFactory().iter(
+            users,
+            course=context.course,
+            collected_block_structure=context.course_structure,
+            course_key=context.course_id,
+        )
+
+    def _user_row(self, user, context, bulk_context, course_grade, user_grades):
+        """
+        Returns the row for the given user, with the given grade results,
+        for this report.
+        """
+        return (
+            [user.id, user.email, user.username] +
+            user_grades +
+            self._user_cohort_group_names(user, context) +
+            self._user_experiment_group_names(user, context) +
+            self._user_team_names(user, bulk_context.teams) +
+            self._user_verification_mode(user, context, bulk_context.enrollments) +
+            self._user_certificate_info(user, context, course_grade, bulk_context.certs) +
+            [_user_enrollment_status(user, context.course_id)]
+        )
+
 
 class ProblemGradeReport(GradeReportBase):
     """
@@ -731,10 +832,14 @@ class ProblemGradeReport(GradeReportBase):
         error_headers = self._error_headers()
         batched_rows = self._batched_rows(context)
 
-        context.update_status('ProblemGradeReport - 2: Compiling grades')
-        success_rows, error_rows = self._compile(context, batched_rows)
-        context.update_status('ProblemGradeReport - 3: Uploading grades')
-        self._upload(context, [success_headers] + success_rows, [error_headers] + error_rows)
+        with CsvReportFile() as success_file, CsvReportFile() as error_file:
+            success_file.writerows([success_headers])
+            error_file.writerows([error_headers])
+
+            context.update_status('ProblemGradeReport - 2: Compiling grades')
+            self._compile(context, batched_rows, success_file, error_file)
+            context.update_status('ProblemGradeReport - 3: Uploading grades')
+            self._upload(context, success_file, error_file)
 
         return context.update_status('ProblemGradeReport - 4: Completed problem grades')
 
@@ -18,6 +18,7 @@ from lms.djangoapps.courseware.courses import get_course_by_id, get_problems_in_
 from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache
 from lms.djangoapps.courseware.models import StudentModule
 from lms.djangoapps.courseware.module_render import get_module_for_descriptor_internal
+from lms.djangoapps.grades.api import defer_subsection_updates
 from lms.djangoapps.grades.api import events as grades_events
 from common.djangoapps.student.models import get_user_by_username_or_email
 from common.djangoapps.track.event_transaction_utils import create_new_event_transaction_id, set_event_transaction_type
@@ -89,22 +90,25 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     task_progress = TaskProgress(action_name, len(modules_to_update), start_time)
     task_progress.update_task_state()
 
-    for module_to_update in modules_to_update:
-        task_progress.attempted += 1
-        module_descriptor = problems[six.text_type(module_to_update.module_state_key)]
-        # There is no try here:  if there's an error, we let it throw, and the task will
-        # be marked as FAILED, with a stack trace.
-        update_status = update_fcn(module_descriptor, module_to_update, task_input)
-        if update_status == UPDATE_STATUS_SUCCEEDED:
-            # If the update_fcn returns true, then it performed some kind of work.
-            # Logging of failures is left to the update_fcn itself.
-            task_progress.succeeded += 1
-        elif update_status == UPDATE_STATUS_FAILED:
-            task_progress.failed += 1
-        elif update_status == UPDATE_STATUS_SKIPPED:
-            task_progress.skipped += 1
-        else:
-            raise UpdateProblemModuleStateError(u"Unexpected update_status returned: {}".format(update_status))
+    # The grades of the students whose scores change are updated in batches,
+    # once all of the student modules are updated.
+    with defer_subsection_updates(course_id):
+        for module_to_update in modules_to_update:
+            task_progress.attempted += 1
+            module_descriptor = problems[six.text_type(module_to_update.module_state_key)]
+            # There is no try here:  if there's an error, we let it throw, and the task will
+            # be marked as FAILED, with a stack trace.
+            update_status = update_fcn(module_descriptor, module_to_update, task_input)
+            if update_status == UPDATE_STATUS_SUCCEEDED:
+                # If the update_fcn returns true, then it performed some kind of work.
+                # Logging of failures is left to the update_fcn itself.
+                task_progress.succeeded += 1
+            elif update_status == UPDATE_STATUS_FAILED:
+                task_progress.failed += 1
+            elif update_status == UPDATE_STATUS_SKIPPED:
+                task_progress.skipped += 1
+            else:
+                raise UpdateProblemModuleStateError(u"Unexpected update_status returned: {}".format(update_status))
 
     return task_progress.update_task_state()
 
@@ -420,7 +424,9 @@ def _get_modules_to_update(course_id, usage_keys, student_identifier, filter_fcn
     if student:
         module_query_params['student_id'] = student.id
 
-    student_modules = StudentModule.get_state_by_params(**module_query_params)
+    # Ordered by student, so the grades of the students are updated in
+    # batches of consecutive ids.
+    student_modules = StudentModule.get_state_by_params(**module_query_params).order_by('student_id')
     if filter_fcn is not None:
         student_modules = filter_fcn(student_modules)
 
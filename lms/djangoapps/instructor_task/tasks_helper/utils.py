@@ -30,6 +30,8 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
                 [row1_colum1, row1_colum2, ...],
                 ...
             ]
+            An iterator of rows can also be given, in which case the rows
+            are written as they are generated.
         csv_name: Name of the resulting CSV
         course_id: ID of the course
 
@@ -37,17 +39,40 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
         report_name: string - Name of the generated report
     """
     report_store = ReportStore.from_config(config_name)
-    report_name = u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
-        course_prefix=course_filename_prefix_generator(course_id),
-        csv_name=csv_name,
-        timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
-    )
+    report_name = _csv_report_name(csv_name, course_id, timestamp)
 
     report_store.store_rows(course_id, report_name, rows)
     tracker_emit(csv_name)
     return report_name
 
 
+def upload_csv_file_to_report_store(report_file, csv_name, course_id, timestamp, config_name='GRADES_DOWNLOAD'):
+    """
+    Upload a CsvReportFile, whose rows were written incrementally, using
+    ReportStore.
+
+    Returns:
+        report_name: string - Name of the generated report
+    """
+    report_store = ReportStore.from_config(config_name)
+    report_name = _csv_report_name(csv_name, course_id, timestamp)
+
+    report_store.store_report_file(course_id, report_name, report_file)
+    tracker_emit(csv_name)
+    return report_name
+
+
+def _csv_report_name(csv_name, course_id, timestamp):
+    """
+    Returns the file name of the CSV report with the given name.
+    """
+    return u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
+        course_prefix=course_filename_prefix_generator(course_id),
+        csv_name=csv_name,
+        timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
+    )
+
+
 def upload_zip_to_report_store(file, zip_name, course_id, timestamp, config_name='GRADES_DOWNLOAD'):
     """
     Upload given file buffer as a zip file using ReportStore.
@@ -4,7 +4,9 @@ Tests for instructor_task/models.py.
 
 
 import copy
+import csv
 import time
+import tracemalloc
 from six import StringIO
 
 from django.conf import settings
@@ -12,7 +14,7 @@ from django.test import SimpleTestCase, TestCase, override_settings
 from opaque_keys.edx.locator import CourseLocator
 
 from common.test.utils import MockS3BotoMixin
-from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore, TASK_INPUT_LENGTH
+from lms.djangoapps.instructor_task.models import CsvReportFile, InstructorTask, ReportStore, TASK_INPUT_LENGTH
 from lms.djangoapps.instructor_task.tests.test_base import TestReportMixin
 
 
@@ -82,6 +84,63 @@ class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, SimpleTe
         return ReportStore.from_config(config_name='GRADES_DOWNLOAD')
 
 
+class CsvReportFileTestCase(TestReportMixin, SimpleTestCase):
+    """
+    Test that CSV reports are written incrementally, in constant memory.
+    """
+    NUM_SYNTHETIC_ROWS = 200000
+
+    def setUp(self):
+        super(CsvReportFileTestCase, self).setUp()
+        self.course_id = CourseLocator(org="testx", course="coursex", run="runx")
+        self.report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+
+    def _synthetic_rows(self):
+        """
+        Generates the rows of a large, synthetic grade report.
+        """
+        yield [u'Student ID', u'Email', u'Username', u'Grade', u'Homework 1: Ünicode', u'Homework (Avg)']
+        for user_id in range(self.NUM_SYNTHETIC_ROWS):
+            username = u'user_{}'.format(user_id)
+            yield [user_id, username + u'@example.com', username, 0.5, 0.75, u'Not Attempted']
+
+    def _read_report(self, filename):
+        """
+        Returns the rows of the stored report with the given filename.
+        """
+        with self.report_store.storage.open(self.report_store.path_to(self.course_id, filename), 'rb') as report:
+            return list(csv.reader(report.read().decode('utf-8').splitlines()))
+
+    def test_writerows(self):
+        with CsvReportFile() as report_file:
+            report_file.writerows([[u'header', u'Ünicode']])
+            report_file.writerows(iter([[1, 0.5], [2, None]]))
+            self.assertEqual(report_file.num_rows, 3)
+            self.report_store.store_report_file(self.course_id, 'report.csv', report_file)
+
+        self.assertEqual(
+            self._read_report('report.csv'),
+            [[u'header', u'Ünicode'], [u'1', u'0.5'], [u'2', u'None']],
+        )
+
+    def test_store_rows_memory_ceiling(self):
+        tracemalloc.start()
+        try:
+            self.report_store.store_rows(self.course_id, 'large_report.csv', self._synthetic_rows())
+            _, peak_bytes = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # The report is about 10MB; holding its rows in a list would take several times that.
+        self.assertLess(peak_bytes, CsvReportFile.MAX_MEMORY_SIZE * 2)
+        rows = self._read_report('large_report.csv')
+        self.assertEqual(len(rows), self.NUM_SYNTHETIC_ROWS + 1)
+        self.assertEqual(
+            rows[-1],
+            [u'199999', u'user_199999@example.com', u'user_199999', u'0.5', u'0.75', u'Not Attempted'],
+        )
+
+
 class DjangoStorageReportStoreLocalTestCase(ReportStoreTestMixin, TestReportMixin, SimpleTestCase):
     """
     Test the DjangoStorageReportStore implementation using the local
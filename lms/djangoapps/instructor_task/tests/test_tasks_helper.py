@@ -1699,10 +1699,12 @@ class TestGradeReport(TestReportMixin, InstructorTaskModuleTestCase):
             display_name='Empty',
         )
 
-    def test_grade_report(self):
+    @ddt.data(True, False)
+    def test_grade_report(self, use_bulk_course_grades):
         self.submit_student_answer(self.student.username, u'Problem1', ['Option 1'])
 
-        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'), \
+                override_switch('instructor_task.use_bulk_course_grades', use_bulk_course_grades):
             result = CourseGradeReport.generate(None, None, self.course.id, None, 'graded')
             self.assertDictContainsSubset(
                 {'action_name': 'graded', 'attempted': 1, 'succeeded': 1, 'failed': 0},
@@ -1724,7 +1726,8 @@ class TestGradeReport(TestReportMixin, InstructorTaskModuleTestCase):
                 ignore_other_columns=True,
             )
 
-    def test_grade_report_with_overrides(self):
+    @ddt.data(True, False)
+    def test_grade_report_with_overrides(self, use_bulk_course_grades):
         course_data = CourseData(self.student, course=self.course)
         subsection_grade = CreateSubsectionGrade(self.unattempted_section, course_data.structure, {}, {})
         grade_model = subsection_grade.update_or_create_model(self.student, force_update_subsections=True)
@@ -1739,7 +1742,8 @@ class TestGradeReport(TestReportMixin, InstructorTaskModuleTestCase):
 
         self.submit_student_answer(self.student.username, u'Problem1', ['Option 1'])
 
-        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'), \
+                override_switch('instructor_task.use_bulk_course_grades', use_bulk_course_grades):
             result = CourseGradeReport.generate(None, None, self.course.id, None, 'graded')
             self.assertDictContainsSubset(
                 {'action_name': 'graded', 'attempted': 1, 'succeeded': 1, 'failed': 0},
@@ -832,6 +832,15 @@ CACHES = {
     },
 }
 
+# .. setting_name: COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE
+# .. setting_default: 128 * 1024 * 1024
+# .. setting_description: Maximum total pickled size, in bytes, of the split modulestore course
+#     structures kept deserialized in each process, in front of the 'course_structure_cache'.
+#     Since structures are immutable, this saves the cache round trip and the deserialization
+#     of popular courses. Memory use of the cached objects is a small multiple of this size.
+#     Set to 0 to disable the process-local cache.
+COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE = 128 * 1024 * 1024
+
 ############################ OAUTH2 Provider ###################################
 OAUTH_EXPIRE_CONFIDENTIAL_CLIENT_DAYS = 365
 OAUTH_EXPIRE_PUBLIC_CLIENT_DAYS = 30
@@ -1238,6 +1247,22 @@ CONTENTSTORE = {
     'DOC_STORE_CONFIG': DOC_STORE_CONFIG
 }
 
+# .. setting_name: CONTENTSERVER_DISK_CACHE
+# .. setting_default: {'DIRECTORY': None, 'MAX_SIZE': 10 * 1024 * 1024 * 1024,
+#     'MIN_ASSET_SIZE': 1024 * 1024, 'MAX_ASSET_SIZE': 512 * 1024 * 1024}
+# .. setting_description: Local disk cache of the course assets served by the contentserver that are
+#     too large for memcached. DIRECTORY is where cached assets are kept, and may be shared by the
+#     processes of a server; the cache is disabled when it is None. MAX_SIZE is the total size, in
+#     bytes, past which the least recently served assets are removed. Only assets of MIN_ASSET_SIZE
+#     to MAX_ASSET_SIZE bytes are cached. The first Range request for an uncached asset waits for
+#     the whole asset to be copied from the contentstore, so MAX_ASSET_SIZE bounds that delay.
+CONTENTSERVER_DISK_CACHE = {
+    'DIRECTORY': None,
+    'MAX_SIZE': 10 * 1024 * 1024 * 1024,
+    'MIN_ASSET_SIZE': 1024 * 1024,
+    'MAX_ASSET_SIZE': 512 * 1024 * 1024,
+}
+
 MODULESTORE = {
     'default': {
         'ENGINE': 'xmodule.modulestore.mixed.MixedModuleStore',
@@ -1333,6 +1358,14 @@ CODE_JAIL = {
     "limit_overrides": {},
 }
 
+# .. setting_name: SAFE_EXEC_PROCESS_CACHE_MAX_SIZE
+# .. setting_default: 16 * 1024 * 1024
+# .. setting_description: Maximum total JSON-encoded size, in bytes, of the capa safe_exec results
+#     kept in each process, in front of the default cache. Since results are cached by a digest of
+#     the code, globals and random seed, this saves the cache round trip for popular problems without
+#     any invalidation. Set to 0 to disable the process-local cache.
+SAFE_EXEC_PROCESS_CACHE_MAX_SIZE = 16 * 1024 * 1024
+
 # Some courses are allowed to run unsafe code. This is a list of regexes, one
 # of them must match the course id for that course to run unsafe code.
 #
@@ -3544,6 +3577,19 @@ CREDENTIALS_PUBLIC_SERVICE_URL = 'http://localhost:8005'
 COMMENTS_SERVICE_URL = 'http://localhost:18080'
 COMMENTS_SERVICE_KEY = 'password'
 
+# .. setting_name: COMMENTS_SERVICE_POOL_SIZE
+# .. setting_default: 10
+# .. setting_description: Number of connections to the comments service kept alive by each process.
+#     Requests are made without a shared session, on a new connection each, when it is 0.
+COMMENTS_SERVICE_POOL_SIZE = 10
+
+# .. setting_name: COMMENTS_SERVICE_USER_CACHE_TIMEOUT
+# .. setting_default: 30
+# .. setting_description: Seconds that users retrieved from the comments service (e.g. the votes,
+#     subscriptions and thread counts of the requesting user) are cached for. Requests changing a
+#     user through this LMS remove it from the cache. 0 disables the cache.
+COMMENTS_SERVICE_USER_CACHE_TIMEOUT = 30
+
 # Reverification checkpoint name pattern
 CHECKPOINT_PATTERN = r'(?P<checkpoint_name>[^/]+)'
 
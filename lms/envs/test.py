@@ -127,6 +127,8 @@ MOCK_STAFF_GRADING = True
 MOCK_PEER_GRADING = True
 
 COMMENTS_SERVICE_URL = 'http://localhost:4567'
+# Tests mock requests.request for calls to the comments service.
+COMMENTS_SERVICE_POOL_SIZE = 0
 
 DJFS = {
     'type': 'osfs',
@@ -226,6 +228,12 @@ CACHES = {
     },
 }
 
+# Structures cached across tests would hide modulestore queries from query-count assertions.
+COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE = 0
+
+# Results cached across tests would outlive the per-test clearing of the default cache.
+SAFE_EXEC_PROCESS_CACHE_MAX_SIZE = 0
+
 ############################### BLOCKSTORE #####################################
 # Blockstore tests
 RUN_BLOCKSTORE_TESTS = os.environ.get('EDXAPP_RUN_BLOCKSTORE_TESTS', 'no').lower() in ('true', 'yes', '1')
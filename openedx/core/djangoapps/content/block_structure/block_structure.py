@@ -5,11 +5,18 @@ Module with family of classes for block structures.
     BlockStructureModulestoreData - responsible for xBlock data.
 
 The following internal data structures are implemented:
-    _BlockRelations - Data structure for a single block's relations.
-    _BlockData - Data structure for a single block's data.
+    _BlockKeys - Interning of usage keys to integer indices.
+    _BlockGraph - Data structure for the relations of all blocks, as
+        CSR-style int arrays.
+    _BlockDataMap - Data structure for the data of all blocks, with a
+        column of values for each xBlock field.
+    _BlockRelations - Data structure for a single block's relations, as
+        found in block structures stored before VERSION 3.
 """
 
 
+from array import array
+from collections.abc import MutableMapping
 from copy import deepcopy
 from functools import partial
 from logging import getLogger
@@ -26,11 +33,38 @@ logger = getLogger(__name__)  # pylint: disable=invalid-name
 # A dictionary key value for storing a transformer's version number.
 TRANSFORMER_VERSION_KEY = '_version'
 
+# The name under which the framework stores its own structure-wide data
+# about the collection, in place of a transformer's name, and its keys.
+COLLECTION_DATA_NAME = '_collection'
+BLOCK_VERSIONS_KEY = 'block_versions'
+XBLOCK_FIELDS_KEY = 'xblock_fields'
+
+# Type code of the int arrays of block indices.
+_INDEX_TYPECODE = 'i'
+
+
+class _Missing(object):
+    """
+    Type of the value that marks a block without a value in a field
+    column.  It's pickled by reference, so it stays a singleton.
+    """
+    def __reduce__(self):
+        return '_MISSING'
+
+    def __repr__(self):
+        return '_MISSING'
+
+
+_MISSING = _Missing()
+
 
 class _BlockRelations(object):
     """
     Data structure to encapsulate relationships for a single block,
     including its children and parents.
+
+    Only used to read block structures that were stored before
+    BlockStructureBlockData.VERSION 3.
     """
     def __init__(self):
 
@@ -43,6 +77,304 @@ class _BlockRelations(object):
         self.children = []
 
 
+class _BlockKeys(object):
+    """
+    Interns usage keys to integer indices, so the relations and data of
+    blocks can be stored in arrays indexed by block.  Indices are never
+    reused, even after a block is removed.
+    """
+    def __init__(self, keys=()):
+
+        # List of usage keys, in index order.
+        # list [UsageKey]
+        self.keys = list(keys)
+
+        # Map of a usage key to its index.
+        # dict {UsageKey: int}
+        self.indices = {usage_key: index for index, usage_key in enumerate(self.keys)}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __getstate__(self):
+        return self.keys
+
+    def __setstate__(self, keys):
+        self.__init__(keys)
+
+    def index(self, usage_key):
+        """
+        Returns the index of the given usage key, or None if it's not
+        interned.
+        """
+        return self.indices.get(usage_key)
+
+    def intern(self, usage_key):
+        """
+        Returns the index of the given usage key, interning it if needed.
+        """
+        index = self.indices.get(usage_key)
+        if index is None:
+            index = len(self.keys)
+            self.keys.append(usage_key)
+            self.indices[usage_key] = index
+        return index
+
+
+class _IndexArrays(object):
+    """
+    Rows of block indices, one for each block index, stored as
+    CSR-style (offsets, indices) int arrays.
+
+    Rows that are edited are kept as lists until the arrays are
+    compacted, so blocks can be added and removed without rebuilding
+    the arrays each time.
+    """
+    def __init__(self, offsets=None, indices=None):
+
+        # The row of block index i is indices[offsets[i]:offsets[i + 1]].
+        # array(int), array(int)
+        self.offsets = offsets if offsets is not None else array(_INDEX_TYPECODE, [0])
+        self.indices = indices if indices is not None else array(_INDEX_TYPECODE)
+
+        # Map of a block index to its row, for rows that were edited
+        # since the arrays were last compacted.
+        # dict {int: [int]}
+        self.edited_rows = {}
+
+    def __getstate__(self):
+        self.compact()
+        return self.offsets, self.indices
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def row(self, index):
+        """
+        Returns the row of the given block index.  The row must not
+        be modified.
+        """
+        row = self.edited_rows.get(index)
+        if row is not None:
+            return row
+        if index + 1 < len(self.offsets):
+            return self.indices[self.offsets[index]:self.offsets[index + 1]]
+        return ()
+
+    def edit_row(self, index):
+        """
+        Returns the row of the given block index as a list that can
+        be modified in place.
+        """
+        row = self.edited_rows.get(index)
+        if row is None:
+            row = list(self.row(index))
+            self.edited_rows[index] = row
+        return row
+
+    def compact(self):
+        """
+        Merges the edited rows into the arrays.
+        """
+        if not self.edited_rows:
+            return
+        num_rows = max(len(self.offsets) - 1, max(self.edited_rows) + 1)
+        offsets = array(_INDEX_TYPECODE, [0])
+        indices = array(_INDEX_TYPECODE)
+        for index in six.moves.range(num_rows):
+            indices.extend(self.row(index))
+            offsets.append(len(indices))
+        self.offsets, self.indices, self.edited_rows = offsets, indices, {}
+
+
+class _BlockGraph(object):
+    """
+    Data structure for the existence of blocks and their relations,
+    by block index.
+    """
+    def __init__(self, block_keys=None, present=None, children=None, parents=None):
+
+        # Interned usage keys of the blocks.
+        # _BlockKeys
+        self.block_keys = block_keys if block_keys is not None else _BlockKeys()
+
+        # Whether the block of each index is in the structure.
+        # bytearray
+        self.present = present if present is not None else bytearray(len(self.block_keys))
+
+        # Number of blocks in the structure.
+        # int
+        self.size = self.present.count(1)
+
+        # Indices of each block's children and of its parents.
+        # _IndexArrays
+        self.children = children if children is not None else _IndexArrays()
+        self.parents = parents if parents is not None else _IndexArrays()
+
+    @classmethod
+    def from_block_relations(cls, block_relations):
+        """
+        Returns a new graph with the relations of the given map of a
+        block's usage key to its _BlockRelations.
+        """
+        graph = cls()
+        for usage_key in block_relations:
+            graph.add_block(usage_key)
+        for usage_key, relations in six.iteritems(block_relations):
+            index = graph.block_keys.index(usage_key)
+            graph.children.edit_row(index).extend(graph.add_block(child) for child in relations.children)
+            graph.parents.edit_row(index).extend(graph.add_block(parent) for parent in relations.parents)
+        graph.children.compact()
+        graph.parents.compact()
+        return graph
+
+    def __getstate__(self):
+        return self.block_keys, self.present, self.children, self.parents
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def __contains__(self, usage_key):
+        return self.index(usage_key) is not None
+
+    def __iter__(self):
+        keys = self.block_keys.keys
+        return (keys[index] for index, present in enumerate(self.present) if present)
+
+    def __len__(self):
+        return self.size
+
+    def index(self, usage_key):
+        """
+        Returns the index of the block with the given usage key, or
+        None if it's not in the structure.
+        """
+        index = self.block_keys.index(usage_key)
+        if index is None or not self.present[index]:
+            return None
+        return index
+
+    def get_children(self, usage_key):
+        """
+        Returns a list of the usage keys of the given block's children.
+        """
+        return self._get_relatives(usage_key, self.children)
+
+    def get_parents(self, usage_key):
+        """
+        Returns a list of the usage keys of the given block's parents.
+        """
+        return self._get_relatives(usage_key, self.parents)
+
+    def add_block(self, usage_key):
+        """
+        Adds the block with the given usage key, if it's not in the
+        structure yet, and returns its index.
+        """
+        index = self.block_keys.intern(usage_key)
+        if index >= len(self.present):
+            self.present.extend(bytearray(index + 1 - len(self.present)))
+        if not self.present[index]:
+            self.present[index] = 1
+            self.size += 1
+        return index
+
+    def add_relation(self, parent_key, child_key):
+        """
+        Adds a parent to child relationship, adding the blocks if
+        needed.
+        """
+        parent = self.add_block(parent_key)
+        child = self.add_block(child_key)
+        self.children.edit_row(parent).append(child)
+        self.parents.edit_row(child).append(parent)
+
+    def clear_parents(self, usage_key):
+        """
+        Removes the given block's parents from its relations, without
+        updating the relations of the parents.
+        """
+        del self.parents.edit_row(self._get_index(usage_key))[:]
+
+    def remove_block(self, usage_key):
+        """
+        Removes the given block and its relations.
+
+        Returns:
+            ([UsageKey], [UsageKey]) - The usage keys of the removed
+                block's parents and children.
+        """
+        index = self._get_index(usage_key)
+        parents = list(self.parents.row(index))
+        children = list(self.children.row(index))
+
+        for child in children:
+            self.parents.edit_row(child).remove(index)
+        for parent in parents:
+            self.children.edit_row(parent).remove(index)
+
+        self.parents.edited_rows[index] = []
+        self.children.edited_rows[index] = []
+        self.present[index] = 0
+        self.size -= 1
+
+        keys = self.block_keys.keys
+        return [keys[parent] for parent in parents], [keys[child] for child in children]
+
+    def prune(self, root_key):
+        """
+        Removes all blocks that are not reachable from the given root,
+        along with their relations, and compacts the arrays.
+        """
+        reachable = bytearray(len(self.present))
+        root = self.index(root_key)
+        if root is not None:
+            reachable[root] = 1
+            stack = [root]
+            while stack:
+                for child in self.children.row(stack.pop()):
+                    if not reachable[child]:
+                        reachable[child] = 1
+                        stack.append(child)
+
+        children = _IndexArrays()
+        parents = _IndexArrays()
+        for index, is_reachable in enumerate(reachable):
+            if is_reachable:
+                # All children of a reachable block are reachable.
+                children.indices.extend(self.children.row(index))
+                parents.indices.extend(parent for parent in self.parents.row(index) if reachable[parent])
+            children.offsets.append(len(children.indices))
+            parents.offsets.append(len(parents.indices))
+
+        self.present = reachable
+        self.size = reachable.count(1)
+        self.children = children
+        self.parents = parents
+
+    def _get_index(self, usage_key):
+        """
+        Returns the index of the block with the given usage key.
+
+        Raises KeyError if it's not in the structure.
+        """
+        index = self.index(usage_key)
+        if index is None:
+            raise KeyError(usage_key)
+        return index
+
+    def _get_relatives(self, usage_key, relations):
+        """
+        Returns a list of the usage keys in the given block's row of the
+        given relations.
+        """
+        index = self.index(usage_key)
+        if index is None:
+            return []
+        keys = self.block_keys.keys
+        return [keys[relative] for relative in relations.row(index)]
+
+
 class BlockStructure(object):
     """
     Base class for a block structure.  BlockStructures are constructed
@@ -59,14 +391,12 @@ class BlockStructure(object):
         # UsageKey
         self.root_block_usage_key = root_block_usage_key
 
-        # Map of a block's usage key to its block relations. The
-        # existence of a block in the structure is determined by its
-        # presence in this map.
-        # dict {UsageKey: _BlockRelations}
-        self._block_relations = {}
+        # The blocks and their parents and children relations.
+        # _BlockGraph
+        self._block_relations = _BlockGraph()
 
         # Add the root block.
-        self._add_block(self._block_relations, root_block_usage_key)
+        self._block_relations.add_block(root_block_usage_key)
 
     def __iter__(self):
         """
@@ -94,7 +424,7 @@ class BlockStructure(object):
         Returns:
             [UsageKey] - A list of usage keys of the block's parents.
         """
-        return self._block_relations[usage_key].parents if usage_key in self else []
+        return self._block_relations.get_parents(usage_key)
 
     def get_children(self, usage_key):
         """
@@ -108,7 +438,7 @@ class BlockStructure(object):
         Returns:
             [UsageKey] - A list of usage keys of the block's children.
         """
-        return self._block_relations[usage_key].children if usage_key in self else []
+        return self._block_relations.get_children(usage_key)
 
     def set_root_block(self, usage_key):
         """
@@ -123,7 +453,7 @@ class BlockStructure(object):
                 new root of the block structure.
         """
         self.root_block_usage_key = usage_key
-        self._block_relations[usage_key].parents = []
+        self._block_relations.clear_parents(usage_key)
 
     def __contains__(self, usage_key):
         """
@@ -148,7 +478,7 @@ class BlockStructure(object):
             iterator(UsageKey) - An iterator of the usage
             keys of all the blocks in the block structure.
         """
-        return six.iterkeys(self._block_relations)
+        return iter(self._block_relations)
 
     #--- Block structure traversal methods ---#
 
@@ -208,29 +538,7 @@ class BlockStructure(object):
         """
         Mutates this block structure by removing any unreachable blocks.
         """
-
-        # Create a new block relations map to store only those blocks
-        # that are still linked
-        pruned_block_relations = {}
-        old_block_relations = self._block_relations
-
-        # Build the structure from the leaves up by doing a post-order
-        # traversal of the old structure, thereby encountering only
-        # reachable blocks.
-        for block_key in self.post_order_traversal():
-            # If the block is in the old structure,
-            if block_key in old_block_relations:
-                # Add it to the new pruned structure
-                self._add_block(pruned_block_relations, block_key)
-
-                # Add a relationship to only those old children that
-                # were also added to the new pruned structure.
-                for child in old_block_relations[block_key].children:
-                    if child in pruned_block_relations:
-                        self._add_to_relations(pruned_block_relations, block_key, child)
-
-        # Replace this structure's relations with the newly pruned one.
-        self._block_relations = pruned_block_relations
+        self._block_relations.prune(self.root_block_usage_key)
 
     def _add_relation(self, parent_key, child_key):
         """
@@ -240,44 +548,7 @@ class BlockStructure(object):
             parent_key (UsageKey) - Usage key of the parent block.
             child_key (UsageKey) - Usage key of the child block.
         """
-        self._add_to_relations(self._block_relations, parent_key, child_key)
-
-    @staticmethod
-    def _add_to_relations(block_relations, parent_key, child_key):
-        """
-        Adds a parent to child relationship in the given block
-        relations map.
-
-        Arguments:
-            block_relations (dict({UsageKey: _BlockRelations})) -
-                Internal map of a block's usage key to its
-                parents/children relations.
-
-            parent_key (UsageKey) - Usage key of the parent block.
-
-            child_key (UsageKey) - Usage key of the child block.
-        """
-        BlockStructure._add_block(block_relations, parent_key)
-        BlockStructure._add_block(block_relations, child_key)
-
-        block_relations[child_key].parents.append(parent_key)
-        block_relations[parent_key].children.append(child_key)
-
-    @staticmethod
-    def _add_block(block_relations, usage_key):
-        """
-        Adds the given usage_key to the given block_relations map.
-
-        Arguments:
-            block_relations (dict({UsageKey: _BlockRelations})) -
-                Internal map of a block's usage key to its
-                parents/children relations.
-
-            usage_key (UsageKey) - Usage key of the block that is to
-                be added to the given block_relations.
-        """
-        if usage_key not in block_relations:
-            block_relations[usage_key] = _BlockRelations()
+        self._block_relations.add_relation(parent_key, child_key)
 
 
 class FieldData(object):
@@ -338,6 +609,10 @@ class TransformerDataMap(dict):
     The map can be accessed by the Transformer's name or the
     Transformer's class type.
     """
+    # Loader of transformer data that hasn't been deserialized yet.  Set
+    # on instances that are deserialized from the columnar format.
+    _lazy_sections = None
+
     def __getitem__(self, key):
         key = self._translate_key(key)
         return dict.__getitem__(self, key)
@@ -350,6 +625,20 @@ class TransformerDataMap(dict):
         key = self._translate_key(key)
         dict.__delitem__(self, key)
 
+    def __getstate__(self):
+        # The loader of lazy sections holds the serialized data, which
+        # can't be pickled or copied, so load all of them first.
+        if self._lazy_sections is not None:
+            self._lazy_sections.load_all()
+        state = self.__dict__.copy()
+        state.pop('_lazy_sections', None)
+        return state
+
+    def __missing__(self, key):
+        if self._lazy_sections is not None and self._lazy_sections.load(key):
+            return dict.__getitem__(self, key)
+        raise KeyError(key)
+
     def get_or_create(self, key):
         """
         Returns the TransformerData associated with the given
@@ -385,14 +674,208 @@ class BlockData(FieldData):
     def class_field_names(self):
         return super(BlockData, self).class_field_names() + ['location', 'transformer_data']
 
-    def __init__(self, usage_key):
+    def __init__(self, usage_key, fields=None, transformer_data=None):
         super(BlockData, self).__init__()
 
+        # Map of field name to the field's value for this block, if
+        # it's stored elsewhere, as in the columns of a _BlockDataMap.
+        if fields is not None:
+            self.fields = fields
+
         # Location (or usage key) of the block.
         self.location = usage_key
 
         # Map of transformer name to its block-specific data.
-        self.transformer_data = TransformerDataMap()
+        self.transformer_data = transformer_data if transformer_data is not None else TransformerDataMap()
+
+
+class _BlockFields(MutableMapping):
+    """
+    A single block's view of the field columns of a _BlockDataMap, as
+    a map of field name to the field's value.
+    """
+    def __init__(self, field_columns, index):
+        self._field_columns = field_columns
+        self._index = index
+
+    def __getitem__(self, field_name):
+        value = _get_column_value(self._field_columns.get(field_name, ()), self._index)
+        if value is _MISSING:
+            raise KeyError(field_name)
+        return value
+
+    def __setitem__(self, field_name, value):
+        _set_column_value(self._field_columns.setdefault(field_name, []), self._index, value)
+
+    def __delitem__(self, field_name):
+        if field_name not in self:
+            raise KeyError(field_name)
+        self._field_columns[field_name][self._index] = _MISSING
+
+    def __iter__(self):
+        return (
+            field_name for field_name, column in six.iteritems(self._field_columns)
+            if _get_column_value(column, self._index) is not _MISSING
+        )
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+def _get_column_value(column, index):
+    """
+    Returns the value of the given field column at the given block
+    index, or _MISSING.
+    """
+    return column[index] if index < len(column) else _MISSING
+
+
+def _set_column_value(column, index, value):
+    """
+    Sets the value of the given field column at the given block index,
+    growing the column as needed.
+    """
+    if index >= len(column):
+        column.extend([_MISSING] * (index + 1 - len(column)))
+    column[index] = value
+
+
+class _BlockDataMap(MutableMapping):
+    """
+    Data structure for the collected data of all blocks, by block index:
+    a column of values for each xBlock field, and a TransformerDataMap
+    for each block.
+
+    It's a map of a block's usage key to a BlockData, which is created
+    on access as a view of the block's data.
+    """
+    def __init__(self, block_keys=None):
+
+        # Interned usage keys of the blocks, usually shared with the
+        # _BlockGraph of the same structure.
+        # _BlockKeys
+        self.block_keys = block_keys if block_keys is not None else _BlockKeys()
+
+        # Map of a field name to the field's values, by block index,
+        # with _MISSING for blocks without a value.
+        # dict {string: list [any picklable type]}
+        self.field_columns = {}
+
+        # Map of the index of each block that has data to its
+        # block-specific transformer data, or to None until it's needed.
+        # dict {int: TransformerDataMap or None}
+        self.transformer_data_maps = {}
+
+        # Loader of transformer data that hasn't been deserialized yet.
+        # LazyTransformerSections or None
+        self.lazy_transformer_sections = None
+
+    def __getstate__(self):
+        if self.lazy_transformer_sections is not None:
+            self.lazy_transformer_sections.load_all()
+        state = self.__dict__.copy()
+        state['lazy_transformer_sections'] = None
+        return state
+
+    def __getitem__(self, usage_key):
+        index = self._get_index(usage_key)
+        return BlockData(
+            usage_key,
+            fields=_BlockFields(self.field_columns, index),
+            transformer_data=self._get_transformer_data_map(index),
+        )
+
+    def __setitem__(self, usage_key, block_data):
+        fields = dict(block_data.fields)
+        index = self.block_keys.intern(usage_key)
+        self._remove_fields(index)
+        for field_name, value in six.iteritems(fields):
+            _set_column_value(self.field_columns.setdefault(field_name, []), index, value)
+        self.transformer_data_maps[index] = block_data.transformer_data
+
+    def __delitem__(self, usage_key):
+        index = self._get_index(usage_key)
+        self._remove_fields(index)
+        del self.transformer_data_maps[index]
+
+    def __contains__(self, usage_key):
+        return self.block_keys.index(usage_key) in self.transformer_data_maps
+
+    def __iter__(self):
+        keys = self.block_keys.keys
+        return (keys[index] for index in self.transformer_data_maps)
+
+    def __len__(self):
+        return len(self.transformer_data_maps)
+
+    def get_or_create(self, usage_key):
+        """
+        Returns the BlockData of the given block, adding the block if
+        it has no data yet.
+        """
+        index = self.block_keys.intern(usage_key)
+        self.transformer_data_maps.setdefault(index, None)
+        return self[usage_key]
+
+    def get_field(self, usage_key, field_name, default=None):
+        """
+        Returns the value of the given field of the given block, or
+        default if it's not found.
+        """
+        index = self.block_keys.index(usage_key)
+        if index not in self.transformer_data_maps:
+            return default
+        value = _get_column_value(self.field_columns.get(field_name, ()), index)
+        if value is _MISSING:
+            # The field may still be an attribute of BlockData itself.
+            return getattr(self[usage_key], field_name, default)
+        return value
+
+    def get_transformer_data_map(self, usage_key, create=False):
+        """
+        Returns the TransformerDataMap of the given block, adding the
+        block if it has no data yet and create is True.
+
+        Raises KeyError if the block has no data and create is False.
+        """
+        if create:
+            index = self.block_keys.intern(usage_key)
+            self.transformer_data_maps.setdefault(index, None)
+        else:
+            index = self._get_index(usage_key)
+        return self._get_transformer_data_map(index)
+
+    def _get_index(self, usage_key):
+        """
+        Returns the index of the given block.
+
+        Raises KeyError if the block has no data.
+        """
+        index = self.block_keys.index(usage_key)
+        if index not in self.transformer_data_maps:
+            raise KeyError(usage_key)
+        return index
+
+    def _get_transformer_data_map(self, index):
+        """
+        Returns the TransformerDataMap of the block with the given index,
+        creating it if needed.
+        """
+        transformer_data_map = self.transformer_data_maps[index]
+        if transformer_data_map is None:
+            transformer_data_map = TransformerDataMap()
+            if self.lazy_transformer_sections is not None:
+                transformer_data_map._lazy_sections = self.lazy_transformer_sections  # pylint: disable=protected-access
+            self.transformer_data_maps[index] = transformer_data_map
+        return transformer_data_map
+
+    def _remove_fields(self, index):
+        """
+        Removes the field values of the block with the given index.
+        """
+        for column in six.itervalues(self.field_columns):
+            if index < len(column):
+                column[index] = _MISSING
 
 
 class BlockStructureBlockData(BlockStructure):
@@ -404,30 +887,41 @@ class BlockStructureBlockData(BlockStructure):
     # update this value whenever the data structure changes. Dependent storage
     # layers can then use this value when serializing/deserializing block
     # structures, and invalidating any previously cached/stored data.
-    VERSION = 2
+    VERSION = 3
 
     def __init__(self, root_block_usage_key):
         super(BlockStructureBlockData, self).__init__(root_block_usage_key)
 
         # Map of a block's usage key to its collected data, including
         # its xBlock fields and block-specific transformer data.
-        # dict {UsageKey: BlockData}
-        self._block_data_map = {}
+        # _BlockDataMap {UsageKey: BlockData}
+        self._block_data_map = _BlockDataMap(self._block_relations.block_keys)
 
         # Map of a transformer's name to its non-block-specific data.
         self.transformer_data = TransformerDataMap()
 
+        # Loader of block-level transformer data that is yet to be
+        # deserialized, if this structure was loaded from the store.
+        # LazyTransformerSections or None
+        self._lazy_transformer_sections = None
+
     def copy(self):
         """
         Returns a new instance of BlockStructureBlockData with a
         deep-copy of this instance's contents.
         """
         from .factory import BlockStructureFactory
+        self._load_lazy_transformer_sections()
+        # Copy the relations and block data together, so their copies
+        # share the interned usage keys as well.
+        block_relations, transformer_data, block_data_map = deepcopy(
+            (self._block_relations, self.transformer_data, self._block_data_map)
+        )
         return BlockStructureFactory.create_new(
             self.root_block_usage_key,
-            deepcopy(self._block_relations),
-            deepcopy(self.transformer_data),
-            deepcopy(self._block_data_map),
+            block_relations,
+            transformer_data,
+            block_data_map,
         )
 
     def iteritems(self):
@@ -466,8 +960,7 @@ class BlockStructureBlockData(BlockStructure):
             default (any type) - The value to return if a field value is
                 not found.
         """
-        block_data = self._block_data_map.get(usage_key)
-        return getattr(block_data, field_name, default) if block_data else default
+        return self._block_data_map.get_field(usage_key, field_name, default)
 
     def override_xblock_field(self, usage_key, field_name, override_data):
         """
@@ -532,7 +1025,7 @@ class BlockStructureBlockData(BlockStructure):
             transformer (BlockStructureTransformer) - The transformer
                 whose dictionary data is requested.
         """
-        return self._block_data_map[usage_key].transformer_data[transformer]
+        return self._block_data_map.get_transformer_data_map(usage_key)[transformer]
 
     def get_transformer_block_field(self, usage_key, transformer, key, default=None):
         """
@@ -578,7 +1071,7 @@ class BlockStructureBlockData(BlockStructure):
                 requested block.
         """
         setattr(
-            self._get_or_create_block(usage_key).transformer_data.get_or_create(transformer),
+            self._block_data_map.get_transformer_data_map(usage_key, create=True).get_or_create(transformer),
             key,
             value,
         )
@@ -621,19 +1114,8 @@ class BlockStructureBlockData(BlockStructure):
                 removed block's children become children of the
                 removed block's parents.
         """
-        children = self._block_relations[usage_key].children
-        parents = self._block_relations[usage_key].parents
-
-        # Remove block from its children.
-        for child in children:
-            self._block_relations[child].parents.remove(usage_key)
-
-        # Remove block from its parents.
-        for parent in parents:
-            self._block_relations[parent].children.remove(usage_key)
-
-        # Remove block.
-        self._block_relations.pop(usage_key, None)
+        # Remove block, and the block from its parents and children.
+        parents, children = self._block_relations.remove_block(usage_key)
         self._block_data_map.pop(usage_key, None)
 
         # Recreate the graph connections if descendants are to be kept.
@@ -753,18 +1235,47 @@ class BlockStructureBlockData(BlockStructure):
             raise TransformerException(u'Version attributes are not set on transformer {0}.', transformer.name())
         self.set_transformer_data(transformer, TRANSFORMER_VERSION_KEY, transformer.WRITE_VERSION)
 
+    def _load_lazy_transformer_sections(self):
+        """
+        Loads any block-level transformer data that is yet to be
+        deserialized, so this structure can be copied or serialized
+        in full.
+        """
+        if self._lazy_transformer_sections is not None:
+            self._lazy_transformer_sections.load_all()
+            self._lazy_transformer_sections = None
+
     def _get_or_create_block(self, usage_key):
         """
         Returns the BlockData associated with the given usage_key.
         If not found, creates and returns a new BlockData and
         maps it to the given key.
         """
-        try:
-            return self._block_data_map[usage_key]
-        except KeyError:
-            block_data = BlockData(usage_key)
-            self._block_data_map[usage_key] = block_data
-            return block_data
+        return self._block_data_map.get_or_create(usage_key)
+
+    def _set_blocks(self, block_relations, block_data_map):
+        """
+        Replaces the blocks of this structure, along with their
+        relations and data, with the given ones.
+
+        Arguments:
+            block_relations (_BlockGraph or dict {UsageKey:
+                _BlockRelations}) - The blocks and their relations.
+
+            block_data_map (_BlockDataMap or dict {UsageKey:
+                BlockData}) - The blocks' data.
+
+        The dicts are as found in block structures that were stored
+        before VERSION 3.
+        """
+        if not isinstance(block_relations, _BlockGraph):
+            block_relations = _BlockGraph.from_block_relations(block_relations)
+        if not isinstance(block_data_map, _BlockDataMap):
+            legacy_block_data_map = block_data_map
+            block_data_map = _BlockDataMap(block_relations.block_keys)
+            block_data_map.update(legacy_block_data_map)
+        self._block_relations = block_relations
+        self._block_data_map = block_data_map
 
 
 class BlockStructureModulestoreData(BlockStructureBlockData):
@@ -789,6 +1300,15 @@ class BlockStructureModulestoreData(BlockStructureBlockData):
         # set(string)
         self._requested_xblock_fields = set()
 
+        # During an incremental collection, the keys of the blocks
+        # whose data is recollected, the names of the transformers
+        # that keep the previously collected data of all other blocks,
+        # and the xBlock fields that were previously collected.
+        # set(UsageKey) or None, set(string), set(string)
+        self._blocks_to_recollect = None
+        self._incremental_transformer_names = set()
+        self._previous_xblock_fields = set()
+
     def request_xblock_fields(self, *field_names):
         """
         Records request for collecting data for the given xBlock fields.
@@ -805,6 +1325,28 @@ class BlockStructureModulestoreData(BlockStructureBlockData):
         """
         self._requested_xblock_fields.update(set(field_names))
 
+    def should_collect(self, usage_key, transformer):
+        """
+        Returns whether the given transformer should collect data for
+        the block with the given usage key.
+
+        This is False only during an incremental collection, for a
+        transformer that supports it and a block that is unaffected by
+        the changes since the previous collection, since the block's
+        previously collected data is kept.
+
+        Arguments:
+            usage_key (UsageKey) - Usage key of the block.
+
+            transformer (BlockStructureTransformer) - The transformer
+                that is collecting data.
+        """
+        return (
+            self._blocks_to_recollect is None or
+            usage_key in self._blocks_to_recollect or
+            transformer.name() not in self._incremental_transformer_names
+        )
+
     def get_xblock(self, usage_key):
         """
         Returns the instantiated xBlock for the given usage key.
@@ -833,12 +1375,118 @@ class BlockStructureModulestoreData(BlockStructureBlockData):
         """
         self._xblock_map[usage_key] = xblock
 
+    def _prepare_incremental_collect(self, previous_block_structure, transformers):
+        """
+        Prepares for collecting only the data of the blocks affected by
+        changes since the given block structure was collected.
+
+        A block is affected if its xBlock's version changed, or if it
+        is an ancestor or a descendant of such a block, since collected
+        data is percolated both up and down the structure.  The
+        previously collected xBlock fields of all other blocks are
+        copied over, along with their data of the given transformers
+        that support incremental collection and whose collected data
+        is of the current version.
+
+        Arguments:
+            previous_block_structure (BlockStructureBlockData) - The
+                previously collected block structure of the same root.
+
+            transformers ([BlockStructureTransformer]) - The
+                transformers that are to collect data.
+
+        Returns:
+            [BlockStructureTransformer] - The transformers that collect
+                data incrementally.
+        """
+        previous_versions = previous_block_structure.get_transformer_data(COLLECTION_DATA_NAME, BLOCK_VERSIONS_KEY)
+        if previous_versions is None:
+            return []
+
+        changed_block_keys = set()
+        for usage_key, xblock in six.iteritems(self._xblock_map):
+            version = _get_xblock_version(xblock)
+            if version is None or version != previous_versions.get(usage_key):
+                changed_block_keys.add(usage_key)
+        affected_block_keys = self._get_relatives(changed_block_keys, self.get_parents)
+        affected_block_keys |= self._get_relatives(changed_block_keys, self.get_children)
+        if len(affected_block_keys) == len(self):
+            return []
+
+        incremental_transformers = [
+            transformer for transformer in transformers
+            if transformer.SUPPORTS_INCREMENTAL_COLLECT and
+            previous_block_structure._get_transformer_data_version(transformer) == transformer.WRITE_VERSION
+        ]
+        for transformer in incremental_transformers:
+            self.transformer_data[transformer] = previous_block_structure.transformer_data[transformer]
+
+        for usage_key in self:
+            previous_block_data = previous_block_structure._block_data_map.get(usage_key)
+            if usage_key in affected_block_keys or previous_block_data is None:
+                continue
+            block_data = self._get_or_create_block(usage_key)
+            block_data.fields.update(previous_block_data.fields)
+            for transformer in incremental_transformers:
+                try:
+                    block_data.transformer_data[transformer] = previous_block_data.transformer_data[transformer]
+                except KeyError:
+                    pass
+
+        logger.info(
+            u'BlockStructure: Recollecting %d of %d blocks for %s.',
+            len(affected_block_keys),
+            len(self),
+            [transformer.name() for transformer in incremental_transformers],
+        )
+        self._blocks_to_recollect = affected_block_keys
+        self._incremental_transformer_names = {transformer.name() for transformer in incremental_transformers}
+        self._previous_xblock_fields = set(
+            previous_block_structure.get_transformer_data(COLLECTION_DATA_NAME, XBLOCK_FIELDS_KEY, [])
+        )
+        return incremental_transformers
+
+    @staticmethod
+    def _get_relatives(usage_keys, get_relatives):
+        """
+        Returns the given usage keys, with the keys of all the blocks
+        reachable from them through the given relation.
+        """
+        relatives = set()
+        stack = list(usage_keys)
+        while stack:
+            usage_key = stack.pop()
+            if usage_key not in relatives:
+                relatives.add(usage_key)
+                stack.extend(get_relatives(usage_key))
+        return relatives
+
+    def _collect_block_versions(self):
+        """
+        Records the version of each block's xBlock and the collected
+        xBlock fields, so the next collection can be incremental.
+        """
+        self.set_transformer_data(COLLECTION_DATA_NAME, BLOCK_VERSIONS_KEY, {
+            usage_key: _get_xblock_version(xblock)
+            for usage_key, xblock in six.iteritems(self._xblock_map)
+        })
+        self.set_transformer_data(COLLECTION_DATA_NAME, XBLOCK_FIELDS_KEY, sorted(self._requested_xblock_fields))
+
     def _collect_requested_xblock_fields(self):
         """
         Iterates through all instantiated xBlocks that were added and
         collects all xBlock fields that were requested.
+
+        During an incremental collection, the fields of unaffected
+        blocks were copied over, unless new fields are requested.
         """
+        blocks_to_recollect = self._blocks_to_recollect
+        if not self._requested_xblock_fields.issubset(self._previous_xblock_fields):
+            blocks_to_recollect = None
+
         for xblock_usage_key, xblock in six.iteritems(self._xblock_map):
+            if blocks_to_recollect is not None and xblock_usage_key not in blocks_to_recollect:
+                continue
             block_data = self._get_or_create_block(xblock_usage_key)
             for field_name in self._requested_xblock_fields:
                 self._set_xblock_field(block_data, xblock, field_name)
@@ -861,3 +1509,16 @@ class BlockStructureModulestoreData(BlockStructureBlockData):
         """
         if hasattr(xblock, field_name):
             setattr(block_data, field_name, getattr(xblock, field_name))
+
+
+def _get_xblock_version(xblock):
+    """
+    Returns a version of the given xBlock that changes whenever its
+    content, settings or children change, or None if it's unknown.
+    """
+    # Split modulestore blocks have the version of the structure in which
+    # they were last changed; other blocks have their last edit time.
+    version = getattr(xblock, 'update_version', None)
+    if version is None:
+        version = getattr(xblock, 'edited_on', None)
+    return version
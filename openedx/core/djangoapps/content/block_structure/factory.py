@@ -58,7 +58,7 @@ class BlockStructureFactory(object):
         return block_structure
 
     @classmethod
-    def create_from_store(cls, root_block_usage_key, block_structure_store):
+    def create_from_store(cls, root_block_usage_key, block_structure_store, transformers=None):
         """
         Deserializes and returns the block structure starting at
         root_block_usage_key from the given store, if it's found in the store.
@@ -75,6 +75,11 @@ class BlockStructureFactory(object):
                 store from which the block structure is to be
                 deserialized.
 
+            transformers ([BlockStructureTransformer]) - Optional list
+                of the transformers whose collected block data is to be
+                loaded up front.  Depending on the serialization format,
+                the data of other transformers may be loaded lazily.
+
         Returns:
             BlockStructure - The deserialized block structure starting
                 at root_block_usage_key, if found in the cache.
@@ -83,7 +88,7 @@ class BlockStructureFactory(object):
             BlockStructureNotFound - If the root_block_usage_key is not found
                 in the store.
         """
-        return block_structure_store.get(root_block_usage_key)
+        return block_structure_store.get(root_block_usage_key, transformers)
 
     @classmethod
     def create_new(cls, root_block_usage_key, block_relations, transformer_data, block_data_map):
@@ -91,7 +96,6 @@ class BlockStructureFactory(object):
         Returns a new block structure for given the arguments.
         """
         block_structure = BlockStructureBlockData(root_block_usage_key)
-        block_structure._block_relations = block_relations  # pylint: disable=protected-access
+        block_structure._set_blocks(block_relations, block_data_map)  # pylint: disable=protected-access
         block_structure.transformer_data = transformer_data
-        block_structure._block_data_map = block_data_map  # pylint: disable=protected-access
         return block_structure
@@ -0,0 +1,175 @@
+"""
+Command to compare the legacy and columnar BlockStructure serialization formats.
+"""
+
+
+import gc
+import resource
+import timeit
+import tracemalloc
+
+import six
+from django.core.management.base import BaseCommand
+from opaque_keys.edx.locator import CourseLocator
+
+import openedx.core.djangoapps.content.block_structure.api as api
+from openedx.core.djangoapps.content.block_structure import serialization
+from openedx.core.djangoapps.content.block_structure.block_structure import BlockStructureBlockData
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+from openedx.core.lib.command_utils import parse_course_keys
+
+# Shape of the synthetic course, per level below the course block.
+SYNTHETIC_BLOCK_TYPES = ['chapter', 'sequential', 'vertical', 'problem']
+SYNTHETIC_TRANSFORMERS = ['grades', 'start_date', 'user_partitions', 'visibility', 'hidden_content', 'student_view']
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms benchmark_block_structure_serialization --settings=devstack
+        $ ./manage.py lms benchmark_block_structure_serialization --num_blocks 5000 --transformers grades
+        $ ./manage.py lms benchmark_block_structure_serialization --courses 'edX/DemoX/Demo_Course' --settings=devstack
+    """
+    help = u'Compares load latency and memory of the legacy and columnar block structure serialization formats.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--courses',
+            dest='courses',
+            nargs='+',
+            help=u'Benchmark the collected block structures of the given courses instead of a synthetic course.',
+        )
+        parser.add_argument(
+            '--num_blocks',
+            help=u'Approximate number of blocks in the synthetic course.',
+            default=5000,
+            type=int,
+        )
+        parser.add_argument(
+            '--transformers',
+            nargs='*',
+            help=u'Names of the transformers whose block data is read after loading.',
+            default=['grades'],
+        )
+        parser.add_argument(
+            '--iterations',
+            help=u'Number of timed loads per format.',
+            default=20,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        if options.get('courses'):
+            block_structures = [
+                (six.text_type(course_key), api.get_course_in_cache(course_key))
+                for course_key in parse_course_keys(options['courses'])
+            ]
+        else:
+            block_structures = [(u'synthetic', _create_synthetic_block_structure(options['num_blocks']))]
+
+        for name, block_structure in block_structures:
+            self.stdout.write(u'{}: {} blocks'.format(name, len(block_structure)))
+            for format_name, serialize, load in _formats(options['transformers']):
+                serialized_data = serialize(block_structure)
+                seconds = min(timeit.repeat(lambda: load(serialized_data), number=1, repeat=options['iterations']))
+                peak_bytes, rss_growth_kb = _measure_memory(load, serialized_data)
+                self.stdout.write(
+                    u'  {:<9} size: {:>10,d} B  load: {:>8.2f} ms  peak alloc: {:>12,d} B  max RSS growth: {:>8,d} KB'
+                    .format(format_name, len(serialized_data), seconds * 1000, peak_bytes, rss_growth_kb)
+                )
+
+
+def _formats(transformer_names):
+    """
+    Returns (name, serialize, load) for each format, where load
+    deserializes and reads the given transformers' block data.
+    """
+    def serialize_legacy(block_structure):
+        # pylint: disable=protected-access
+        block_structure._load_lazy_transformer_sections()
+        return zpickle(
+            (block_structure._block_relations, block_structure.transformer_data, block_structure._block_data_map)
+        )
+
+    def load_legacy(serialized_data):
+        _, _, block_data_map = zunpickle(serialized_data)
+        _read_transformer_data(block_data_map, transformer_names)
+
+    def load_columnar(serialized_data):
+        _, _, block_data_map, _ = serialization.deserialize(serialized_data)
+        _read_transformer_data(block_data_map, transformer_names)
+
+    return [
+        (u'legacy', serialize_legacy, load_legacy),
+        (u'columnar', serialization.serialize, load_columnar),
+    ]
+
+
+def _read_transformer_data(block_data_map, transformer_names):
+    """
+    Reads the given transformers' data of every block, as a transform would.
+    """
+    for block_data in six.itervalues(block_data_map):
+        for transformer_name in transformer_names:
+            try:
+                block_data.transformer_data[transformer_name]
+            except KeyError:
+                pass
+
+
+def _measure_memory(load, serialized_data):
+    """
+    Returns the peak bytes allocated by a single load and the growth of
+    the process' max RSS (in KB on Linux) during it.
+    """
+    gc.collect()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    try:
+        load(serialized_data)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak_bytes, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+
+
+def _create_synthetic_block_structure(num_blocks):
+    """
+    Returns a collected block structure for a synthetic course with
+    approximately num_blocks blocks and typical collected data.
+    """
+    course_key = CourseLocator(u'edX', u'Benchmark', u'Synthetic')
+    root_key = course_key.make_usage_key(u'course', u'course')
+    block_structure = BlockStructureBlockData(root_key)
+    for transformer_name in SYNTHETIC_TRANSFORMERS:
+        block_structure.set_transformer_data(transformer_name, u'_version', 1)
+
+    # Use the same fan-out at each level, so the leaves are the bulk of the blocks.
+    fan_out = max(2, int(round(num_blocks ** (1.0 / len(SYNTHETIC_BLOCK_TYPES)))))
+    parents = [root_key]
+    block_count = 0
+    for block_type in SYNTHETIC_BLOCK_TYPES:
+        children = []
+        for parent_key in parents:
+            for _ in range(fan_out):
+                block_key = course_key.make_usage_key(block_type, u'{}_{}'.format(block_type, block_count))
+                block_count += 1
+                block_structure._add_relation(parent_key, block_key)  # pylint: disable=protected-access
+                _add_synthetic_block_data(block_structure, block_key, block_type)
+                children.append(block_key)
+        parents = children
+    _add_synthetic_block_data(block_structure, root_key, u'course')
+    return block_structure
+
+
+def _add_synthetic_block_data(block_structure, block_key, block_type):
+    """
+    Sets typical collected xBlock fields and transformer data on the block.
+    """
+    block_structure.override_xblock_field(block_key, u'category', block_type)
+    block_structure.override_xblock_field(block_key, u'display_name', u'{} {}'.format(block_type, block_key.block_id))
+    block_structure.override_xblock_field(block_key, u'graded', block_type == u'problem')
+    block_structure.override_xblock_field(block_key, u'format', u'Homework')
+    block_structure.override_xblock_field(block_key, u'due', None)
+    for transformer_name in SYNTHETIC_TRANSFORMERS:
+        block_structure.set_transformer_block_field(block_key, transformer_name, u'merged_value', [block_type] * 4)
@@ -64,7 +64,10 @@ class BlockStructureManager(object):
             BlockStructureBlockData - A transformed block structure,
                 starting at starting_block_usage_key.
         """
-        block_structure = collected_block_structure.copy() if collected_block_structure else self.get_collected()
+        if collected_block_structure:
+            block_structure = collected_block_structure.copy()
+        else:
+            block_structure = self.get_collected(transformers.get_transformers())
 
         if starting_block_usage_key:
             # Override the root_block_usage_key so traversals start at the
@@ -80,7 +83,7 @@ class BlockStructureManager(object):
         transformers.transform(block_structure)
         return block_structure
 
-    def get_collected(self):
+    def get_collected(self, transformers=None):
         """
         Returns the collected Block Structure for the root_block_usage_key,
         getting block data from the cache and modulestore, as needed.
@@ -89,6 +92,11 @@ class BlockStructureManager(object):
         the modulestore is accessed if needed (at cache miss), and the
         transformers data is collected if needed.
 
+        Arguments:
+            transformers ([BlockStructureTransformer]) - Optional list of
+                transformers whose collected block data is to be loaded
+                up front from the store.
+
         Returns:
             BlockStructureBlockData - A collected block structure,
                 starting at root_block_usage_key, with collected data
@@ -98,6 +106,7 @@ class BlockStructureManager(object):
             block_structure = BlockStructureFactory.create_from_store(
                 self.root_block_usage_key,
                 self.store,
+                transformers,
             )
             BlockStructureTransformers.verify_versions(block_structure)
 
@@ -116,22 +125,36 @@ class BlockStructureManager(object):
         """
         with self._bulk_operations():
             if not self.store.is_up_to_date(self.root_block_usage_key, self.modulestore):
-                self._update_collected()
+                self._update_collected(incremental=config.waffle().is_enabled(config.INCREMENTAL_COLLECT))
 
-    def _update_collected(self):
+    def _update_collected(self, incremental=False):
         """
         The store is updated with newly collected transformers data from
         the modulestore.
+
+        If incremental, the data that was previously collected for
+        blocks that are unaffected by changes is kept where possible.
         """
         with self._bulk_operations():
+            previous_block_structure = self._get_previously_collected() if incremental else None
             block_structure = BlockStructureFactory.create_from_modulestore(
                 self.root_block_usage_key,
                 self.modulestore,
             )
-            BlockStructureTransformers.collect(block_structure)
+            BlockStructureTransformers.collect(block_structure, previous_block_structure)
             self.store.add(block_structure)
             return block_structure
 
+    def _get_previously_collected(self):
+        """
+        Returns the collected block structure in the store, or None if
+        there is none.
+        """
+        try:
+            return BlockStructureFactory.create_from_store(self.root_block_usage_key, self.store)
+        except BlockStructureNotFound:
+            return None
+
     def clear(self):
         """
         Removes data for the block structure associated with the given
@@ -0,0 +1,272 @@
+"""
+Columnar serialization format for BlockStructure objects.
+
+Unlike the legacy format, which zpickles the entire
+(block_relations, transformer_data, block_data_map) tuple as a single
+blob, this format stores the data in independently compressed sections
+that are located through an offset index.  A reader only decompresses
+the sections it actually needs, and slices them out of the serialized
+buffer (bytes or an mmap) without copying it.
+
+Layout:
+    MAGIC (4 bytes)
+    header length (4 bytes, unsigned big-endian)
+    header - pickled dict of {section name: (offset, length)}, with
+        offsets relative to the end of the header.
+    sections - concatenation of zlib-compressed pickles.
+
+Sections:
+    keys - tuple of (list of usage keys in index order, bytes of whether
+        each key's block is in the structure, list of indices of keys
+        with block data).  In version 1, the second item was the number
+        of keys, in index order, whose blocks are in the structure.
+    relations - tuple of CSR-style (offsets, indices) int arrays for the
+        children and for the parents of each key.
+    transformer_data - the structure-wide TransformerDataMap.
+    field.<name> - column of collected xBlock values for field <name>,
+        as a list of values by key index.  In version 1, it was a dict
+        of {key index: value}.
+    transformer.<name> - column of block-level data for transformer
+        <name>, as a dict of {key index: fields dict}.  These sections
+        are loaded lazily, on first access of the transformer's data.
+
+Except for the block-level transformer data, the sections are stored as
+BlockStructureBlockData keeps them in memory, so they are used as they
+are loaded.
+"""
+
+
+import pickle
+import struct
+import zlib
+
+import six
+
+from .block_structure import _MISSING, TransformerData, _BlockDataMap, _BlockGraph, _BlockKeys, _IndexArrays
+
+MAGIC = b'BSC\x01'
+FORMAT_VERSION = 2
+
+_HEADER_LENGTH = struct.Struct('>I')
+_PICKLE_PROTOCOL = 4
+
+KEYS_SECTION = u'keys'
+RELATIONS_SECTION = u'relations'
+TRANSFORMER_DATA_SECTION = u'transformer_data'
+FIELD_SECTION_PREFIX = u'field.'
+TRANSFORMER_SECTION_PREFIX = u'transformer.'
+
+
+def is_columnar(serialized_data):
+    """
+    Returns whether the given serialized data is in the columnar format,
+    as opposed to the legacy zpickled format.
+    """
+    return bytes(serialized_data[:len(MAGIC)]) == MAGIC
+
+
+def serialize(block_structure):
+    """
+    Serializes the given block structure into the columnar format.
+
+    Arguments:
+        block_structure (BlockStructureBlockData) - The block structure
+            that is to be serialized.
+
+    Returns:
+        bytes - The serialized data.
+    """
+    # pylint: disable=protected-access
+    block_structure._load_lazy_transformer_sections()
+    block_relations = block_structure._block_relations
+    block_data_map = block_structure._block_data_map
+    if block_data_map.block_keys is not block_relations.block_keys:
+        block_data_map = _BlockDataMap(block_relations.block_keys)
+        block_data_map.update(block_structure._block_data_map)
+
+    block_relations.children.compact()
+    block_relations.parents.compact()
+    sections = {
+        KEYS_SECTION: (
+            block_relations.block_keys.keys,
+            bytes(block_relations.present),
+            list(block_data_map.transformer_data_maps),
+        ),
+        RELATIONS_SECTION: (
+            (block_relations.children.offsets, block_relations.children.indices),
+            (block_relations.parents.offsets, block_relations.parents.indices),
+        ),
+        TRANSFORMER_DATA_SECTION: block_structure.transformer_data,
+    }
+
+    transformer_columns = {}
+    for index, transformer_data_map in six.iteritems(block_data_map.transformer_data_maps):
+        for transformer_name, transformer_data in six.iteritems(transformer_data_map or {}):
+            transformer_columns.setdefault(transformer_name, {})[index] = transformer_data.fields
+
+    for field_name, column in six.iteritems(block_data_map.field_columns):
+        sections[FIELD_SECTION_PREFIX + field_name] = column
+    for transformer_name, column in six.iteritems(transformer_columns):
+        sections[TRANSFORMER_SECTION_PREFIX + transformer_name] = column
+
+    index = {}
+    body = []
+    offset = 0
+    for section_name, section_data in six.iteritems(sections):
+        compressed = zlib.compress(pickle.dumps(section_data, _PICKLE_PROTOCOL))
+        index[section_name] = (offset, len(compressed))
+        offset += len(compressed)
+        body.append(compressed)
+
+    header = pickle.dumps({u'version': FORMAT_VERSION, u'sections': index}, _PICKLE_PROTOCOL)
+    return b''.join([MAGIC, _HEADER_LENGTH.pack(len(header)), header] + body)
+
+
+def deserialize(serialized_data, transformer_names=None):
+    """
+    Deserializes the given columnar data.
+
+    Block-level transformer data is loaded lazily, except for the
+    transformers named in transformer_names, which are loaded up front.
+
+    Arguments:
+        serialized_data (bytes-like) - Data previously returned by
+            serialize.  Any object supporting the buffer protocol, such
+            as an mmap, can be given.
+
+        transformer_names ([string]) - Names of the transformers whose
+            block-level data should be eagerly loaded.
+
+    Returns:
+        tuple of (block_relations, transformer_data, block_data_map,
+        lazy_transformer_sections).
+    """
+    reader = _SectionReader(serialized_data)
+
+    keys, present, data_indices = reader.load(KEYS_SECTION)
+    block_keys = _BlockKeys(keys)
+    if isinstance(present, int):
+        present = b'\x01' * present + b'\x00' * (len(keys) - present)
+
+    children_csr, parents_csr = reader.load(RELATIONS_SECTION)
+    block_relations = _BlockGraph(
+        block_keys,
+        bytearray(present),
+        _IndexArrays(*children_csr),
+        _IndexArrays(*parents_csr),
+    )
+
+    transformer_data = reader.load(TRANSFORMER_DATA_SECTION)
+
+    block_data_map = _BlockDataMap(block_keys)
+    block_data_map.transformer_data_maps = dict.fromkeys(data_indices)
+    for section_name in reader.section_names(FIELD_SECTION_PREFIX):
+        column = reader.load(section_name)
+        if isinstance(column, dict):
+            column = [column.get(index, _MISSING) for index in six.moves.range(len(keys))]
+        block_data_map.field_columns[section_name[len(FIELD_SECTION_PREFIX):]] = column
+
+    lazy_transformer_sections = LazyTransformerSections(reader, block_data_map)
+    for transformer_name in transformer_names or []:
+        lazy_transformer_sections.load(transformer_name)
+
+    return block_relations, transformer_data, block_data_map, lazy_transformer_sections
+
+
+class LazyTransformerSections(object):
+    """
+    Loads the block-level data of a transformer into all of the blocks of
+    a deserialized block structure, the first time any block's
+    TransformerDataMap is accessed for that transformer.
+    """
+    def __init__(self, reader, block_data_map):
+        self._reader = reader
+        self._block_data_map = block_data_map
+        self._pending = set(
+            section_name[len(TRANSFORMER_SECTION_PREFIX):]
+            for section_name in reader.section_names(TRANSFORMER_SECTION_PREFIX)
+        )
+        block_data_map.lazy_transformer_sections = self
+
+    @property
+    def pending(self):
+        """
+        Returns the names of the transformers whose data is not yet loaded.
+        """
+        return frozenset(self._pending)
+
+    def load(self, transformer_name):
+        """
+        Loads the block-level data of the given transformer, if it hasn't
+        been loaded yet.  Returns whether any data was loaded.
+        """
+        if transformer_name not in self._pending:
+            return False
+        self._pending.discard(transformer_name)
+
+        # pylint: disable=protected-access
+        column = self._reader.load(TRANSFORMER_SECTION_PREFIX + transformer_name)
+        transformer_data_maps = self._block_data_map.transformer_data_maps
+        for index, fields in six.iteritems(column):
+            if index not in transformer_data_maps:
+                # The block was removed from the structure since it was loaded.
+                continue
+            transformer_data = TransformerData()
+            transformer_data.fields = fields
+            # Don't overwrite any data set on the block after it was loaded.
+            dict.setdefault(
+                self._block_data_map._get_transformer_data_map(index),
+                transformer_name,
+                transformer_data,
+            )
+        return True
+
+    def load_all(self):
+        """
+        Loads the data of all remaining transformers and detaches this
+        object from the blocks so the structure can be copied or pickled.
+        """
+        for transformer_name in list(self._pending):
+            self.load(transformer_name)
+        self._block_data_map.lazy_transformer_sections = None
+        for transformer_data_map in six.itervalues(self._block_data_map.transformer_data_maps):
+            if transformer_data_map is not None:
+                transformer_data_map.__dict__.pop('_lazy_sections', None)
+        self._reader = None
+
+
+class _SectionReader(object):
+    """
+    Provides access to the sections of columnar serialized data.
+    """
+    def __init__(self, serialized_data):
+        if not is_columnar(serialized_data):
+            raise ValueError(u'Data is not in the columnar BlockStructure format.')
+
+        buf = memoryview(serialized_data)
+        header_start = len(MAGIC) + _HEADER_LENGTH.size
+        header_length, = _HEADER_LENGTH.unpack_from(buf, len(MAGIC))
+        body_start = header_start + header_length
+        header = pickle.loads(buf[header_start:body_start])
+
+        if header[u'version'] not in (1, FORMAT_VERSION):
+            raise ValueError(u'Unsupported columnar BlockStructure format version {}.'.format(header[u'version']))
+
+        self._body = buf[body_start:]
+        self._index = header[u'sections']
+
+    def section_names(self, prefix):
+        """
+        Returns the names of all sections that start with the given prefix.
+        """
+        return [section_name for section_name in self._index if section_name.startswith(prefix)]
+
+    def load(self, section_name):
+        """
+        Decompresses and returns the data of the given section.
+        """
+        offset, length = self._index[section_name]
+        raw_data = zlib.decompress(self._body[offset:offset + length])
+        if six.PY2:
+            return pickle.loads(raw_data)
+        return pickle.loads(raw_data, encoding='latin1')
@@ -25,7 +25,11 @@ def update_block_structure_on_course_publish(sender, course_key, **kwargs):  # p
     if isinstance(course_key, LibraryLocator):
         return
 
-    if config.waffle().is_enabled(config.INVALIDATE_CACHE_ON_PUBLISH):
+    # Incremental collection recollects from the previously collected structure, so keep it.
+    if (
+        config.waffle().is_enabled(config.INVALIDATE_CACHE_ON_PUBLISH) and
+        not config.waffle().is_enabled(config.INCREMENTAL_COLLECT)
+    ):
         clear_course_from_cache(course_key)
 
     update_course_in_cache_v2.apply_async(
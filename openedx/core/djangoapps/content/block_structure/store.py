@@ -11,7 +11,7 @@ import six
 from django.utils.encoding import python_2_unicode_compatible
 from openedx.core.lib.cache_utils import zpickle, zunpickle
 
-from . import config
+from . import config, serialization
 from .block_structure import BlockStructureBlockData
 from .exceptions import BlockStructureNotFound
 from .factory import BlockStructureFactory
@@ -71,7 +71,7 @@ class BlockStructureStore(object):
         bs_model = self._update_or_create_model(block_structure, serialized_data)
         self._add_to_cache(serialized_data, bs_model)
 
-    def get(self, root_block_usage_key):
+    def get(self, root_block_usage_key, transformers=None):
         """
         Deserializes and returns the block structure starting at
         root_block_usage_key, if found in the cache or storage.
@@ -84,6 +84,11 @@ class BlockStructureStore(object):
                 root of the block structure that is to be retrieved
                 from the store.
 
+            transformers ([BlockStructureTransformer]) - Transformers
+                whose block data is to be loaded up front.  When stored
+                in the columnar format, the block data of any other
+                transformer is only loaded when first accessed.
+
         Returns:
             BlockStructure - The deserialized block structure starting
             at root_block_usage_key, if found.
@@ -100,7 +105,7 @@ class BlockStructureStore(object):
             serialized_data = self._get_from_store(bs_model)
             self._add_to_cache(serialized_data, bs_model)
 
-        return self._deserialize(serialized_data, root_block_usage_key)
+        return self._deserialize(serialized_data, root_block_usage_key, transformers)
 
     def delete(self, root_block_usage_key):
         """
@@ -195,7 +200,16 @@ class BlockStructureStore(object):
     def _serialize(self, block_structure):
         """
         Serializes the data for the given block_structure.
+
+        The columnar format is written only when its waffle switch is
+        enabled, while both formats are always readable.  This allows
+        the switch to be rolled out (or back) without making previously
+        stored data unreadable.
         """
+        if config.waffle().is_enabled(config.COLUMNAR_SERIALIZATION):
+            return serialization.serialize(block_structure)
+
+        block_structure._load_lazy_transformer_sections()
         data_to_cache = (
             block_structure._block_relations,
             block_structure.transformer_data,
@@ -203,25 +217,35 @@ class BlockStructureStore(object):
         )
         return zpickle(data_to_cache)
 
-    def _deserialize(self, serialized_data, root_block_usage_key):
+    def _deserialize(self, serialized_data, root_block_usage_key, transformers=None):
         """
         Deserializes the given data and returns the parsed block_structure.
         """
-
+        lazy_transformer_sections = None
         try:
-            block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+            if serialization.is_columnar(serialized_data):
+                block_relations, transformer_data, block_data_map, lazy_transformer_sections = (
+                    serialization.deserialize(
+                        serialized_data,
+                        [transformer.name() for transformer in transformers or []],
+                    )
+                )
+            else:
+                block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
         except Exception:
             # Somehow failed to de-serialized the data, assume it's corrupt.
             bs_model = self._get_model(root_block_usage_key)
             logger.exception(u"BlockStructure: Failed to load data from cache for %s", bs_model)
             raise BlockStructureNotFound(bs_model.data_usage_key)
 
-        return BlockStructureFactory.create_new(
+        block_structure = BlockStructureFactory.create_new(
             root_block_usage_key,
             block_relations,
             transformer_data,
             block_data_map,
         )
+        block_structure._lazy_transformer_sections = lazy_transformer_sections
+        return block_structure
 
     @staticmethod
     def _encode_root_cache_key(bs_model):
@@ -4,6 +4,7 @@ Tests for block_structure.py
 
 
 import itertools
+import pickle
 # pylint: disable=protected-access
 from collections import namedtuple
 from copy import deepcopy
@@ -16,8 +17,9 @@ from six.moves import range
 
 from openedx.core.lib.graph_traversals import traverse_post_order
 
-from ..block_structure import BlockStructure, BlockStructureModulestoreData
+from ..block_structure import BlockData, BlockStructure, BlockStructureModulestoreData, _BlockRelations
 from ..exceptions import TransformerException
+from ..factory import BlockStructureFactory
 from .helpers import ChildrenMapTestMixin, MockTransformer, MockXBlock
 
 
@@ -312,3 +314,39 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
         _set_value(new_copy, 'edit2')
         self.assertEqual(_get_value(block_structure), 'edit1')
         self.assertEqual(_get_value(new_copy), 'edit2')
+
+    def test_pickled_round_trip(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.DAG_CHILDREN_MAP)
+        for block in block_structure:
+            block_structure.override_xblock_field(block, 'display_name', u'Block {}'.format(block))
+            block_structure.set_transformer_block_field(block, MockTransformer, 'test', block)
+        block_structure.remove_block(4, keep_descendants=False)
+
+        block_relations, transformer_data, block_data_map = pickle.loads(pickle.dumps(
+            (block_structure._block_relations, block_structure.transformer_data, block_structure._block_data_map)
+        ))
+        new_structure = BlockStructureFactory.create_new(0, block_relations, transformer_data, block_data_map)
+
+        self.assert_block_structure(new_structure, [[1, 2], [3], [3], [5, 6], [], [], []], missing_blocks=[4])
+        for block in new_structure:
+            self.assertEqual(new_structure.get_xblock_field(block, 'display_name'), u'Block {}'.format(block))
+            self.assertEqual(new_structure.get_transformer_block_field(block, MockTransformer, 'test'), block)
+        self.assertIsNone(new_structure.get_xblock_field(4, 'display_name'))
+
+    def test_legacy_block_relations(self):
+        children_map = ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP
+        block_relations = {block: _BlockRelations() for block in range(len(children_map))}
+        for parent, children in enumerate(children_map):
+            for child in children:
+                block_relations[parent].children.append(child)
+                block_relations[child].parents.append(parent)
+        block_data = BlockData(3)
+        block_data.display_name = u'Block 3'
+        block_data.transformer_data.get_or_create(MockTransformer).test = 3
+
+        block_structure = BlockStructureFactory.create_new(0, block_relations, {}, {3: block_data})
+
+        self.assert_block_structure(block_structure, children_map)
+        self.assertEqual(block_structure.get_xblock_field(3, 'display_name'), u'Block 3')
+        self.assertEqual(block_structure.get_transformer_block_field(3, MockTransformer, 'test'), 3)
+        self.assertEqual(list(block_structure.iteritems())[0][1].fields, {'display_name': u'Block 3'})
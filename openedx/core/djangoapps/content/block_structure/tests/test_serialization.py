@@ -0,0 +1,122 @@
+"""
+Tests for block_structure/serialization.py
+"""
+
+
+import pickle
+from copy import deepcopy
+from unittest import TestCase
+
+import ddt
+
+from openedx.core.lib.cache_utils import zpickle
+
+from .. import serialization
+from .helpers import ChildrenMapTestMixin, MockTransformer
+
+
+class OtherMockTransformer(MockTransformer):
+    """
+    A second mock transformer, to verify per-transformer sections.
+    """
+    pass
+
+
+@ddt.ddt
+class TestColumnarSerialization(ChildrenMapTestMixin, TestCase):
+    """
+    Tests for the columnar serialization format.
+    """
+    def setUp(self):
+        super(TestColumnarSerialization, self).setUp()
+        self.block_structure = self.create_block_structure(self.DAG_CHILDREN_MAP)
+        for transformer in [MockTransformer, OtherMockTransformer]:
+            self.block_structure._add_transformer(transformer)  # pylint: disable=protected-access
+        for block_key in range(len(self.DAG_CHILDREN_MAP)):
+            self.block_structure.override_xblock_field(block_key, 'display_name', u'Block {}'.format(block_key))
+            self.block_structure.set_transformer_block_field(block_key, MockTransformer, 'test', block_key)
+        self.block_structure.set_transformer_block_field(3, OtherMockTransformer, 'other', u'other val')
+
+    def _deserialize(self, transformer_names=None):
+        """
+        Round-trips the test block structure through the columnar format.
+        """
+        return serialization.deserialize(serialization.serialize(self.block_structure), transformer_names)
+
+    def test_is_columnar(self):
+        self.assertTrue(serialization.is_columnar(serialization.serialize(self.block_structure)))
+        self.assertFalse(serialization.is_columnar(zpickle((1, 2, 3))))
+
+    def test_round_trip(self):
+        block_relations, transformer_data, block_data_map, _ = self._deserialize()
+
+        self.block_structure._block_relations = block_relations  # pylint: disable=protected-access
+        self.assert_block_structure(self.block_structure, self.DAG_CHILDREN_MAP)
+        self.assertEqual(transformer_data[MockTransformer]._version, MockTransformer.WRITE_VERSION)
+
+        for block_key, block_data in block_data_map.items():
+            self.assertEqual(block_data.display_name, u'Block {}'.format(block_key))
+            self.assertEqual(block_data.transformer_data[MockTransformer].test, block_key)
+        self.assertEqual(block_data_map[3].transformer_data[OtherMockTransformer].other, u'other val')
+        self.assertNotIn(OtherMockTransformer.name(), block_data_map[4].transformer_data)
+
+    def test_preserves_parent_order(self):
+        parents = self.block_structure.get_parents(3)
+        block_relations, _, _, _ = self._deserialize()
+        self.block_structure._block_relations = block_relations  # pylint: disable=protected-access
+        self.assertEqual(self.block_structure.get_parents(3), parents)
+
+    @ddt.data(
+        (None, {MockTransformer.name(), OtherMockTransformer.name()}),
+        ([MockTransformer.name()], {OtherMockTransformer.name()}),
+    )
+    @ddt.unpack
+    def test_lazy_transformer_sections(self, transformer_names, expected_pending):
+        _, _, block_data_map, lazy_sections = self._deserialize(transformer_names)
+        self.assertEqual(lazy_sections.pending, expected_pending)
+
+        # Accessing a transformer's data loads its section for all blocks.
+        self.assertEqual(block_data_map[3].transformer_data[OtherMockTransformer].other, u'other val')
+        self.assertEqual(lazy_sections.pending, expected_pending - {OtherMockTransformer.name()})
+
+        lazy_sections.load_all()
+        self.assertEqual(lazy_sections.pending, frozenset())
+        self.assertEqual(block_data_map[6].transformer_data[MockTransformer].test, 6)
+
+    def test_data_set_before_loading_is_kept(self):
+        _, _, block_data_map, lazy_sections = self._deserialize()
+        block_data_map[2].transformer_data[OtherMockTransformer.name()] = u'new val'
+        lazy_sections.load(OtherMockTransformer.name())
+        self.assertEqual(block_data_map[2].transformer_data[OtherMockTransformer], u'new val')
+
+    @ddt.data(pickle.HIGHEST_PROTOCOL, None)
+    def test_copy_partially_loaded(self, protocol):
+        _, _, block_data_map, lazy_sections = self._deserialize()
+        transformer_data_map = block_data_map[3].transformer_data
+        self.assertEqual(transformer_data_map[MockTransformer].test, 3)
+        self.assertEqual(lazy_sections.pending, {OtherMockTransformer.name()})
+
+        if protocol is None:
+            copied_map = deepcopy(transformer_data_map)
+        else:
+            copied_map = pickle.loads(pickle.dumps(transformer_data_map, protocol))
+        self.assertEqual(copied_map[OtherMockTransformer].other, u'other val')
+        self.assertEqual(lazy_sections.pending, frozenset())
+
+        copied_data_map = pickle.loads(pickle.dumps(block_data_map, pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(copied_data_map[3].transformer_data[OtherMockTransformer].other, u'other val')
+        self.assertEqual(copied_data_map[6].transformer_data[MockTransformer].test, 6)
+
+    def test_missing_transformer(self):
+        _, _, block_data_map, _ = self._deserialize()
+        with self.assertRaises(KeyError):
+            block_data_map[0].transformer_data['unknown']  # pylint: disable=pointless-statement
+
+    def test_from_memoryview(self):
+        serialized_data = memoryview(serialization.serialize(self.block_structure))
+        _, _, block_data_map, _ = serialization.deserialize(serialized_data)
+        self.assertEqual(block_data_map[5].transformer_data[MockTransformer].test, 5)
+
+    def test_invalid_data(self):
+        with self.assertRaises(ValueError):
+            serialization.deserialize(zpickle((1, 2, 3)))
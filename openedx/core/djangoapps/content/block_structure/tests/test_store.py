@@ -8,7 +8,7 @@ from edx_toggles.toggles.testutils import override_waffle_switch
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
-from ..config import STORAGE_BACKING_FOR_CACHE, waffle_switch
+from ..config import COLUMNAR_SERIALIZATION, STORAGE_BACKING_FOR_CACHE, waffle_switch
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
 from ..store import BlockStructureStore
@@ -68,6 +68,40 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
             with self.assertRaises(BlockStructureNotFound):
                 self.store.get(self.block_structure.root_block_usage_key)
 
+    @ddt.data(True, False)
+    def test_add_and_get_columnar(self, with_storage_backing):
+        with override_waffle_switch(waffle_switch(STORAGE_BACKING_FOR_CACHE), active=with_storage_backing):
+            with override_waffle_switch(waffle_switch(COLUMNAR_SERIALIZATION), active=True):
+                self.store.add(self.block_structure)
+                stored_value = self.store.get(self.block_structure.root_block_usage_key, [MockTransformer])
+            self.assert_block_structure(stored_value, self.children_map)
+            self.assertEqual(
+                stored_value.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test'),
+                u'{} val'.format(MockTransformer.name()),
+            )
+
+    @ddt.data(True, False)
+    def test_read_both_formats(self, write_columnar):
+        """
+        Data written in either format remains readable after the
+        columnar serialization switch is toggled.
+        """
+        with override_waffle_switch(waffle_switch(STORAGE_BACKING_FOR_CACHE), active=True):
+            with override_waffle_switch(waffle_switch(COLUMNAR_SERIALIZATION), active=write_columnar):
+                self.store.add(self.block_structure)
+            with override_waffle_switch(waffle_switch(COLUMNAR_SERIALIZATION), active=not write_columnar):
+                self.mock_cache.map.clear()
+                stored_value = self.store.get(self.block_structure.root_block_usage_key)
+                self.assert_block_structure(stored_value, self.children_map)
+
+                # Rewriting a lazily loaded structure includes all of its data.
+                self.store.add(stored_value.copy())
+                stored_value = self.store.get(self.block_structure.root_block_usage_key)
+                self.assertEqual(
+                    stored_value.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test'),
+                    u'{} val'.format(MockTransformer.name()),
+                )
+
     def test_uncached_without_storage(self):
         self.store.add(self.block_structure)
         self.mock_cache.map.clear()
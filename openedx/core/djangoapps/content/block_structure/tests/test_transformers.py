@@ -10,7 +10,13 @@ from mock import MagicMock, patch
 from ..block_structure import BlockStructureModulestoreData
 from ..exceptions import TransformerDataIncompatible, TransformerException
 from ..transformers import BlockStructureTransformers
-from .helpers import ChildrenMapTestMixin, MockFilteringTransformer, MockTransformer, mock_registered_transformers
+from .helpers import (
+    ChildrenMapTestMixin,
+    MockFilteringTransformer,
+    MockTransformer,
+    MockXBlock,
+    mock_registered_transformers
+)
 
 
 class TestBlockStructureTransformers(ChildrenMapTestMixin, TestCase):
@@ -82,3 +88,101 @@ class TestBlockStructureTransformers(ChildrenMapTestMixin, TestCase):
                 self.transformers.verify_versions(block_structure)
             self.transformers.collect(block_structure)
             self.assertTrue(self.transformers.verify_versions(block_structure))
+
+
+class IncrementalMockTransformer(MockTransformer):
+    """
+    Mock transformer that supports incremental collection, and collects
+    the version of each block's xBlock.
+    """
+    SUPPORTS_INCREMENTAL_COLLECT = True
+
+    @classmethod
+    def collect(cls, block_structure):
+        block_structure.request_xblock_fields('display_name')
+        for block_key in block_structure.topological_traversal():
+            if block_structure.should_collect(block_key, cls):
+                xblock = block_structure.get_xblock(block_key)
+                block_structure.set_transformer_block_field(block_key, cls, 'version', xblock.update_version)
+
+
+class TestIncrementalCollect(ChildrenMapTestMixin, TestCase):
+    """
+    Tests for collecting only the data of the blocks affected by changes
+    since the previous collection.
+    """
+    def setUp(self):
+        super(TestIncrementalCollect, self).setUp()
+        self.registered_transformers = [IncrementalMockTransformer(), MockTransformer()]
+
+    def collect(self, versions, previous_block_structure=None):
+        """
+        Returns a block structure of SIMPLE_CHILDREN_MAP collected from
+        xBlocks of the given versions, and whether each block's data was
+        recollected by each transformer.
+        """
+        block_structure = self.create_block_structure(self.SIMPLE_CHILDREN_MAP, BlockStructureModulestoreData)
+        for block_key, version in enumerate(versions):
+            block_structure._add_xblock(  # pylint: disable=protected-access
+                block_key,
+                MockXBlock(block_key, {'update_version': version, 'display_name': u'{}-{}'.format(block_key, version)}),
+            )
+        with mock_registered_transformers(self.registered_transformers):
+            BlockStructureTransformers.collect(block_structure, previous_block_structure)
+        return block_structure
+
+    def test_full_collect_without_previous_versions(self):
+        previous_block_structure = self.create_block_structure(self.SIMPLE_CHILDREN_MAP)
+        block_structure = self.collect([1] * 5, previous_block_structure)
+        for block_key in block_structure:
+            for transformer in self.registered_transformers:
+                self.assertTrue(block_structure.should_collect(block_key, transformer))
+
+    def test_incremental_collect(self):
+        previous_block_structure = self.collect([1] * 5)
+
+        # Block 3 changed, which affects its ancestors 1 and 0.
+        block_structure = self.collect([1, 1, 1, 2, 1], previous_block_structure)
+
+        for block_key in (0, 1, 3):
+            self.assertTrue(block_structure.should_collect(block_key, IncrementalMockTransformer))
+        for block_key in (2, 4):
+            self.assertFalse(block_structure.should_collect(block_key, IncrementalMockTransformer))
+        for block_key in block_structure:
+            self.assertTrue(block_structure.should_collect(block_key, MockTransformer))
+
+        self.assertEqual(
+            [
+                block_structure.get_transformer_block_field(block_key, IncrementalMockTransformer, 'version')
+                for block_key in range(5)
+            ],
+            [1, 1, 1, 2, 1],
+        )
+        self.assertEqual(
+            [block_structure.get_xblock_field(block_key, 'display_name') for block_key in range(5)],
+            [u'0-1', u'1-1', u'2-1', u'3-2', u'4-1'],
+        )
+
+    def test_unchanged_fields_of_unaffected_blocks_are_kept(self):
+        previous_block_structure = self.collect([1] * 5)
+        block_structure = self.create_block_structure(self.SIMPLE_CHILDREN_MAP, BlockStructureModulestoreData)
+        for block_key in range(5):
+            version = 2 if block_key == 3 else 1
+            block_structure._add_xblock(  # pylint: disable=protected-access
+                block_key,
+                MockXBlock(block_key, {'update_version': version, 'display_name': u'changed'}),
+            )
+        with mock_registered_transformers(self.registered_transformers):
+            BlockStructureTransformers.collect(block_structure, previous_block_structure)
+
+        # Only the display names of affected blocks are read from their xBlocks.
+        self.assertEqual(
+            [block_structure.get_xblock_field(block_key, 'display_name') for block_key in range(5)],
+            [u'changed', u'changed', u'2-1', u'changed', u'4-1'],
+        )
+
+    def test_all_blocks_affected(self):
+        previous_block_structure = self.collect([1] * 5)
+        block_structure = self.collect([2, 1, 1, 1, 1], previous_block_structure)
+        for block_key in block_structure:
+            self.assertTrue(block_structure.should_collect(block_key, IncrementalMockTransformer))
@@ -58,6 +58,21 @@ class BlockStructureTransformer(object):
     WRITE_VERSION = 0
     READ_VERSION = 0
 
+    # Whether the transformer supports incremental collection.
+    #
+    # When a block structure is recollected after only some of its
+    # blocks changed, the previously collected data of a transformer
+    # that supports it is kept for the blocks that are unaffected by
+    # the changes.  A block is affected if it changed, or if it is an
+    # ancestor or descendant of a changed block.
+    #
+    # Such a transformer's collect method must only collect data for
+    # the blocks for which block_structure.should_collect returns True,
+    # and its collected data for a block must depend on nothing but the
+    # block's ancestors and descendants.
+    #
+    SUPPORTS_INCREMENTAL_COLLECT = False
+
     @classmethod
     def name(cls):
         """
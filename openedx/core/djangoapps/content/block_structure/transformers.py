@@ -71,17 +71,33 @@ class BlockStructureTransformers(object):
                 self._transformers['no_filter'].append(transformer)
         return self
 
+    def get_transformers(self):
+        """
+        Returns the list of all transformers in the collection.
+        """
+        return self._transformers['supports_filter'] + self._transformers['no_filter']
+
     @classmethod
-    def collect(cls, block_structure):
+    def collect(cls, block_structure, previous_block_structure=None):
         """
         Collects data for each registered transformer.
+
+        If the previously collected block structure is given,
+        transformers that support incremental collection keep its data
+        for the blocks that are unaffected by the changes since then.
         """
-        for transformer in TransformerRegistry.get_registered_transformers():
+        transformers = TransformerRegistry.get_registered_transformers()
+        if previous_block_structure is not None:
+            # pylint: disable=protected-access
+            block_structure._prepare_incremental_collect(previous_block_structure, transformers)
+
+        for transformer in transformers:
             block_structure._add_transformer(transformer)  # pylint: disable=protected-access
             transformer.collect(block_structure)
 
         # Collect all fields that were requested by the transformers.
         block_structure._collect_requested_xblock_fields()  # pylint: disable=protected-access
+        block_structure._collect_block_versions()  # pylint: disable=protected-access
 
     @classmethod
     def verify_versions(cls, block_structure):
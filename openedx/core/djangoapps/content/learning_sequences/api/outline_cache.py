@@ -0,0 +1,89 @@
+"""
+Process-local cache of CourseOutlineData, and of what OutlineProcessors derive
+from an outline alone.
+
+Fetching a cached CourseOutlineData from the Django cache still means a network
+round trip and unpickling hundreds of objects, on every request for a user's
+outline. Since the stored outline of a course only changes when it is replaced,
+which saves its CourseContext, this cache keeps outlines in each process by
+course key, published version, and CourseContext modification time, and never
+serves stale data.
+
+The user-independent results of OutlineProcessors (e.g. the set of sequences
+hidden from all students) are kept alongside the outline they were computed
+from, so they are computed once per outline and process rather than per user.
+"""
+import threading
+
+from openedx.core.lib.cache_utils import LRUCache
+
+# Number of course outlines kept in each process.
+OUTLINE_CACHE_SIZE = 64
+
+
+class OutlineCache:
+    """
+    A thread-safe, size-bounded LRU cache of course outlines and of results
+    derived from them.
+    """
+    def __init__(self, max_size=OUTLINE_CACHE_SIZE):
+        self._lock = threading.Lock()
+        # (course_key, published_version, modified) -> CourseOutlineData
+        self._outlines = LRUCache(max_size)
+        # id(CourseOutlineData) -> (CourseOutlineData, {name: result}), for
+        # the cached outlines
+        self._results = {}
+
+    def get(self, cache_key):
+        """
+        Return the outline cached under `cache_key`, or None.
+        """
+        return self._outlines.get(cache_key)
+
+    def set(self, cache_key, outline):
+        """
+        Cache `outline` under `cache_key`, evicting the least recently used
+        outlines past the maximum size.
+        """
+        with self._lock:
+            previous = self._outlines.pop(cache_key)
+            if previous is not None:
+                self._results.pop(id(previous), None)
+            for _, evicted in self._outlines.set(cache_key, outline):
+                self._results.pop(id(evicted), None)
+            self._results[id(outline)] = (outline, {})
+
+    def memoize(self, outline, name, compute):
+        """
+        Return `compute()`, which must only depend on `outline`, computing it
+        once per cached outline.
+
+        Outlines that aren't in this cache (e.g. built by tests) aren't
+        memoized.
+        """
+        results = self._get_results(outline)
+        if results is not None and name in results:
+            return results[name]
+        result = compute()
+        if results is not None:
+            results[name] = result
+        return result
+
+    def clear(self):
+        """
+        Remove everything from the cache.
+        """
+        with self._lock:
+            self._outlines.clear()
+            self._results.clear()
+
+    def _get_results(self, outline):
+        """
+        Return the dict of results derived from a cached outline, or None.
+        """
+        with self._lock:
+            cached_outline, results = self._results.get(id(outline), (None, None))
+        return results if cached_outline is outline else None
+
+
+outline_cache = OutlineCache()
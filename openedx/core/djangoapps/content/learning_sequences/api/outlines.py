@@ -33,6 +33,7 @@ from ..models import (
     LearningContext,
     LearningSequence
 )
+from .outline_cache import outline_cache
 from .permissions import can_see_all_content
 from .processors.content_gating import ContentGatingOutlineProcessor
 from .processors.milestones import MilestonesOutlineProcessor
@@ -63,6 +64,25 @@ def get_course_outline(course_key: CourseKey) -> CourseOutlineData:
     """
     course_context = _get_course_context_for_outline(course_key)
 
+    # Check to see if it's in this process. Replacing the outline saves the
+    # CourseContext, so its modification time tells apart outlines that were
+    # stored with the same published version.
+    process_cache_key = (
+        course_context.learning_context.context_key,
+        course_context.learning_context.published_version,
+        course_context.modified,
+    )
+    outline_data = outline_cache.get(process_cache_key)
+    if outline_data is None:
+        outline_data = _get_course_outline_for_context(course_context)
+        outline_cache.set(process_cache_key, outline_data)
+    return outline_data
+
+
+def _get_course_outline_for_context(course_context: CourseContext) -> CourseOutlineData:
+    """
+    Get the outline of a course run from the cache, or from its model data.
+    """
     # Check to see if it's in the cache.
     cache_key = "learning_sequences.api.get_course_outline.v1.{}.{}".format(
         course_context.learning_context.context_key, course_context.learning_context.published_version
@@ -238,7 +258,11 @@ def _get_user_course_outline_and_processors(course_key: CourseKey,
                 inaccessible_sequences |= processor_inaccessible_sequences
 
     # Open question: Does it make sense to remove a Section if it has no Sequences in it?
-    trimmed_course_outline = full_course_outline.remove(usage_keys_to_remove)
+    if usage_keys_to_remove:
+        trimmed_course_outline = full_course_outline.remove(usage_keys_to_remove)
+    else:
+        # Nothing is hidden from most enrolled students, so skip copying the outline.
+        trimmed_course_outline = full_course_outline
     accessible_sequences = set(trimmed_course_outline.sequences) - inaccessible_sequences
 
     user_course_outline = UserCourseOutlineData(
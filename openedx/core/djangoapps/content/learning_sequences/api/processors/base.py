@@ -8,6 +8,8 @@ from datetime import datetime
 from django.contrib.auth import get_user_model
 from opaque_keys.edx.keys import CourseKey, UsageKey
 
+from ..outline_cache import outline_cache
+
 User = get_user_model()
 log = logging.getLogger(__name__)
 
@@ -76,3 +78,14 @@ class OutlineProcessor:
         there is no need to check for staff access here.
         """
         return frozenset()
+
+    def memoize(self, full_course_outline, name, compute):
+        """
+        Return `compute()`, computing it only once for all users of the same
+        course outline in this process.
+
+        Use this for anything that depends on nothing but the
+        full_course_outline, like the set of sequences hidden from everyone.
+        The result is shared, so it must not be modified.
+        """
+        return outline_cache.memoize(full_course_outline, (self.__class__.__name__, name), compute)
@@ -30,10 +30,12 @@ class EnrollmentOutlineProcessor(OutlineProcessor):
             return frozenset()
 
         # Otherwise remove everything:
-        seqs_to_remove = set(full_course_outline.sequences)
-        sections_to_remove = set(sec.usage_key for sec in full_course_outline.sections)
+        def all_usage_keys():
+            seqs_to_remove = set(full_course_outline.sequences)
+            sections_to_remove = set(sec.usage_key for sec in full_course_outline.sections)
+            return frozenset(seqs_to_remove | sections_to_remove)
 
-        return frozenset(seqs_to_remove | sections_to_remove)
+        return self.memoize(full_course_outline, 'all_usage_keys', all_usage_keys)
 
     def inaccessible_sequences(self, full_course_outline):
         """
@@ -42,5 +44,7 @@ class EnrollmentOutlineProcessor(OutlineProcessor):
         is_public_outline = full_course_outline.course_visibility == CourseVisibility.PUBLIC_OUTLINE
         is_enrolled_in_course = CourseEnrollment.is_enrolled(self.user, self.course_key)
         if is_public_outline and not is_enrolled_in_course:
-            return frozenset(full_course_outline.sequences)
+            return self.memoize(
+                full_course_outline, 'all_sequences', lambda: frozenset(full_course_outline.sequences)
+            )
         return frozenset()
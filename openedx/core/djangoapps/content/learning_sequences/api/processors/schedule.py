@@ -68,7 +68,9 @@ class ScheduleOutlineProcessor(OutlineProcessor):
 
         # If the course hasn't started at all, then everything is inaccessible.
         if self._course_start is None or self.at_time < self._course_start - start_offset:
-            return set(full_course_outline.sequences)
+            return self.memoize(
+                full_course_outline, 'all_sequences', lambda: frozenset(full_course_outline.sequences)
+            )
 
         self_paced = full_course_outline.self_paced
 
@@ -29,14 +29,18 @@ class VisibilityOutlineProcessor(OutlineProcessor):
         def should_remove(visibility):
             return visibility.hide_from_toc or visibility.visible_to_staff_only
 
-        sections_to_remove = {
-            sec.usage_key
-            for sec in full_course_outline.sections
-            if should_remove(sec.visibility)
-        }
-        seqs_to_remove = {
-            seq.usage_key
-            for seq in full_course_outline.sequences.values()
-            if should_remove(seq.visibility)
-        }
-        return frozenset(sections_to_remove | seqs_to_remove)
+        def hidden_usage_keys():
+            sections_to_remove = {
+                sec.usage_key
+                for sec in full_course_outline.sections
+                if should_remove(sec.visibility)
+            }
+            seqs_to_remove = {
+                seq.usage_key
+                for seq in full_course_outline.sequences.values()
+                if should_remove(seq.visibility)
+            }
+            return frozenset(sections_to_remove | seqs_to_remove)
+
+        # This is the same for every user.
+        return self.memoize(full_course_outline, 'usage_keys_to_remove', hidden_usage_keys)
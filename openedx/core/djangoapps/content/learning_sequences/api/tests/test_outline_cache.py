@@ -0,0 +1,66 @@
+"""
+Tests for the process-local cache of course outlines.
+"""
+from unittest import TestCase
+
+from mock import Mock
+
+from ..outline_cache import OutlineCache
+
+
+class OutlineCacheTestCase(TestCase):
+    """
+    Tests for OutlineCache, with stand-ins for CourseOutlineData.
+    """
+    def setUp(self):
+        super().setUp()
+        self.cache = OutlineCache(max_size=2)
+
+    def test_get_and_set(self):
+        outline = object()
+        assert self.cache.get(('course', 'v1', 1)) is None
+        self.cache.set(('course', 'v1', 1), outline)
+        assert self.cache.get(('course', 'v1', 1)) is outline
+        assert self.cache.get(('course', 'v1', 2)) is None
+
+    def test_least_recently_used_evicted(self):
+        outlines = [object() for _ in range(3)]
+        self.cache.set('a', outlines[0])
+        self.cache.set('b', outlines[1])
+        self.cache.get('a')
+        self.cache.set('c', outlines[2])
+        assert self.cache.get('a') is outlines[0]
+        assert self.cache.get('b') is None
+        assert self.cache.get('c') is outlines[2]
+
+    def test_memoize(self):
+        outline = object()
+        compute = Mock(return_value=frozenset(['hidden']))
+        self.cache.set('a', outline)
+
+        assert self.cache.memoize(outline, 'hidden', compute) == frozenset(['hidden'])
+        assert self.cache.memoize(outline, 'hidden', compute) == frozenset(['hidden'])
+        assert compute.call_count == 1
+
+        # Results are per outline: a new outline for the same key starts over.
+        new_outline = object()
+        self.cache.set('a', new_outline)
+        self.cache.memoize(new_outline, 'hidden', compute)
+        assert compute.call_count == 2
+
+    def test_memoize_uncached_outline(self):
+        outline = object()
+        compute = Mock(return_value=frozenset())
+        self.cache.memoize(outline, 'hidden', compute)
+        self.cache.memoize(outline, 'hidden', compute)
+        assert compute.call_count == 2
+
+    def test_memoize_evicted_outline(self):
+        outline = object()
+        compute = Mock(return_value=frozenset())
+        self.cache.set('a', outline)
+        self.cache.set('b', object())
+        self.cache.set('c', object())
+        self.cache.memoize(outline, 'hidden', compute)
+        self.cache.memoize(outline, 'hidden', compute)
+        assert compute.call_count == 2
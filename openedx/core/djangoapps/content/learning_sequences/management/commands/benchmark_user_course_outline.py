@@ -0,0 +1,119 @@
+"""
+Command to measure the latency of user course outlines, as when a mobile app
+refreshes the outline of a course.
+"""
+import timeit
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from edx_django_utils.cache import RequestCache, TieredCache
+from opaque_keys.edx.keys import CourseKey
+
+from ...api import get_course_outline, get_user_course_outline, replace_course_outline
+from ...api.outline_cache import outline_cache
+from ...data import (
+    CourseLearningSequenceData,
+    CourseOutlineData,
+    CourseSectionData,
+    CourseVisibility,
+    VisibilityData
+)
+
+User = get_user_model()
+
+# Number of sequences per section of generated outlines.
+SEQUENCES_PER_SECTION = 10
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms benchmark_user_course_outline course-v1:edX+DemoX+Demo_Course staff --settings=devstack
+        $ ./manage.py lms benchmark_user_course_outline course-v1:Bench+Outline+300 staff --generate-sequences 300
+    """
+    help = "Measures the latency of a user's course outline over repeated requests."
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_key')
+        parser.add_argument('username')
+        parser.add_argument(
+            '--requests',
+            help='Number of timed outline requests.',
+            default=100,
+            type=int,
+        )
+        parser.add_argument(
+            '--generate-sequences',
+            help='Create an outline with this many sequences for the course, which must not have one.',
+            default=0,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        course_key = CourseKey.from_string(options['course_key'])
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError("No user {}".format(options['username']))
+
+        if options['generate_sequences']:
+            self._generate_outline(course_key, options['generate_sequences'])
+        self.stdout.write("{} sequences".format(len(get_course_outline(course_key).sequences)))
+
+        def request_outline():
+            # Each request starts with an empty request cache.
+            RequestCache.clear_all_namespaces()
+            get_user_course_outline(course_key, user, datetime.now(timezone.utc))
+
+        def request_outline_uncached():
+            outline_cache.clear()
+            TieredCache.dangerous_clear_all_tiers()
+            request_outline()
+
+        for name, request in (('uncached', request_outline_uncached), ('cached', request_outline)):
+            timings = sorted(timeit.repeat(request, number=1, repeat=options['requests']))
+            self.stdout.write("{:<8} outline: median {:>7.2f} ms, 95th percentile {:>7.2f} ms".format(
+                name,
+                timings[len(timings) // 2] * 1000,
+                timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000,
+            ))
+
+    def _generate_outline(self, course_key, num_sequences):
+        """
+        Store an outline with `num_sequences` sequences for the course.
+        """
+        try:
+            get_course_outline(course_key)
+        except CourseOutlineData.DoesNotExist:
+            pass
+        else:
+            raise CommandError("{} already has an outline, which would be replaced".format(course_key))
+
+        visibility = VisibilityData(hide_from_toc=False, visible_to_staff_only=False)
+        sections = []
+        for section_num, first in enumerate(range(0, num_sequences, SEQUENCES_PER_SECTION)):
+            sections.append(CourseSectionData(
+                usage_key=course_key.make_usage_key('chapter', 'bench_chapter_{}'.format(section_num)),
+                title="Chapter {}".format(section_num),
+                visibility=visibility,
+                sequences=[
+                    CourseLearningSequenceData(
+                        usage_key=course_key.make_usage_key('sequential', 'bench_seq_{}'.format(seq_num)),
+                        title="Sequence {}".format(seq_num),
+                        visibility=visibility,
+                    )
+                    for seq_num in range(first, min(first + SEQUENCES_PER_SECTION, num_sequences))
+                ],
+            ))
+        replace_course_outline(CourseOutlineData(
+            course_key=course_key,
+            title="Outline benchmark course",
+            published_at=datetime.now(timezone.utc),
+            published_version="benchmark",
+            entrance_exam_id=None,
+            days_early_for_beta=None,
+            sections=sections,
+            self_paced=False,
+            course_visibility=CourseVisibility.PRIVATE,
+        ))
@@ -0,0 +1,249 @@
+"""
+Local disk cache of large course assets.
+
+Assets that are too large for memcached are otherwise read from GridFS on
+every request.  This cache keeps copies of them in a local directory, named
+after their location and content digest, so that an asset which changes is
+cached under a new name and its old copy ages out.  The least recently served
+files are removed once the directory grows past its maximum size.
+
+Files are written to a temporary name and renamed into place, so that several
+processes can share the directory.
+"""
+
+
+import hashlib
+import logging
+import os
+import tempfile
+import time
+
+from django.conf import settings
+from six import text_type
+
+log = logging.getLogger(__name__)
+
+# Suffix of the files that are being written.
+TEMP_FILE_SUFFIX = '.tmp'
+
+# Temporary files older than this many seconds were left by a process that
+# didn't finish writing them, and are removed when evicting.
+STALE_TEMP_FILE_AGE = 60 * 60
+
+
+def get_asset_disk_cache():
+    """
+    Returns the AssetDiskCache configured by the CONTENTSERVER_DISK_CACHE
+    setting, or None if the disk cache is disabled.
+    """
+    config = getattr(settings, 'CONTENTSERVER_DISK_CACHE', None) or {}
+    if not config.get('DIRECTORY'):
+        return None
+    return AssetDiskCache(
+        config['DIRECTORY'],
+        max_size=config.get('MAX_SIZE', AssetDiskCache.DEFAULT_MAX_SIZE),
+        min_asset_size=config.get('MIN_ASSET_SIZE', 0),
+        max_asset_size=config.get('MAX_ASSET_SIZE'),
+    )
+
+
+class AssetDiskCache(object):
+    """
+    A size-bounded directory of course asset files.
+    """
+    DEFAULT_MAX_SIZE = 10 * 1024 * 1024 * 1024
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE, min_asset_size=0, max_asset_size=None):
+        self.directory = directory
+        self.max_size = max_size
+        self.min_asset_size = min_asset_size
+        self.max_asset_size = max_asset_size
+
+    def is_cacheable(self, content):
+        """
+        Returns whether the given content should be cached.  Content without a
+        digest can't be told apart from an updated version of itself, so it
+        isn't cached.
+        """
+        if not getattr(content, 'content_digest', None) or content.length is None:
+            return False
+        if content.length < self.min_asset_size:
+            return False
+        return self.max_asset_size is None or content.length <= self.max_asset_size
+
+    def path(self, content):
+        """
+        Returns the path of the cache file of the given content.
+        """
+        key = u'{}:{}'.format(text_type(content.location), content.content_digest)
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def open(self, content):
+        """
+        Returns the cache file of the given content, opened for reading, or
+        None if it isn't cached.
+        """
+        path = self.path(content)
+        try:
+            cached_file = open(path, 'rb')
+        except (IOError, OSError):
+            return None
+        if os.fstat(cached_file.fileno()).st_size != content.length:
+            cached_file.close()
+            return None
+        try:
+            # The modification time is the last time the file was served.
+            os.utime(path, None)
+        except OSError:
+            # The file was just evicted, but remains readable while it is open.
+            pass
+        return cached_file
+
+    def add(self, content, chunk_size):
+        """
+        Copies the given content stream to the cache, and returns the cache
+        file opened for reading, or None if it couldn't be written.
+        """
+        for _ in self.stream_and_add(content, chunk_size):
+            pass
+        return self.open(content)
+
+    def stream_and_add(self, content, chunk_size):
+        """
+        Yields the data of the given content stream, while copying it to the
+        cache.
+
+        Errors writing the cache file only stop the copy.  The file is
+        added to the cache once all of the data has been read, so a client
+        that disconnects before then leaves nothing behind.
+        """
+        temp_file = self._create_temp_file()
+        try:
+            for chunk in content.stream_data(chunk_size):
+                if temp_file is not None:
+                    try:
+                        temp_file.write(chunk)
+                    except (IOError, OSError):
+                        log.exception(u'Error writing %s to the asset disk cache', text_type(content.location))
+                        self._discard(temp_file)
+                        temp_file = None
+                yield chunk
+            if temp_file is not None:
+                self._commit(temp_file, self.path(content))
+                temp_file = None
+        finally:
+            if temp_file is not None:
+                self._discard(temp_file)
+
+    def evict(self):
+        """
+        Removes the least recently served files until the cache fits in its
+        maximum size, along with stale temporary files.
+        """
+        now = time.time()
+        files = []
+        total_size = 0
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if name.endswith(TEMP_FILE_SUFFIX):
+                if now - stat.st_mtime > STALE_TEMP_FILE_AGE:
+                    self._remove(path)
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+
+        files.sort()
+        for _, size, path in files:
+            if total_size <= self.max_size:
+                break
+            self._remove(path)
+            total_size -= size
+
+    def _create_temp_file(self):
+        """
+        Returns a new temporary file in the cache directory, or None if it
+        couldn't be created.
+        """
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            return tempfile.NamedTemporaryFile(suffix=TEMP_FILE_SUFFIX, dir=self.directory, delete=False)
+        except (IOError, OSError):
+            log.exception(u'Error creating a file in the asset disk cache %s', self.directory)
+            return None
+
+    def _commit(self, temp_file, path):
+        """
+        Moves a complete temporary file to the given cache path.
+        """
+        try:
+            temp_file.close()
+            os.rename(temp_file.name, path)
+        except (IOError, OSError):
+            log.exception(u'Error adding %s to the asset disk cache', path)
+            self._remove(temp_file.name)
+            return
+        self.evict()
+
+    def _discard(self, temp_file):
+        """
+        Closes and removes a temporary file.
+        """
+        try:
+            temp_file.close()
+        except (IOError, OSError):
+            pass
+        self._remove(temp_file.name)
+
+    @staticmethod
+    def _remove(path):
+        """
+        Removes a file, unless another process already did.
+        """
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class FileRange(object):
+    """
+    A file-like object over `length` bytes of a file, from `offset`.
+
+    It has no name, so that FileResponse doesn't derive headers from the
+    cache file, and it has a file descriptor, positioned at `offset`, so that
+    WSGI servers whose `wsgi.file_wrapper` uses sendfile, limited to the
+    response's Content-Length, can send the range without reading it.
+    """
+
+    def __init__(self, file_obj, offset, length):
+        file_obj.seek(offset)
+        self._file = file_obj
+        self._remaining = length
+
+    def read(self, size=-1):
+        """
+        Reads at most `size` bytes, up to the end of the range.
+        """
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def tell(self):
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
@@ -8,12 +8,14 @@ import logging
 
 import six
 from django.http import (
+    FileResponse,
     HttpResponse,
     HttpResponseBadRequest,
     HttpResponseForbidden,
     HttpResponseNotFound,
     HttpResponseNotModified,
-    HttpResponsePermanentRedirect
+    HttpResponsePermanentRedirect,
+    StreamingHttpResponse
 )
 from django.utils.deprecation import MiddlewareMixin
 from opaque_keys import InvalidKeyError
@@ -23,12 +25,13 @@ from six import text_type
 from openedx.core.djangoapps.header_control import force_header_for_response
 from common.djangoapps.student.models import CourseEnrollment
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import XASSET_LOCATION_TAG, StaticContent
+from xmodule.contentstore.content import XASSET_LOCATION_TAG, StaticContent, StaticContentStream
 from xmodule.exceptions import NotFoundError
 from xmodule.modulestore import InvalidLocationError
 from xmodule.modulestore.exceptions import ItemNotFoundError
 
 from .caching import get_cached_content, set_cached_content
+from .disk_cache import FileRange, get_asset_disk_cache
 from .models import CdnUserAgentsConfig, CourseAssetCacheTtlConfig
 
 log = logging.getLogger(__name__)
@@ -43,6 +46,9 @@ except ImportError:
 
 HTTP_DATE_FORMAT = u"%a, %d %b %Y %H:%M:%S GMT"
 
+# Size of the reads from streamed assets, which matches the default GridFS chunk size.
+STREAM_CHUNK_SIZE = 255 * 1024
+
 
 class StaticContentServer(MiddlewareMixin):
     """
@@ -134,10 +140,6 @@ class StaticContentServer(MiddlewareMixin):
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
             response = None
             if request.META.get('HTTP_RANGE'):
-                # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-                if isinstance(content, StaticContent):
-                    content = AssetManager.find(loc, as_stream=True)
-
                 header_value = request.META['HTTP_RANGE']
                 try:
                     unit, ranges = parse_range_header(header_value, content.length)
@@ -163,7 +165,7 @@ class StaticContentServer(MiddlewareMixin):
 
                         if 0 <= first <= last < content.length:
                             # If the byte range is satisfiable
-                            response = HttpResponse(content.stream_data_in_range(first, last))
+                            response = self.get_range_response(content, first, last)
                             response['Content-Range'] = u'bytes {first}-{last}/{length}'.format(
                                 first=first, last=last, length=content.length
                             )
@@ -181,7 +183,7 @@ class StaticContentServer(MiddlewareMixin):
 
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
-                response = HttpResponse(content.stream_data())
+                response = self.get_full_response(content)
                 response['Content-Length'] = content.length
 
             if newrelic:
@@ -201,6 +203,67 @@ class StaticContentServer(MiddlewareMixin):
 
             return response
 
+    def get_full_response(self, content):
+        """
+        Returns a response with all of the content's data.
+
+        Streamed content is served from the asset disk cache if it is cached,
+        and added to it while it is streamed otherwise.
+        """
+        if not isinstance(content, StaticContentStream):
+            return HttpResponse(content.data)
+
+        disk_cache = get_asset_disk_cache()
+        if disk_cache is None or not disk_cache.is_cacheable(content):
+            return StreamingHttpResponse(_closing(content.stream_data(STREAM_CHUNK_SIZE), content))
+
+        cached_file = disk_cache.open(content)
+        if cached_file is None:
+            self._set_disk_cache_parameter(False)
+            return StreamingHttpResponse(_closing(disk_cache.stream_and_add(content, STREAM_CHUNK_SIZE), content))
+
+        self._set_disk_cache_parameter(True)
+        content.close()
+        return FileResponse(FileRange(cached_file, 0, content.length))
+
+    def get_range_response(self, content, first, last):
+        """
+        Returns a response with the content's data from byte `first` to byte
+        `last`, included.
+
+        Streamed content is added to the asset disk cache first if it isn't
+        cached, so that each range of it is read from a local file rather than
+        GridFS.
+        """
+        if not isinstance(content, StaticContentStream):
+            return HttpResponse(content.data[first:last + 1])
+
+        disk_cache = get_asset_disk_cache()
+        if disk_cache is None or not disk_cache.is_cacheable(content):
+            return StreamingHttpResponse(
+                _closing(content.stream_data_in_range(first, last, STREAM_CHUNK_SIZE), content)
+            )
+
+        cached_file = disk_cache.open(content)
+        self._set_disk_cache_parameter(cached_file is not None)
+        if cached_file is None:
+            cached_file = disk_cache.add(content, STREAM_CHUNK_SIZE)
+            if cached_file is None:
+                return StreamingHttpResponse(
+                    _closing(content.stream_data_in_range(first, last, STREAM_CHUNK_SIZE), content)
+                )
+
+        content.close()
+        return FileResponse(FileRange(cached_file, first, last - first + 1))
+
+    @staticmethod
+    def _set_disk_cache_parameter(is_hit):
+        """
+        Reports whether the asset was served from the asset disk cache.
+        """
+        if newrelic:
+            newrelic.agent.add_custom_parameter('contentserver.disk_cache_hit', is_hit)
+
     def set_caching_headers(self, content, response):
         """
         Sets caching headers based on whether or not the asset is locked.
@@ -305,6 +368,18 @@ class StaticContentServer(MiddlewareMixin):
         return content
 
 
+def _closing(data, content):
+    """
+    Yields the given data, and closes the content's stream once it is
+    exhausted or the response is closed.
+    """
+    try:
+        for chunk in data:
+            yield chunk
+    finally:
+        content.close()
+
+
 def parse_range_header(header_value, content_length):
     """
     Returns the unit and a list of (start, end) tuples of ranges.
@@ -8,7 +8,10 @@ import copy
 import datetime
 import ddt
 import logging
+import os
+import shutil
 import six
+import tempfile
 import unittest
 from uuid import uuid4
 
@@ -104,6 +107,14 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         cls.url_unlocked_versioned_old_style = get_old_style_versioned_asset_url(cls.url_unlocked)
         cls.length_unlocked = cls.contentstore.get_attr(cls.unlocked_asset, 'length')
 
+        # An asset too large for the in-memory cache, so that it is streamed
+        cls.large_asset = cls.course_key.make_asset_key('asset', 'large_static.pdf')
+        cls.url_large = six.text_type(cls.large_asset)
+        cls.data_large = bytes(bytearray(index % 251 for index in range(3 * 1024 * 1024)))
+        cls.contentstore.save(
+            StaticContent(cls.large_asset, 'large_static.pdf', 'application/pdf', cls.data_large)
+        )
+
     def setUp(self):
         """
         Create user and login.
@@ -284,6 +295,77 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
             first=(self.length_unlocked), last=(self.length_unlocked)))
         self.assertEqual(resp.status_code, 416)
 
+    def test_large_asset_streamed(self):
+        """
+        Test that assets too large for the in-memory cache are streamed.
+        """
+        resp = self.client.get(self.url_large)
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        self.assertEqual(resp['Content-Length'], str(len(self.data_large)))
+        self.assertEqual(resp['Content-Type'], 'application/pdf')
+        self.assertEqual(b''.join(resp.streaming_content), self.data_large)
+
+    def test_large_asset_range_request(self):
+        """
+        Test that a range request for a streamed asset streams that range.
+        """
+        resp = self.client.get(self.url_large, HTTP_RANGE='bytes=1000-1999999')
+        self.assertEqual(resp.status_code, 206)
+        self.assertEqual(resp['Content-Range'], u'bytes 1000-1999999/{}'.format(len(self.data_large)))
+        self.assertEqual(b''.join(resp.streaming_content), self.data_large[1000:2000000])
+
+    def test_small_asset_range_request(self):
+        """
+        Test that a range request for a small asset is served from its data in memory,
+        without finding the asset again.
+        """
+        with patch.object(AssetManager, 'find', wraps=AssetManager.find) as mock_find:
+            resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=1-4')
+        self.assertEqual(mock_find.call_count, 1)
+        self.assertEqual(resp.status_code, 206)
+        self.assertFalse(resp.streaming)
+        self.assertEqual(len(resp.content), 4)
+
+    def test_large_asset_disk_cache(self):
+        """
+        Test that streamed assets are added to the disk cache, and then served from it.
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        with override_settings(CONTENTSERVER_DISK_CACHE={'DIRECTORY': cache_dir}):
+            resp = self.client.get(self.url_large)
+            self.assertEqual(b''.join(resp.streaming_content), self.data_large)
+            resp.close()
+
+            with patch('xmodule.contentstore.content.StaticContentStream.stream_data') as mock_stream_data:
+                resp = self.client.get(self.url_large)
+                self.assertEqual(resp.status_code, 200)
+                self.assertEqual(resp['Content-Length'], str(len(self.data_large)))
+                self.assertEqual(resp['Content-Type'], 'application/pdf')
+                self.assertEqual(b''.join(resp.streaming_content), self.data_large)
+                resp.close()
+
+                resp = self.client.get(self.url_large, HTTP_RANGE='bytes=-1000')
+                self.assertEqual(resp.status_code, 206)
+                self.assertEqual(resp['Content-Length'], '1000')
+                self.assertEqual(b''.join(resp.streaming_content), self.data_large[-1000:])
+                resp.close()
+            self.assertFalse(mock_stream_data.called)
+
+    def test_large_asset_range_request_disk_cache(self):
+        """
+        Test that a range request for a streamed asset adds it to the disk cache first.
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        with override_settings(CONTENTSERVER_DISK_CACHE={'DIRECTORY': cache_dir}):
+            resp = self.client.get(self.url_large, HTTP_RANGE='bytes=1000-1999')
+            self.assertEqual(resp.status_code, 206)
+            self.assertEqual(b''.join(resp.streaming_content), self.data_large[1000:2000])
+            resp.close()
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
     def test_vary_header_sent(self):
         """
         Tests that we're properly setting the Vary header to ensure browser requests don't get
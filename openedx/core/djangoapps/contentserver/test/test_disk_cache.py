@@ -0,0 +1,106 @@
+"""
+Tests for the asset disk cache.
+"""
+
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from django.test.utils import override_settings
+from opaque_keys.edx.locator import CourseLocator
+from xmodule.contentstore.content import StaticContentStream
+
+from ..disk_cache import AssetDiskCache, FileRange, get_asset_disk_cache
+
+COURSE_KEY = CourseLocator('edX', 'toy', '2012_Fall')
+
+
+def make_content(name, data, content_digest='digest'):
+    """
+    Returns a StaticContentStream of the given data.
+    """
+    location = COURSE_KEY.make_asset_key('asset', name)
+    return StaticContentStream(
+        location, name, 'application/pdf', io.BytesIO(data), length=len(data), content_digest=content_digest
+    )
+
+
+class AssetDiskCacheTestCase(unittest.TestCase):
+    """
+    Tests for AssetDiskCache.
+    """
+
+    def setUp(self):
+        super(AssetDiskCacheTestCase, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.disk_cache = AssetDiskCache(self.directory, max_size=250)
+
+    def test_is_cacheable(self):
+        disk_cache = AssetDiskCache(self.directory, min_asset_size=10, max_asset_size=20)
+        self.assertTrue(disk_cache.is_cacheable(make_content('a.pdf', b'x' * 10)))
+        self.assertTrue(disk_cache.is_cacheable(make_content('a.pdf', b'x' * 20)))
+        self.assertFalse(disk_cache.is_cacheable(make_content('a.pdf', b'x' * 9)))
+        self.assertFalse(disk_cache.is_cacheable(make_content('a.pdf', b'x' * 21)))
+        self.assertFalse(disk_cache.is_cacheable(make_content('a.pdf', b'x' * 10, content_digest=None)))
+
+    def test_add(self):
+        data = bytes(bytearray(range(100)))
+        self.assertIsNone(self.disk_cache.open(make_content('a.pdf', data)))
+
+        cached_file = self.disk_cache.add(make_content('a.pdf', data), chunk_size=7)
+        with cached_file:
+            self.assertEqual(cached_file.read(), data)
+        with self.disk_cache.open(make_content('a.pdf', data)) as cached_file:
+            self.assertEqual(cached_file.read(), data)
+
+        # An updated asset has a new digest, and so isn't cached yet.
+        self.assertIsNone(self.disk_cache.open(make_content('a.pdf', data, content_digest='updated')))
+
+    def test_stream_and_add(self):
+        data = b'x' * 100
+        self.assertEqual(b''.join(self.disk_cache.stream_and_add(make_content('a.pdf', data), 30)), data)
+        self.assertIsNotNone(self.disk_cache.open(make_content('a.pdf', data)))
+
+    def test_stream_interrupted(self):
+        stream = self.disk_cache.stream_and_add(make_content('a.pdf', b'x' * 100), 30)
+        next(stream)
+        stream.close()
+        self.assertIsNone(self.disk_cache.open(make_content('a.pdf', b'x' * 100)))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_evict_least_recently_served(self):
+        for served_at, name in enumerate(('a.pdf', 'b.pdf', 'c.pdf')):
+            self.disk_cache.add(make_content(name, b'x' * 100), 30).close()
+            # Make sure that the files were served at different times.
+            os.utime(self.disk_cache.path(make_content(name, b'')), (served_at, served_at))
+        self.assertIsNone(self.disk_cache.open(make_content('a.pdf', b'x' * 100)))
+        self.assertIsNotNone(self.disk_cache.open(make_content('b.pdf', b'x' * 100)))
+        self.assertIsNotNone(self.disk_cache.open(make_content('c.pdf', b'x' * 100)))
+
+    def test_get_asset_disk_cache(self):
+        with override_settings(CONTENTSERVER_DISK_CACHE={'DIRECTORY': None}):
+            self.assertIsNone(get_asset_disk_cache())
+        with override_settings(CONTENTSERVER_DISK_CACHE={'DIRECTORY': self.directory, 'MAX_SIZE': 10}):
+            disk_cache = get_asset_disk_cache()
+        self.assertEqual((disk_cache.directory, disk_cache.max_size), (self.directory, 10))
+
+
+class FileRangeTestCase(unittest.TestCase):
+    """
+    Tests for FileRange.
+    """
+
+    def test_read(self):
+        file_range = FileRange(io.BytesIO(bytes(bytearray(range(100)))), 10, 25)
+        self.assertEqual(file_range.tell(), 10)
+        self.assertEqual(file_range.read(20), bytes(bytearray(range(10, 30))))
+        self.assertEqual(file_range.read(20), bytes(bytearray(range(30, 35))))
+        self.assertEqual(file_range.read(20), b'')
+
+    def test_read_all(self):
+        file_range = FileRange(io.BytesIO(b'abcdef'), 2, 3)
+        self.assertEqual(file_range.read(), b'cde')
@@ -150,6 +150,10 @@ class User(models.Model):
             retrieve_params['course_id'] = text_type(self.course_id)
         if self.attributes.get('group_id'):
             retrieve_params['group_id'] = self.group_id
+        response = utils.get_cached_user(self.id, retrieve_params)
+        if response is not None:
+            self._update_from_response(response)
+            return
         try:
             response = utils.perform_request(
                 'get',
@@ -172,6 +176,7 @@ class User(models.Model):
                 )
             else:
                 raise
+        utils.cache_user(self.id, retrieve_params, response)
         self._update_from_response(response)
 
     def retire(self, retired_username):
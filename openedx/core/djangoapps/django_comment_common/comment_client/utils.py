@@ -2,17 +2,40 @@
 """" Common utilities for comment client wrapper """
 
 
+import json
 import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from http.cookiejar import DefaultCookiePolicy
 from uuid import uuid4
 
 import requests
 import six
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import translation
 from django.utils.translation import get_language
 
 from .settings import SERVICE_HOST as COMMENTS_SERVICE
 
 log = logging.getLogger(__name__)
 
+# Number of threads making requests for perform_in_parallel, in each process.
+PARALLEL_REQUEST_WORKERS = 8
+
+USER_CACHE_KEY = u'comment_client.user.{user_id}'
+USER_URL_PATTERN = re.compile(r'/users/(?P<user_id>[^/?]+)')
+
+_local = threading.local()
+_session_lock = threading.Lock()
+# (pid, pool size, requests.Session)
+_session = None
+_executor_lock = threading.Lock()
+_executor = None
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in six.iteritems(dic) if v is not None])
@@ -31,11 +54,139 @@ def extract(dic, keys):
         return strip_none({k: dic.get(k) for k in keys})
 
 
+def _get_forums_config():
+    """
+    Return the current ForumsConfig, which perform_in_parallel passes to its threads.
+    """
+    config = getattr(_local, 'forums_config', None)
+    if config is None:
+        # To avoid dependency conflict
+        from openedx.core.djangoapps.django_comment_common.models import ForumsConfig
+        config = ForumsConfig.current()
+    return config
+
+
+def _get_session():
+    """
+    Return the process's requests.Session for the comments service, which keeps up to
+    COMMENTS_SERVICE_POOL_SIZE connections alive, or None if connections aren't pooled.
+    """
+    global _session  # pylint: disable=global-statement
+    pool_size = getattr(settings, 'COMMENTS_SERVICE_POOL_SIZE', 0)
+    if not pool_size:
+        return None
+    with _session_lock:
+        # Connections aren't shared with processes forked after the session was created.
+        if _session is None or _session[:2] != (os.getpid(), pool_size):
+            session = requests.Session()
+            # The comments service doesn't use cookies, and no cookies are shared between users.
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = (os.getpid(), pool_size, session)
+        return _session[2]
+
+
+def _get_executor():
+    """
+    Return the process's executor for perform_in_parallel.
+    """
+    global _executor  # pylint: disable=global-statement
+    with _executor_lock:
+        if _executor is None or _executor[0] != os.getpid():
+            _executor = (os.getpid(), ThreadPoolExecutor(max_workers=PARALLEL_REQUEST_WORKERS))
+        return _executor[1]
+
+
+def perform_in_parallel(*calls):
+    """
+    Call each of `calls`, functions making independent requests to the comments service,
+    at the same time, and return their results in order.
+
+    The calls are made in other threads with the current language and ForumsConfig, and
+    mustn't otherwise depend on the state of the current thread (e.g. the request cache,
+    or a database transaction). Once all of them are done, the exception of the first
+    of `calls` which failed is raised.
+    """
+    if len(calls) < 2 or getattr(_local, 'forums_config', None) is not None:
+        # Calls made by other calls in parallel are made in turn, so they can't wait
+        # on threads that are busy with the calls waiting for them.
+        return [call() for call in calls]
+
+    config = _get_forums_config()
+    language = get_language()
+
+    def perform(call):
+        _local.forums_config = config
+        try:
+            with translation.override(language):
+                return call()
+        finally:
+            _local.forums_config = None
+
+    executor = _get_executor()
+    futures = [executor.submit(perform, call) for call in calls]
+    # Wait for every call, so none is left running past a failure
+    wait(futures)
+    return [future.result() for future in futures]
+
+
+def _user_cache_params_key(params):
+    """
+    Return the key of the cached comments service user retrieved with `params`.
+    """
+    return json.dumps(sorted((six.text_type(key), six.text_type(value)) for key, value in six.iteritems(params)))
+
+
+def get_cached_user(user_id, params):
+    """
+    Return the response for the comments service user with `user_id` retrieved with `params`, if
+    it's cached, or None.
+    """
+    if not getattr(settings, 'COMMENTS_SERVICE_USER_CACHE_TIMEOUT', 0):
+        return None
+    return (cache.get(USER_CACHE_KEY.format(user_id=user_id)) or {}).get(_user_cache_params_key(params))
+
+
+def cache_user(user_id, params, response):
+    """
+    Cache the response for the comments service user with `user_id` retrieved with `params`, for
+    COMMENTS_SERVICE_USER_CACHE_TIMEOUT seconds.
+    """
+    timeout = getattr(settings, 'COMMENTS_SERVICE_USER_CACHE_TIMEOUT', 0)
+    if not timeout:
+        return
+    cache_key = USER_CACHE_KEY.format(user_id=user_id)
+    responses = cache.get(cache_key) or {}
+    responses[_user_cache_params_key(params)] = response
+    cache.set(cache_key, responses, timeout)
+
+
+def invalidate_cached_user(user_id):
+    """
+    Remove the cached responses for the comments service user with `user_id`.
+    """
+    if getattr(settings, 'COMMENTS_SERVICE_USER_CACHE_TIMEOUT', 0):
+        cache.delete(USER_CACHE_KEY.format(user_id=user_id))
+
+
+def _invalidate_cached_users(url, data_or_params):
+    """
+    Remove the cached users who may have been changed by a request which isn't a GET: the user
+    whose url it is (e.g. following a thread), and the user it is made for (e.g. voting on or
+    creating a thread).
+    """
+    match = USER_URL_PATTERN.search(url)
+    if match:
+        invalidate_cached_user(match.group('user_id'))
+    if data_or_params.get('user_id'):
+        invalidate_cached_user(data_or_params['user_id'])
+
+
 def perform_request(method, url, data_or_params=None, raw=False,
                     metric_action=None, metric_tags=None, paged_results=False):
-    # To avoid dependency conflict
-    from openedx.core.djangoapps.django_comment_common.models import ForumsConfig
-    config = ForumsConfig.current()
+    config = _get_forums_config()
 
     if not config.enabled:
         raise CommentClientMaintenanceError('service disabled')
@@ -63,14 +214,20 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = data_or_params.copy()
         params.update(request_id_dict)
-    response = requests.request(
-        method,
-        url,
-        data=data,
-        params=params,
-        headers=headers,
-        timeout=config.connection_timeout
-    )
+    session = _get_session()
+    request = session.request if session is not None else requests.request
+    try:
+        response = request(
+            method,
+            url,
+            data=data,
+            params=params,
+            headers=headers,
+            timeout=config.connection_timeout
+        )
+    finally:
+        if method.lower() != 'get':
+            _invalidate_cached_users(url, data_or_params)
 
     metric_tags.append(u'status_code:{}'.format(response.status_code))
     status_code = int(response.status_code)
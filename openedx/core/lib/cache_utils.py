@@ -6,6 +6,7 @@ Utilities related to caching.
 import collections
 import functools
 import itertools
+import threading
 import zlib
 
 import six
@@ -153,6 +154,87 @@ class process_cached(object):  # pylint: disable=invalid-name
         return functools.partial(self.__call__, obj)
 
 
+class LRUCache(object):
+    """
+    A thread-safe, process-local cache that evicts its least recently used
+    entries to keep the total size of its values within a limit.
+
+    Each value is cached along with its size, in whatever unit suits the
+    caller: the default size of 1 bounds the cache by its number of entries,
+    while e.g. passing encoded lengths bounds it by bytes.
+    """
+    def __init__(self, max_size):
+        """
+        Arguments:
+            max_size (int): The maximum total size of the cached values.
+        """
+        self.max_size = max_size
+        self.size = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Return the value cached for ``key``, or ``default`` if it isn't cached.
+        """
+        with self._lock:
+            try:
+                value, size = self._entries.pop(key)
+            except KeyError:
+                return default
+            # Re-insert the entry to mark it as the most recently used.
+            self._entries[key] = (value, size)
+            return value
+
+    def set(self, key, value, size=1):
+        """
+        Cache ``value`` for ``key``, evicting the least recently used values
+        as needed to stay within the size limit. Values larger than the limit
+        aren't cached.
+
+        Returns:
+            The list of (key, value) pairs that were evicted.
+        """
+        if size > self.max_size:
+            return []
+
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            while self._entries and self.size + size > self.max_size:
+                evicted_key, (evicted_value, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                evicted.append((evicted_key, evicted_value))
+            self._entries[key] = (value, size)
+            self.size += size
+        return evicted
+
+    def pop(self, key, default=None):
+        """
+        Remove ``key`` from the cache, and return its value, or ``default``
+        if it isn't cached.
+        """
+        with self._lock:
+            try:
+                value, size = self._entries.pop(key)
+            except KeyError:
+                return default
+            self.size -= size
+            return value
+
+    def clear(self):
+        """
+        Remove all values from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
 class CacheInvalidationManager:
     """
     This class provides a decorator for simple functions, which can handle invalidation.
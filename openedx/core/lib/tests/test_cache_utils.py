@@ -10,7 +10,7 @@ import six
 from edx_django_utils.cache import RequestCache
 from mock import Mock
 
-from openedx.core.lib.cache_utils import request_cached
+from openedx.core.lib.cache_utils import LRUCache, request_cached
 
 
 @ddt.ddt
@@ -297,3 +297,53 @@ class TestRequestCachedDecorator(TestCase):
         result = wrapped(3)
         self.assertEqual(result, 2)
         self.assertEqual(to_be_wrapped.call_count, 2)
+
+
+class TestLRUCache(TestCase):
+    """
+    Test the size-bounded LRUCache.
+    """
+    def setUp(self):
+        super(TestLRUCache, self).setUp()
+        self.cache = LRUCache(max_size=100)
+
+    def test_get_and_set(self):
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.get('a', 'default'), 'default')
+        self.assertEqual(self.cache.set('a', {'_id': 'a'}, 10), [])
+        self.assertEqual(self.cache.get('a'), {'_id': 'a'})
+        self.assertEqual(self.cache.size, 10)
+
+    def test_evicts_least_recently_used_by_size(self):
+        self.cache.set('a', 'value a', 40)
+        self.cache.set('b', 'value b', 40)
+        # Using 'a' makes 'b' the least recently used value.
+        self.cache.get('a')
+        self.assertEqual(self.cache.set('c', 'value c', 40), [('b', 'value b')])
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a'), 'value a')
+        self.assertEqual(self.cache.size, 80)
+
+    def test_evicts_by_count(self):
+        cache = LRUCache(max_size=2)
+        cache.set('a', 'value a')
+        cache.set('b', 'value b')
+        self.assertEqual(cache.set('c', 'value c'), [('a', 'value a')])
+        self.assertEqual(len(cache), 2)
+
+    def test_replace(self):
+        self.cache.set('a', 'value a', 40)
+        self.cache.set('a', 'value a', 60)
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.size, 60)
+
+    def test_pop(self):
+        self.cache.set('a', 'value a', 40)
+        self.assertEqual(self.cache.pop('a'), 'value a')
+        self.assertIsNone(self.cache.pop('a'))
+        self.assertEqual(self.cache.size, 0)
+
+    def test_too_large(self):
+        self.assertEqual(self.cache.set('a', 'value a', 101), [])
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.size, 0)
@@ -272,6 +272,24 @@ def replace_static_urls(data_dir, block, view, frag, context, course_id=None, st
     ))
 
 
+def replace_urls(course_id, jump_to_id_base_url, data_dir, block, view, frag, context, static_asset_path=''):  # pylint: disable=unused-argument
+    """
+    Replaces the /static/, /course/ and /jump_to_id/ urls of the fragment as
+    replace_static_urls, replace_course_urls and replace_jump_to_id_urls do,
+    in a single scan.
+
+    The static urls of the course are resolved once per request, so this can
+    wrap every block of a fragment tree.
+    """
+    rewriter = static_replace.get_course_url_rewriter(
+        course_id,
+        data_directory=data_dir,
+        static_asset_path=static_asset_path,
+        jump_to_id_base_url=jump_to_id_base_url,
+    )
+    return wrap_fragment(frag, rewriter.rewrite(frag.content))
+
+
 def grade_histogram(module_id):
     '''
     Print out a histogram of grades on a given problem in staff member debug info.